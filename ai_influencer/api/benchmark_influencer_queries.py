@@ -0,0 +1,190 @@
+"""
+Influencer Query Benchmark
+Measures listing and detail latency as the influencers table grows
+
+Run from this directory: python benchmark_influencer_queries.py [sizes...]
+Each size gets a fresh SQLite database with that many influencers, 1-3
+niches each. Keyset page and detail latencies should stay flat across
+sizes, while the legacy listing (one niche COUNT query per influencer)
+and OFFSET paging grow with the table.
+"""
+
+import json
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from main import INFLUENCER_QUERY_INDEXES, InfluencerCRUD, encode_cursor, json_field_cache
+
+PAGE_SIZE = 50
+SAMPLES = 200
+
+def create_database(db_path: str, influencer_count: int) -> sqlite3.Connection:
+    """Create the influencer schema and fill it with generated influencers"""
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    conn.executescript("""
+        CREATE TABLE influencers (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name VARCHAR(100) NOT NULL,
+            bio TEXT,
+            avatar_path VARCHAR(255),
+            voice_type VARCHAR(50) DEFAULT 'professional_male',
+            personality_traits TEXT,
+            target_audience TEXT,
+            branding_guidelines TEXT,
+            is_active BOOLEAN DEFAULT 1,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+        CREATE TABLE niches (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name VARCHAR(100) UNIQUE NOT NULL,
+            description TEXT,
+            target_keywords TEXT,
+            content_templates TEXT,
+            tone_guidelines TEXT,
+            performance_benchmarks TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+        CREATE TABLE influencer_niches (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            influencer_id INTEGER NOT NULL,
+            niche_id INTEGER NOT NULL,
+            expertise_level INTEGER DEFAULT 5,
+            content_style TEXT,
+            performance_metrics TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE(influencer_id, niche_id)
+        );
+        CREATE INDEX idx_influencers_active ON influencers(is_active);
+        CREATE INDEX idx_influencer_niches_influencer ON influencer_niches(influencer_id);
+        CREATE INDEX idx_influencer_niches_niche ON influencer_niches(niche_id);
+    """)
+    for statement in INFLUENCER_QUERY_INDEXES:
+        conn.execute(statement)
+    
+    niche_names = ["finance", "technology", "fitness", "travel", "food", "fashion", "gaming", "education"]
+    conn.executemany(
+        "INSERT INTO niches (name, description, target_keywords, content_templates, tone_guidelines, performance_benchmarks) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        [(name, f"{name.title()} content", json.dumps([name, "tips", "guide"]),
+          json.dumps({"youtube": "long form", "tiktok": "short form"}),
+          json.dumps({"tone": "friendly"}), json.dumps({"engagement_rate": 0.05}))
+         for name in niche_names]
+    )
+    
+    rng = random.Random(42)
+    start = datetime(2025, 1, 1)
+    influencers = []
+    links = []
+    for influencer_id in range(1, influencer_count + 1):
+        # Several influencers share each second, so the id tie-break matters
+        created = (start + timedelta(seconds=influencer_id // 3)).strftime("%Y-%m-%d %H:%M:%S")
+        influencers.append((
+            influencer_id, f"Influencer {influencer_id}", "Generated for benchmarking", "professional_female",
+            json.dumps(["analytical", "friendly", "curious"]),
+            json.dumps({"age_range": "25-40", "interests": ["investing", "gadgets"]}),
+            json.dumps({"colors": ["#123456", "#abcdef"], "tone": "confident"}),
+            int(rng.random() < 0.9), created, created
+        ))
+        for niche_id in rng.sample(range(1, len(niche_names) + 1), rng.randint(1, 3)):
+            links.append((influencer_id, niche_id, rng.randint(1, 10), json.dumps({"format": "video"})))
+    
+    conn.executemany(
+        "INSERT INTO influencers (id, name, bio, voice_type, personality_traits, target_audience, "
+        "branding_guidelines, is_active, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        influencers
+    )
+    conn.executemany(
+        "INSERT INTO influencer_niches (influencer_id, niche_id, expertise_level, content_style) VALUES (?, ?, ?, ?)",
+        links
+    )
+    conn.commit()
+    conn.execute("ANALYZE")
+    return conn
+
+def legacy_list(conn: sqlite3.Connection, active_only: bool = True) -> list:
+    """The previous listing: every influencer, plus one niche COUNT query each"""
+    cursor = conn.cursor()
+    cursor.execute("SELECT * FROM influencers WHERE is_active = 1 ORDER BY created_at DESC" if active_only
+                   else "SELECT * FROM influencers ORDER BY created_at DESC")
+    influencers = []
+    for row in cursor.fetchall():
+        influencer = dict(row)
+        for field, default in (('personality_traits', '[]'), ('target_audience', '{}'), ('branding_guidelines', '{}')):
+            influencer[field] = json.loads(influencer[field] or default)
+        cursor.execute("SELECT COUNT(*) as niche_count FROM influencer_niches WHERE influencer_id = ?",
+                       (influencer['id'],))
+        influencer['niche_count'] = cursor.fetchone()['niche_count']
+        influencers.append(influencer)
+    return influencers
+
+def measure(operation, samples: int = SAMPLES) -> dict:
+    """Run an operation repeatedly, returning p50/p95 latency in milliseconds"""
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        operation()
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return {"p50_ms": round(statistics.median(timings), 3),
+            "p95_ms": round(timings[int(len(timings) * 0.95) - 1], 3)}
+
+def benchmark_size(db_dir: str, influencer_count: int) -> dict:
+    """Benchmark the query layer against one table size"""
+    conn = create_database(str(Path(db_dir) / f"influencers_{influencer_count}.db"), influencer_count)
+    crud = InfluencerCRUD(conn)
+    json_field_cache.clear()
+    rng = random.Random(7)
+    
+    # Cursor positioned 90% of the way through the (roughly 90%) active influencers
+    deep_offset = int(influencer_count * 0.9 * 0.9)
+    deep = conn.execute(
+        "SELECT created_at, id FROM influencers WHERE is_active = 1 ORDER BY created_at DESC, id DESC LIMIT 1 OFFSET ?",
+        (deep_offset,)
+    ).fetchone()
+    deep_cursor = encode_cursor(deep['created_at'], deep['id'])
+    
+    page, next_cursor = crud.get_page(limit=PAGE_SIZE)
+    assert len(page) == PAGE_SIZE and next_cursor and all('niche_count' in i for i in page)
+    
+    result = {
+        "influencers": influencer_count,
+        "first_page": measure(lambda: crud.get_page(limit=PAGE_SIZE)),
+        "deep_page_keyset": measure(lambda: crud.get_page(limit=PAGE_SIZE, cursor=deep_cursor)),
+        "deep_page_offset": measure(lambda: conn.execute(
+            "SELECT * FROM influencers WHERE is_active = 1 ORDER BY created_at DESC, id DESC LIMIT ? OFFSET ?",
+            (PAGE_SIZE, deep_offset)
+        ).fetchall(), samples=20),
+        "get_by_id": measure(lambda: crud.get_by_id(rng.randint(1, influencer_count))),
+        "legacy_list_all": measure(lambda: legacy_list(conn), samples=3),
+        "json_cache": json_field_cache.get_stats()
+    }
+    conn.close()
+    return result
+
+if __name__ == "__main__":
+    sizes = [int(size) for size in sys.argv[1:]] or [1000, 10000, 100000]
+    
+    print("🚀 Influencer Query Benchmark")
+    print("=" * 60)
+    
+    results = []
+    with tempfile.TemporaryDirectory() as db_dir:
+        for size in sizes:
+            result = benchmark_size(db_dir, size)
+            results.append(result)
+            print(f"{size:>7} influencers | first page p50 {result['first_page']['p50_ms']:.2f}ms"
+                  f" | deep page p50 {result['deep_page_keyset']['p50_ms']:.2f}ms"
+                  f" (OFFSET {result['deep_page_offset']['p50_ms']:.2f}ms)"
+                  f" | get_by_id p50 {result['get_by_id']['p50_ms']:.2f}ms"
+                  f" | legacy list {result['legacy_list_all']['p50_ms']:.0f}ms")
+    
+    print("=" * 60)
+    print(json.dumps(results, indent=2))
@@ -8,9 +8,12 @@ Date: 2025-11-07
 
 import sqlite3
 import json
-from typing import List, Optional, Dict, Any
+import base64
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime
-from fastapi import FastAPI, HTTPException, Depends, Query
+from fastapi import FastAPI, HTTPException, Depends, Query, Response
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from pathlib import Path
@@ -37,6 +40,7 @@ class Influencer(InfluencerBase):
     created_at: datetime
     updated_at: datetime
     niches: List[Dict[str, Any]] = []
+    niche_count: int = 0
     
     class Config:
         from_attributes = True
@@ -77,11 +81,12 @@ class SocialAccount(SocialAccountBase):
     class Config:
         from_attributes = True
 
+DB_PATH = "/workspace/ai_influencer_poc/database/influencers.db"
+
 # Database dependency
 def get_db():
     """Database connection dependency - creates new connection for each request"""
-    db_path = "/workspace/ai_influencer_poc/database/influencers.db"
-    conn = sqlite3.connect(db_path)
+    conn = sqlite3.connect(DB_PATH)
     conn.row_factory = sqlite3.Row
     try:
         yield conn
@@ -91,11 +96,122 @@ def get_db():
 # Simplified CRUD functions that create their own database connections
 def get_db_connection():
     """Get a new database connection for CRUD operations"""
-    db_path = "/workspace/ai_influencer_poc/database/influencers.db"
-    conn = sqlite3.connect(db_path)
+    conn = sqlite3.connect(DB_PATH)
     conn.row_factory = sqlite3.Row
     return conn
 
+# Indexes backing keyset pagination (newest first) of the influencer listing
+INFLUENCER_QUERY_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_influencers_active_created ON influencers(is_active, created_at DESC, id DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_influencers_created ON influencers(created_at DESC, id DESC)"
+]
+
+def ensure_query_indexes(conn: sqlite3.Connection):
+    """Create the listing indexes on databases migrated before they existed"""
+    for statement in INFLUENCER_QUERY_INDEXES:
+        conn.execute(statement)
+    conn.commit()
+
+class JSONFieldCache:
+    """
+    Thread-safe LRU cache of decoded JSON columns, keyed by row and row version.
+    
+    An entry is reused only while both the row version (``updated_at``) and
+    the raw JSON text match what was decoded, so a write landing in the same
+    second as a cached read is still picked up. Cached values are shared
+    between readers and must be treated as read-only.
+    """
+    
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple, Tuple[Any, Tuple, Tuple]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def decode(self, key: Tuple, version: Any, raw: Tuple[Optional[str], ...],
+               defaults: Tuple[str, ...]) -> Tuple[Any, ...]:
+        """Decode JSON column values (NULL decodes its default), reusing a cached decode"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version and entry[1] == raw:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[2]
+        
+        decoded = tuple(json.loads(text or default) for text, default in zip(raw, defaults))
+        
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = (version, raw, decoded)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return decoded
+    
+    def clear(self):
+        """Drop all cached decodes"""
+        with self._lock:
+            self._entries.clear()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache size and hit counts"""
+        with self._lock:
+            return {"size": len(self._entries), "max_entries": self.max_entries,
+                    "hits": self.hits, "misses": self.misses}
+
+json_field_cache = JSONFieldCache()
+
+PERSONA_FIELDS = ('personality_traits', 'target_audience', 'branding_guidelines')
+PERSONA_FIELD_DEFAULTS = ('[]', '{}', '{}')
+
+# Niche summary used in listings, and the full niche (with link details) used by get_by_id
+NICHE_SUMMARY_JSON = "json_object('id', n.id, 'name', n.name, 'expertise_level', inf_n.expertise_level)"
+NICHE_DETAIL_JSON = """json_object(
+            'id', n.id, 'name', n.name, 'description', n.description,
+            'target_keywords', json(COALESCE(n.target_keywords, '[]')),
+            'content_templates', json(COALESCE(n.content_templates, '{}')),
+            'tone_guidelines', json(COALESCE(n.tone_guidelines, '{}')),
+            'performance_benchmarks', json(COALESCE(n.performance_benchmarks, '{}')),
+            'created_at', n.created_at,
+            'expertise_level', inf_n.expertise_level,
+            'content_style', json(COALESCE(inf_n.content_style, '{}')))"""
+
+def influencer_query(where: str, niche_json: str, limit: bool = False) -> str:
+    """Build a query returning influencers with their niche count and niches in one pass"""
+    return f"""
+        SELECT i.*,
+               COUNT(inf_n.niche_id) AS niche_count,
+               json_group_array({niche_json}) FILTER (WHERE n.id IS NOT NULL) AS niches_json
+        FROM (
+            SELECT * FROM influencers
+            WHERE {where}
+            ORDER BY created_at DESC, id DESC
+            {'LIMIT ?' if limit else ''}
+        ) i
+        LEFT JOIN influencer_niches inf_n ON inf_n.influencer_id = i.id
+        LEFT JOIN niches n ON n.id = inf_n.niche_id
+        GROUP BY i.id
+        ORDER BY i.created_at DESC, i.id DESC
+    """
+
+# Page size when a cursor is given without a limit
+DEFAULT_PAGE_SIZE = 100
+
+def encode_cursor(created_at: str, influencer_id: int) -> str:
+    """Encode the position after an influencer as an opaque page cursor"""
+    return base64.urlsafe_b64encode(json.dumps([created_at, influencer_id]).encode()).decode()
+
+def decode_cursor(cursor: str) -> Tuple[str, int]:
+    """Decode a page cursor, raising ValueError if it is malformed"""
+    try:
+        created_at, influencer_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+    if not isinstance(created_at, str) or not isinstance(influencer_id, int):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return created_at, influencer_id
+
 # CRUD operations
 class InfluencerCRUD:
     def __init__(self, db: sqlite3.Connection):
@@ -134,69 +250,71 @@ class InfluencerCRUD:
     def get_by_id(self, influencer_id: int) -> Optional[Dict[str, Any]]:
         """Get influencer by ID with niches"""
         cursor = self.db.cursor()
-        
-        # Get influencer data
-        cursor.execute("SELECT * FROM influencers WHERE id = ?", (influencer_id,))
+        cursor.execute(influencer_query("id = ?", NICHE_DETAIL_JSON), (influencer_id,))
         row = cursor.fetchone()
         
         if not row:
             return None
         
-        influencer = dict(row)
-        
-        # Parse JSON fields
-        influencer['personality_traits'] = json.loads(influencer['personality_traits'] or '[]')
-        influencer['target_audience'] = json.loads(influencer['target_audience'] or '{}')
-        influencer['branding_guidelines'] = json.loads(influencer['branding_guidelines'] or '{}')
-        
-        # Get associated niches
-        cursor.execute("""
-            SELECT n.*, inf_n.expertise_level, inf_n.content_style
-            FROM influencer_niches inf_n
-            JOIN niches n ON inf_n.niche_id = n.id
-            WHERE inf_n.influencer_id = ?
-        """, (influencer_id,))
-        
-        niches = []
-        for niche_row in cursor.fetchall():
-            niche = dict(niche_row)
-            niche['content_templates'] = json.loads(niche['content_templates'] or '{}')
-            niche['tone_guidelines'] = json.loads(niche['tone_guidelines'] or '{}')
-            niche['performance_benchmarks'] = json.loads(niche['performance_benchmarks'] or '{}')
-            niche['content_style'] = json.loads(niche['content_style'] or '{}')
-            niches.append(niche)
-        
-        influencer['niches'] = niches
-        
-        return influencer
+        return self._row_to_influencer(row, 'detail')
     
     def get_all(self, active_only: bool = True) -> List[Dict[str, Any]]:
         """Get all influencers"""
         cursor = self.db.cursor()
+        cursor.execute(influencer_query("is_active = 1" if active_only else "1", NICHE_SUMMARY_JSON))
+        return [self._row_to_influencer(row, 'summary') for row in cursor.fetchall()]
+    
+    def get_page(self, active_only: bool = True, limit: int = DEFAULT_PAGE_SIZE,
+                 cursor: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Get one page of influencers, newest first, using keyset pagination.
+        
+        Pages are read from the listing index after the cursor position, so
+        any page costs the same however deep into the table it is.
+        
+        Returns:
+            The page of influencers (with niche count and niche summaries),
+            and the cursor for the next page (None on the last page)
+        """
+        conditions = ["is_active = 1"] if active_only else []
+        params: List[Any] = []
+        if cursor:
+            conditions.append("(created_at, id) < (?, ?)")
+            params.extend(decode_cursor(cursor))
+        params.append(limit + 1)
+        
+        db_cursor = self.db.cursor()
+        db_cursor.execute(
+            influencer_query(" AND ".join(conditions) or "1", NICHE_SUMMARY_JSON, limit=True), params
+        )
+        rows = db_cursor.fetchall()
+        
+        influencers = [self._row_to_influencer(row, 'summary') for row in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit:
+            last = influencers[-1]
+            next_cursor = encode_cursor(last['created_at'], last['id'])
+        return influencers, next_cursor
+    
+    def _row_to_influencer(self, row: sqlite3.Row, niche_view: str) -> Dict[str, Any]:
+        """Convert a joined influencer row, decoding JSON through the shared cache"""
+        influencer = dict(row)
+        niches_json = influencer.pop('niches_json')
+        
+        persona = json_field_cache.decode(
+            ('influencer', influencer['id']),
+            influencer['updated_at'],
+            tuple(influencer[field] for field in PERSONA_FIELDS),
+            PERSONA_FIELD_DEFAULTS
+        )
+        influencer.update(zip(PERSONA_FIELDS, persona))
+        
+        niches, = json_field_cache.decode(
+            ('influencer_niches', niche_view, influencer['id']), None, (niches_json,), ('[]',)
+        )
+        influencer['niches'] = niches
         
-        if active_only:
-            cursor.execute("SELECT * FROM influencers WHERE is_active = 1 ORDER BY created_at DESC")
-        else:
-            cursor.execute("SELECT * FROM influencers ORDER BY created_at DESC")
-        
-        influencers = []
-        for row in cursor.fetchall():
-            influencer = dict(row)
-            influencer['personality_traits'] = json.loads(influencer['personality_traits'] or '[]')
-            influencer['target_audience'] = json.loads(influencer['target_audience'] or '{}')
-            influencer['branding_guidelines'] = json.loads(influencer['branding_guidelines'] or '{}')
-            
-            # Get niches count for each influencer
-            cursor.execute(
-                "SELECT COUNT(*) as niche_count FROM influencer_niches WHERE influencer_id = ?",
-                (influencer['id'],)
-            )
-            niche_count = cursor.fetchone()['niche_count']
-            influencer['niche_count'] = niche_count
-            
-            influencers.append(influencer)
-        
-        return influencers
+        return influencer
     
     def update(self, influencer_id: int, update_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Update influencer"""
@@ -320,8 +438,22 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
+@app.on_event("startup")
+async def create_query_indexes():
+    """Make sure the influencer listing indexes exist"""
+    try:
+        conn = get_db_connection()
+        try:
+            ensure_query_indexes(conn)
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        # The schema migration has not run yet; it creates the same indexes
+        print(f"Skipping influencer query indexes: {e}")
+
 # API routes
 @app.get("/")
 async def root():
@@ -336,61 +468,42 @@ async def health_check():
 # Influencer endpoints
 @app.get("/api/v1/influencers", response_model=List[Influencer])
 async def get_influencers(
-    active_only: bool = Query(True, description="Only return active influencers")
+    response: Response,
+    active_only: bool = Query(True, description="Only return active influencers"),
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Page size; omit with cursor for all influencers"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor header of the previous page")
 ):
-    """Get all influencers"""
+    """Get influencers, newest first
+    
+    Paging is opt-in: without limit or cursor every influencer is returned.
+    With either, one page is returned and the X-Next-Cursor response header
+    fetches the next one.
+    """
     with get_db_connection() as conn:
-        cursor = conn.cursor()
-        
-        if active_only:
-            cursor.execute("SELECT * FROM influencers WHERE is_active = 1 ORDER BY created_at DESC")
-        else:
-            cursor.execute("SELECT * FROM influencers ORDER BY created_at DESC")
-        
-        influencers = []
-        for row in cursor.fetchall():
-            influencer = dict(row)
-            influencer['personality_traits'] = json.loads(influencer['personality_traits'] or '[]')
-            influencer['target_audience'] = json.loads(influencer['target_audience'] or '{}')
-            influencer['branding_guidelines'] = json.loads(influencer['branding_guidelines'] or '{}')
-            
-            # Get niches count for each influencer
-            cursor.execute(
-                "SELECT COUNT(*) as niche_count FROM influencer_niches WHERE influencer_id = ?",
-                (influencer['id'],)
-            )
-            niche_count = cursor.fetchone()['niche_count']
-            influencer['niche_count'] = niche_count
-            influencer['niches'] = []  # Simplified for now
-            
-            influencers.append(influencer)
-        
-        return influencers
+        crud = InfluencerCRUD(conn)
+        if limit is None and cursor is None:
+            return crud.get_all(active_only)
+        try:
+            influencers, next_cursor = crud.get_page(active_only, limit or DEFAULT_PAGE_SIZE, cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    
+    return influencers
 
 @app.get("/api/v1/influencers/{influencer_id}", response_model=Influencer)
 async def get_influencer(influencer_id: int):
     """Get specific influencer by ID"""
     with get_db_connection() as conn:
-        cursor = conn.cursor()
-        
-        # Get influencer data
-        cursor.execute("SELECT * FROM influencers WHERE id = ?", (influencer_id,))
-        row = cursor.fetchone()
-        
-        if not row:
-            raise HTTPException(status_code=404, detail="Influencer not found")
-        
-        influencer = dict(row)
-        
-        # Parse JSON fields
-        influencer['personality_traits'] = json.loads(influencer['personality_traits'] or '[]')
-        influencer['target_audience'] = json.loads(influencer['target_audience'] or '{}')
-        influencer['branding_guidelines'] = json.loads(influencer['branding_guidelines'] or '{}')
-        
-        # Get associated niches (simplified)
-        influencer['niches'] = []
-        
-        return influencer
+        crud = InfluencerCRUD(conn)
+        influencer = crud.get_by_id(influencer_id)
+    
+    if not influencer:
+        raise HTTPException(status_code=404, detail="Influencer not found")
+    
+    return influencer
 
 @app.post("/api/v1/influencers", response_model=Influencer)
 async def create_influencer(
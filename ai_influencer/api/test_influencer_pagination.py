@@ -0,0 +1,71 @@
+"""
+Tests for keyset pagination of the influencer listing
+
+Uses the benchmark's generated database, where several influencers share
+each created_at second, so pages must tie-break on id to avoid gaps or
+duplicates.
+"""
+
+import sqlite3
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from benchmark_influencer_queries import create_database
+from main import InfluencerCRUD
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "influencers.db")
+    create_database(path, 160).close()
+    return path
+
+
+def walk_pages(crud, active_only, limit):
+    ids, cursor = [], None
+    while True:
+        page, cursor = crud.get_page(active_only, limit, cursor)
+        assert len(page) <= limit
+        ids.extend(influencer['id'] for influencer in page)
+        if cursor is None:
+            return ids
+
+
+@pytest.mark.parametrize("limit", [1, 2, 3, 7, 200])
+@pytest.mark.parametrize("active_only", [True, False])
+def test_pages_have_no_gaps_or_duplicates(db_path, limit, active_only):
+    with sqlite3.connect(db_path) as conn:
+        conn.row_factory = sqlite3.Row
+        crud = InfluencerCRUD(conn)
+        expected = [influencer['id'] for influencer in crud.get_all(active_only)]
+        ids = walk_pages(crud, active_only, limit)
+        row_count = conn.execute(
+            "SELECT COUNT(*) FROM influencers WHERE is_active = 1 OR ?", (not active_only,)
+        ).fetchone()[0]
+
+    assert len(set(expected)) == len(expected) == row_count > 100
+    assert ids == expected
+
+
+def test_listing_pages_only_when_asked(db_path, monkeypatch):
+    monkeypatch.setattr(main, "DB_PATH", db_path)
+    client = TestClient(main.app)
+
+    everything = client.get("/api/v1/influencers")
+    assert everything.status_code == 200
+    assert len(everything.json()) > main.DEFAULT_PAGE_SIZE
+    assert "X-Next-Cursor" not in everything.headers
+
+    ids, params = [], {"limit": 40}
+    while True:
+        page = client.get("/api/v1/influencers", params=params)
+        assert page.status_code == 200
+        ids.extend(influencer['id'] for influencer in page.json())
+        if "X-Next-Cursor" not in page.headers:
+            break
+        params = {"limit": 40, "cursor": page.headers["X-Next-Cursor"]}
+
+    assert ids == [influencer['id'] for influencer in everything.json()]
+    assert client.get("/api/v1/influencers", params={"cursor": "not-a-cursor"}).status_code == 400
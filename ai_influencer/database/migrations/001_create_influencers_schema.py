@@ -124,6 +124,8 @@ def create_influencer_tables():
     
     # Create indexes for performance
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_influencers_active ON influencers(is_active)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_influencers_active_created ON influencers(is_active, created_at DESC, id DESC)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_influencers_created ON influencers(created_at DESC, id DESC)")
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_influencer_niches_influencer ON influencer_niches(influencer_id)")
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_influencer_niches_niche ON influencer_niches(niche_id)")
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_social_accounts_influencer ON social_accounts(influencer_id)")
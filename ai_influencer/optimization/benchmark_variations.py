@@ -0,0 +1,113 @@
+"""
+Image Variation Benchmark
+Compares one-by-one variation generation with the concurrent variation engine
+
+Run from this directory: python benchmark_variations.py [variations] [workers]
+Uses a temporary influencer database and the mock image service (0.1s per
+variation call, rate limited per model). The one-by-one baseline runs on a
+sample and is projected to the full count.
+"""
+
+import json
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from optimized_image_generator import OptimizedImageGenerator, VariationRequest
+
+SCENARIOS = ["office", "home", "outdoor", "presentation"]
+POSES = ["neutral", "presenting", "pointing", "thinking", "explaining", "enthusiastic"]
+LIGHTING = ["natural", "studio", "dramatic"]
+CLOTHING = ["consistent", "casual", "formal"]
+
+def create_database(db_path: str):
+    """Create an influencer database holding the influencer the mock base reference uses"""
+    conn = sqlite3.connect(db_path)
+    conn.execute("""
+        CREATE TABLE influencers (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name VARCHAR(100) NOT NULL,
+            voice_type VARCHAR(50) DEFAULT 'professional_male',
+            personality_traits TEXT,
+            target_audience TEXT,
+            branding_guidelines TEXT,
+            is_active BOOLEAN DEFAULT 1,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    conn.execute(
+        "INSERT INTO influencers (name, voice_type, personality_traits, target_audience, branding_guidelines) "
+        "VALUES (?, ?, ?, ?, ?)",
+        ("Alex Finance Guru", "professional_male", json.dumps(["trustworthy", "analytical"]),
+         json.dumps({"age_range": "25-45"}), json.dumps({"colors": ["navy", "gold"]}))
+    )
+    conn.commit()
+    conn.close()
+
+def make_requests(base_image_id: str, count: int) -> list:
+    """Build variation requests cycling through scenarios, poses, lighting and clothing"""
+    return [
+        VariationRequest(
+            base_image_id=base_image_id,
+            scenario=SCENARIOS[i % len(SCENARIOS)],
+            pose=POSES[(i // len(SCENARIOS)) % len(POSES)],
+            lighting=LIGHTING[i % len(LIGHTING)],
+            clothing=CLOTHING[(i // 2) % len(CLOTHING)]
+        )
+        for i in range(count)
+    ]
+
+def run_benchmark(db_dir: str, variation_count: int = 500, max_workers: int = 16,
+                  baseline_sample: int = 50) -> dict:
+    """Generate ``variation_count`` variations of one base image both ways"""
+    db_path = str(Path(db_dir) / "influencers.db")
+    create_database(db_path)
+    base_image_id = "base_1_benchmark"
+    requests = make_requests(base_image_id, variation_count)
+    
+    # Baseline: one variation at a time, each building its own prompt and scores
+    generator = OptimizedImageGenerator(db_path, max_workers=max_workers)
+    base_ref = generator._get_base_image_reference(base_image_id)
+    sample = requests[:baseline_sample]
+    started = time.perf_counter()
+    baseline = [generator._generate_single_variation(base_image_id, request, base_ref) for request in sample]
+    baseline_elapsed = time.perf_counter() - started
+    
+    generator = OptimizedImageGenerator(db_path, max_workers=max_workers)
+    started = time.perf_counter()
+    variations = generator.generate_variations(base_image_id, requests)
+    elapsed = time.perf_counter() - started
+    
+    assert len(variations) == variation_count
+    assert len({variation.id for variation in variations}) == variation_count
+    assert [variation.prompt_used for variation in variations[:baseline_sample]] == \
+        [variation.prompt_used for variation in baseline]
+    
+    projected_baseline = baseline_elapsed / len(sample) * variation_count
+    return {
+        "variations": variation_count,
+        "max_workers": max_workers,
+        "rate_limit_per_minute": generator.model_rate_limits["gemini_2_5_flash"],
+        "baseline_sample": len(sample),
+        "baseline_seconds_projected": round(projected_baseline, 2),
+        "concurrent_seconds": round(elapsed, 2),
+        "variations_per_second": round(variation_count / elapsed, 1),
+        "speedup": round(projected_baseline / elapsed, 1),
+        "distinct_prompts_built": sum(len(templates) for templates in generator._prompt_templates.values())
+    }
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+    
+    print("🚀 Image Variation Benchmark")
+    print("=" * 60)
+    with tempfile.TemporaryDirectory() as db_dir:
+        result = run_benchmark(db_dir, count, workers)
+    print(f"{result['variations']} variations: one-by-one ~{result['baseline_seconds_projected']:.1f}s (projected), "
+          f"concurrent {result['concurrent_seconds']:.1f}s ({result['speedup']:.1f}x, "
+          f"{result['variations_per_second']:.0f}/s at {result['rate_limit_per_minute']} requests/min)")
+    print("=" * 60)
+    print(json.dumps(result, indent=2))
@@ -8,6 +8,11 @@ Date: 2025-11-07
 
 import json
 import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime
@@ -49,14 +54,61 @@ class GeneratedImage:
     cost_estimate: float
     model_used: str
 
+class ModelRateLimiter:
+    """
+    Thread-safe token bucket for one image model's request rate
+    
+    Callers reserve a token up front and sleep off any deficit, so waiting
+    threads are served in arrival order without polling.
+    """
+    
+    def __init__(self, requests_per_minute: float, burst: Optional[int] = None):
+        self.rate = requests_per_minute / 60.0
+        self.capacity = burst or max(1, int(self.rate))
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> float:
+        """Block until a request may be sent; returns the seconds waited"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        
+        if wait:
+            time.sleep(wait)
+        return wait
+
 class OptimizedImageGenerator:
     """
     Cost-optimized image generation system
     Strategy: Generate 1 high-quality base image, then create inexpensive variations
     """
     
-    def __init__(self, db_path: str = "/workspace/ai_influencer_poc/database/influencers.db"):
+    def __init__(self, db_path: str = "/workspace/ai_influencer_poc/database/influencers.db",
+                 max_workers: int = 16, model_rate_limits: Optional[Dict[str, float]] = None,
+                 prompt_cache_size: int = 128):
         self.db_path = db_path
+        self.max_workers = max_workers
+        
+        # Requests per minute allowed by each model's API, shared by all variation workers
+        self.model_rate_limits = {
+            "dall_e_3": 50,
+            "gemini_2_5_flash": 2000,
+            "qwen_vl": 600,
+            "stable_diffusion": 6000,
+            **(model_rate_limits or {})
+        }
+        self._rate_limiters: Dict[str, ModelRateLimiter] = {}
+        self._rate_limiter_lock = threading.Lock()
+        
+        # Variation prompts per influencer version, keyed by (scenario, pose, lighting, clothing)
+        self.prompt_cache_size = prompt_cache_size
+        self._prompt_templates: "OrderedDict[Tuple, Dict[Tuple[str, str, str, str], str]]" = OrderedDict()
+        self._prompt_lock = threading.Lock()
         
         # Model cost structure (per image)
         self.model_costs = {
@@ -172,20 +224,68 @@ class OptimizedImageGenerator:
         
         return base_image
     
-    def generate_variations(self, base_image_id: str, requests: List[VariationRequest]) -> List[GeneratedImage]:
-        """Generate multiple variations based on base image"""
+    def generate_variations(self, base_image_id: str, requests: List[VariationRequest],
+                            max_workers: Optional[int] = None) -> List[GeneratedImage]:
+        """
+        Generate multiple variations based on base image
+        
+        The base reference is loaded once and shared by every variation.
+        Variation calls run on up to ``max_workers`` threads under the
+        model's rate limit, then all variations are scored in one pass.
+        Results are returned in request order.
+        """
         
         # Get base image reference
         base_ref = self._get_base_image_reference(base_image_id)
         if not base_ref:
             raise ValueError(f"Base image {base_image_id} not found")
         
-        variations = []
-        for request in requests:
-            variation = self._generate_single_variation(base_image_id, request, base_ref)
-            variations.append(variation)
+        if not requests:
+            return []
+        
+        # Use cheaper model for variations
+        model = "gemini_2_5_flash"  # Fast and cheap for variations
+        prompts = self._get_variation_prompts(base_ref, requests)
+        
+        def call_service(prompt: str) -> Tuple[str, str]:
+            return self._call_ai_service(prompt, model, "variation", base_ref["image_url"])
         
-        return variations
+        executor = ThreadPoolExecutor(
+            max_workers=min(max_workers or self.max_workers, len(requests)),
+            thread_name_prefix="image-variations"
+        )
+        try:
+            generated = list(executor.map(call_service, prompts))
+        finally:
+            # On failure, drop the calls that have not started yet
+            executor.shutdown(wait=True, cancel_futures=True)
+        
+        # Score every variation in one pass
+        image_data = [data for data, _ in generated]
+        style_scores = self._calculate_style_consistency_batch(image_data, base_ref["influencer"])
+        brand_scores = self._calculate_brand_alignment_batch(image_data, base_ref["influencer"], "variation")
+        
+        cost_estimate = self.model_costs[model]["variation"]
+        created_at = datetime.now()
+        
+        return [
+            GeneratedImage(
+                id=self._generate_image_id(base_ref["influencer_id"], "variation"),
+                influencer_id=base_ref["influencer_id"],
+                base_image=False,
+                base_image_id=base_image_id,
+                image_url=image_url,
+                prompt_used=prompt,
+                style_consistency_score=style_score,
+                brand_alignment_score=brand_score,
+                platform_optimized={},
+                created_at=created_at,
+                cost_estimate=cost_estimate,
+                model_used=model
+            )
+            for prompt, (_, image_url), style_score, brand_score
+            in zip(prompts, generated, style_scores, brand_scores)
+        ]
     
     def _generate_single_variation(self, base_image_id: str, request: VariationRequest, base_ref: Dict) -> GeneratedImage:
         """Generate single variation based on base image"""
@@ -194,7 +294,7 @@ class OptimizedImageGenerator:
         model = "gemini_2_5_flash"  # Fast and cheap for variations
         
         # Build variation prompt using base image + scenario
-        variation_prompt = self._build_variation_prompt(base_ref, request)
+        variation_prompt = self._get_variation_prompts(base_ref, [request])[0]
         
         # Generate variation (would use image-to-image or reference-based generation)
         image_data, image_url = self._call_ai_service(variation_prompt, model, "variation", base_ref["image_url"])
@@ -282,6 +382,38 @@ class OptimizedImageGenerator:
         
         return prompt
     
+    def _get_variation_prompts(self, base_ref: Dict, requests: List[VariationRequest]) -> List[str]:
+        """Get variation prompts, building each distinct one once per influencer version"""
+        influencer = base_ref["influencer"]
+        key = (base_ref["influencer_id"], influencer.get('updated_at'), influencer.get('primary_niche'))
+        
+        with self._prompt_lock:
+            templates = self._prompt_templates.get(key)
+            if templates is None:
+                templates = self._prompt_templates[key] = {}
+                while len(self._prompt_templates) > self.prompt_cache_size:
+                    self._prompt_templates.popitem(last=False)
+            else:
+                self._prompt_templates.move_to_end(key)
+            
+            prompts = []
+            for request in requests:
+                signature = (request.scenario, request.pose, request.lighting, request.clothing)
+                prompt = templates.get(signature)
+                if prompt is None:
+                    prompt = templates[signature] = self._build_variation_prompt(base_ref, request)
+                prompts.append(prompt)
+        
+        return prompts
+    
+    def _get_rate_limiter(self, model: str) -> ModelRateLimiter:
+        """Get the shared rate limiter for a model"""
+        with self._rate_limiter_lock:
+            limiter = self._rate_limiters.get(model)
+            if limiter is None:
+                limiter = self._rate_limiters[model] = ModelRateLimiter(self.model_rate_limits[model])
+            return limiter
+    
     def _get_appearance_description(self, voice_type: str, personality_traits: List[str]) -> str:
         """Get appearance description based on voice type and personality"""
         
@@ -313,6 +445,7 @@ class OptimizedImageGenerator:
         
         # Mock implementation
         model_config = self.model_costs[model]
+        self._get_rate_limiter(model).acquire()
         
         if image_type == "base_image":
             mock_image_data = f"base_{hashlib.md5(prompt.encode()).hexdigest()[:12]}"
@@ -324,7 +457,6 @@ class OptimizedImageGenerator:
             mock_url = f"https://images.example.com/variations/{mock_image_data}.jpg"
         
         # Simulate API processing time
-        import time
         processing_time = 0.5 if image_type == "base_image" else 0.1
         time.sleep(processing_time)
         
@@ -376,9 +508,8 @@ class OptimizedImageGenerator:
     
     def _generate_image_id(self, influencer_id: int, image_type: str) -> str:
         """Generate unique image ID"""
-        import time
         timestamp = int(time.time())
-        return f"{image_type}_{influencer_id}_{timestamp}"
+        return f"{image_type}_{influencer_id}_{timestamp}_{uuid.uuid4().hex[:8]}"
     
     def _store_base_image_reference(self, base_image_id: str, influencer_id: int, image_url: str):
         """Store base image reference for future variations"""
@@ -404,16 +535,25 @@ class OptimizedImageGenerator:
     
     def _calculate_style_consistency(self, image_data: str, influencer: Dict) -> float:
         """Calculate style consistency score"""
-        # Mock implementation - would use computer vision in production
-        import hashlib
-        image_hash = hashlib.md5(image_data.encode()).hexdigest()
-        hash_int = int(image_hash[:8], 16)
-        return (hash_int % 100) / 100
+        return self._calculate_style_consistency_batch([image_data], influencer)[0]
+    
+    def _calculate_style_consistency_batch(self, image_data: List[str], influencer: Dict) -> List[float]:
+        """Calculate style consistency scores for many images in one pass"""
+        # Mock implementation - would embed the images as one batch and compare
+        # them all against the influencer's reference embedding in production
+        return [
+            (int(hashlib.md5(data.encode()).hexdigest()[:8], 16) % 100) / 100
+            for data in image_data
+        ]
     
     def _calculate_brand_alignment(self, image_data: str, influencer: Dict, image_type: str) -> float:
         """Calculate brand alignment score"""
-        # Mock implementation
-        import hashlib
+        return self._calculate_brand_alignment_batch([image_data], influencer, image_type)[0]
+    
+    def _calculate_brand_alignment_batch(self, image_data: List[str], influencer: Dict,
+                                         image_type: str) -> List[float]:
+        """Calculate brand alignment scores for many images in one pass"""
+        # Mock implementation - the brand profile is computed once per batch
         brand_hash = hashlib.md5(f"{influencer['name']}_{image_type}".encode()).hexdigest()
-        hash_int = int(brand_hash[:8], 16)
-        return (hash_int % 100) / 100
\ No newline at end of file
+        score = (int(brand_hash[:8], 16) % 100) / 100
+        return [score] * len(image_data)
\ No newline at end of file
@@ -0,0 +1,99 @@
+"""
+Shared fixtures for the Phase 1 tests: a temporary influencer database
+with the Phase 1 tables, and a social media stand-in that records posts.
+"""
+
+import json
+import sqlite3
+import threading
+
+import pytest
+
+from database_migration import create_phase1_tables
+from social_media_api import PostResult
+
+
+def insert_influencer(db_path, name="Alex Tech", traits=("energetic", "trustworthy"), is_active=1):
+    """Insert an influencer row and return its id"""
+    with sqlite3.connect(db_path) as conn:
+        cursor = conn.execute("""
+            INSERT INTO influencers
+            (name, bio, voice_type, personality_traits, target_audience, branding_guidelines, is_active)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, (
+            name, f"{name} bio", "professional_male", json.dumps(list(traits)),
+            json.dumps({"age": "25-34"}), json.dumps({"colors": ["blue"]}), is_active
+        ))
+        return cursor.lastrowid
+
+
+@pytest.fixture
+def phase1_db(tmp_path):
+    """Temporary database with the influencer and Phase 1 tables"""
+    db_path = str(tmp_path / "influencers.db")
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("""
+            CREATE TABLE influencers (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name VARCHAR(100) NOT NULL,
+                bio TEXT,
+                avatar_path VARCHAR(255),
+                voice_type VARCHAR(50) DEFAULT 'professional_male',
+                personality_traits TEXT,
+                target_audience TEXT,
+                branding_guidelines TEXT,
+                is_active BOOLEAN DEFAULT 1,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE niches (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name VARCHAR(100) UNIQUE NOT NULL,
+                description TEXT,
+                target_keywords TEXT,
+                content_templates TEXT,
+                tone_guidelines TEXT,
+                performance_benchmarks TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        conn.execute("""
+            INSERT INTO niches (name, description, target_keywords, content_templates,
+                                tone_guidelines, performance_benchmarks)
+            VALUES ('technology', 'Tech', '["ai"]', '{}', '{}', '{}')
+        """)
+    create_phase1_tables(db_path)
+    return db_path
+
+
+class FakeSocialManager:
+    """Records posts instead of calling platform APIs
+
+    ``fail`` makes every post fail; ``hold`` is an event that posts whose
+    topic contains "slow" wait on before returning.
+    """
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.hold = threading.Event()
+        self.hold.set()
+        self.posted = []
+        self._lock = threading.Lock()
+
+    def post_to_platform(self, platform, title, content, media=None):
+        if "slow" in title.lower():
+            self.hold.wait(10)
+        with self._lock:
+            self.posted.append(title)
+        if self.fail:
+            return PostResult(platform=platform, post_id="", url=None, success=False,
+                              error_message="upload rejected")
+        return PostResult(platform=platform, post_id=f"post_{len(self.posted)}",
+                          url="https://example.com/post", success=True)
+
+
+@pytest.fixture
+def fake_social_manager():
+    return FakeSocialManager()
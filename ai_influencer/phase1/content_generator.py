@@ -7,8 +7,13 @@ Date: 2025-11-07
 """
 
 import json
+import os
 import sqlite3
-from typing import Dict, List, Any, Optional
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, Iterable, Iterator, List, Any, Optional, Tuple
 from datetime import datetime
 import random
 from dataclasses import dataclass
@@ -40,16 +45,78 @@ class GeneratedContent:
     cost_estimate: float
     persona_consistency_score: float
 
+class PersonaCache:
+    """
+    Thread-safe LRU cache of parsed influencer personas
+    
+    Each entry is keyed by the raw row it was parsed from, so a batch reads
+    its rows with one query and only re-parses personas whose row changed.
+    updated_at alone is not enough: it has one-second resolution, so an
+    update in the same second as a cached read would go unnoticed.
+    """
+    
+    def __init__(self, max_size: int = 256):
+        self.max_size = max_size
+        self._entries: "OrderedDict[int, Tuple[Any, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, influencer_id: int, version: Any) -> Optional[Dict[str, Any]]:
+        """Get a cached persona if it was parsed from ``version`` (the raw row)"""
+        with self._lock:
+            entry = self._entries.get(influencer_id)
+            if entry is None or entry[0] != version:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(influencer_id)
+            self.hits += 1
+            return entry[1]
+    
+    def put(self, influencer_id: int, version: Any, influencer: Dict[str, Any]):
+        """Cache a parsed persona, evicting the least recently used"""
+        with self._lock:
+            self._entries[influencer_id] = (version, influencer)
+            self._entries.move_to_end(influencer_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+    
+    def invalidate(self, influencer_id: Optional[int] = None):
+        """Drop one persona, or all of them"""
+        with self._lock:
+            if influencer_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(influencer_id, None)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache size and hit statistics"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0
+            }
+
 class InfluencerContentGenerator:
     """
     Core content generation engine that applies influencer personas
     to the existing content generation pipeline
     """
     
-    def __init__(self, db_path: str = "/workspace/ai_influencer_poc/database/influencers.db"):
+    def __init__(self, db_path: str = "/workspace/ai_influencer_poc/database/influencers.db",
+                 persona_cache_size: int = 256, max_workers: Optional[int] = None):
         self.db_path = db_path
         self.base_content_cost = 2.40  # Your existing pipeline cost per video
         
+        # Batch generation: parsed personas survive across batches, and
+        # generation runs on a pool sized for provider I/O
+        self.persona_cache = PersonaCache(persona_cache_size)
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) * 4)
+        
         # Content templates by platform and type
         self.content_templates = {
             "youtube": {
@@ -105,14 +172,18 @@ class InfluencerContentGenerator:
             if not row:
                 return None
             
-            influencer = dict(row)
-            
-            # Parse JSON fields
-            influencer['personality_traits'] = json.loads(influencer['personality_traits'] or '[]')
-            influencer['target_audience'] = json.loads(influencer['target_audience'] or '{}')
-            influencer['branding_guidelines'] = json.loads(influencer['branding_guidelines'] or '{}')
-            
-            return influencer
+            return self._parse_influencer_row(row)
+    
+    def _parse_influencer_row(self, row: sqlite3.Row) -> Dict[str, Any]:
+        """Convert an influencer row to a persona dict, parsing JSON fields"""
+        influencer = dict(row)
+        
+        # Parse JSON fields
+        influencer['personality_traits'] = json.loads(influencer['personality_traits'] or '[]')
+        influencer['target_audience'] = json.loads(influencer['target_audience'] or '{}')
+        influencer['branding_guidelines'] = json.loads(influencer['branding_guidelines'] or '{}')
+        
+        return influencer
     
     def get_niche_content_guidelines(self, niche: str) -> Dict[str, Any]:
         """Get content guidelines for specific niche"""
@@ -122,19 +193,90 @@ class InfluencerContentGenerator:
             row = cursor.fetchone()
             
             if not row:
-                return {
-                    "tone": "professional",
-                    "content_style": {},
-                    "target_keywords": [],
-                    "content_templates": {}
-                }
-            
-            niche_data = dict(row)
-            niche_data['content_templates'] = json.loads(niche_data['content_templates'] or '{}')
-            niche_data['tone_guidelines'] = json.loads(niche_data['tone_guidelines'] or '{}')
-            niche_data['performance_benchmarks'] = json.loads(niche_data['performance_benchmarks'] or '{}')
+                return self._default_niche_guidelines()
             
-            return niche_data
+            return self._parse_niche_row(row)
+    
+    def _default_niche_guidelines(self) -> Dict[str, Any]:
+        """Guidelines used for niches without a row"""
+        return {
+            "tone": "professional",
+            "content_style": {},
+            "target_keywords": [],
+            "content_templates": {}
+        }
+    
+    def _parse_niche_row(self, row: sqlite3.Row) -> Dict[str, Any]:
+        """Convert a niche row to guidelines, parsing JSON fields"""
+        niche_data = dict(row)
+        niche_data['content_templates'] = json.loads(niche_data['content_templates'] or '{}')
+        niche_data['tone_guidelines'] = json.loads(niche_data['tone_guidelines'] or '{}')
+        niche_data['performance_benchmarks'] = json.loads(niche_data['performance_benchmarks'] or '{}')
+        
+        return niche_data
+    
+    def load_personas(self, influencer_ids: Iterable[int], conn: sqlite3.Connection = None) -> Dict[int, Dict[str, Any]]:
+        """
+        Load many active influencer personas, using the persona cache
+        
+        One query reads every requested row; only rows that are not cached
+        or differ from the row a cached persona was parsed from are parsed.
+        Inactive or missing influencers are left out of the result.
+        """
+        ids = sorted(set(influencer_ids))
+        if not ids:
+            return {}
+        
+        if conn is None:
+            with self.get_db_connection() as conn:
+                return self.load_personas(ids, conn)
+        
+        placeholders = ",".join("?" * len(ids))
+        rows = {
+            row["id"]: row
+            for row in conn.execute(
+                f"SELECT * FROM influencers WHERE id IN ({placeholders}) AND is_active = 1", ids
+            )
+        }
+        
+        personas = {}
+        for influencer_id in ids:
+            row = rows.get(influencer_id)
+            if row is None:
+                self.persona_cache.invalidate(influencer_id)
+                continue
+            raw = tuple(row)
+            persona = self.persona_cache.get(influencer_id, raw)
+            if persona is None:
+                persona = self._parse_influencer_row(row)
+                self.persona_cache.put(influencer_id, raw, persona)
+            personas[influencer_id] = persona
+        
+        return personas
+    
+    def load_niche_guidelines(self, niches: Iterable[str], conn: sqlite3.Connection = None) -> Dict[str, Dict[str, Any]]:
+        """Load guidelines for many niches with a single query"""
+        names = sorted(set(niches))
+        if not names:
+            return {}
+        
+        if conn is None:
+            with self.get_db_connection() as conn:
+                return self.load_niche_guidelines(names, conn)
+        
+        placeholders = ",".join("?" * len(names))
+        guidelines = {
+            row["name"]: self._parse_niche_row(row)
+            for row in conn.execute(f"SELECT * FROM niches WHERE name IN ({placeholders})", names)
+        }
+        for name in names:
+            guidelines.setdefault(name, self._default_niche_guidelines())
+        
+        return guidelines
+    
+    def invalidate_persona(self, influencer_id: Optional[int] = None):
+        """Drop a cached persona after its influencer is updated (all personas if no id)"""
+        self.persona_cache.invalidate(influencer_id)
     
     def apply_influencer_persona(self, content: str, influencer: Dict[str, Any], platform: str) -> str:
         """Apply influencer personality to content"""
@@ -194,6 +336,15 @@ class InfluencerContentGenerator:
         # Get niche guidelines
         niche_guidelines = self.get_niche_content_guidelines(request.niche)
         
+        return self.build_content(request, influencer, niche_guidelines)
+    
+    def build_content(self, request: ContentRequest, influencer: Dict[str, Any],
+                       niche_guidelines: Dict[str, Any]) -> GeneratedContent:
+        """Generate content for a request from an already loaded persona and niche
+        
+        Does not touch the database, so it is safe to call from worker threads.
+        """
+        
         # Generate base content (simulating your existing $2.40 pipeline)
         base_content = self._generate_base_content(request.topic, request.niche, request.content_type)
         
@@ -212,7 +363,8 @@ class InfluencerContentGenerator:
         consistency_score = self._calculate_persona_consistency(persona_content, influencer, request.platform)
         
         # Create generated content
-        content_id = f"{request.influencer_id}_{request.platform}_{int(datetime.now().timestamp())}"
+        # The random suffix keeps ids unique when many posts are generated per second
+        content_id = f"{request.influencer_id}_{request.platform}_{int(datetime.now().timestamp())}_{uuid.uuid4().hex[:8]}"
         
         generated_content = GeneratedContent(
             id=content_id,
@@ -376,14 +528,64 @@ class InfluencerContentGenerator:
         
         return min(score, 1.0)
     
-    def batch_generate_content(self, requests: List[ContentRequest]) -> List[GeneratedContent]:
-        """Generate multiple pieces of content with different influencer personas"""
-        results = []
-        for request in requests:
+    def iter_generate_content(self, requests: List[ContentRequest],
+                              max_workers: Optional[int] = None) -> Iterator[Tuple[int, GeneratedContent]]:
+        """
+        Generate content for many requests, yielding results as they complete
+        
+        Personas and niche guidelines for the whole batch are loaded up front
+        with one connection (each distinct influencer and niche once), then
+        generation runs on a thread pool. Yields (request index, content)
+        pairs in completion order; failed requests are reported and skipped.
+        At most twice the pool size of requests are in flight at a time.
+        """
+        if not requests:
+            return
+        
+        with self.get_db_connection() as conn:
+            personas = self.load_personas((request.influencer_id for request in requests), conn)
+            guidelines = self.load_niche_guidelines((request.niche for request in requests), conn)
+        
+        max_workers = max_workers or self.max_workers
+        pending = {}
+        next_index = 0
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
             try:
-                content = self.generate_content(request)
-                results.append(content)
-            except Exception as e:
-                print(f"Error generating content for request {request}: {e}")
-                continue
-        return results
\ No newline at end of file
+                while next_index < len(requests) or pending:
+                    # Keep the pool fed without queueing the whole batch
+                    while next_index < len(requests) and len(pending) < max_workers * 2:
+                        request = requests[next_index]
+                        influencer = personas.get(request.influencer_id)
+                        if influencer is None:
+                            print(f"Error generating content for request {request}: "
+                                  f"Influencer {request.influencer_id} not found or inactive")
+                        else:
+                            future = executor.submit(
+                                self.build_content, request, influencer, guidelines[request.niche]
+                            )
+                            pending[future] = next_index
+                        next_index += 1
+                    
+                    if not pending:
+                        continue
+                    
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        index = pending.pop(future)
+                        try:
+                            content = future.result()
+                        except Exception as e:
+                            print(f"Error generating content for request {requests[index]}: {e}")
+                            continue
+                        yield index, content
+            finally:
+                # The consumer stopped early: drop work that has not started
+                for future in pending:
+                    future.cancel()
+    
+    def batch_generate_content(self, requests: List[ContentRequest],
+                               max_workers: Optional[int] = None) -> List[GeneratedContent]:
+        """Generate multiple pieces of content with different influencer personas"""
+        results = sorted(self.iter_generate_content(requests, max_workers), key=lambda item: item[0])
+        return [content for _, content in results]
@@ -7,13 +7,19 @@ Date: 2025-11-07
 """
 
 import json
+import os
+import socket
 import sqlite3
 import asyncio
-from typing import Dict, List, Any, Optional
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime, timedelta
 from dataclasses import dataclass, asdict
 from content_generator import InfluencerContentGenerator, ContentRequest, GeneratedContent
 from social_media_api import SocialMediaManager, MediaAsset, PostResult
+from database_migration import update_scheduled_posts_table
 import uuid
 import logging
 
@@ -77,6 +83,28 @@ class ContentScheduler:
         self.retry_delay_minutes = 15
         self.content_buffer_minutes = 10
         
+        # Parallel mode: workers claim due posts under a lease, so several
+        # scheduler processes can share one database
+        self.parallel_mode = False
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.max_workers = 16
+        self.lease_seconds = 300
+        self.status_flush_size = 50
+        # Finished posts are written at least this often, and leases of posts
+        # still being processed are renewed, so no claim outlives its lease
+        self.status_flush_interval = 5.0
+        self.platform_concurrency = {
+            "youtube": 2,
+            "tiktok": 4,
+            "instagram": 4,
+            "linkedin": 4,
+            "twitter": 8
+        }
+        self.default_platform_concurrency = 4
+        self._platform_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._platform_slots_lock = threading.Lock()
+        self._lease_columns_ready = False
+        
     def _setup_logging(self) -> logging.Logger:
         """Setup logging for the scheduler"""
         logger = logging.getLogger('ContentScheduler')
@@ -92,7 +120,8 @@ class ContentScheduler:
     
     def get_db_connection(self):
         """Get database connection"""
-        conn = sqlite3.connect(self.db_path)
+        # Wait on locks held by other scheduler processes instead of failing
+        conn = sqlite3.connect(self.db_path, timeout=30)
         conn.row_factory = sqlite3.Row
         return conn
     
@@ -211,23 +240,22 @@ class ContentScheduler:
                 ORDER BY scheduled_time ASC
             """, (current_time.isoformat(), (current_time - timedelta(days=7)).isoformat()))
             
-            posts = []
-            for row in cursor.fetchall():
-                post = ScheduledPost(
-                    id=row['id'],
-                    influencer_id=row['influencer_id'],
-                    topic=row['topic'],
-                    niche=row['niche'],
-                    content_type=row['content_type'],
-                    platform=row['platform'],
-                    scheduled_time=datetime.fromisoformat(row['scheduled_time']),
-                    status=row['status'],
-                    retry_count=row['retry_count'],
-                    created_at=datetime.fromisoformat(row['created_at'])
-                )
-                posts.append(post)
-            
-            return posts
+            return [self._row_to_post(row) for row in cursor.fetchall()]
+    
+    def _row_to_post(self, row: sqlite3.Row) -> ScheduledPost:
+        """Build a ScheduledPost from a scheduled_posts row"""
+        return ScheduledPost(
+            id=row['id'],
+            influencer_id=row['influencer_id'],
+            topic=row['topic'],
+            niche=row['niche'],
+            content_type=row['content_type'],
+            platform=row['platform'],
+            scheduled_time=datetime.fromisoformat(row['scheduled_time']),
+            status=row['status'],
+            retry_count=row['retry_count'],
+            created_at=datetime.fromisoformat(row['created_at'])
+        )
     
     def process_scheduled_post(self, post: ScheduledPost) -> bool:
         """Process a single scheduled post"""
@@ -361,6 +389,9 @@ class ContentScheduler:
     
     def run_scheduler_cycle(self) -> Dict[str, int]:
         """Run a single scheduler cycle"""
+        if self.parallel_mode:
+            return self.run_parallel_scheduler_cycle()
+        
         current_time = datetime.now()
         results = {
             "processed": 0,
@@ -387,6 +418,266 @@ class ContentScheduler:
         
         return results
     
+    def claim_due_posts(self, current_time: datetime, limit: int) -> List[ScheduledPost]:
+        """
+        Atomically claim up to ``limit`` due posts for this worker
+        
+        Claimed posts move to "generating" with a lease. Posts whose lease
+        has expired (their worker died mid-post) are claimed again. The
+        claim is a single UPDATE ... RETURNING, so concurrent schedulers
+        never claim the same post.
+        """
+        if not self._lease_columns_ready:
+            update_scheduled_posts_table(self.db_path)
+            self._lease_columns_ready = True
+        
+        now = current_time.isoformat()
+        with self.get_db_connection() as conn:
+            rows = conn.execute("""
+                UPDATE scheduled_posts
+                SET status = 'generating', claimed_by = ?, lease_expires_at = ?, updated_at = ?
+                WHERE id IN (
+                    SELECT id FROM scheduled_posts
+                    WHERE scheduled_time <= ?
+                    AND scheduled_time >= ?  -- Only posts from the last week
+                    AND (status = 'scheduled'
+                         OR (status = 'generating' AND lease_expires_at < ?))
+                    ORDER BY scheduled_time ASC
+                    LIMIT ?
+                )
+                RETURNING *
+            """, (
+                self.worker_id,
+                (current_time + timedelta(seconds=self.lease_seconds)).isoformat(),
+                now, now, (current_time - timedelta(days=7)).isoformat(), now, limit
+            )).fetchall()
+            conn.commit()
+        
+        posts = [self._row_to_post(row) for row in rows]
+        posts.sort(key=lambda post: post.scheduled_time)
+        return posts
+    
+    def renew_leases(self, post_ids: List[str], current_time: Optional[datetime] = None) -> int:
+        """
+        Extend the lease on posts this worker still holds
+        
+        Returns the number of leases renewed; posts re-claimed by another
+        worker after their lease expired are not touched.
+        """
+        if not post_ids:
+            return 0
+        
+        current_time = current_time or datetime.now()
+        placeholders = ",".join("?" * len(post_ids))
+        with self.get_db_connection() as conn:
+            cursor = conn.execute(f"""
+                UPDATE scheduled_posts
+                SET lease_expires_at = ?
+                WHERE claimed_by = ? AND id IN ({placeholders})
+            """, [
+                (current_time + timedelta(seconds=self.lease_seconds)).isoformat(),
+                self.worker_id, *post_ids
+            ])
+            conn.commit()
+            return cursor.rowcount
+    
+    def _platform_slot(self, platform: str) -> threading.BoundedSemaphore:
+        """Get the semaphore capping concurrent posts to a platform"""
+        with self._platform_slots_lock:
+            if platform not in self._platform_slots:
+                limit = self.platform_concurrency.get(platform, self.default_platform_concurrency)
+                self._platform_slots[platform] = threading.BoundedSemaphore(limit)
+            return self._platform_slots[platform]
+    
+    def _process_claimed_post(self, post: ScheduledPost, influencer: Optional[Dict[str, Any]],
+                              niche_guidelines: Dict[str, Any]) -> Tuple[Tuple, Optional[Tuple], str]:
+        """
+        Generate and publish a claimed post without touching the database
+        
+        Runs on a worker thread. Returns the status update row, the
+        generated content row (None if generation failed) and the outcome
+        ("posted", "retry" or "failed") for the main thread to write in bulk.
+        """
+        generated_content = None
+        try:
+            if influencer is None:
+                raise ValueError(f"Influencer {post.influencer_id} not found or inactive")
+            
+            content_request = ContentRequest(
+                topic=post.topic,
+                niche=post.niche,
+                influencer_id=post.influencer_id,
+                content_type=post.content_type,
+                platform=post.platform
+            )
+            generated_content = self.content_generator.build_content(content_request, influencer, niche_guidelines)
+            post.generated_content = generated_content
+            
+            with self._platform_slot(post.platform):
+                post_result = self._post_to_social_media(generated_content, post)
+            post.post_result = post_result
+            
+            if post_result.success:
+                outcome, error_message = "posted", None
+            else:
+                outcome, error_message = "retry", post_result.error_message
+                
+        except Exception as e:
+            self.logger.error(f"Error processing post {post.id}: {e}")
+            outcome, error_message = "failed", str(e)
+        
+        if outcome == "retry":
+            post.retry_count += 1
+            if post.retry_count < self.max_retries:
+                post.scheduled_time = datetime.now() + timedelta(minutes=self.retry_delay_minutes * post.retry_count)
+                post.status = "scheduled"
+            else:
+                self.logger.error(f"Max retries reached for post {post.id}: {error_message}")
+                post.status = "failed"
+        else:
+            post.status = outcome
+        
+        status_row = (
+            post.status, post.retry_count, error_message, post.scheduled_time.isoformat(),
+            datetime.now().isoformat(), post.id, self.worker_id
+        )
+        
+        content_row = None
+        if generated_content is not None:
+            content_row = (
+                generated_content.id, post.id, generated_content.influencer_id,
+                generated_content.content, json.dumps(generated_content.hashtags),
+                generated_content.title, generated_content.description,
+                json.dumps(generated_content.platform_optimized),
+                generated_content.cost_estimate, generated_content.persona_consistency_score,
+                generated_content.generated_at.isoformat()
+            )
+        
+        return status_row, content_row, "retry" if post.status == "scheduled" else post.status
+    
+    def _flush_post_updates(self, status_rows: List[Tuple], content_rows: List[Tuple]):
+        """
+        Write finished posts in one transaction
+        
+        Status updates only apply while this worker still holds the claim,
+        so a post whose lease expired and was re-claimed elsewhere is left
+        to its new owner.
+        """
+        if not status_rows and not content_rows:
+            return
+        
+        with self.get_db_connection() as conn:
+            conn.executemany("""
+                INSERT OR REPLACE INTO generated_content 
+                (id, post_id, influencer_id, content, hashtags, title, description,
+                 platform_optimized, cost_estimate, persona_consistency_score, generated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, content_rows)
+            conn.executemany("""
+                UPDATE scheduled_posts 
+                SET status = ?, retry_count = ?, error_message = ?, scheduled_time = ?,
+                    updated_at = ?, claimed_by = NULL, lease_expires_at = NULL
+                WHERE id = ? AND claimed_by = ?
+            """, status_rows)
+            conn.commit()
+        
+        status_rows.clear()
+        content_rows.clear()
+    
+    def run_parallel_scheduler_cycle(self, max_posts: Optional[int] = None) -> Dict[str, int]:
+        """
+        Run a scheduler cycle that claims and processes due posts concurrently
+        
+        Posts are claimed in small batches as worker slots free up, so the
+        lease only has to cover one post's processing and other scheduler
+        processes can claim the rest of the backlog. Personas for each
+        claimed batch are loaded with one query, publishing is capped per
+        platform, and status writes are flushed in batches of
+        ``status_flush_size`` or every ``status_flush_interval`` seconds,
+        whichever comes first. Leases of posts still in flight are renewed
+        every third of ``lease_seconds``, so a slow upload is not re-claimed.
+        """
+        results = {
+            "processed": 0,
+            "successful": 0,
+            "failed": 0,
+            "retries_scheduled": 0
+        }
+        
+        pending = {}
+        status_rows: List[Tuple] = []
+        content_rows: List[Tuple] = []
+        backlog_drained = max_posts is not None and max_posts <= 0
+        claimed_total = 0
+        renew_interval = self.lease_seconds / 3
+        tick = min(self.status_flush_interval, renew_interval)
+        oldest_buffered = None
+        last_renewal = time.monotonic()
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            try:
+                while pending or not backlog_drained:
+                    # Claim only what the pool can start soon
+                    capacity = self.max_workers * 2 - len(pending)
+                    if max_posts is not None:
+                        capacity = min(capacity, max_posts - claimed_total)
+                    if not backlog_drained and capacity > 0:
+                        posts = self.claim_due_posts(datetime.now(), capacity)
+                        claimed_total += len(posts)
+                        if len(posts) < capacity or (max_posts is not None and claimed_total >= max_posts):
+                            backlog_drained = True
+                        
+                        if posts:
+                            personas = self.content_generator.load_personas(post.influencer_id for post in posts)
+                            guidelines = self.content_generator.load_niche_guidelines(post.niche for post in posts)
+                            for post in posts:
+                                future = executor.submit(
+                                    self._process_claimed_post, post,
+                                    personas.get(post.influencer_id), guidelines[post.niche]
+                                )
+                                pending[future] = post
+                    
+                    if not pending:
+                        continue
+                    
+                    # Wake up periodically to flush and renew leases while slow posts run
+                    done, _ = wait(pending, timeout=tick, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        post = pending.pop(future)
+                        status_row, content_row, outcome = future.result()
+                        if oldest_buffered is None:
+                            oldest_buffered = time.monotonic()
+                        status_rows.append(status_row)
+                        if content_row is not None:
+                            content_rows.append(content_row)
+                        
+                        results["processed"] += 1
+                        if outcome == "posted":
+                            results["successful"] += 1
+                        else:
+                            results["failed"] += 1
+                            if outcome == "retry":
+                                results["retries_scheduled"] += 1
+                    
+                    now = time.monotonic()
+                    if status_rows and (len(status_rows) >= self.status_flush_size
+                                        or now - oldest_buffered >= self.status_flush_interval):
+                        self._flush_post_updates(status_rows, content_rows)
+                        oldest_buffered = None
+                    if pending and now - last_renewal >= renew_interval:
+                        self.renew_leases([post.id for post in pending.values()])
+                        last_renewal = now
+            finally:
+                # Unfinished posts keep their lease and are re-claimed once it expires
+                for future in pending:
+                    future.cancel()
+                self._flush_post_updates(status_rows, content_rows)
+        
+        if results["processed"] > 0:
+            self.logger.info(f"Parallel cycle completed ({self.worker_id}): {results}")
+        
+        return results
+    
     def get_campaign_performance(self, campaign_id: str) -> Dict[str, Any]:
         """Get performance metrics for a campaign"""
         with self.get_db_connection() as conn:
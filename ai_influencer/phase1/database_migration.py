@@ -52,6 +52,8 @@ def create_phase1_tables(db_path: str = "/workspace/ai_influencer_poc/database/i
                 status TEXT DEFAULT 'scheduled',  -- scheduled, generating, ready, posted, failed
                 retry_count INTEGER DEFAULT 0,
                 error_message TEXT,
+                claimed_by TEXT,  -- scheduler worker holding the lease
+                lease_expires_at TEXT,
                 created_at TEXT DEFAULT CURRENT_TIMESTAMP,
                 updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
                 FOREIGN KEY (influencer_id) REFERENCES influencers (id)
@@ -126,6 +128,7 @@ def create_phase1_tables(db_path: str = "/workspace/ai_influencer_poc/database/i
         indexes = [
             "CREATE INDEX IF NOT EXISTS idx_scheduled_posts_status ON scheduled_posts(status)",
             "CREATE INDEX IF NOT EXISTS idx_scheduled_posts_scheduled_time ON scheduled_posts(scheduled_time)",
+            "CREATE INDEX IF NOT EXISTS idx_scheduled_posts_due ON scheduled_posts(status, scheduled_time)",
             "CREATE INDEX IF NOT EXISTS idx_scheduled_posts_platform ON scheduled_posts(platform)",
             "CREATE INDEX IF NOT EXISTS idx_scheduled_posts_influencer ON scheduled_posts(influencer_id)",
             "CREATE INDEX IF NOT EXISTS idx_generated_content_influencer ON generated_content(influencer_id)",
@@ -238,6 +241,38 @@ def update_existing_influencers_table(db_path: str = "/workspace/ai_influencer_p
     finally:
         conn.close()
 
+def update_scheduled_posts_table(db_path: str = "/workspace/ai_influencer_poc/database/influencers.db"):
+    """Add the scheduler lease columns to an existing scheduled_posts table"""
+    
+    conn = sqlite3.connect(db_path, timeout=30)
+    cursor = conn.cursor()
+    
+    try:
+        cursor.execute("PRAGMA table_info(scheduled_posts)")
+        existing_columns = [row[1] for row in cursor.fetchall()]
+        
+        new_columns = {
+            "claimed_by": "TEXT",
+            "lease_expires_at": "TEXT"
+        }
+        
+        for column_name, column_def in new_columns.items():
+            if column_name not in existing_columns:
+                cursor.execute(f"ALTER TABLE scheduled_posts ADD COLUMN {column_name} {column_def}")
+                print(f"➕ Added column: {column_name}")
+        
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_scheduled_posts_due ON scheduled_posts(status, scheduled_time)"
+        )
+        conn.commit()
+        
+    except Exception as e:
+        print(f"❌ Error updating scheduled_posts table: {e}")
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
 def verify_phase1_setup(db_path: str = "/workspace/ai_influencer_poc/database/influencers.db"):
     """Verify Phase 1 setup is complete"""
     
@@ -312,6 +347,9 @@ def main():
         # Update existing influencers table
         update_existing_influencers_table(db_path)
         
+        # Add scheduler lease columns to databases created before them
+        update_scheduled_posts_table(db_path)
+        
         # Verify setup
         if verify_phase1_setup(db_path):
             print("\n🚀 Phase 1 database setup completed successfully!")
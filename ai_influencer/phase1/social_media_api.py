@@ -9,10 +9,13 @@ Date: 2025-11-07
 import json
 import time
 import os
-from typing import Dict, List, Any, Optional
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import requests
+from requests.adapters import HTTPAdapter
 from abc import ABC, abstractmethod
 
 @dataclass
@@ -24,6 +27,7 @@ class PostResult:
     success: bool
     error_message: Optional[str] = None
     metrics: Optional[Dict[str, Any]] = None
+    media_id: Optional[str] = None  # uploaded media attached to the post
 
 @dataclass
 class MediaAsset:
@@ -33,12 +37,18 @@ class MediaAsset:
     caption: str
     hashtags: List[str]
     alt_text: Optional[str] = None
+    media_ids: Dict[str, str] = field(default_factory=dict)  # platform -> uploaded media ID
 
 class SocialMediaPlatform(ABC):
     """Abstract base class for social media platforms"""
     
-    def __init__(self, config: Dict[str, str]):
+    platform_name = ""
+    # Post IDs per batch metrics lookup; 0 means the API has no batch lookup
+    metrics_batch_size = 0
+    
+    def __init__(self, config: Dict[str, str], session: Optional[requests.Session] = None):
         self.config = config
+        self.session = session or requests.Session()
         self.api_key = config.get('api_key', '')
         self.base_url = config.get('base_url', '')
         self.headers = {
@@ -60,12 +70,40 @@ class SocialMediaPlatform(ABC):
     def upload_media(self, media_asset: MediaAsset) -> str:
         """Upload media and return media ID"""
         pass
+    
+    def get_metrics_batch(self, post_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Get metrics for several posts, one lookup per ``metrics_batch_size`` posts where the API allows"""
+        if not self.metrics_batch_size:
+            return {post_id: self.get_metrics(post_id) for post_id in post_ids}
+        
+        metrics = {}
+        for start in range(0, len(post_ids), self.metrics_batch_size):
+            metrics.update(self.lookup_metrics(post_ids[start:start + self.metrics_batch_size]))
+        return metrics
+    
+    def lookup_metrics(self, post_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Fetch metrics for up to ``metrics_batch_size`` posts in one request"""
+        raise NotImplementedError(f"{self.platform_name or type(self).__name__} has no batch metrics lookup")
+    
+    def resolve_media_id(self, media: Optional[MediaAsset]) -> Optional[str]:
+        """Get this platform's media ID for an asset, uploading it only if it has not been uploaded yet"""
+        if media is None:
+            return None
+        media_id = media.media_ids.get(self.platform_name)
+        if media_id is None:
+            media_id = self.upload_media(media)
+            media.media_ids[self.platform_name] = media_id
+        return media_id
 
 class YouTubeAPI(SocialMediaPlatform):
     """YouTube Data API v3 integration"""
     
-    def __init__(self, config: Dict[str, str]):
-        super().__init__(config)
+    platform_name = "youtube"
+    # videos.list accepts up to 50 IDs per request
+    metrics_batch_size = 50
+    
+    def __init__(self, config: Dict[str, str], session: Optional[requests.Session] = None):
+        super().__init__(config, session)
         self.api_key = config.get('api_key', '')
         self.channel_id = config.get('channel_id', '')
         self.base_url = "https://www.googleapis.com/youtube/v3"
@@ -76,6 +114,7 @@ class YouTubeAPI(SocialMediaPlatform):
             # In production, this would upload to YouTube
             # For POC, we'll simulate the response
             
+            media_id = self.resolve_media_id(media)
             video_id = f"yt_{int(time.time())}"
             video_url = f"https://youtube.com/watch?v={video_id}"
             
@@ -84,7 +123,8 @@ class YouTubeAPI(SocialMediaPlatform):
                 post_id=video_id,
                 url=video_url,
                 success=True,
-                error_message=None
+                error_message=None,
+                media_id=media_id
             )
             
         except Exception as e:
@@ -98,15 +138,32 @@ class YouTubeAPI(SocialMediaPlatform):
     
     def get_metrics(self, post_id: str) -> Dict[str, Any]:
         """Get YouTube video metrics"""
-        # Simulated metrics for POC
-        return {
-            "views": 1250,
-            "likes": 85,
-            "comments": 12,
-            "shares": 8,
-            "retention_rate": 0.72,
-            "click_through_rate": 0.15
+        return self.lookup_metrics([post_id])[post_id]
+    
+    def lookup_metrics(self, post_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Get statistics for up to 50 videos with one videos.list request (simulated for POC)"""
+        params = {"part": "statistics", "id": ",".join(post_ids), "key": self.api_key}
+        # In production: self.session.get(f"{self.base_url}/videos", params=params).json()
+        response = {
+            "items": [
+                {"id": video_id, "statistics": {"viewCount": "1250", "likeCount": "85", "commentCount": "12"}}
+                for video_id in params["id"].split(",")
+            ]
         }
+        
+        metrics = {}
+        for item in response["items"]:
+            statistics = item["statistics"]
+            metrics[item["id"]] = {
+                "views": int(statistics.get("viewCount", 0)),
+                "likes": int(statistics.get("likeCount", 0)),
+                "comments": int(statistics.get("commentCount", 0)),
+                # Not in videos.list; simulated YouTube Analytics figures
+                "shares": 8,
+                "retention_rate": 0.72,
+                "click_through_rate": 0.15
+            }
+        return metrics
     
     def upload_media(self, media_asset: MediaAsset) -> str:
         """Upload video to YouTube"""
@@ -116,8 +173,10 @@ class YouTubeAPI(SocialMediaPlatform):
 class TikTokAPI(SocialMediaPlatform):
     """TikTok Business API integration"""
     
-    def __init__(self, config: Dict[str, str]):
-        super().__init__(config)
+    platform_name = "tiktok"
+    
+    def __init__(self, config: Dict[str, str], session: Optional[requests.Session] = None):
+        super().__init__(config, session)
         self.app_id = config.get('app_id', '')
         self.secret = config.get('secret', '')
         self.base_url = "https://business-api.tiktok.com/open_api/v1"
@@ -126,13 +185,15 @@ class TikTokAPI(SocialMediaPlatform):
         """Post TikTok video"""
         try:
             # Simulate TikTok posting
+            media_id = self.resolve_media_id(media)
             post_id = f"tt_{int(time.time())}"
             
             return PostResult(
                 platform="tiktok",
                 post_id=post_id,
                 url=f"https://tiktok.com/@your_account/video/{post_id}",
-                success=True
+                success=True,
+                media_id=media_id
             )
             
         except Exception as e:
@@ -161,8 +222,10 @@ class TikTokAPI(SocialMediaPlatform):
 class InstagramAPI(SocialMediaPlatform):
     """Instagram Graph API integration"""
     
-    def __init__(self, config: Dict[str, str]):
-        super().__init__(config)
+    platform_name = "instagram"
+    
+    def __init__(self, config: Dict[str, str], session: Optional[requests.Session] = None):
+        super().__init__(config, session)
         self.access_token = config.get('access_token', '')
         self.business_account_id = config.get('business_account_id', '')
         self.base_url = "https://graph.facebook.com/v18.0"
@@ -190,22 +253,26 @@ class InstagramAPI(SocialMediaPlatform):
     
     def _post_image(self, caption: str, media: Optional[MediaAsset] = None) -> PostResult:
         """Post Instagram image"""
+        media_id = self.resolve_media_id(media)
         post_id = f"ig_{int(time.time())}"
         return PostResult(
             platform="instagram",
             post_id=post_id,
             url=f"https://instagram.com/p/{post_id}",
-            success=True
+            success=True,
+            media_id=media_id
         )
     
     def _post_video(self, caption: str, media: Optional[MediaAsset] = None) -> PostResult:
         """Post Instagram video"""
+        media_id = self.resolve_media_id(media)
         post_id = f"ig_video_{int(time.time())}"
         return PostResult(
             platform="instagram",
             post_id=post_id,
             url=f"https://instagram.com/p/{post_id}",
-            success=True
+            success=True,
+            media_id=media_id
         )
     
     def get_metrics(self, post_id: str) -> Dict[str, Any]:
@@ -226,8 +293,10 @@ class InstagramAPI(SocialMediaPlatform):
 class LinkedInAPI(SocialMediaPlatform):
     """LinkedIn Marketing API integration"""
     
-    def __init__(self, config: Dict[str, str]):
-        super().__init__(config)
+    platform_name = "linkedin"
+    
+    def __init__(self, config: Dict[str, str], session: Optional[requests.Session] = None):
+        super().__init__(config, session)
         self.access_token = config.get('access_token', '')
         self.organization_id = config.get('organization_id', '')
         self.base_url = "https://api.linkedin.com/v2"
@@ -239,13 +308,15 @@ class LinkedInAPI(SocialMediaPlatform):
     def post_content(self, content: str, media: Optional[MediaAsset] = None) -> PostResult:
         """Post LinkedIn content"""
         try:
+            media_id = self.resolve_media_id(media)
             post_id = f"li_{int(time.time())}"
             
             return PostResult(
                 platform="linkedin",
                 post_id=post_id,
                 url=f"https://linkedin.com/posts/{post_id}",
-                success=True
+                success=True,
+                media_id=media_id
             )
             
         except Exception as e:
@@ -275,8 +346,12 @@ class LinkedInAPI(SocialMediaPlatform):
 class TwitterAPI(SocialMediaPlatform):
     """Twitter API v2 integration"""
     
-    def __init__(self, config: Dict[str, str]):
-        super().__init__(config)
+    platform_name = "twitter"
+    # GET /2/tweets accepts up to 100 IDs per request
+    metrics_batch_size = 100
+    
+    def __init__(self, config: Dict[str, str], session: Optional[requests.Session] = None):
+        super().__init__(config, session)
         self.bearer_token = config.get('bearer_token', '')
         self.base_url = "https://api.twitter.com/2"
         self.headers = {
@@ -291,13 +366,15 @@ class TwitterAPI(SocialMediaPlatform):
             if len(content) > 280:
                 content = content[:277] + "..."
             
+            media_id = self.resolve_media_id(media)
             tweet_id = f"tw_{int(time.time())}"
             
             return PostResult(
                 platform="twitter",
                 post_id=tweet_id,
                 url=f"https://twitter.com/your_account/status/{tweet_id}",
-                success=True
+                success=True,
+                media_id=media_id
             )
             
         except Exception as e:
@@ -311,14 +388,37 @@ class TwitterAPI(SocialMediaPlatform):
     
     def get_metrics(self, post_id: str) -> Dict[str, Any]:
         """Get Twitter post metrics"""
-        return {
-            "impressions": 4200,
-            "likes": 125,
-            "retweets": 35,
-            "replies": 18,
-            "clicks": 85,
-            "engagement_rate": 0.12
+        return self.lookup_metrics([post_id])[post_id]
+    
+    def lookup_metrics(self, post_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Get metrics for up to 100 tweets with one tweets lookup (simulated for POC)"""
+        params = {"ids": ",".join(post_ids), "tweet.fields": "public_metrics,non_public_metrics"}
+        # In production: self.session.get(f"{self.base_url}/tweets", params=params, headers=self.headers).json()
+        response = {
+            "data": [
+                {
+                    "id": tweet_id,
+                    "public_metrics": {"impression_count": 4200, "like_count": 125,
+                                       "retweet_count": 35, "reply_count": 18},
+                    "non_public_metrics": {"url_link_clicks": 85}
+                }
+                for tweet_id in params["ids"].split(",")
+            ]
         }
+        
+        metrics = {}
+        for tweet in response["data"]:
+            public = tweet["public_metrics"]
+            metrics[tweet["id"]] = {
+                "impressions": public["impression_count"],
+                "likes": public["like_count"],
+                "retweets": public["retweet_count"],
+                "replies": public["reply_count"],
+                "clicks": tweet["non_public_metrics"]["url_link_clicks"],
+                # Not returned by the API; simulated for POC
+                "engagement_rate": 0.12
+            }
+        return metrics
     
     def upload_media(self, media_asset: MediaAsset) -> str:
         """Upload media to Twitter"""
@@ -327,8 +427,34 @@ class TwitterAPI(SocialMediaPlatform):
 class SocialMediaManager:
     """Manages posting to multiple social media platforms"""
     
-    def __init__(self, config_path: str = "/workspace/ai_influencer_poc/phase1/platform_config.json"):
+    # Seconds allowed for one platform's post (or metrics fetch) before it is reported as failed
+    DEFAULT_PLATFORM_TIMEOUTS = {
+        "youtube": 120.0,
+        "tiktok": 60.0,
+        "instagram": 30.0,
+        "linkedin": 30.0,
+        "twitter": 15.0
+    }
+    
+    def __init__(self, config_path: str = "/workspace/ai_influencer_poc/phase1/platform_config.json",
+                 platform_timeouts: Optional[Dict[str, float]] = None, default_timeout: float = 30.0,
+                 pool_maxsize: int = 20, max_workers: int = 32):
         self.platforms = {}
+        self.platform_timeouts = {**self.DEFAULT_PLATFORM_TIMEOUTS, **(platform_timeouts or {})}
+        self.default_timeout = default_timeout
+        
+        # One pooled session shared by every platform client, so connections are reused across posts
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=len(self.DEFAULT_PLATFORM_TIMEOUTS), pool_maxsize=pool_maxsize)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        
+        # Platform calls are blocking, so fan-out runs them on this pool. It is not the loop's
+        # default executor, so asyncio.run() does not wait on calls abandoned after a timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="social-media")
+        
+        # (platform, media file) -> in-flight upload; finished uploads are kept on MediaAsset.media_ids
+        self._media_uploads: Dict[Tuple[str, str], asyncio.Future] = {}
         self.load_platform_config(config_path)
     
     def load_platform_config(self, config_path: str):
@@ -370,13 +496,26 @@ class SocialMediaManager:
         
         # Initialize platform clients
         self.platforms = {
-            "youtube": YouTubeAPI(config.get("youtube", {})),
-            "tiktok": TikTokAPI(config.get("tiktok", {})),
-            "instagram": InstagramAPI(config.get("instagram", {})),
-            "linkedin": LinkedInAPI(config.get("linkedin", {})),
-            "twitter": TwitterAPI(config.get("twitter", {}))
+            "youtube": YouTubeAPI(config.get("youtube", {}), self.session),
+            "tiktok": TikTokAPI(config.get("tiktok", {}), self.session),
+            "instagram": InstagramAPI(config.get("instagram", {}), self.session),
+            "linkedin": LinkedInAPI(config.get("linkedin", {}), self.session),
+            "twitter": TwitterAPI(config.get("twitter", {}), self.session)
         }
     
+    def get_platform_timeout(self, platform: str) -> float:
+        """Get the per-request timeout for a platform"""
+        return self.platform_timeouts.get(platform, self.default_timeout)
+    
+    def close(self):
+        """Close the shared HTTP session and worker threads"""
+        self._executor.shutdown(wait=False)
+        self.session.close()
+    
+    def _run_in_thread(self, func, *args) -> asyncio.Future:
+        """Run a blocking platform call on the manager's worker pool"""
+        return asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+    
     def post_to_platform(self, platform: str, title: str, content: str, 
                         media: Optional[MediaAsset] = None) -> PostResult:
         """Post content to a specific platform"""
@@ -399,22 +538,77 @@ class SocialMediaManager:
     def post_to_multiple_platforms(self, platforms: List[str], title: str, content: str, 
                                  media: Optional[MediaAsset] = None) -> Dict[str, PostResult]:
         """Post content to multiple platforms simultaneously"""
-        results = {}
+        return _run_sync(self.post_to_multiple_platforms_async(platforms, title, content, media))
+    
+    async def post_to_multiple_platforms_async(self, platforms: List[str], title: str, content: str,
+                                               media: Optional[MediaAsset] = None) -> Dict[str, PostResult]:
+        """
+        Post content to several platforms concurrently.
         
-        for platform in platforms:
-            try:
-                result = self.post_to_platform(platform, title, content, media)
-                results[platform] = result
-            except Exception as e:
-                results[platform] = PostResult(
-                    platform=platform,
-                    post_id="",
-                    url=None,
-                    success=False,
-                    error_message=str(e)
-                )
+        Each platform runs on its own worker thread under its own timeout, so
+        the total latency is that of the slowest platform rather than the sum.
+        A platform that fails or times out gets a failed PostResult without
+        affecting the others.
+        """
+        platforms = list(dict.fromkeys(platforms))
+        results = await asyncio.gather(
+            *(self._post_with_timeout(platform, title, content, media) for platform in platforms)
+        )
+        return dict(zip(platforms, results))
+    
+    async def _post_with_timeout(self, platform: str, title: str, content: str,
+                                 media: Optional[MediaAsset]) -> PostResult:
+        """Post to one platform under its timeout, converting errors to a failed PostResult"""
+        timeout = self.get_platform_timeout(platform)
+        try:
+            # One timeout covers the upload and the post together
+            return await asyncio.wait_for(self._upload_and_post(platform, title, content, media), timeout)
+        except asyncio.TimeoutError:
+            error_message = f"Timed out after {timeout:g}s"
+        except Exception as e:
+            error_message = str(e)
         
-        return results
+        return PostResult(
+            platform=platform,
+            post_id="",
+            url=None,
+            success=False,
+            error_message=error_message
+        )
+    
+    async def _upload_and_post(self, platform: str, title: str, content: str,
+                               media: Optional[MediaAsset]) -> PostResult:
+        """Upload media (shared with concurrent posts of the same asset), then post with its media ID"""
+        if media is not None and platform in self.platforms:
+            await self.upload_media_once(platform, media)
+        return await self._run_in_thread(self.post_to_platform, platform, title, content, media)
+    
+    async def upload_media_once(self, platform: str, media: MediaAsset) -> str:
+        """
+        Upload a media asset to a platform, reusing an earlier or in-flight upload.
+        
+        Concurrent posts of the same asset to the same platform share one
+        upload. The upload is shielded from the caller's timeout, so a retry
+        after a timeout picks up the same upload instead of starting another.
+        """
+        if platform in media.media_ids:
+            return media.media_ids[platform]
+        
+        key = (platform, media.file_path)
+        upload = self._media_uploads.get(key)
+        if upload is None or upload.get_loop() is not asyncio.get_running_loop():
+            upload = self._run_in_thread(self.platforms[platform].upload_media, media)
+            self._media_uploads[key] = upload
+        
+        try:
+            media_id = await asyncio.shield(upload)
+        finally:
+            # Still-running uploads stay registered for retries; a failed one is retried from scratch
+            if upload.done() and self._media_uploads.get(key) is upload:
+                del self._media_uploads[key]
+        
+        media.media_ids[platform] = media_id
+        return media_id
     
     def get_platform_metrics(self, platform: str, post_id: str) -> Dict[str, Any]:
         """Get metrics for a post from a specific platform"""
@@ -426,11 +620,56 @@ class SocialMediaManager:
     
     def get_all_platform_metrics(self, post_results: Dict[str, PostResult]) -> Dict[str, Dict[str, Any]]:
         """Get metrics for all posts"""
-        all_metrics = {}
+        post_ids = {
+            platform: [result.post_id]
+            for platform, result in post_results.items()
+            if result.success and result.post_id
+        }
+        metrics = _run_sync(self.get_metrics_for_posts_async(post_ids))
+        return {platform: metrics[platform][post_ids[platform][0]] for platform in post_ids}
+    
+    async def get_metrics_for_posts_async(self, post_ids: Dict[str, List[str]]) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        Get metrics for many posts, fetching from all platforms concurrently.
         
-        for platform, result in post_results.items():
-            if result.success and result.post_id:
-                metrics = self.get_platform_metrics(platform, result.post_id)
-                all_metrics[platform] = metrics
+        Args:
+            post_ids: Post IDs to fetch, keyed by platform
+        
+        Returns:
+            Metrics keyed by platform, then post ID. A platform that fails or
+            times out maps every requested post to an ``{"error": ...}`` dict.
+        """
+        platforms = list(post_ids)
+        results = await asyncio.gather(
+            *(self._fetch_platform_metrics(platform, post_ids[platform]) for platform in platforms)
+        )
+        return dict(zip(platforms, results))
+    
+    async def _fetch_platform_metrics(self, platform: str, post_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Fetch one platform's metrics in batches, converting errors to error dicts"""
+        post_ids = list(dict.fromkeys(post_ids))
+        if platform not in self.platforms:
+            return {post_id: {"error": f"Platform {platform} not configured"} for post_id in post_ids}
         
-        return all_metrics
\ No newline at end of file
+        timeout = self.get_platform_timeout(platform)
+        try:
+            return await asyncio.wait_for(
+                self._run_in_thread(self.platforms[platform].get_metrics_batch, post_ids), timeout
+            )
+        except asyncio.TimeoutError:
+            error = f"Timed out after {timeout:g}s"
+        except Exception as e:
+            error = str(e)
+        return {post_id: {"error": error} for post_id in post_ids}
+
+
+def _run_sync(coro):
+    """Run a coroutine to completion from synchronous code, even when an event loop is already running"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    
+    # asyncio.run() cannot nest inside a running loop, so use a helper thread
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
\ No newline at end of file
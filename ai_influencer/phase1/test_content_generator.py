@@ -0,0 +1,107 @@
+"""
+Tests for the persona cache and concurrent batch generation in InfluencerContentGenerator
+"""
+
+import json
+import sqlite3
+import threading
+import time
+
+from conftest import insert_influencer
+from content_generator import ContentRequest, InfluencerContentGenerator
+
+
+def make_requests(influencer_ids, topic="productivity"):
+    return [
+        ContentRequest(topic=f"{topic} {i}", niche="technology", influencer_id=influencer_id,
+                       content_type="post", platform="twitter")
+        for i, influencer_id in enumerate(influencer_ids)
+    ]
+
+
+def test_personas_are_cached_across_batches(phase1_db):
+    ids = [insert_influencer(phase1_db, name=f"Influencer {i}") for i in range(3)]
+    generator = InfluencerContentGenerator(phase1_db)
+
+    first = generator.load_personas(ids)
+    second = generator.load_personas(ids + ids)
+
+    assert sorted(first) == ids
+    assert all(second[i] is first[i] for i in ids)
+    stats = generator.persona_cache.get_stats()
+    assert stats["hits"] == 3 and stats["misses"] == 3
+
+
+def test_same_second_update_is_not_served_stale(phase1_db):
+    influencer_id = insert_influencer(phase1_db, traits=("calm",))
+    generator = InfluencerContentGenerator(phase1_db)
+    assert generator.load_personas([influencer_id])[influencer_id]["personality_traits"] == ["calm"]
+
+    # updated_at is left untouched, as when a write lands in the same second
+    with sqlite3.connect(phase1_db) as conn:
+        conn.execute("UPDATE influencers SET personality_traits = ?, voice_type = ? WHERE id = ?",
+                     (json.dumps(["energetic"]), "casual_female", influencer_id))
+
+    persona = generator.load_personas([influencer_id])[influencer_id]
+    assert persona["personality_traits"] == ["energetic"]
+    assert persona["voice_type"] == "casual_female"
+
+
+def test_deactivated_influencers_are_dropped_from_the_cache(phase1_db):
+    influencer_id = insert_influencer(phase1_db)
+    generator = InfluencerContentGenerator(phase1_db)
+    generator.load_personas([influencer_id])
+
+    with sqlite3.connect(phase1_db) as conn:
+        conn.execute("UPDATE influencers SET is_active = 0 WHERE id = ?", (influencer_id,))
+
+    assert generator.load_personas([influencer_id]) == {}
+    assert generator.persona_cache.get_stats()["size"] == 0
+
+
+def test_batch_results_follow_request_order(phase1_db):
+    ids = [insert_influencer(phase1_db, name=f"Influencer {i}") for i in range(4)]
+    generator = InfluencerContentGenerator(phase1_db, max_workers=4)
+    original_build = generator.build_content
+
+    def build_content(request, influencer, guidelines):
+        # Later requests finish first
+        time.sleep(0.01 * (4 - int(request.topic.split()[-1]) % 4))
+        return original_build(request, influencer, guidelines)
+
+    generator.build_content = build_content
+    # Request 2 names a missing influencer and is skipped
+    requests = make_requests([ids[0], ids[1], 9999, ids[2], ids[3], ids[0]])
+
+    completed = [index for index, _ in generator.iter_generate_content(requests)]
+    assert sorted(completed) == [0, 1, 3, 4, 5]
+    assert completed != sorted(completed)
+
+    contents = generator.batch_generate_content(requests)
+    assert [content.influencer_id for content in contents] == [ids[0], ids[1], ids[2], ids[3], ids[0]]
+    generated = [request for request in requests if request.influencer_id != 9999]
+    assert all(request.topic in content.title for request, content in zip(generated, contents))
+
+
+def test_stopping_early_cancels_unstarted_work(phase1_db):
+    influencer_id = insert_influencer(phase1_db)
+    generator = InfluencerContentGenerator(phase1_db)
+    original_build = generator.build_content
+    calls = []
+    lock = threading.Lock()
+
+    def build_content(request, influencer, guidelines):
+        with lock:
+            calls.append(request.topic)
+        time.sleep(0.01)
+        return original_build(request, influencer, guidelines)
+
+    generator.build_content = build_content
+    results = generator.iter_generate_content(make_requests([influencer_id] * 50), max_workers=2)
+
+    index, content = next(results)
+    results.close()
+
+    assert content.influencer_id == influencer_id
+    # Only the bounded window (twice the pool size) was ever submitted
+    assert len(calls) <= 2 * 2 + 1
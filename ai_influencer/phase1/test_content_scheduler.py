@@ -0,0 +1,184 @@
+"""
+Tests for the claim-based parallel ContentScheduler cycle
+"""
+
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+import content_scheduler
+from conftest import FakeSocialManager, insert_influencer
+from content_scheduler import ContentScheduler, ScheduledPost
+
+
+@pytest.fixture(autouse=True)
+def no_platform_clients(monkeypatch):
+    # Schedulers get a FakeSocialManager instead of real platform clients
+    monkeypatch.setattr(content_scheduler, "SocialMediaManager", FakeSocialManager)
+
+
+def make_scheduler(db_path, social_manager):
+    scheduler = ContentScheduler(db_path)
+    scheduler.social_manager = social_manager
+    scheduler.max_workers = 4
+    return scheduler
+
+
+def schedule_posts(scheduler, influencer_id, count, topic="productivity", platform="twitter"):
+    due = datetime.now() - timedelta(minutes=1)
+    for i in range(count):
+        scheduler.schedule_post(ScheduledPost(
+            id=f"{topic}_{i}",
+            influencer_id=influencer_id,
+            topic=topic,
+            niche="technology",
+            content_type="post",
+            platform=platform,
+            scheduled_time=due,
+            status="scheduled"
+        ))
+
+
+def post_rows(db_path):
+    with sqlite3.connect(db_path) as conn:
+        conn.row_factory = sqlite3.Row
+        return {row["id"]: dict(row) for row in conn.execute("SELECT * FROM scheduled_posts")}
+
+
+def test_concurrent_claims_are_exclusive(phase1_db, fake_social_manager):
+    influencer_id = insert_influencer(phase1_db)
+    schedulers = [make_scheduler(phase1_db, fake_social_manager) for _ in range(4)]
+    schedule_posts(schedulers[0], influencer_id, 40)
+
+    claimed = {}
+
+    def claim(scheduler):
+        posts = []
+        while True:
+            batch = scheduler.claim_due_posts(datetime.now(), 3)
+            if not batch:
+                break
+            posts.extend(batch)
+        claimed[scheduler.worker_id] = [post.id for post in posts]
+
+    threads = [threading.Thread(target=claim, args=(scheduler,)) for scheduler in schedulers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    all_ids = [post_id for ids in claimed.values() for post_id in ids]
+    assert len(all_ids) == 40
+    assert len(set(all_ids)) == 40
+
+    rows = post_rows(phase1_db)
+    for worker_id, ids in claimed.items():
+        for post_id in ids:
+            assert rows[post_id]["status"] == "generating"
+            assert rows[post_id]["claimed_by"] == worker_id
+
+
+def test_expired_lease_is_reclaimed_and_old_owner_update_is_dropped(phase1_db, fake_social_manager):
+    influencer_id = insert_influencer(phase1_db)
+    first = make_scheduler(phase1_db, fake_social_manager)
+    second = make_scheduler(phase1_db, fake_social_manager)
+    schedule_posts(first, influencer_id, 2)
+
+    now = datetime.now()
+    assert len(first.claim_due_posts(now, 10)) == 2
+    # Still leased to the first worker
+    assert second.claim_due_posts(now, 10) == []
+
+    after_expiry = now + timedelta(seconds=first.lease_seconds + 1)
+    reclaimed = second.claim_due_posts(after_expiry, 10)
+    assert sorted(post.id for post in reclaimed) == ["productivity_0", "productivity_1"]
+
+    # The first worker finishing late must not overwrite the new owner's claim
+    first._flush_post_updates([(
+        "posted", 0, None, now.isoformat(), now.isoformat(), "productivity_0", first.worker_id
+    )], [])
+    rows = post_rows(phase1_db)
+    assert rows["productivity_0"]["status"] == "generating"
+    assert rows["productivity_0"]["claimed_by"] == second.worker_id
+
+
+def test_parallel_cycle_posts_every_due_post_once(phase1_db, fake_social_manager):
+    influencer_id = insert_influencer(phase1_db)
+    scheduler = make_scheduler(phase1_db, fake_social_manager)
+    schedule_posts(scheduler, influencer_id, 25)
+
+    results = scheduler.run_parallel_scheduler_cycle()
+
+    assert results == {"processed": 25, "successful": 25, "failed": 0, "retries_scheduled": 0}
+    assert len(fake_social_manager.posted) == 25
+    rows = post_rows(phase1_db)
+    assert all(row["status"] == "posted" and row["claimed_by"] is None for row in rows.values())
+    with sqlite3.connect(phase1_db) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM generated_content").fetchone()[0] == 25
+
+
+def test_failed_posts_follow_the_retry_schedule(phase1_db):
+    influencer_id = insert_influencer(phase1_db)
+    scheduler = make_scheduler(phase1_db, FakeSocialManager(fail=True))
+    scheduler.max_retries = 2
+    schedule_posts(scheduler, influencer_id, 1)
+
+    started = datetime.now()
+    results = scheduler.run_parallel_scheduler_cycle()
+
+    assert results == {"processed": 1, "successful": 0, "failed": 1, "retries_scheduled": 1}
+    row = post_rows(phase1_db)["productivity_0"]
+    assert row["status"] == "scheduled"
+    assert row["retry_count"] == 1
+    assert row["error_message"] == "upload rejected"
+    retry_at = datetime.fromisoformat(row["scheduled_time"])
+    expected = started + timedelta(minutes=scheduler.retry_delay_minutes)
+    assert abs((retry_at - expected).total_seconds()) < 5
+
+    # Not due again until its retry time
+    assert scheduler.run_parallel_scheduler_cycle()["processed"] == 0
+
+    with sqlite3.connect(phase1_db) as conn:
+        conn.execute("UPDATE scheduled_posts SET scheduled_time = ?",
+                     ((datetime.now() - timedelta(seconds=1)).isoformat(),))
+    results = scheduler.run_parallel_scheduler_cycle()
+
+    assert results == {"processed": 1, "successful": 0, "failed": 1, "retries_scheduled": 0}
+    row = post_rows(phase1_db)["productivity_0"]
+    assert row["status"] == "failed"
+    assert row["retry_count"] == 2
+
+
+def test_finished_posts_are_flushed_while_a_slow_post_runs(phase1_db, fake_social_manager):
+    influencer_id = insert_influencer(phase1_db)
+    scheduler = make_scheduler(phase1_db, fake_social_manager)
+    scheduler.status_flush_interval = 0.05
+    scheduler.lease_seconds = 0.6
+    schedule_posts(scheduler, influencer_id, 3, topic="productivity")
+    schedule_posts(scheduler, influencer_id, 1, topic="slow upload", platform="youtube")
+
+    fake_social_manager.hold.clear()
+    cycle = threading.Thread(target=scheduler.run_parallel_scheduler_cycle)
+    cycle.start()
+    try:
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            rows = post_rows(phase1_db)
+            if all(rows[f"productivity_{i}"]["status"] == "posted" for i in range(3)):
+                break
+            time.sleep(0.02)
+        assert all(rows[f"productivity_{i}"]["status"] == "posted" for i in range(3))
+
+        # Outlive the original lease: renewal keeps other schedulers off the slow post
+        time.sleep(1.0)
+        other = make_scheduler(phase1_db, fake_social_manager)
+        assert other.claim_due_posts(datetime.now(), 10) == []
+    finally:
+        fake_social_manager.hold.set()
+        cycle.join()
+
+    assert post_rows(phase1_db)["slow upload_0"]["status"] == "posted"
+    assert len(fake_social_manager.posted) == 4
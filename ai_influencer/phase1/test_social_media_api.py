@@ -0,0 +1,137 @@
+"""
+Tests for concurrent fan-out posting and metrics collection in SocialMediaManager
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from social_media_api import MediaAsset, SocialMediaManager
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = SocialMediaManager(config_path=str(tmp_path / "platform_config.json"))
+    yield manager
+    manager.close()
+
+
+def make_media():
+    return MediaAsset(file_path="/tmp/clip.mp4", file_type="video", caption="Clip", hashtags=["#ai"])
+
+
+def count_uploads(manager, platform, delay=0.0):
+    """Wrap a platform's upload_media to count calls, optionally slowing it down"""
+    client = manager.platforms[platform]
+    original = client.upload_media
+    calls = []
+    lock = threading.Lock()
+
+    def upload_media(media_asset):
+        time.sleep(delay)
+        with lock:
+            calls.append(media_asset.file_path)
+            return f"{original(media_asset)}_{len(calls)}"
+
+    client.upload_media = upload_media
+    return calls
+
+
+def test_posts_use_the_media_id_uploaded_once_per_platform(manager):
+    media = make_media()
+    twitter_uploads = count_uploads(manager, "twitter", delay=0.05)
+    youtube_uploads = count_uploads(manager, "youtube")
+
+    async def run():
+        # Concurrent posts of one asset share the in-flight upload
+        return await asyncio.gather(
+            manager.post_to_multiple_platforms_async(["twitter", "youtube"], "Title", "Body", media),
+            manager.post_to_multiple_platforms_async(["twitter"], "Title", "Body again", media)
+        )
+
+    first, second = asyncio.run(run())
+
+    assert len(twitter_uploads) == 1 and len(youtube_uploads) == 1
+    assert first["twitter"].success and first["youtube"].success
+    assert first["twitter"].media_id == second["twitter"].media_id == media.media_ids["twitter"]
+    assert first["youtube"].media_id == media.media_ids["youtube"]
+
+    # A later synchronous post reuses the stored ID instead of uploading again
+    result = manager.post_to_platform("twitter", "Title", "Body", media)
+    assert result.media_id == media.media_ids["twitter"]
+    assert len(twitter_uploads) == 1
+
+
+def test_upload_and_post_share_one_platform_timeout(manager):
+    manager.platform_timeouts["linkedin"] = 0.3
+    count_uploads(manager, "linkedin", delay=0.2)
+    client = manager.platforms["linkedin"]
+    original_post = client.post_content
+
+    def slow_post(content, media=None):
+        time.sleep(0.2)
+        return original_post(content, media)
+
+    client.post_content = slow_post
+
+    started = time.monotonic()
+    results = manager.post_to_multiple_platforms(["linkedin", "tiktok"], "Title", "Body", make_media())
+    elapsed = time.monotonic() - started
+
+    assert not results["linkedin"].success
+    assert results["linkedin"].error_message == "Timed out after 0.3s"
+    assert results["tiktok"].success
+    assert elapsed < 0.4
+
+
+def test_failing_platform_does_not_affect_the_others(manager):
+    def broken(content, media=None):
+        raise RuntimeError("API unavailable")
+
+    manager.platforms["instagram"].post_content = broken
+
+    results = manager.post_to_multiple_platforms(["instagram", "twitter", "mastodon"], "Title", "Body")
+
+    assert results["instagram"].error_message == "API unavailable"
+    assert results["twitter"].success and results["twitter"].media_id is None
+    assert results["mastodon"].error_message == "Platform mastodon not configured"
+
+
+def test_metrics_are_fetched_per_platform_with_errors_isolated(manager):
+    def broken(post_ids):
+        raise RuntimeError("quota exceeded")
+
+    manager.platforms["tiktok"].get_metrics_batch = broken
+
+    metrics = asyncio.run(manager.get_metrics_for_posts_async({
+        "youtube": ["yt_1", "yt_2", "yt_1"],
+        "tiktok": ["tt_1"],
+        "mastodon": ["m_1"]
+    }))
+
+    assert list(metrics["youtube"]) == ["yt_1", "yt_2"]
+    assert metrics["youtube"]["yt_1"]["views"] == 1250
+    assert metrics["tiktok"] == {"tt_1": {"error": "quota exceeded"}}
+    assert metrics["mastodon"] == {"m_1": {"error": "Platform mastodon not configured"}}
+
+
+@pytest.mark.parametrize("platform, batch_size", [("youtube", 50), ("twitter", 100)])
+def test_metrics_use_one_lookup_per_batch(manager, platform, batch_size):
+    client = manager.platforms[platform]
+    original = client.lookup_metrics
+    lookups = []
+
+    def lookup_metrics(post_ids):
+        lookups.append(len(post_ids))
+        return original(post_ids)
+
+    client.lookup_metrics = lookup_metrics
+    post_ids = [f"{platform}_{i}" for i in range(batch_size * 2 + 5)]
+
+    metrics = asyncio.run(manager.get_metrics_for_posts_async({platform: post_ids}))
+
+    assert lookups == [batch_size, batch_size, 5]
+    assert list(metrics[platform]) == post_ids
+    assert metrics[platform][post_ids[-1]] == client.get_metrics(post_ids[-1])
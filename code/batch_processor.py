@@ -10,6 +10,7 @@ Architecture:
 - Integration with Google Sheets client and idea data service
 - Job queue management and prioritization (urgent, normal, low)
 - Progress tracking and state management
+- Batched, transactional SQLite persistence of job state
 - Integration with existing video generation workflow
 
 Author: AI Content Automation System
@@ -22,16 +23,21 @@ import logging
 import time
 import uuid
 import hashlib
+import inspect
 from datetime import datetime, timezone
 from typing import Dict, List, Optional, Any, Tuple, Callable, Union
 from dataclasses import dataclass, field, asdict
 from enum import Enum
 from decimal import Decimal
 from concurrent.futures import ThreadPoolExecutor, as_completed
+import bisect
+import heapq
+import itertools
 import threading
 import queue
 import sqlite3
 import os
+import sys
 from pathlib import Path
 
 # Import existing services
@@ -188,15 +194,136 @@ class RateLimiter:
             return min(backoff, 60.0)  # Cap at 60 seconds
 
 
+class PriorityJobQueue:
+    """Single priority heap with blocking, condition-variable based dispatch.
+    
+    Workers block on the condition instead of polling, so a job is handed to
+    an idle worker as soon as it is added. Jobs age while they wait: the heap
+    key is ``priority.value * aging_interval + enqueue_time``, so a job's
+    effective priority improves by one level every ``aging_interval`` seconds
+    and LOW jobs cannot be starved by a steady stream of URGENT work. Because
+    every queued job ages at the same rate the key never needs recomputing.
+    """
+    
+    # Upper bounds (seconds) of the queue wait-time histogram buckets
+    WAIT_TIME_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0, 60.0, 300.0, float("inf"))
+    
+    def __init__(self, aging_interval: Optional[float] = 30.0):
+        self.aging_interval = aging_interval
+        self._heap: List[Tuple[Tuple[float, float, int], float, VideoJob, JobPriority]] = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._wake_generation = 0
+        self._counts: Dict[JobPriority, int] = {priority: 0 for priority in JobPriority}
+        self._wait_histograms: Dict[JobPriority, Dict[str, Any]] = {
+            priority: {
+                "count": 0,
+                "total_seconds": 0.0,
+                "max_seconds": 0.0,
+                "buckets": [0] * len(self.WAIT_TIME_BUCKETS)
+            }
+            for priority in JobPriority
+        }
+    
+    def _sort_key(self, priority: JobPriority, enqueued_at: float) -> Tuple[float, float, int]:
+        if self.aging_interval:
+            return (priority.value * self.aging_interval + enqueued_at, 0.0, next(self._sequence))
+        # Strict priority, FIFO within a priority level
+        return (priority.value, enqueued_at, next(self._sequence))
+    
+    def put(self, job: VideoJob, priority: JobPriority):
+        """Add a job and wake one waiting worker."""
+        enqueued_at = time.monotonic()
+        with self._condition:
+            heapq.heappush(self._heap, (self._sort_key(priority, enqueued_at), enqueued_at, job, priority))
+            self._counts[priority] += 1
+            self._condition.notify()
+    
+    def get(self, timeout: Optional[float] = None) -> Optional[Tuple[VideoJob, JobPriority]]:
+        """Pop the highest priority job, blocking up to ``timeout`` seconds.
+        
+        Returns None when the timeout expires or ``wake_all`` is called
+        before a job becomes available. A timeout of 0 never blocks.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            generation = self._wake_generation
+            while not self._heap:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return None
+                self._condition.wait(remaining)
+                if self._wake_generation != generation:
+                    return None
+            
+            _, enqueued_at, job, priority = heapq.heappop(self._heap)
+            self._counts[priority] -= 1
+            self._record_wait(priority, time.monotonic() - enqueued_at)
+            return job, priority
+    
+    def wake_all(self):
+        """Release every blocked ``get`` call without a job."""
+        with self._condition:
+            self._wake_generation += 1
+            self._condition.notify_all()
+    
+    def qsize(self, priority: Optional[JobPriority] = None) -> int:
+        with self._condition:
+            if priority is None:
+                return len(self._heap)
+            return self._counts[priority]
+    
+    def empty(self, priority: Optional[JobPriority] = None) -> bool:
+        return self.qsize(priority) == 0
+    
+    def _record_wait(self, priority: JobPriority, waited: float):
+        histogram = self._wait_histograms[priority]
+        histogram["count"] += 1
+        histogram["total_seconds"] += waited
+        histogram["max_seconds"] = max(histogram["max_seconds"], waited)
+        histogram["buckets"][bisect.bisect_left(self.WAIT_TIME_BUCKETS, waited)] += 1
+    
+    def get_wait_time_histograms(self) -> Dict[str, Dict[str, Any]]:
+        """Get queue wait-time histograms keyed by priority name."""
+        with self._condition:
+            result = {}
+            for priority, histogram in self._wait_histograms.items():
+                count = histogram["count"]
+                result[priority.name] = {
+                    "count": count,
+                    "mean_seconds": histogram["total_seconds"] / count if count else 0.0,
+                    "max_seconds": histogram["max_seconds"],
+                    "buckets": {
+                        ("+Inf" if bound == float("inf") else str(bound)): bucket_count
+                        for bound, bucket_count in zip(self.WAIT_TIME_BUCKETS, histogram["buckets"])
+                    }
+                }
+            return result
+
+
+class PriorityLane:
+    """Read-only view of one priority level of a PriorityJobQueue."""
+    
+    def __init__(self, job_queue: PriorityJobQueue, priority: JobPriority):
+        self.job_queue = job_queue
+        self.priority = priority
+    
+    def qsize(self) -> int:
+        return self.job_queue.qsize(self.priority)
+    
+    def empty(self) -> bool:
+        return self.job_queue.empty(self.priority)
+
+
 class QueueManager:
     """Job queue manager with priority-based scheduling."""
     
-    def __init__(self, max_workers: int = 4):
+    def __init__(self, max_workers: int = 4, aging_interval: Optional[float] = 30.0):
         self.max_workers = max_workers
-        self.queues: Dict[JobPriority, queue.PriorityQueue] = {
-            JobPriority.URGENT: queue.PriorityQueue(),
-            JobPriority.NORMAL: queue.PriorityQueue(),
-            JobPriority.LOW: queue.PriorityQueue()
+        self.job_queue = PriorityJobQueue(aging_interval=aging_interval)
+        self.queues: Dict[JobPriority, PriorityLane] = {
+            priority: PriorityLane(self.job_queue, priority)
+            for priority in (JobPriority.URGENT, JobPriority.NORMAL, JobPriority.LOW)
         }
         self.running = False
         self.workers: List[threading.Thread] = []
@@ -207,56 +334,58 @@ class QueueManager:
         if priority is None:
             priority = job.priority
         
-        # Use creation time as secondary sort key for FIFO within same priority
-        import time
-        sort_key = (priority.value, job.created_at.timestamp())
-        
-        with self.lock:
-            self.queues[priority].put((sort_key, job))
-            logger.info(f"Added job {job.id} to {priority.name} queue")
+        self.job_queue.put(job, priority)
+        logger.info(f"Added job {job.id} to {priority.name} queue")
     
-    def get_next_job(self) -> Optional[VideoJob]:
-        """Get the next job from the highest priority queue."""
-        with self.lock:
-            # Check queues in priority order
-            for priority in [JobPriority.URGENT, JobPriority.NORMAL, JobPriority.LOW]:
-                try:
-                    if not self.queues[priority].empty():
-                        _, job = self.queues[priority].get_nowait()
-                        logger.info(f"Retrieved job {job.id} from {priority.name} queue")
-                        return job
-                except queue.Empty:
-                    continue
+    def get_next_job(self, timeout: float = 0) -> Optional[VideoJob]:
+        """Get the next job by effective priority, waiting up to ``timeout`` seconds."""
+        item = self.job_queue.get(timeout=timeout)
+        if item is None:
             return None
+        
+        job, priority = item
+        logger.info(f"Retrieved job {job.id} from {priority.name} queue")
+        return job
     
     def start(self):
         """Start the queue manager workers."""
-        if not self.running:
-            self.running = True
-            for i in range(self.max_workers):
-                worker = threading.Thread(target=self._worker_loop, args=(i,))
-                worker.daemon = True
-                worker.start()
-                self.workers.append(worker)
-            logger.info(f"Started {self.max_workers} queue workers")
+        with self.lock:
+            if not self.running:
+                self.running = True
+                for i in range(self.max_workers):
+                    worker = threading.Thread(target=self._worker_loop, args=(i,))
+                    worker.daemon = True
+                    worker.start()
+                    self.workers.append(worker)
+                logger.info(f"Started {self.max_workers} queue workers")
     
     def stop(self):
         """Stop the queue manager workers."""
-        self.running = False
-        for worker in self.workers:
-            worker.join(timeout=5.0)
-        self.workers.clear()
+        with self.lock:
+            self.running = False
+            self.job_queue.wake_all()
+            for worker in self.workers:
+                worker.join(timeout=5.0)
+            self.workers.clear()
         logger.info("Stopped queue manager workers")
     
+    def get_queue_stats(self) -> Dict[str, Any]:
+        """Get queue depth per priority and dispatch wait-time histograms."""
+        return {
+            "depth": {priority.name: lane.qsize() for priority, lane in self.queues.items()},
+            "wait_time_histograms": self.job_queue.get_wait_time_histograms()
+        }
+    
     def _worker_loop(self, worker_id: int):
         """Worker thread main loop."""
         logger.info(f"Worker {worker_id} started")
         
         while self.running:
             try:
-                job = self.get_next_job()
+                # Blocks until a job arrives or stop() wakes the worker; the
+                # timeout only bounds shutdown if the wakeup raced the wait
+                job = self.get_next_job(timeout=1.0)
                 if job is None:
-                    time.sleep(0.1)  # No jobs available, short sleep
                     continue
                 
                 # Process the job
@@ -272,6 +401,431 @@ class QueueManager:
         # This will be implemented in the concrete processor
 
 
+class BulkJobProgress:
+    """Push-based progress counters for a single bulk job.
+    
+    Video job state transitions update per-status counters under a lock, so
+    progress and completion are known in O(1) at the moment a job finishes
+    instead of by rescanning every job. Asyncio consumers can await the
+    completion future or iterate progress snapshots; transitions may happen
+    on worker threads, so results are handed to each consumer's event loop
+    with ``call_soon_threadsafe``.
+    """
+    
+    FINISHED_STATUSES = (JobStatus.COMPLETED, JobStatus.CANCELLED)
+    
+    def __init__(self, bulk_job_id: str):
+        self.bulk_job_id = bulk_job_id
+        self.total = 0
+        self.sealed = False
+        self.counts: Dict[JobStatus, int] = {status: 0 for status in JobStatus}
+        self._statuses: Dict[str, JobStatus] = {}
+        self._lock = threading.Lock()
+        self._waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+        self._subscribers: List[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]] = []
+    
+    def add_job(self, video_job: VideoJob):
+        """Start counting a video job in its current status."""
+        with self._lock:
+            if video_job.id in self._statuses:
+                return
+            self._statuses[video_job.id] = video_job.status
+            self.total += 1
+            self.counts[video_job.status] += 1
+    
+    def seal(self) -> Dict[str, Any]:
+        """Mark the job list as complete; completion can only fire after this."""
+        with self._lock:
+            self.sealed = True
+            snapshot = self._snapshot_locked()
+        self._publish(snapshot)
+        return snapshot
+    
+    def transition(self, job_id: str, new_status: JobStatus) -> Optional[Dict[str, Any]]:
+        """Move a tracked job to a new status and publish the new snapshot.
+        
+        Returns None when the job is not tracked here or its status is unchanged.
+        """
+        with self._lock:
+            old_status = self._statuses.get(job_id)
+            if old_status is None or old_status == new_status:
+                return None
+            self._statuses[job_id] = new_status
+            self.counts[old_status] -= 1
+            self.counts[new_status] += 1
+            snapshot = self._snapshot_locked()
+        self._publish(snapshot)
+        return snapshot
+    
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return self._snapshot_locked()
+    
+    def publish(self):
+        """Push the current snapshot to subscribers, e.g. after a pause."""
+        self._publish(self.snapshot())
+    
+    async def wait(self, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Wait until every job has finished or failed and return the final snapshot."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        with self._lock:
+            snapshot = self._snapshot_locked()
+            if snapshot["done"]:
+                return snapshot
+            self._waiters.append((loop, future))
+        try:
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            with self._lock:
+                if (loop, future) in self._waiters:
+                    self._waiters.remove((loop, future))
+    
+    async def updates(self):
+        """Yield a snapshot now and after every transition until the bulk job is done."""
+        loop = asyncio.get_running_loop()
+        updates: asyncio.Queue = asyncio.Queue()
+        with self._lock:
+            snapshot = self._snapshot_locked()
+            self._subscribers.append((loop, updates))
+        try:
+            while True:
+                yield snapshot
+                if snapshot["done"]:
+                    return
+                snapshot = await updates.get()
+        finally:
+            with self._lock:
+                self._subscribers.remove((loop, updates))
+    
+    def _snapshot_locked(self) -> Dict[str, Any]:
+        finished = sum(self.counts[status] for status in self.FINISHED_STATUSES)
+        failed = self.counts[JobStatus.FAILED]
+        return {
+            "bulk_job_id": self.bulk_job_id,
+            "total": self.total,
+            "finished": finished,
+            "failed": failed,
+            "progress": int((finished / self.total) * 100) if self.total else 0,
+            "counts": {status.value: count for status, count in self.counts.items() if count},
+            "done": self.sealed and finished + failed == self.total
+        }
+    
+    def _publish(self, snapshot: Dict[str, Any]):
+        with self._lock:
+            subscribers = list(self._subscribers)
+            waiters = list(self._waiters) if snapshot["done"] else []
+        
+        for loop, updates in subscribers:
+            self._call_soon(loop, updates.put_nowait, snapshot)
+        for loop, future in waiters:
+            self._call_soon(loop, self._resolve, future, snapshot)
+    
+    @staticmethod
+    def _resolve(future: asyncio.Future, snapshot: Dict[str, Any]):
+        if not future.done():
+            future.set_result(snapshot)
+    
+    @staticmethod
+    def _call_soon(loop: asyncio.AbstractEventLoop, callback: Callable, *args):
+        try:
+            loop.call_soon_threadsafe(callback, *args)
+        except RuntimeError:
+            # The consumer's event loop has already been closed
+            pass
+
+
+class JobStateStore:
+    """Batched, transactional SQLite persistence for job state.
+    
+    Keeps a single WAL-mode connection open for the lifetime of the
+    processor instead of connecting per row. Video job and event rows are
+    buffered (video jobs coalesced per id, so only the latest state of a job
+    is written) and flushed together in one transaction when the buffer
+    fills, on a background interval, before any read, and whenever a bulk
+    job is saved. The SQL text is fixed per table, so ``executemany`` reuses
+    the connection's prepared statements for every row in a flush.
+    """
+    
+    INSERT_BULK_JOB = """
+        INSERT OR REPLACE INTO bulk_jobs 
+        (id, sheet_id, status, progress, completed_at, user_id, 
+         error_message, priority, idempotency_key)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+    
+    INSERT_VIDEO_JOB = """
+        INSERT OR REPLACE INTO video_jobs
+        (id, bulk_job_id, idea_data, status, priority, ai_provider,
+         cost, output_url, retry_count, last_retry_at, user_id,
+         idempotency_key, error_message)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+    
+    INSERT_JOB_EVENT = """
+        INSERT INTO job_events
+        (id, job_id, event_type, message, progress_percent, created_at)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """
+    
+    def __init__(self, db_path: str, flush_interval: float = 0.5, max_pending: int = 1000):
+        self.db_path = db_path
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        
+        self.conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30.0)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+        
+        self._pending_video_jobs: Dict[str, Tuple[Any, ...]] = {}
+        self._pending_events: List[Tuple[Any, ...]] = []
+        # _write_lock serialises transactions so flushes land in order;
+        # _lock only guards the in-memory buffers
+        self._write_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._flusher: Optional[threading.Thread] = None
+        
+        self.stats = {
+            "transactions": 0,
+            "bulk_jobs_written": 0,
+            "video_jobs_written": 0,
+            "events_written": 0,
+            "coalesced_writes": 0,
+            "errors": 0
+        }
+    
+    def _create_schema(self):
+        with self.conn:
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS bulk_jobs (
+                    id TEXT PRIMARY KEY,
+                    sheet_id TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    progress INTEGER DEFAULT 0,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    completed_at TIMESTAMP,
+                    user_id TEXT,
+                    error_message TEXT,
+                    priority INTEGER DEFAULT 5,
+                    idempotency_key TEXT
+                )
+            """)
+            
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS video_jobs (
+                    id TEXT PRIMARY KEY,
+                    bulk_job_id TEXT NOT NULL,
+                    idea_data TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    priority INTEGER NOT NULL,
+                    ai_provider TEXT NOT NULL,
+                    cost REAL DEFAULT 0.0,
+                    output_url TEXT,
+                    retry_count INTEGER DEFAULT 0,
+                    last_retry_at TIMESTAMP,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    user_id TEXT,
+                    idempotency_key TEXT,
+                    error_message TEXT
+                )
+            """)
+            
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS job_events (
+                    id TEXT PRIMARY KEY,
+                    job_id TEXT NOT NULL,
+                    event_type TEXT NOT NULL,
+                    message TEXT NOT NULL,
+                    progress_percent REAL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_video_jobs_bulk_job_id ON video_jobs(bulk_job_id)"
+            )
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_job_events_job_id ON job_events(job_id)"
+            )
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_bulk_jobs_idempotency_key ON bulk_jobs(idempotency_key)"
+            )
+    
+    @staticmethod
+    def _bulk_job_row(bulk_job: BulkJob) -> Tuple[Any, ...]:
+        return (
+            bulk_job.id, bulk_job.sheet_id, bulk_job.status.value,
+            bulk_job.progress, bulk_job.completed_at, bulk_job.user_id,
+            bulk_job.error_message, bulk_job.priority.value,
+            bulk_job.idempotency_key
+        )
+    
+    @staticmethod
+    def _video_job_row(video_job: VideoJob) -> Tuple[Any, ...]:
+        return (
+            video_job.id, video_job.bulk_job_id,
+            json.dumps(video_job.idea_data), video_job.status.value,
+            video_job.priority.value, video_job.ai_provider,
+            float(video_job.cost), video_job.output_url,
+            video_job.retry_count, video_job.last_retry_at,
+            video_job.user_id, video_job.idempotency_key,
+            video_job.error_message
+        )
+    
+    @staticmethod
+    def _event_row(event: JobEvent) -> Tuple[Any, ...]:
+        # Events are flushed in batches, so record when each one happened
+        # rather than letting the column default to the flush time. Stored
+        # in UTC in the same text layout as CURRENT_TIMESTAMP so rows sort.
+        created_at = event.created_at
+        if created_at.tzinfo is not None:
+            created_at = created_at.astimezone(timezone.utc)
+        return (
+            event.id, event.job_id, event.event_type,
+            event.message, event.progress_percent,
+            created_at.strftime("%Y-%m-%d %H:%M:%S.%f")
+        )
+    
+    def save_bulk_job(self, bulk_job: BulkJob):
+        """Write a bulk job immediately, together with any buffered rows."""
+        self._commit([self._bulk_job_row(bulk_job)])
+    
+    def save_video_job(self, video_job: VideoJob):
+        """Buffer the current state of a video job."""
+        # The row is snapshotted now; the job object keeps changing after this
+        row = self._video_job_row(video_job)
+        with self._lock:
+            if video_job.id in self._pending_video_jobs:
+                self.stats["coalesced_writes"] += 1
+            self._pending_video_jobs[video_job.id] = row
+            pending_count = len(self._pending_video_jobs) + len(self._pending_events)
+        self._after_buffered_write(pending_count)
+    
+    def save_job_event(self, event: JobEvent):
+        """Buffer a job event."""
+        row = self._event_row(event)
+        with self._lock:
+            self._pending_events.append(row)
+            pending_count = len(self._pending_video_jobs) + len(self._pending_events)
+        self._after_buffered_write(pending_count)
+    
+    def flush(self) -> int:
+        """Write all buffered rows in one transaction, returning the row count."""
+        return self._commit([])
+    
+    def find_bulk_job_id(self, idempotency_key: str) -> Optional[str]:
+        """Look up a bulk job id by idempotency key."""
+        self.flush()
+        with self._write_lock:
+            row = self.conn.execute(
+                "SELECT id FROM bulk_jobs WHERE idempotency_key = ?",
+                (idempotency_key,)
+            ).fetchone()
+        return row[0] if row else None
+    
+    def fetch_job_events(self, job_ids: List[str], limit: int = 100) -> List[Tuple[Any, ...]]:
+        """Fetch the most recent events for the given video job ids."""
+        self.flush()
+        with self._write_lock:
+            cursor = self.conn.execute("""
+                SELECT id, job_id, event_type, message, progress_percent, created_at
+                FROM job_events
+                WHERE job_id IN ({})
+                ORDER BY created_at DESC, rowid DESC
+                LIMIT ?
+            """.format(",".join(["?"] * len(job_ids))), job_ids + [limit])
+            return cursor.fetchall()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get write counters and buffer occupancy."""
+        with self._lock:
+            return {
+                **self.stats,
+                "pending_video_jobs": len(self._pending_video_jobs),
+                "pending_events": len(self._pending_events)
+            }
+    
+    def close(self):
+        """Flush buffered rows, stop the flusher and close the connection."""
+        if self._closed:
+            return
+        self._closed = True
+        self._wakeup.set()
+        if self._flusher is not None:
+            self._flusher.join(timeout=5.0)
+        self.flush()
+        with self._write_lock:
+            self.conn.close()
+    
+    def _commit(self, bulk_job_rows: List[Tuple[Any, ...]]) -> int:
+        with self._write_lock:
+            with self._lock:
+                video_job_rows = list(self._pending_video_jobs.values())
+                event_rows = self._pending_events
+                self._pending_video_jobs = {}
+                self._pending_events = []
+            
+            if not (bulk_job_rows or video_job_rows or event_rows):
+                return 0
+            
+            try:
+                with self.conn:
+                    if video_job_rows:
+                        self.conn.executemany(self.INSERT_VIDEO_JOB, video_job_rows)
+                    if event_rows:
+                        self.conn.executemany(self.INSERT_JOB_EVENT, event_rows)
+                    if bulk_job_rows:
+                        self.conn.executemany(self.INSERT_BULK_JOB, bulk_job_rows)
+            except Exception as e:
+                logger.error(f"Failed to persist job state: {e}")
+                with self._lock:
+                    self.stats["errors"] += 1
+                    # Put the rows back unless a newer state was buffered meanwhile
+                    for row in video_job_rows:
+                        self._pending_video_jobs.setdefault(row[0], row)
+                    self._pending_events[:0] = event_rows
+                raise
+            
+            with self._lock:
+                self.stats["transactions"] += 1
+                self.stats["bulk_jobs_written"] += len(bulk_job_rows)
+                self.stats["video_jobs_written"] += len(video_job_rows)
+                self.stats["events_written"] += len(event_rows)
+            return len(bulk_job_rows) + len(video_job_rows) + len(event_rows)
+    
+    def _after_buffered_write(self, pending_count: int):
+        if pending_count >= self.max_pending or self._closed:
+            # Flushing inline bounds the buffer and applies backpressure to producers
+            self.flush()
+        else:
+            self._ensure_flusher()
+    
+    def _ensure_flusher(self):
+        if self._flusher is not None:
+            return
+        with self._lock:
+            if self._flusher is None:
+                self._flusher = threading.Thread(
+                    target=self._flush_loop, name="job-state-flusher", daemon=True
+                )
+                self._flusher.start()
+    
+    def _flush_loop(self):
+        while not self._closed:
+            self._wakeup.wait(self.flush_interval)
+            if self._closed:
+                break
+            try:
+                self.flush()
+            except Exception:
+                # Rows stay buffered and are retried on the next interval
+                pass
+
+
 class BatchProcessor:
     """Main batch processing pipeline orchestrator."""
     
@@ -279,13 +833,20 @@ class BatchProcessor:
                  credentials_path: str,
                  db_path: str = "batch_processing.db",
                  max_workers: int = 4,
-                 rate_limiter: Optional[RateLimiter] = None):
+                 rate_limiter: Optional[RateLimiter] = None,
+                 validation_workers: Optional[int] = None,
+                 pipeline_queue_size: int = 100):
         
         # Core components
         self.credentials_path = credentials_path
         self.db_path = db_path
         self.max_workers = max_workers
         
+        # Job creation pipeline: parallel validations and bound on ideas
+        # buffered between stages
+        self.validation_workers = validation_workers or max_workers
+        self.pipeline_queue_size = pipeline_queue_size
+        
         # Service integrations
         self.sheets_client: Optional[GoogleSheetsClient] = None
         self.idea_service = IdeaDataService()
@@ -314,6 +875,7 @@ class BatchProcessor:
         # Progress tracking
         self.progress_callbacks: List[Callable[[str, int, str], None]] = []
         self.completion_callbacks: List[Callable[[str, Dict[str, Any]], None]] = []
+        self.progress_trackers: Dict[str, BulkJobProgress] = {}
         
         # Threading
         self.executor = ThreadPoolExecutor(max_workers=max_workers)
@@ -323,58 +885,11 @@ class BatchProcessor:
         self._init_database()
     
     def _init_database(self):
-        """Initialize the local database for job tracking."""
+        """Open the job state store and initialize the local database for job tracking."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute("""
-                    CREATE TABLE IF NOT EXISTS bulk_jobs (
-                        id TEXT PRIMARY KEY,
-                        sheet_id TEXT NOT NULL,
-                        status TEXT NOT NULL,
-                        progress INTEGER DEFAULT 0,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        completed_at TIMESTAMP,
-                        user_id TEXT,
-                        error_message TEXT,
-                        priority INTEGER DEFAULT 5,
-                        idempotency_key TEXT
-                    )
-                """)
-                
-                conn.execute("""
-                    CREATE TABLE IF NOT EXISTS video_jobs (
-                        id TEXT PRIMARY KEY,
-                        bulk_job_id TEXT NOT NULL,
-                        idea_data TEXT NOT NULL,
-                        status TEXT NOT NULL,
-                        priority INTEGER NOT NULL,
-                        ai_provider TEXT NOT NULL,
-                        cost REAL DEFAULT 0.0,
-                        output_url TEXT,
-                        retry_count INTEGER DEFAULT 0,
-                        last_retry_at TIMESTAMP,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        user_id TEXT,
-                        idempotency_key TEXT,
-                        error_message TEXT
-                    )
-                """)
-                
-                conn.execute("""
-                    CREATE TABLE IF NOT EXISTS job_events (
-                        id TEXT PRIMARY KEY,
-                        job_id TEXT NOT NULL,
-                        event_type TEXT NOT NULL,
-                        message TEXT NOT NULL,
-                        progress_percent REAL,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                """)
-                
-                conn.commit()
-                logger.info("Database initialized successfully")
-                
+            self.job_store = JobStateStore(self.db_path)
+            logger.info("Database initialized successfully")
+            
         except Exception as e:
             logger.error(f"Failed to initialize database: {e}")
             raise
@@ -448,71 +963,29 @@ class BatchProcessor:
     
     def _get_job_by_idempotency_key(self, key: str) -> Optional[BulkJob]:
         """Get bulk job by idempotency key."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute(
-                "SELECT id FROM bulk_jobs WHERE idempotency_key = ?", 
-                (key,)
-            )
-            row = cursor.fetchone()
-            if row:
-                return self.bulk_jobs.get(row[0])
+        bulk_job_id = self.job_store.find_bulk_job_id(key)
+        if bulk_job_id:
+            return self.bulk_jobs.get(bulk_job_id)
         return None
     
     def _save_bulk_job(self, bulk_job: BulkJob):
-        """Save bulk job to database."""
+        """Save bulk job to database, committing any buffered job state with it."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute("""
-                    INSERT OR REPLACE INTO bulk_jobs 
-                    (id, sheet_id, status, progress, completed_at, user_id, 
-                     error_message, priority, idempotency_key)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    bulk_job.id, bulk_job.sheet_id, bulk_job.status.value,
-                    bulk_job.progress, bulk_job.completed_at, bulk_job.user_id,
-                    bulk_job.error_message, bulk_job.priority.value,
-                    bulk_job.idempotency_key
-                ))
-                conn.commit()
+            self.job_store.save_bulk_job(bulk_job)
         except Exception as e:
             logger.error(f"Failed to save bulk job {bulk_job.id}: {e}")
     
     def _save_video_job(self, video_job: VideoJob):
-        """Save video job to database."""
+        """Queue a video job write; rows are flushed to the database in batches."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute("""
-                    INSERT OR REPLACE INTO video_jobs
-                    (id, bulk_job_id, idea_data, status, priority, ai_provider,
-                     cost, output_url, retry_count, last_retry_at, user_id,
-                     idempotency_key, error_message)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    video_job.id, video_job.bulk_job_id,
-                    json.dumps(video_job.idea_data), video_job.status.value,
-                    video_job.priority.value, video_job.ai_provider,
-                    float(video_job.cost), video_job.output_url,
-                    video_job.retry_count, video_job.last_retry_at,
-                    video_job.user_id, video_job.idempotency_key,
-                    video_job.error_message
-                ))
-                conn.commit()
+            self.job_store.save_video_job(video_job)
         except Exception as e:
             logger.error(f"Failed to save video job {video_job.id}: {e}")
     
     def _save_job_event(self, event: JobEvent):
-        """Save job event to database and in-memory list."""
+        """Queue a job event write and add it to the in-memory list."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute("""
-                    INSERT INTO job_events
-                    (id, job_id, event_type, message, progress_percent)
-                    VALUES (?, ?, ?, ?, ?)
-                """, (
-                    event.id, event.job_id, event.event_type,
-                    event.message, event.progress_percent
-                ))
-                conn.commit()
+            self.job_store.save_job_event(event)
             
             self.job_events.append(event)
             logger.debug(f"Saved event {event.id} for job {event.job_id}")
@@ -536,6 +1009,7 @@ class BatchProcessor:
             # Update bulk job status
             bulk_job.status = PipelineState.RUNNING
             self._save_bulk_job(bulk_job)
+            tracker = self.progress_trackers[bulk_job_id] = BulkJobProgress(bulk_job_id)
             
             await self.start_sheets_client()
             
@@ -554,25 +1028,120 @@ class BatchProcessor:
             
             logger.info(f"Found {len(ideas)} ideas in sheet {bulk_job.sheet_id}")
             
-            # Create video jobs for each idea
-            video_jobs = []
+            # Start workers first so the earliest jobs generate while later
+            # ideas are still being validated
+            self.queue_manager.start()
+            self.state = PipelineState.RUNNING
+            
+            pipeline_stats = await self._create_video_jobs(
+                bulk_job, ideas, validation_level, ai_provider, tracker
+            )
+            video_jobs = bulk_job.video_jobs
+            self._save_bulk_job(bulk_job)
+            
+            logger.info(f"Created {len(video_jobs)} video jobs for bulk job {bulk_job_id}")
+            
+            # All jobs are known now, so the bulk job can complete
+            self._on_bulk_progress(bulk_job, tracker.seal())
+            
+            # Monitor progress
+            await self._monitor_job_progress(bulk_job_id)
+            
+            return {
+                "bulk_job_id": bulk_job_id,
+                "total_ideas": len(ideas),
+                "created_jobs": len(video_jobs),
+                "skipped_invalid": pipeline_stats["invalid"],
+                "skipped_duplicates": pipeline_stats["duplicates"],
+                "time_to_first_job": pipeline_stats["time_to_first_job"],
+                "status": "started"
+            }
+            
+        except Exception as e:
+            logger.error(f"Failed to process sheet ideas: {e}")
+            bulk_job.status = PipelineState.FAILED
+            bulk_job.error_message = str(e)
+            self._save_bulk_job(bulk_job)
+            raise
+    
+    async def _create_video_jobs(self,
+                                 bulk_job: BulkJob,
+                                 ideas: List[Dict[str, Any]],
+                                 validation_level: ValidationLevel,
+                                 ai_provider: str,
+                                 tracker: BulkJobProgress) -> Dict[str, Any]:
+        """Turn parsed ideas into queued video jobs through a staged pipeline.
+        
+        Stages (parse -> validate -> dedupe -> persist -> enqueue) run concurrently and
+        are connected by bounded asyncio queues, so each idea is queued for
+        generation as soon as it has been validated rather than after the
+        whole sheet. Validation runs on the thread pool with up to
+        ``validation_workers`` ideas in flight. A full queue blocks the stage
+        feeding it, which bounds memory for very large sheets.
+        """
+        loop = asyncio.get_running_loop()
+        started_at = time.monotonic()
+        done = object()  # End-of-stream marker passed down the stages
+        
+        validate_queue: asyncio.Queue = asyncio.Queue(maxsize=self.pipeline_queue_size)
+        dedupe_queue: asyncio.Queue = asyncio.Queue(maxsize=self.pipeline_queue_size)
+        persist_queue: asyncio.Queue = asyncio.Queue(maxsize=self.pipeline_queue_size)
+        enqueue_queue: asyncio.Queue = asyncio.Queue(maxsize=self.pipeline_queue_size)
+        
+        stats = {"invalid": 0, "duplicates": 0, "failed": 0, "time_to_first_job": None}
+        
+        async def parse_stage():
             for i, idea in enumerate(ideas):
+                await validate_queue.put((i, idea))
+            for _ in range(self.validation_workers):
+                await validate_queue.put(done)
+        
+        async def validate_stage():
+            while True:
+                item = await validate_queue.get()
+                if item is done:
+                    return
+                i, idea = item
                 try:
-                    # Validate idea data
-                    validation_result = await self.validator.validate_idea(idea)
-                    
-                    if not validation_result.is_valid and validation_level == ValidationLevel.STRICT:
-                        logger.warning(f"Idea {i+1} failed validation, skipping")
-                        continue
-                    
-                    # Create video job
-                    video_job_id = str(uuid.uuid4())
-                    idea_key_data = f"{bulk_job_id}:{json.dumps(idea, sort_keys=True)}"
+                    validation_result = await loop.run_in_executor(
+                        self.executor, self.validator.validate_idea, idea
+                    )
+                    # Validators may also be coroutine-based
+                    if inspect.isawaitable(validation_result):
+                        validation_result = await validation_result
+                except Exception as e:
+                    logger.error(f"Failed to create video job for idea {i+1}: {e}")
+                    stats["failed"] += 1
+                    continue
+                
+                if not validation_result.is_valid and validation_level == ValidationLevel.STRICT:
+                    logger.warning(f"Idea {i+1} failed validation, skipping")
+                    stats["invalid"] += 1
+                    continue
+                
+                await dedupe_queue.put((i, idea, validation_result))
+        
+        async def dedupe_stage():
+            seen_keys = set()
+            while True:
+                item = await dedupe_queue.get()
+                if item is done:
+                    await persist_queue.put(done)
+                    return
+                i, idea, validation_result = item
+                
+                try:
+                    idea_key_data = f"{bulk_job.id}:{json.dumps(idea, sort_keys=True)}"
                     idempotency_key = hashlib.sha256(idea_key_data.encode()).hexdigest()[:16]
+                    if idempotency_key in seen_keys:
+                        logger.info(f"Idea {i+1} duplicates an earlier row, skipping")
+                        stats["duplicates"] += 1
+                        continue
+                    seen_keys.add(idempotency_key)
                     
                     video_job = VideoJob(
-                        id=video_job_id,
-                        bulk_job_id=bulk_job_id,
+                        id=str(uuid.uuid4()),
+                        bulk_job_id=bulk_job.id,
                         idea_data=validation_result.cleaned_data or idea,
                         status=JobStatus.QUEUED,
                         priority=bulk_job.priority,
@@ -581,51 +1150,73 @@ class BatchProcessor:
                         user_id=bulk_job.user_id,
                         idempotency_key=idempotency_key
                     )
-                    
-                    video_jobs.append(video_job)
+                except Exception as e:
+                    logger.error(f"Failed to create video job for idea {i+1}: {e}")
+                    stats["failed"] += 1
+                    continue
+                
+                await persist_queue.put((i, idea, video_job))
+        
+        async def persist_stage():
+            while True:
+                item = await persist_queue.get()
+                if item is done:
+                    await enqueue_queue.put(done)
+                    return
+                i, idea, video_job = item
+                
+                try:
                     self._save_video_job(video_job)
                     
-                    # Add to queue
-                    self.queue_manager.add_job(video_job)
-                    
                     # Create event
                     event = JobEvent(
                         id=str(uuid.uuid4()),
-                        job_id=video_job_id,
+                        job_id=video_job.id,
                         event_type="created",
                         message=f"Video job created for idea: {idea.get('title', 'Untitled')}"
                     )
                     self._save_job_event(event)
                     
+                    bulk_job.video_jobs.append(video_job)
+                    tracker.add_job(video_job)
                 except Exception as e:
-                    logger.error(f"Failed to create video job for idea {i+1}: {e}")
+                    logger.error(f"Failed to persist video job for idea {i+1}: {e}")
+                    stats["failed"] += 1
                     continue
-            
-            bulk_job.video_jobs = video_jobs
-            self._save_bulk_job(bulk_job)
-            
-            logger.info(f"Created {len(video_jobs)} video jobs for bulk job {bulk_job_id}")
-            
-            # Start processing
-            self.queue_manager.start()
-            self.state = PipelineState.RUNNING
-            
-            # Monitor progress
-            await self._monitor_job_progress(bulk_job_id)
-            
-            return {
-                "bulk_job_id": bulk_job_id,
-                "total_ideas": len(ideas),
-                "created_jobs": len(video_jobs),
-                "status": "started"
-            }
-            
-        except Exception as e:
-            logger.error(f"Failed to process sheet ideas: {e}")
-            bulk_job.status = PipelineState.FAILED
-            bulk_job.error_message = str(e)
-            self._save_bulk_job(bulk_job)
+                
+                await enqueue_queue.put(video_job)
+        
+        async def enqueue_stage():
+            while True:
+                video_job = await enqueue_queue.get()
+                if video_job is done:
+                    return
+                self.queue_manager.add_job(video_job)
+                if stats["time_to_first_job"] is None:
+                    stats["time_to_first_job"] = time.monotonic() - started_at
+        
+        async def validation_stages():
+            await asyncio.gather(*(validate_stage() for _ in range(self.validation_workers)))
+            await dedupe_queue.put(done)
+        
+        tasks = [
+            asyncio.ensure_future(stage)
+            for stage in (parse_stage(), validation_stages(), dedupe_stage(),
+                          persist_stage(), enqueue_stage())
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
             raise
+        
+        logger.info(
+            f"Job creation pipeline for bulk job {bulk_job.id}: {len(ideas)} ideas, "
+            f"{stats['invalid']} invalid, {stats['duplicates']} duplicates, "
+            f"{stats['failed']} failed in {time.monotonic() - started_at:.2f}s"
+        )
+        return stats
     
     async def _fetch_sheet_data(self, sheet_id: str, column_range: str) -> List[List[Any]]:
         """Fetch data from Google Sheets with error handling and rate limiting."""
@@ -657,66 +1248,82 @@ class BatchProcessor:
             raise
     
     async def _monitor_job_progress(self, bulk_job_id: str):
-        """Monitor progress of video jobs and update bulk job status."""
+        """Wait until a bulk job finishes or the pipeline stops running.
         
-        bulk_job = self.bulk_jobs[bulk_job_id]
-        total_jobs = len(bulk_job.video_jobs)
+        Counters and progress callbacks are updated by job state transitions
+        (see ``_set_job_status``), so this only waits for pushed snapshots.
+        """
+        tracker = self.progress_trackers[bulk_job_id]
         
-        while self.state == PipelineState.RUNNING:
-            try:
-                # Count job statuses
-                completed_count = 0
-                failed_count = 0
-                
-                for job in bulk_job.video_jobs:
-                    if job.status in [JobStatus.COMPLETED, JobStatus.CANCELLED]:
-                        completed_count += 1
-                    elif job.status == JobStatus.FAILED:
-                        failed_count += 1
-                
-                # Calculate progress
-                if total_jobs > 0:
-                    progress = int((completed_count / total_jobs) * 100)
-                    bulk_job.progress = progress
-                    
-                    # Notify progress
-                    self._notify_progress(
-                        bulk_job_id, 
-                        progress, 
-                        f"Completed {completed_count}/{total_jobs} jobs"
-                    )
-                    
-                    # Update bulk job
-                    self._save_bulk_job(bulk_job)
-                
-                # Check if all jobs are done
-                if completed_count + failed_count == total_jobs:
-                    if failed_count == 0:
-                        bulk_job.status = PipelineState.COMPLETED
-                        bulk_job.completed_at = datetime.now(timezone.utc)
-                        logger.info(f"Bulk job {bulk_job_id} completed successfully")
-                    else:
-                        bulk_job.status = PipelineState.FAILED
-                        bulk_job.error_message = f"{failed_count} jobs failed"
-                        logger.warning(f"Bulk job {bulk_job_id} completed with {failed_count} failures")
-                    
-                    self._save_bulk_job(bulk_job)
-                    self.state = PipelineState.COMPLETED
-                    break
-                
-                await asyncio.sleep(2)  # Check every 2 seconds
-                
-            except Exception as e:
-                logger.error(f"Error monitoring job progress: {e}")
-                await asyncio.sleep(5)
+        async for snapshot in tracker.updates():
+            if snapshot["done"] or self.state != PipelineState.RUNNING:
+                break
+    
+    def _set_job_status(self, video_job: VideoJob, status: JobStatus):
+        """Apply a video job state transition and push it to its bulk job's counters."""
+        video_job.status = status
+        video_job.updated_at = datetime.now(timezone.utc)
+        
+        tracker = self.progress_trackers.get(video_job.bulk_job_id)
+        bulk_job = self.bulk_jobs.get(video_job.bulk_job_id)
+        if tracker is None or bulk_job is None:
+            return
+        
+        snapshot = tracker.transition(video_job.id, status)
+        if snapshot is not None:
+            self._on_bulk_progress(bulk_job, snapshot)
+    
+    def _on_bulk_progress(self, bulk_job: BulkJob, snapshot: Dict[str, Any]):
+        """Update a bulk job from a progress snapshot and finish it when all jobs are done."""
+        progress_changed = snapshot["progress"] != bulk_job.progress
+        bulk_job.progress = snapshot["progress"]
+        
+        if progress_changed or snapshot["done"]:
+            self._notify_progress(
+                bulk_job.id,
+                snapshot["progress"],
+                f"Completed {snapshot['finished']}/{snapshot['total']} jobs"
+            )
+        
+        # Paused or cancelled bulk jobs are finished by resume/cancel instead
+        if not snapshot["done"] or bulk_job.status != PipelineState.RUNNING:
+            if progress_changed:
+                self._save_bulk_job(bulk_job)
+            return
+        
+        failed_count = snapshot["failed"]
+        if failed_count == 0:
+            bulk_job.status = PipelineState.COMPLETED
+            bulk_job.completed_at = datetime.now(timezone.utc)
+            logger.info(f"Bulk job {bulk_job.id} completed successfully")
+        else:
+            bulk_job.status = PipelineState.FAILED
+            bulk_job.error_message = f"{failed_count} jobs failed"
+            logger.warning(f"Bulk job {bulk_job.id} completed with {failed_count} failures")
+        
+        self._save_bulk_job(bulk_job)
+        self.state = PipelineState.COMPLETED
+    
+    async def wait_for_bulk_job(self, bulk_job_id: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Wait for every video job of a bulk job to finish and return the final counters."""
+        tracker = self.progress_trackers.get(bulk_job_id)
+        if tracker is None:
+            raise ValueError(f"Bulk job {bulk_job_id} is not being processed")
+        return await tracker.wait(timeout=timeout)
+    
+    def stream_bulk_job_progress(self, bulk_job_id: str):
+        """Async iterator of progress snapshots, pushed on every job state transition."""
+        tracker = self.progress_trackers.get(bulk_job_id)
+        if tracker is None:
+            raise ValueError(f"Bulk job {bulk_job_id} is not being processed")
+        return tracker.updates()
     
     async def generate_video(self, video_job: VideoJob) -> Dict[str, Any]:
         """Generate a video for a single idea (integration point for video generation workflow)."""
         
         try:
             # Update job status
-            video_job.status = JobStatus.DISPATCHED
-            video_job.updated_at = datetime.now(timezone.utc)
+            self._set_job_status(video_job, JobStatus.DISPATCHED)
             self._save_video_job(video_job)
             
             # Create event
@@ -733,8 +1340,7 @@ class BatchProcessor:
             if not self.rate_limiter.can_proceed(user_id, video_job.ai_provider):
                 backoff_time = self.rate_limiter.get_backoff_time(user_id)
                 
-                video_job.status = JobStatus.RATE_LIMITED
-                video_job.updated_at = datetime.now(timezone.utc)
+                self._set_job_status(video_job, JobStatus.RATE_LIMITED)
                 self._save_video_job(video_job)
                 
                 logger.info(f"Job {video_job.id} rate limited, backing off {backoff_time:.1f}s")
@@ -744,10 +1350,9 @@ class BatchProcessor:
             result = await self._execute_video_generation(video_job)
             
             # Update job with results
-            video_job.status = JobStatus.COMPLETED
             video_job.output_url = result.get("output_url")
             video_job.cost = Decimal(str(result.get("cost", 0.0)))
-            video_job.updated_at = datetime.now(timezone.utc)
+            self._set_job_status(video_job, JobStatus.COMPLETED)
             self._save_video_job(video_job)
             
             # Create success event
@@ -765,12 +1370,13 @@ class BatchProcessor:
         except Exception as e:
             logger.error(f"Video generation failed for job {video_job.id}: {e}")
             
-            # Update job with error
-            video_job.status = JobStatus.FAILED
+            # Update job with error; a job that will be retried never counts
+            # as failed, so the bulk job cannot complete on a transient error
             video_job.error_message = str(e)
             video_job.retry_count += 1
             video_job.last_retry_at = datetime.now(timezone.utc)
-            video_job.updated_at = datetime.now(timezone.utc)
+            will_retry = video_job.retry_count < 3  # Max retries
+            self._set_job_status(video_job, JobStatus.RETRIED if will_retry else JobStatus.FAILED)
             self._save_video_job(video_job)
             
             # Create error event
@@ -783,9 +1389,7 @@ class BatchProcessor:
             self._save_job_event(event)
             
             # Re-queue if retry limit not exceeded
-            if video_job.retry_count < 3:  # Max retries
-                video_job.status = JobStatus.RETRIED
-                self._save_video_job(video_job)
+            if will_retry:
                 self.queue_manager.add_job(video_job)
                 logger.info(f"Re-queued job {video_job.id} for retry ({video_job.retry_count}/3)")
             else:
@@ -852,16 +1456,27 @@ class BatchProcessor:
         if not bulk_job:
             return {"error": f"Bulk job {bulk_job_id} not found"}
         
-        # Get job statistics
-        total_jobs = len(bulk_job.video_jobs)
-        completed_jobs = sum(1 for job in bulk_job.video_jobs 
-                           if job.status == JobStatus.COMPLETED)
-        failed_jobs = sum(1 for job in bulk_job.video_jobs 
-                         if job.status == JobStatus.FAILED)
-        running_jobs = sum(1 for job in bulk_job.video_jobs 
-                          if job.status in [JobStatus.DISPATCHED, JobStatus.IN_PROGRESS])
-        queued_jobs = sum(1 for job in bulk_job.video_jobs 
-                         if job.status in [JobStatus.QUEUED, JobStatus.RETRIED])
+        # Get job statistics from the pushed counters when the bulk job is tracked
+        tracker = self.progress_trackers.get(bulk_job_id)
+        if tracker is not None:
+            counts = tracker.snapshot()["counts"]
+            total_jobs = tracker.total
+            completed_jobs = counts.get(JobStatus.COMPLETED.value, 0)
+            failed_jobs = counts.get(JobStatus.FAILED.value, 0)
+            running_jobs = (counts.get(JobStatus.DISPATCHED.value, 0) +
+                            counts.get(JobStatus.IN_PROGRESS.value, 0))
+            queued_jobs = (counts.get(JobStatus.QUEUED.value, 0) +
+                           counts.get(JobStatus.RETRIED.value, 0))
+        else:
+            total_jobs = len(bulk_job.video_jobs)
+            completed_jobs = sum(1 for job in bulk_job.video_jobs 
+                               if job.status == JobStatus.COMPLETED)
+            failed_jobs = sum(1 for job in bulk_job.video_jobs 
+                             if job.status == JobStatus.FAILED)
+            running_jobs = sum(1 for job in bulk_job.video_jobs 
+                              if job.status in [JobStatus.DISPATCHED, JobStatus.IN_PROGRESS])
+            queued_jobs = sum(1 for job in bulk_job.video_jobs 
+                             if job.status in [JobStatus.QUEUED, JobStatus.RETRIED])
         
         return {
             "bulk_job_id": bulk_job_id,
@@ -884,27 +1499,18 @@ class BatchProcessor:
         """Get recent job events for a bulk job."""
         job_ids = [job.id for job in self.bulk_jobs.get(bulk_job_id, BulkJob("", "", PipelineState.IDLE)).video_jobs]
         
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute("""
-                SELECT id, job_id, event_type, message, progress_percent, created_at
-                FROM job_events
-                WHERE job_id IN ({})
-                ORDER BY created_at DESC
-                LIMIT ?
-            """.format(",".join(["?"] * len(job_ids))), job_ids + [limit])
-            
-            events = []
-            for row in cursor.fetchall():
-                events.append({
-                    "id": row[0],
-                    "job_id": row[1],
-                    "event_type": row[2],
-                    "message": row[3],
-                    "progress_percent": row[4],
-                    "created_at": row[5]
-                })
-            
-            return events
+        events = []
+        for row in self.job_store.fetch_job_events(job_ids, limit):
+            events.append({
+                "id": row[0],
+                "job_id": row[1],
+                "event_type": row[2],
+                "message": row[3],
+                "progress_percent": row[4],
+                "created_at": row[5]
+            })
+        
+        return events
     
     def pause_bulk_job(self, bulk_job_id: str) -> bool:
         """Pause a running bulk job."""
@@ -916,6 +1522,11 @@ class BatchProcessor:
         self.state = PipelineState.PAUSED
         self._save_bulk_job(bulk_job)
         
+        # Wake the progress monitor so it sees the pipeline is no longer running
+        tracker = self.progress_trackers.get(bulk_job_id)
+        if tracker is not None:
+            tracker.publish()
+        
         logger.info(f"Paused bulk job {bulk_job_id}")
         return True
     
@@ -934,6 +1545,11 @@ class BatchProcessor:
             if job.status == JobStatus.RETRIED:
                 self.queue_manager.add_job(job)
         
+        # Finish the bulk job if its last jobs completed while it was paused
+        tracker = self.progress_trackers.get(bulk_job_id)
+        if tracker is not None:
+            self._on_bulk_progress(bulk_job, tracker.snapshot())
+        
         logger.info(f"Resumed bulk job {bulk_job_id}")
         return True
     
@@ -950,7 +1566,7 @@ class BatchProcessor:
         # Cancel all video jobs
         for job in bulk_job.video_jobs:
             if job.status not in [JobStatus.COMPLETED, JobStatus.CANCELLED]:
-                job.status = JobStatus.CANCELLED
+                self._set_job_status(job, JobStatus.CANCELLED)
                 self._save_video_job(job)
         
         self.queue_manager.stop()
@@ -983,7 +1599,9 @@ class BatchProcessor:
             "rate_limiter": {
                 "user_buckets": len(self.rate_limiter.user_buckets),
                 "project_buckets": len(self.rate_limiter.project_buckets)
-            }
+            },
+            "queue": self.queue_manager.get_queue_stats(),
+            "persistence": self.job_store.get_stats()
         }
     
     async def cleanup(self):
@@ -996,10 +1614,18 @@ class BatchProcessor:
         # Shutdown executor
         self.executor.shutdown(wait=True)
         
+        # Flush buffered job state and close the database connection
+        self.job_store.close()
+        
         # Close sheets client
         if self.sheets_client:
             await self.sheets_client.close()
         
+        # Close the shared MiniMax session if any video was generated
+        minimax = sys.modules.get('integrate_minimax_video')
+        if minimax is not None:
+            await minimax.close_shared_video_client()
+        
         logger.info("Batch processor cleanup completed")
 
 
@@ -0,0 +1,431 @@
+"""
+Second-Tier Cache Backends
+
+Pluggable persistent cache tier shared by smart_batcher.CacheManager and
+parallel_generator.MultiLayerCache, so cache hits survive restarts and are
+shared across worker processes.
+
+Features:
+- CacheBackend interface with on-disk (SQLite) and Redis implementations
+- Read-through lookups with remaining TTL for promotion into memory tiers
+- Write-behind buffering with coalesced, batched flushes
+- Negative caching of recent misses to avoid repeated backend round trips
+- Per-tier hit/miss statistics
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (key, serialized payload, ttl seconds or None for no expiry)
+CacheWrite = Tuple[str, str, Optional[float]]
+
+
+def check_ttl(ttl: Optional[float]) -> None:
+    """Reject TTLs that are not positive; None means no expiry"""
+    if ttl is not None and ttl <= 0:
+        raise ValueError(f"ttl must be positive, or None for no expiry (got {ttl})")
+
+
+class CacheBackend(ABC):
+    """Storage interface for a second-tier cache
+
+    Backends store serialized payloads only; encoding, buffering and
+    statistics are handled by SecondTierCache.
+    """
+
+    name = "backend"
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Tuple[str, Optional[float]]]:
+        """Return (payload, remaining_ttl) or None when absent or expired"""
+
+    @abstractmethod
+    def set_many(self, entries: List[CacheWrite]) -> None:
+        """Store several entries in one round trip / transaction"""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Remove an entry if present"""
+
+    def set(self, key: str, payload: str, ttl: Optional[float] = None) -> None:
+        self.set_many([(key, payload, ttl)])
+
+    def close(self) -> None:
+        """Release backend resources"""
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """Local on-disk cache backend stored in a SQLite database
+
+    WAL mode lets several worker processes on the same host read while one
+    writes, so the file doubles as a cross-process cache.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, db_path: str = "cache/content_cache.db", purge_interval: float = 300.0):
+        self.db_path = db_path
+        self.purge_interval = purge_interval
+        self._last_purge = time.time()
+        self._lock = threading.Lock()
+
+        if db_path != ":memory:":
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+
+        self.conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30.0)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS cache_entries (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                expires_at REAL
+            )
+        """)
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_cache_entries_expires_at ON cache_entries(expires_at)"
+        )
+        self.conn.commit()
+
+    def get(self, key: str) -> Optional[Tuple[str, Optional[float]]]:
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT value, expires_at FROM cache_entries WHERE key = ?", (key,)
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        value, expires_at = row
+        if expires_at is None:
+            return value, None
+
+        remaining = expires_at - time.time()
+        if remaining <= 0:
+            self.delete(key)
+            return None
+        return value, remaining
+
+    def set_many(self, entries: List[CacheWrite]) -> None:
+        if not entries:
+            return
+
+        for _, _, ttl in entries:
+            check_ttl(ttl)
+        now = time.time()
+        rows = [
+            (key, payload, now + ttl if ttl is not None else None)
+            for key, payload, ttl in entries
+        ]
+        with self._lock:
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO cache_entries (key, value, expires_at) VALUES (?, ?, ?)",
+                    rows
+                )
+            if now - self._last_purge > self.purge_interval:
+                self._purge_expired_locked(now)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            with self.conn:
+                self.conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+
+    def purge_expired(self) -> int:
+        """Delete expired rows, returning how many were removed"""
+        with self._lock:
+            return self._purge_expired_locked(time.time())
+
+    def _purge_expired_locked(self, now: float) -> int:
+        with self.conn:
+            cursor = self.conn.execute(
+                "DELETE FROM cache_entries WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,)
+            )
+        self._last_purge = now
+        return cursor.rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            self.conn.close()
+
+
+class RedisCacheBackend(CacheBackend):
+    """Redis cache backend
+
+    Accepts any client exposing the redis-py ``get``/``set``/``setex``/
+    ``delete``/``ttl`` commands, which allows running against a local
+    stand-in in tests. When no client is given, redis-py is imported lazily.
+    """
+
+    name = "redis"
+
+    def __init__(self, url: Optional[str] = None, client: Any = None,
+                 key_prefix: str = "", **redis_kwargs):
+        if client is None:
+            import redis  # Optional dependency
+            if url:
+                client = redis.Redis.from_url(url, decode_responses=True)
+            else:
+                client = redis.Redis(decode_responses=True, **redis_kwargs)
+        self.client = client
+        self.key_prefix = key_prefix
+
+    def _key(self, key: str) -> str:
+        return f"{self.key_prefix}{key}"
+
+    def ping(self) -> bool:
+        return bool(self.client.ping())
+
+    def get(self, key: str) -> Optional[Tuple[str, Optional[float]]]:
+        redis_key = self._key(key)
+        value = self.client.get(redis_key)
+        if value is None:
+            return None
+        if isinstance(value, bytes):
+            value = value.decode("utf-8")
+
+        ttl = self.client.ttl(redis_key)
+        # Redis reports -1 for keys without expiry and -2 for missing keys
+        if ttl is None or ttl == -1:
+            return value, None
+        if ttl < 0:
+            return None
+        return value, float(ttl)
+
+    def set_many(self, entries: List[CacheWrite]) -> None:
+        if not entries:
+            return
+
+        for _, _, ttl in entries:
+            check_ttl(ttl)
+        pipeline = self.client.pipeline() if hasattr(self.client, "pipeline") else self.client
+        for key, payload, ttl in entries:
+            if ttl is not None:
+                pipeline.setex(self._key(key), max(1, int(ttl)), payload)
+            else:
+                pipeline.set(self._key(key), payload)
+        if pipeline is not self.client:
+            pipeline.execute()
+
+    def delete(self, key: str) -> None:
+        self.client.delete(self._key(key))
+
+    def close(self) -> None:
+        close = getattr(self.client, "close", None)
+        if close:
+            close()
+
+
+class SecondTierCache:
+    """Read-through, write-behind cache tier on top of a CacheBackend
+
+    Writes are buffered (coalesced per key) and flushed in batches by a
+    background thread, while reads see buffered writes immediately. Recent
+    misses are remembered for ``negative_ttl`` seconds so repeated lookups
+    for uncached content do not each reach the backend.
+    """
+
+    def __init__(self,
+                 backend: CacheBackend,
+                 write_behind: bool = True,
+                 flush_interval: float = 0.5,
+                 max_pending: int = 500,
+                 negative_ttl: float = 30.0,
+                 negative_cache_size: int = 10000):
+        self.backend = backend
+        self.write_behind = write_behind
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.negative_ttl = negative_ttl
+        self.negative_cache_size = negative_cache_size
+
+        self._pending: "OrderedDict[str, Tuple[str, Optional[float], float]]" = OrderedDict()
+        self._negative: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._flusher: Optional[threading.Thread] = None
+
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "negative_hits": 0,
+            "writes": 0,
+            "flushes": 0,
+            "errors": 0
+        }
+
+    @property
+    def name(self) -> str:
+        return self.backend.name
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self.get_with_ttl(key)
+        return entry[0] if entry else None
+
+    def get_with_ttl(self, key: str) -> Optional[Tuple[Any, Optional[float]]]:
+        """Return (value, remaining_ttl) or None on a miss"""
+        now = time.time()
+        with self._lock:
+            pending = self._pending.get(key)
+            if pending is not None:
+                payload, ttl, queued_at = pending
+                if ttl is None or queued_at + ttl > now:
+                    self.stats["hits"] += 1
+                    return json.loads(payload), (queued_at + ttl - now) if ttl is not None else None
+                # Expired while buffered; the flush drops it along with any older stored value
+                self.stats["misses"] += 1
+                return None
+
+            negative_until = self._negative.get(key)
+            if negative_until is not None:
+                if negative_until > now:
+                    self.stats["negative_hits"] += 1
+                    self.stats["misses"] += 1
+                    return None
+                del self._negative[key]
+
+        try:
+            stored = self.backend.get(key)
+        except Exception as e:
+            logger.error(f"{self.name} cache get error: {e}")
+            with self._lock:
+                self.stats["errors"] += 1
+                self.stats["misses"] += 1
+            return None
+
+        with self._lock:
+            if stored is None:
+                self.stats["misses"] += 1
+                self._remember_miss(key, now)
+                return None
+            self.stats["hits"] += 1
+
+        payload, remaining_ttl = stored
+        return json.loads(payload), remaining_ttl
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = 3600) -> None:
+        check_ttl(ttl)
+        payload = json.dumps(value, default=str)
+        with self._lock:
+            self._negative.pop(key, None)
+            self.stats["writes"] += 1
+            if self.write_behind:
+                self._pending[key] = (payload, ttl, time.time())
+                self._pending.move_to_end(key)
+                pending_count = len(self._pending)
+
+        if not self.write_behind:
+            self._write([(key, payload, ttl)])
+            return
+
+        self._ensure_flusher()
+        if pending_count >= self.max_pending:
+            self._wakeup.set()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._pending.pop(key, None)
+            self._remember_miss(key, time.time())
+        self._delete_stored(key)
+
+    def flush(self) -> int:
+        """Write all buffered entries to the backend, returning the count"""
+        with self._flush_lock:
+            now = time.time()
+            with self._lock:
+                if not self._pending:
+                    return 0
+                entries = [
+                    (key, payload, (queued_at + ttl - now) if ttl is not None else None)
+                    for key, (payload, ttl, queued_at) in self._pending.items()
+                ]
+                snapshot = dict(self._pending)
+
+            # Entries whose TTL ran out while buffered are dropped rather than written,
+            # and the values they replaced are removed so they are not served again
+            live_entries = [entry for entry in entries if entry[2] is None or entry[2] > 0]
+            self._write(live_entries)
+            for key, _, remaining_ttl in entries:
+                if remaining_ttl is not None and remaining_ttl <= 0:
+                    self._delete_stored(key)
+
+            with self._lock:
+                # Keep entries that were overwritten while the flush was running
+                for key, value in snapshot.items():
+                    if self._pending.get(key) is value:
+                        del self._pending[key]
+                self.stats["flushes"] += 1
+            return len(live_entries)
+
+    def close(self) -> None:
+        """Flush buffered writes, stop the flusher and close the backend"""
+        self._closed = True
+        self._wakeup.set()
+        if self._flusher is not None:
+            self._flusher.join(timeout=5.0)
+        self.flush()
+        self.backend.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters and buffer occupancy for this tier"""
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return {
+                **self.stats,
+                "hit_ratio": self.stats["hits"] / lookups if lookups else 0.0,
+                "pending_writes": len(self._pending),
+                "backend": self.name
+            }
+
+    def _write(self, entries: List[CacheWrite]) -> None:
+        if not entries:
+            return
+        try:
+            self.backend.set_many(entries)
+        except Exception as e:
+            logger.error(f"{self.name} cache write error: {e}")
+            with self._lock:
+                self.stats["errors"] += 1
+
+    def _delete_stored(self, key: str) -> None:
+        try:
+            self.backend.delete(key)
+        except Exception as e:
+            logger.error(f"{self.name} cache delete error: {e}")
+            with self._lock:
+                self.stats["errors"] += 1
+
+    def _remember_miss(self, key: str, now: float) -> None:
+        if self.negative_ttl <= 0:
+            return
+        self._negative[key] = now + self.negative_ttl
+        self._negative.move_to_end(key)
+        while len(self._negative) > self.negative_cache_size:
+            self._negative.popitem(last=False)
+
+    def _ensure_flusher(self) -> None:
+        if self._flusher is not None or self._closed:
+            return
+        with self._lock:
+            if self._flusher is None:
+                self._flusher = threading.Thread(
+                    target=self._flush_loop, name=f"{self.name}-cache-flusher", daemon=True
+                )
+                self._flusher.start()
+
+    def _flush_loop(self) -> None:
+        while not self._closed:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
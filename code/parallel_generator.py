@@ -36,12 +36,14 @@ from typing import (
     Awaitable
 )
 from dataclasses import dataclass, field
-from collections import defaultdict, deque
+from collections import OrderedDict, defaultdict, deque
 import aiohttp
 import aiofiles
 import uuid
 import math
 
+from cache_backends import CacheBackend, RedisCacheBackend, SecondTierCache
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -590,29 +592,33 @@ class SmartBatcher:
 class MultiLayerCache:
     """Multi-layer caching system for generated content"""
     
-    def __init__(self, memory_cache_size: int = 1000, redis_url: Optional[str] = None):
-        self.memory_cache: Dict[str, Dict] = {}
-        self.memory_cache_order = deque()
+    def __init__(
+        self,
+        memory_cache_size: int = 1000,
+        redis_url: Optional[str] = None,
+        l2_backend: Optional[CacheBackend] = None
+    ):
+        self.memory_cache: "OrderedDict[str, Dict]" = OrderedDict()
         self.memory_cache_size = memory_cache_size
         self.redis_url = redis_url
-        self.redis_client = None
+        self.l2_cache = SecondTierCache(l2_backend) if l2_backend else None
         self.hit_stats = {
             "memory_hits": 0,
-            "redis_hits": 0,
+            "l2_hits": 0,
             "misses": 0,
             "total_requests": 0
         }
         self.lock = asyncio.Lock()
     
     async def initialize_redis(self) -> None:
-        """Initialize Redis connection if available"""
-        if not self.redis_url:
+        """Initialize Redis second tier if configured and no other tier is set"""
+        if not self.redis_url or self.l2_cache:
             return
         
         try:
-            import redis.asyncio as redis
-            self.redis_client = redis.from_url(self.redis_url)
-            await self.redis_client.ping()
+            backend = RedisCacheBackend(url=self.redis_url)
+            await asyncio.to_thread(backend.ping)
+            self.l2_cache = SecondTierCache(backend)
             logger.info("Redis cache initialized")
         except ImportError:
             logger.warning("Redis not available, using memory cache only")
@@ -627,19 +633,18 @@ class MultiLayerCache:
         async with self.lock:
             if cache_key in self.memory_cache:
                 # Move to end (LRU)
-                self.memory_cache_order.move_to_end(cache_key)
+                self.memory_cache.move_to_end(cache_key)
                 self.hit_stats["memory_hits"] += 1
                 return self.memory_cache[cache_key]
         
-        # Check Redis cache
-        if self.redis_client:
-            try:
-                cached_data = await self.redis_client.get(cache_key)
-                if cached_data:
-                    self.hit_stats["redis_hits"] += 1
-                    return json.loads(cached_data)
-            except Exception as e:
-                logger.error(f"Redis get error: {e}")
+        # Read through to the second tier, promoting hits into memory
+        if self.l2_cache:
+            cached_data = await asyncio.to_thread(self.l2_cache.get, cache_key)
+            if cached_data is not None:
+                self.hit_stats["l2_hits"] += 1
+                async with self.lock:
+                    self._store_in_memory(cache_key, cached_data)
+                return cached_data
         
         self.hit_stats["misses"] += 1
         return None
@@ -648,60 +653,55 @@ class MultiLayerCache:
         """Set cached content in all layers"""
         # Store in memory cache
         async with self.lock:
-            if cache_key in self.memory_cache:
-                self.memory_cache_order.move_to_end(cache_key)
-            else:
-                # Evict oldest if at capacity
-                if len(self.memory_cache) >= self.memory_cache_size:
-                    oldest_key = self.memory_cache_order.popleft()
-                    del self.memory_cache[oldest_key]
-            
-            self.memory_cache[cache_key] = data
-            self.memory_cache_order.append(cache_key)
+            self._store_in_memory(cache_key, data)
         
-        # Store in Redis cache
-        if self.redis_client:
-            try:
-                await self.redis_client.setex(
-                    cache_key, 
-                    ttl_seconds, 
-                    json.dumps(data, default=str)
-                )
-            except Exception as e:
-                logger.error(f"Redis set error: {e}")
+        # Store in second tier (buffered, written behind)
+        if self.l2_cache:
+            self.l2_cache.set(cache_key, data, ttl_seconds)
+    
+    def _store_in_memory(self, cache_key: str, data: Dict) -> None:
+        if cache_key in self.memory_cache:
+            self.memory_cache.move_to_end(cache_key)
+        elif len(self.memory_cache) >= self.memory_cache_size:
+            # Evict oldest if at capacity
+            self.memory_cache.popitem(last=False)
+        
+        self.memory_cache[cache_key] = data
     
     async def invalidate(self, cache_key: str) -> None:
         """Invalidate cache entry from all layers"""
         # Remove from memory cache
         async with self.lock:
-            if cache_key in self.memory_cache:
-                del self.memory_cache[cache_key]
-            if cache_key in self.memory_cache_order:
-                self.memory_cache_order.remove(cache_key)
+            self.memory_cache.pop(cache_key, None)
         
-        # Remove from Redis cache
-        if self.redis_client:
-            try:
-                await self.redis_client.delete(cache_key)
-            except Exception as e:
-                logger.error(f"Redis delete error: {e}")
+        # Remove from second tier
+        if self.l2_cache:
+            await asyncio.to_thread(self.l2_cache.delete, cache_key)
+    
+    async def flush(self) -> None:
+        """Flush buffered second-tier writes"""
+        if self.l2_cache:
+            await asyncio.to_thread(self.l2_cache.flush)
     
     def get_hit_ratio(self) -> float:
         """Get cache hit ratio"""
         total = self.hit_stats["total_requests"]
         if total == 0:
             return 0.0
-        hits = self.hit_stats["memory_hits"] + self.hit_stats["redis_hits"]
+        hits = self.hit_stats["memory_hits"] + self.hit_stats["l2_hits"]
         return (hits / total) * 100.0
     
     def get_cache_stats(self) -> Dict[str, Any]:
         """Get detailed cache statistics"""
+        memory_lookups = self.hit_stats["total_requests"]
         return {
             **self.hit_stats,
             "hit_ratio_percent": self.get_hit_ratio(),
             "memory_cache_size": len(self.memory_cache),
             "memory_cache_capacity": self.memory_cache_size,
-            "redis_available": self.redis_client is not None
+            "memory_hit_ratio": self.hit_stats["memory_hits"] / memory_lookups if memory_lookups else 0.0,
+            "l2_available": self.l2_cache is not None,
+            "l2": self.l2_cache.get_stats() if self.l2_cache else None
         }
 
 
@@ -930,13 +930,14 @@ class ParallelGenerator:
         rate_limit_config: RateLimitConfig = None,
         batching_config: BatchingConfig = None,
         resource_config: ResourcePoolConfig = None,
-        redis_url: str = None
+        redis_url: str = None,
+        cache_backend: Optional[CacheBackend] = None
     ):
         # Initialize components
         self.rate_limiter = CombinedRateLimiter(rate_limit_config or RateLimitConfig())
         self.batcher = SmartBatcher(batching_config or BatchingConfig())
         self.resource_pool = ResourcePool(resource_config or ResourcePoolConfig())
-        self.cache = MultiLayerCache(redis_url=redis_url)
+        self.cache = MultiLayerCache(redis_url=redis_url, l2_backend=cache_backend)
         self.load_balancer = LoadBalancer()
         self.cost_monitor = CostMonitor()
         
@@ -984,6 +985,7 @@ class ParallelGenerator:
             await asyncio.gather(*self.background_tasks, return_exceptions=True)
         
         self.background_tasks.clear()
+        await self.cache.flush()
         logger.info("ParallelGenerator stopped")
     
     async def generate(
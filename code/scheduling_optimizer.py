@@ -13,6 +13,7 @@ Based on the optimization algorithms and batch integration specifications.
 """
 
 import asyncio
+import bisect
 import json
 import logging
 import math
@@ -146,6 +147,81 @@ class SchedulePlan:
     schedule_adherence_score: Optional[float] = None
 
 
+class ScheduleIndex:
+    """
+    Hour-bucket index over the slots assigned while building a schedule.
+    
+    Assignments are stored as per-slot counts on an hourly grid starting at
+    ``origin`` plus a sorted slot list per platform. Adding a post is O(log n)
+    and the collision, concurrency and spacing penalties for every candidate
+    slot are derived from the counts with a few vectorized passes over the
+    grid, instead of rescanning the whole schedule for each slot.
+    """
+    
+    def __init__(self, origin: datetime, num_slots: int):
+        self.origin = origin
+        self.num_slots = num_slots
+        self.slot_counts = np.zeros(num_slots, dtype=np.int64)
+        # Maintained incrementally: +10 in the post's own hour, +5 either side
+        self.collision_penalties = np.zeros(num_slots)
+        self._slot_range = np.arange(num_slots)
+        self._platform_counts: Dict[Platform, np.ndarray] = {}
+        self._platform_slots: Dict[Platform, List[int]] = defaultdict(list)
+    
+    def __len__(self) -> int:
+        return int(self.slot_counts.sum())
+    
+    def slot_of(self, scheduled_time: datetime) -> int:
+        return int((scheduled_time - self.origin).total_seconds() // 3600)
+    
+    def time_of(self, slot: int) -> datetime:
+        return self.origin + timedelta(hours=slot)
+    
+    def add(self, platform: Platform, scheduled_time: datetime):
+        """Record a post assigned to ``scheduled_time``."""
+        slot = self.slot_of(scheduled_time)
+        self.slot_counts[slot] += 1
+        self.collision_penalties[slot] += 10.0
+        if slot > 0:
+            self.collision_penalties[slot - 1] += 5.0
+        if slot + 1 < self.num_slots:
+            self.collision_penalties[slot + 1] += 5.0
+        
+        if platform not in self._platform_counts:
+            self._platform_counts[platform] = np.zeros(self.num_slots, dtype=np.int64)
+        self._platform_counts[platform][slot] += 1
+        bisect.insort(self._platform_slots[platform], slot)
+    
+    def concurrent_count(self, scheduled_time: datetime) -> int:
+        """Number of posts assigned to the same hour slot."""
+        return int(self.slot_counts[self.slot_of(scheduled_time)])
+    
+    def concurrency_penalties(self, max_concurrent: int) -> np.ndarray:
+        excess = self.slot_counts - max_concurrent + 1
+        return np.where(excess > 0, excess * 20.0, 0.0)
+    
+    def nearest_gap_hours(self, platform: Platform) -> np.ndarray:
+        """Distance in hours from every slot to the closest post on ``platform``."""
+        counts = self._platform_counts.get(platform)
+        if counts is None:
+            return np.full(self.num_slots, np.inf)
+        
+        occupied = counts > 0
+        previous = np.where(occupied, self._slot_range, -np.inf)
+        np.maximum.accumulate(previous, out=previous)
+        following = np.where(occupied, self._slot_range, np.inf)
+        following = np.minimum.accumulate(following[::-1])[::-1]
+        return np.minimum(self._slot_range - previous, following - self._slot_range)
+    
+    def platform_gaps(self, platform: Platform, scheduled_time: datetime, within_hours: float) -> List[float]:
+        """Signed hour offsets of ``platform`` posts closer than ``within_hours``, oldest first."""
+        slot = self.slot_of(scheduled_time)
+        slots = self._platform_slots.get(platform, [])
+        lo = bisect.bisect_right(slots, slot - within_hours)
+        hi = bisect.bisect_left(slots, slot + within_hours)
+        return [float(slot - other) for other in slots[lo:hi]]
+
+
 class SchedulingOptimizer:
     """
     Main scheduling optimizer class that implements the algorithm suite from the specification.
@@ -158,6 +234,14 @@ class SchedulingOptimizer:
         
         # Initialize platform baseline windows from evidence synthesis
         self._platform_windows = self._init_platform_windows()
+        self._baseline_weights = {
+            platform: self._build_baseline_weights(platform) for platform in Platform
+        }
+        
+        # Memoized (weekday x hour) timing score matrices, keyed by platform,
+        # content type, audience and calendar signals
+        self._timing_score_cache: Dict[Tuple, Tuple[float, np.ndarray]] = {}
+        self._timing_score_ttl = 300.0  # Recency penalties depend on the last 24h
         
         # Initialize machine learning models
         self._ml_models = {}
@@ -165,7 +249,7 @@ class SchedulingOptimizer:
         
         # Initialize adaptive parameters
         self._daypart_weights = defaultdict(lambda: defaultdict(lambda: defaultdict(float)))
-        self._posterior_params = defaultdict(lambda: defaultdict(lambda: defaultdict(lambda: (1, 1))))
+        self._posterior_params = defaultdict(lambda: (1, 1))
         self._seasonality_factors = defaultdict(lambda: defaultdict(lambda: defaultdict(float)))
         
         # ML training data
@@ -346,49 +430,97 @@ class SchedulingOptimizer:
         Returns:
             Dict mapping hour -> score (0-1)
         """
-        scores = {}
+        scores = self.get_timing_score_matrix(
+            platform, content_type, audience_profile, calendar_signals
+        )[day_of_week]
+        return dict(enumerate(scores.tolist()))
+    
+    def get_timing_score_matrix(self,
+                                platform: Platform,
+                                content_type: ContentType,
+                                audience_profile: AudienceProfile,
+                                calendar_signals: Optional[Dict] = None) -> np.ndarray:
+        """
+        Get normalized timing scores for every weekday and hour as a (7, 24) array.
         
+        Scores are computed for the whole week at once and memoized per
+        platform, content type, audience and calendar signals. Entries for a
+        platform are invalidated when new performance metrics are recorded for
+        it, and expire after ``_timing_score_ttl`` seconds because the recency
+        penalty looks at the last 24 hours of posts.
+        
+        Returns:
+            Read-only array indexed by [day_of_week, hour]
+        """
+        calendar_signals = calendar_signals or {}
+        key = (
+            platform,
+            content_type,
+            tuple(sorted(audience_profile.age_cohorts.items())),
+            tuple(sorted(audience_profile.device_split.items())),
+            bool(calendar_signals.get('is_holiday', False)),
+            calendar_signals.get('season', 'normal')
+        )
+        
+        cached = self._timing_score_cache.get(key)
+        now = time.monotonic()
+        if cached is not None and now - cached[0] < self._timing_score_ttl:
+            return cached[1]
+        
+        scores = self._compute_timing_scores(platform, content_type, audience_profile, calendar_signals)
+        scores.setflags(write=False)
+        self._timing_score_cache[key] = (now, scores)
+        return scores
+    
+    def _compute_timing_scores(self,
+                               platform: Platform,
+                               content_type: ContentType,
+                               audience_profile: AudienceProfile,
+                               calendar_signals: Dict) -> np.ndarray:
+        """Evaluate the scoring model for all 7 x 24 slots with array operations."""
         # Hyperparameters (tunable)
         w_demo = 0.3
         w_fmt = 0.2
         w_seas = 0.1
         
         # 1. Initialize with platform baseline
-        for hour in range(24):
-            scores[hour] = self._get_baseline_weight(platform, day_of_week, hour)
+        scores = self._baseline_weights[platform].copy()
         
         # 2. Apply demographic adjustments
-        demo_adjust = self._calculate_demo_adjustment(audience_profile, day_of_week)
-        for hour in range(24):
-            scores[hour] *= (1 + w_demo * demo_adjust.get(hour, 0))
+        scores *= 1 + w_demo * self._calculate_demo_adjustment(audience_profile)
         
-        # 3. Apply content format adjustments
-        format_adjust = self._calculate_format_adjustment(platform, content_type)
-        for hour in range(24):
-            scores[hour] *= (1 + w_fmt * format_adjust.get(hour, 0))
+        # 3. Apply content format adjustments (same for every weekday)
+        scores *= 1 + w_fmt * self._calculate_format_adjustment(platform, content_type)
         
         # 4. Apply seasonality signals
-        seasonality = self._calculate_seasonality(day_of_week, calendar_signals or {})
-        for hour in range(24):
-            scores[hour] *= (1 + w_seas * seasonality.get(hour, 0))
+        scores *= 1 + w_seas * self._calculate_seasonality(calendar_signals)
         
         # 5. Apply recency penalty (check if recent posts exist)
-        recency_penalty = self._calculate_recency_penalty(platform, content_type)
-        for hour in range(24):
-            scores[hour] *= recency_penalty.get(hour, 1.0)
+        scores *= self._calculate_recency_penalty(platform, content_type)
         
         # 6. Apply compliance guardrails
-        compliance_mask = self._apply_compliance_guardrails(platform, content_type)
-        for hour in range(24):
-            if not compliance_mask.get(hour, True):
-                scores[hour] = 0.0
+        scores[:, ~self._apply_compliance_guardrails(platform, content_type)] = 0.0
         
-        # 7. Normalize scores
-        max_score = max(scores.values()) if scores.values() else 1.0
-        if max_score > 0:
-            scores = {hour: score / max_score for hour, score in scores.items()}
-        
-        return scores
+        # 7. Normalize scores per weekday
+        max_scores = scores.max(axis=1, keepdims=True)
+        return np.divide(scores, max_scores, out=scores, where=max_scores > 0)
+    
+    def _invalidate_timing_scores(self, platform: Optional[Platform] = None):
+        """Drop memoized timing scores for one platform, or all platforms."""
+        if platform is None:
+            self._timing_score_cache.clear()
+            return
+        for key in [key for key in self._timing_score_cache if key[0] == platform]:
+            del self._timing_score_cache[key]
+    
+    def _build_baseline_weights(self, platform: Platform) -> np.ndarray:
+        """Baseline weight for every weekday and hour of a platform as a (7, 24) array."""
+        weights = np.full((7, 24), 0.1)  # Default low weight for non-preferred hours
+        for day_of_week, day_windows in self._platform_windows.get(platform, {}).items():
+            # Apply in reverse so the first matching window wins, as in _get_baseline_weight
+            for window in reversed(day_windows):
+                weights[day_of_week, window.start_hour:window.end_hour] = window.weight
+        return weights
     
     def _get_baseline_weight(self, platform: Platform, day_of_week: int, hour: int) -> float:
         """Get baseline weight for platform/day/hour combination."""
@@ -401,9 +533,9 @@ class SchedulingOptimizer:
         
         return 0.1  # Default low weight for non-preferred hours
     
-    def _calculate_demo_adjustment(self, audience: AudienceProfile, day_of_week: int) -> Dict[int, float]:
-        """Calculate demographic-based adjustments."""
-        adjustments = {}
+    def _calculate_demo_adjustment(self, audience: AudienceProfile) -> np.ndarray:
+        """Calculate demographic-based adjustments as a (7, 24) array."""
+        adjustments = np.zeros((7, 24))
         
         # Mobile-first audiences favor evening/weekend hours
         mobile_share = audience.device_split.get('mobile', 0.5)
@@ -414,12 +546,8 @@ class SchedulingOptimizer:
         
         if mobile_share > 0.7 and young_audience_share > 0.5:
             # Boost evening hours (6pm-11pm) and weekend mornings
-            for hour in range(18, 24):
-                adjustments[hour] = adjustments.get(hour, 0) + 0.1
-            
-            if day_of_week in [5, 6]:  # Weekend
-                for hour in range(8, 12):
-                    adjustments[hour] = adjustments.get(hour, 0) + 0.05
+            adjustments[:, 18:24] += 0.1
+            adjustments[5:7, 8:12] += 0.05
         
         # Work-age audiences favor post-workday windows
         work_age_share = sum([
@@ -427,110 +555,96 @@ class SchedulingOptimizer:
             audience.age_cohorts.get('35-44', 0)
         ])
         
-        if work_age_share > 0.4 and day_of_week < 5:  # Weekdays
-            # Boost 3-6pm window
-            for hour in range(15, 18):
-                adjustments[hour] = adjustments.get(hour, 0) + 0.08
+        if work_age_share > 0.4:
+            # Boost 3-6pm window on weekdays
+            adjustments[0:5, 15:18] += 0.08
         
         return adjustments
     
-    def _calculate_format_adjustment(self, platform: Platform, content_type: ContentType) -> Dict[int, float]:
-        """Calculate content format-specific adjustments."""
-        adjustments = {}
+    def _calculate_format_adjustment(self, platform: Platform, content_type: ContentType) -> np.ndarray:
+        """Calculate content format-specific adjustments as a (24,) array."""
+        adjustments = np.zeros(24)
         
         # YouTube Shorts: reduce timing sensitivity
         if content_type == ContentType.YOUTUBE_SHORTS:
             # Flatten timing sensitivity, boost some evening hours
-            for hour in range(24):
-                adjustments[hour] = -0.1 if 0 <= hour <= 8 else 0.05
+            adjustments[:] = 0.05
+            adjustments[0:9] = -0.1
         
         # Instagram Reels: boost bookend windows and midday
         elif content_type == ContentType.INSTAGRAM_REELS:
             # Morning bookends (6-9am) and evening (6-9pm), plus midday
-            for hour in [6, 7, 8, 18, 19, 20]:
-                adjustments[hour] = adjustments.get(hour, 0) + 0.1
-            for hour in range(11, 14):
-                adjustments[hour] = adjustments.get(hour, 0) + 0.05
+            adjustments[[6, 7, 8, 18, 19, 20]] += 0.1
+            adjustments[11:14] += 0.05
         
         # LinkedIn: boost business hours
         elif platform == Platform.LINKEDIN:
-            for hour in range(8, 11):
-                adjustments[hour] = adjustments.get(hour, 0) + 0.15
-            for hour in [12, 13]:
-                adjustments[hour] = adjustments.get(hour, 0) + 0.12
+            adjustments[8:11] += 0.15
+            adjustments[[12, 13]] += 0.12
         
         # X (Twitter): morning-first strategy
         elif platform == Platform.TWITTER:
-            for hour in range(8, 13):
-                adjustments[hour] = adjustments.get(hour, 0) + 0.1
+            adjustments[8:13] += 0.1
         
         return adjustments
     
-    def _calculate_seasonality(self, day_of_week: int, calendar_signals: Dict) -> Dict[int, float]:
-        """Calculate seasonality-based adjustments."""
-        adjustments = {}
+    def _calculate_seasonality(self, calendar_signals: Dict) -> np.ndarray:
+        """Calculate seasonality-based adjustments as a (7, 24) array."""
+        adjustments = np.zeros((7, 24))
         
         # Weekend adjustments
-        if day_of_week in [5, 6]:  # Saturday/Sunday
-            for hour in range(24):
-                adjustments[hour] = -0.05  # Slight weekend penalty for most content
+        adjustments[5:7, :] = -0.05  # Slight weekend penalty for most content
         
         # Holiday indicators
         if calendar_signals.get('is_holiday', False):
             # Adjust for holiday posting patterns
-            for hour in range(24):
-                adjustments[hour] = adjustments.get(hour, 0) - 0.1
+            adjustments -= 0.1
         
         # Back-to-school season, etc. could be added here
         season = calendar_signals.get('season', 'normal')
         if season == 'back_to_school':
-            for hour in range(8, 10):
-                adjustments[hour] = adjustments.get(hour, 0) + 0.05
+            adjustments[:, 8:10] += 0.05
         
         return adjustments
     
-    def _calculate_recency_penalty(self, platform: Platform, content_type: ContentType) -> Dict[int, float]:
-        """Calculate recency penalty to avoid posting collisions."""
-        penalties = {}
+    def _calculate_recency_penalty(self, platform: Platform, content_type: ContentType) -> np.ndarray:
+        """Calculate recency penalty to avoid posting collisions as a (24,) array."""
+        penalties = np.ones(24)
         
         # Get recent posts for this platform
         recent_posts = self._get_recent_posts(platform, hours_back=24)
         
         # Apply minimum spacing rules
-        min_gap = self._get_min_gap_hours(platform, content_type)
+        min_gap = int(self._get_min_gap_hours(platform, content_type))
         
         for post in recent_posts:
-            post_hour = post['posted_at'].hour
+            post_hour = post['hour_of_day']
             # Penalize hours within the min gap window
-            for hour in range(max(0, post_hour - int(min_gap)), 
-                            min(24, post_hour + int(min_gap))):
-                penalties[hour] = penalties.get(hour, 1.0) * 0.5  # 50% penalty
+            penalties[max(0, post_hour - min_gap):min(24, post_hour + min_gap)] *= 0.5  # 50% penalty
         
         return penalties
     
-    def _apply_compliance_guardrails(self, platform: Platform, content_type: ContentType) -> Dict[int, bool]:
-        """Apply platform compliance and policy guardrails."""
-        guardrails = {}
+    def _apply_compliance_guardrails(self, platform: Platform, content_type: ContentType) -> np.ndarray:
+        """Apply platform compliance and policy guardrails as a (24,) mask of allowed hours."""
+        allowed = np.ones(24, dtype=bool)
         
         # LinkedIn: avoid link-heavy posts outside business hours
-        if platform == Platform.LINKEDIN:
-            for hour in range(24):
-                if content_type == ContentType.LINKEDIN_POST:
-                    if not (8 <= hour <= 14):  # Outside business hours
-                        guardrails[hour] = False
+        if platform == Platform.LINKEDIN and content_type == ContentType.LINKEDIN_POST:
+            allowed[:8] = False
+            allowed[15:] = False
         
-        # General late-night restrictions (11pm-6am)
-        for hour in range(23, 24) or range(0, 6):
-            if platform != Platform.TIKTOK:  # TikTok is more flexible
-                guardrails[hour] = False
+        # General late-night restriction (11pm)
+        if platform != Platform.TIKTOK:  # TikTok is more flexible
+            allowed[23] = False
         
-        return guardrails
+        return allowed
     
     def _get_recent_posts(self, platform: Platform, hours_back: int = 24) -> List[Dict]:
         """Get recent posts for a platform within the specified time window."""
         cutoff_time = datetime.now() - timedelta(hours=hours_back)
         
         with sqlite3.connect(self.db_path) as conn:
+            conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
             cursor.execute('''
                 SELECT platform, content_type, posted_at, hour_of_day
@@ -582,6 +696,23 @@ class SchedulingOptimizer:
         # Convert constraint dict for quick lookup
         constraint_map = {c.platform: c for c in constraints}
         
+        # Hourly slot grid: slot i is origin + i hours, covering every day in the window
+        window_days = []
+        current_date = start_date
+        while current_date <= end_date:
+            window_days.append(current_date)
+            current_date += timedelta(days=1)
+        
+        origin = start_date.replace(hour=0, minute=0, second=0, microsecond=0)
+        slot_hours = np.arange(24 * len(window_days), dtype=float)
+        valid_slots = ((slot_hours >= (start_date - origin).total_seconds() / 3600) &
+                       (slot_hours <= (end_date - origin).total_seconds() / 3600))
+        
+        # Timing scores only depend on platform, format, audience and weekday,
+        # so each combination is looked up once rather than per post and day
+        window_weekdays = [day.weekday() for day in window_days]
+        profile_scores = {}
+        
         # Calculate candidate posts with global priority scores
         candidate_posts = []
         for post in posts:
@@ -593,19 +724,17 @@ class SchedulingOptimizer:
                 logger.warning(f"No audience profile for {platform}, skipping")
                 continue
             
-            # Calculate base timing scores for each day
-            day_scores = {}
-            current_date = start_date
-            while current_date <= end_date:
-                day_scores[current_date.date()] = self.calculate_timing_scores(
-                    platform, content_type, audience, 
-                    current_date.weekday()
-                )
-                current_date += timedelta(days=1)
+            profile_key = (platform, content_type, id(audience))
+            if profile_key not in profile_scores:
+                # Base timing scores for each day of the window, flattened onto the slot grid
+                week_scores = self.get_timing_score_matrix(platform, content_type, audience)
+                timing_grid = week_scores[window_weekdays].ravel()
+                profile_scores[profile_key] = (timing_grid, float(timing_grid.max()))
+            
+            timing_grid, timing_score = profile_scores[profile_key]
             
             # Calculate global priority score
             base_priority = post.get('priority', PriorityTier.NORMAL.value)
-            timing_score = max([max(scores.values()) for scores in day_scores.values()])
             global_score = base_priority * (1 + timing_score)
             
             candidate_posts.append({
@@ -613,7 +742,7 @@ class SchedulingOptimizer:
                 'platform': platform,
                 'content_type': content_type,
                 'audience': audience,
-                'day_scores': day_scores,
+                'timing_grid': timing_grid,
                 'global_score': global_score,
                 'constraint': constraint_map.get(platform)
             })
@@ -623,19 +752,17 @@ class SchedulingOptimizer:
         
         # Initialize schedule
         schedule = []
-        scheduled_times = defaultdict(list)  # platform -> list of scheduled times
-        active_concurrent = 0
+        schedule_index = ScheduleIndex(origin, len(slot_hours))
         
         # Greedy assignment with dynamic penalties
         for candidate in candidate_posts:
             best_assignment = self._find_best_slot(
-                candidate, schedule, scheduled_times, start_date, end_date, max_concurrent
+                candidate, schedule_index, valid_slots, max_concurrent
             )
             
             if best_assignment:
                 schedule.append(best_assignment)
-                scheduled_times[candidate['platform']].append(best_assignment['scheduled_time'])
-                active_concurrent = min(active_concurrent + 1, max_concurrent)
+                schedule_index.add(candidate['platform'], best_assignment['scheduled_time'])
             
         # Create job assignments for batch integration
         job_assignments = []
@@ -665,123 +792,78 @@ class SchedulingOptimizer:
             schedule_adherence_score=schedule_adherence_score
         )
     
-    def _find_best_slot(self, candidate, existing_schedule, scheduled_times, start_date, end_date, max_concurrent):
-        """Find the best scheduling slot for a candidate post."""
-        platform = candidate['platform']
-        content_type = candidate['content_type']
-        constraint = candidate['constraint']
+    def _find_best_slot(self, candidate, schedule_index, valid_slots, max_concurrent):
+        """Find the best scheduling slot for a candidate post.
         
-        best_slot = None
-        best_penalty = float('inf')
+        Penalties for every hour in the window are evaluated at once against
+        the schedule index; the earliest slot with the lowest penalty wins.
+        """
+        penalties = self._calculate_assignment_penalty(candidate, schedule_index, max_concurrent)
+        penalties = np.where(valid_slots, penalties, np.inf)
+        if not len(penalties):
+            return None
         
-        current_date = start_date
-        while current_date <= end_date:
-            day_of_week = current_date.weekday()
-            day_scores = candidate['day_scores'].get(current_date.date())
-            
-            if not day_scores:
-                current_date += timedelta(days=1)
-                continue
-            
-            # Check each hour of the day
-            for hour in range(24):
-                scheduled_time = current_date.replace(hour=hour, minute=0, second=0, microsecond=0)
-                
-                # Skip if outside business hours
-                if scheduled_time < start_date or scheduled_time > end_date:
-                    continue
-                
-                # Calculate total penalty for this slot
-                penalty = self._calculate_assignment_penalty(
-                    candidate, scheduled_time, existing_schedule, scheduled_times, max_concurrent
-                )
-                
-                if penalty < best_penalty:
-                    best_penalty = penalty
-                    best_slot = {
-                        'post': candidate['post'],
-                        'platform': platform,
-                        'content_type': content_type,
-                        'scheduled_time': scheduled_time,
-                        'timing_score': day_scores.get(hour, 0),
-                        'penalty_score': penalty,
-                        'constraint_violations': self._check_constraint_violations(
-                            candidate, scheduled_time, existing_schedule, scheduled_times
-                        )
-                    }
-            
-            current_date += timedelta(days=1)
+        best = int(np.argmin(penalties))
+        if not np.isfinite(penalties[best]):
+            return None
         
-        return best_slot
+        scheduled_time = schedule_index.time_of(best)
+        return {
+            'post': candidate['post'],
+            'platform': candidate['platform'],
+            'content_type': candidate['content_type'],
+            'scheduled_time': scheduled_time,
+            'timing_score': float(candidate['timing_grid'][best]),
+            'penalty_score': float(penalties[best]),
+            'constraint_violations': self._check_constraint_violations(
+                candidate, scheduled_time, schedule_index
+            )
+        }
     
-    def _calculate_assignment_penalty(self, candidate, scheduled_time, existing_schedule, scheduled_times, max_concurrent):
-        """Calculate total penalty for assigning a post to a specific time slot."""
+    def _calculate_assignment_penalty(self, candidate, schedule_index, max_concurrent):
+        """Calculate total penalty for assigning a post to each slot of the schedule grid."""
         platform = candidate['platform']
         constraint = candidate.get('constraint')
-        penalty = 0.0
+        penalty = np.zeros(schedule_index.num_slots)
         
         # Collision penalty: check for posts at similar times
-        collision_penalty = self._calculate_collision_penalty(scheduled_time, existing_schedule)
-        penalty += collision_penalty
+        penalty += self._calculate_collision_penalty(schedule_index)
         
         # Spacing penalty: check minimum gaps
-        spacing_penalty = self._calculate_spacing_penalty(platform, scheduled_time, scheduled_times, constraint)
-        penalty += spacing_penalty
+        penalty += self._calculate_spacing_penalty(platform, schedule_index, constraint)
         
         # Concurrency penalty: check max concurrent posts
-        concurrency_penalty = self._calculate_concurrency_penalty(scheduled_time, existing_schedule, max_concurrent)
-        penalty += concurrency_penalty
+        penalty += self._calculate_concurrency_penalty(schedule_index, max_concurrent)
         
         # Negative timing score (we want high scores)
-        timing_score = candidate['day_scores'].get(scheduled_time.date(), {}).get(scheduled_time.hour, 0)
-        penalty -= timing_score  # Subtract because lower penalty is better
+        penalty -= candidate['timing_grid']  # Subtract because lower penalty is better
         
         return penalty
     
-    def _calculate_collision_penalty(self, scheduled_time, existing_schedule):
-        """Calculate penalty for posting near other scheduled posts."""
-        penalty = 0.0
-        for assignment in existing_schedule:
-            time_diff = abs((scheduled_time - assignment['scheduled_time']).total_seconds() / 3600)
-            if time_diff < 1:  # Within 1 hour
-                penalty += 10.0
-            elif time_diff < 2:  # Within 2 hours
-                penalty += 5.0
+    def _calculate_collision_penalty(self, schedule_index):
+        """Calculate penalty for posting near other scheduled posts.
         
-        return penalty
+        Posts in the same hour add 10, posts one hour away add 5.
+        """
+        return schedule_index.collision_penalties
     
-    def _calculate_spacing_penalty(self, platform, scheduled_time, scheduled_times, constraint):
+    def _calculate_spacing_penalty(self, platform, schedule_index, constraint):
         """Calculate penalty for violating minimum spacing requirements."""
-        if not constraint:
+        if not constraint or constraint.min_gap_hours <= 0:
             return 0.0
         
         min_gap = constraint.min_gap_hours
-        recent_times = scheduled_times.get(platform, [])
+        gaps = schedule_index.nearest_gap_hours(platform)
         
-        for recent_time in recent_times:
-            time_diff = (scheduled_time - recent_time).total_seconds() / 3600
-            if time_diff < min_gap:
-                # Penalty increases as we get closer to recent posts
-                gap_ratio = time_diff / min_gap
-                penalty = (1 - gap_ratio) * 5.0
-                return penalty
-        
-        return 0.0
+        # Penalty increases as we get closer to the nearest post on the platform
+        return np.where(gaps < min_gap, (1 - gaps / min_gap) * 5.0, 0.0)
     
-    def _calculate_concurrency_penalty(self, scheduled_time, existing_schedule, max_concurrent):
+    def _calculate_concurrency_penalty(self, schedule_index, max_concurrent):
         """Calculate penalty for exceeding concurrent post limits."""
-        concurrent_count = 0
-        for assignment in existing_schedule:
-            time_diff = abs((scheduled_time - assignment['scheduled_time']).total_seconds() / 900)  # 15 min window
-            if time_diff <= 0.25:  # Within 15 minutes
-                concurrent_count += 1
-        
-        if concurrent_count >= max_concurrent:
-            return (concurrent_count - max_concurrent + 1) * 20.0  # Heavy penalty for excess
-        
-        return 0.0
+        # Heavy penalty for each post in excess of the limit within the same hour
+        return schedule_index.concurrency_penalties(max_concurrent)
     
-    def _check_constraint_violations(self, candidate, scheduled_time, existing_schedule, scheduled_times):
+    def _check_constraint_violations(self, candidate, scheduled_time, schedule_index):
         """Check for constraint violations and return list of violations."""
         violations = []
         
@@ -791,15 +873,11 @@ class SchedulingOptimizer:
         if constraint:
             # Check spacing
             min_gap = constraint.min_gap_hours
-            recent_times = scheduled_times.get(platform, [])
-            for recent_time in recent_times:
-                time_diff = (scheduled_time - recent_time).total_seconds() / 3600
-                if time_diff < min_gap:
-                    violations.append(f"Violates minimum spacing: {time_diff:.1f}h < {min_gap}h")
+            for time_diff in schedule_index.platform_gaps(platform, scheduled_time, min_gap):
+                violations.append(f"Violates minimum spacing: {abs(time_diff):.1f}h < {min_gap}h")
             
             # Check concurrent limit
-            concurrent_count = sum(1 for assignment in existing_schedule 
-                                 if abs((scheduled_time - assignment['scheduled_time']).total_seconds() / 900) <= 0.25)
+            concurrent_count = schedule_index.concurrent_count(scheduled_time)
             if concurrent_count >= constraint.max_concurrent_posts:
                 violations.append(f"Exceeds concurrent limit: {concurrent_count} >= {constraint.max_concurrent_posts}")
         
@@ -1547,6 +1625,9 @@ class SchedulingOptimizer:
         smoothed_weight = 0.8 * current_weight + 0.2 * posterior_mean
         self._daypart_weights[platform][day_of_week][hour_of_day] = smoothed_weight
         
+        # New history changes the recency penalties for this platform
+        self._invalidate_timing_scores(platform)
+        
         # Store in database
         with sqlite3.connect(self.db_path) as conn:
             cursor = conn.cursor()
@@ -18,15 +18,19 @@ import logging
 import math
 import time
 import uuid
-from collections import defaultdict, deque
+from collections import OrderedDict, defaultdict, deque
 from dataclasses import dataclass, field
-from typing import Dict, List, Any, Optional, Tuple, Union, Set
+from typing import Dict, List, Any, Optional, Tuple, Union, Set, FrozenSet
 from datetime import datetime, timedelta
 import heapq
 from concurrent.futures import ThreadPoolExecutor
 import weakref
 import pickle
 import os
+import random
+import re
+
+from cache_backends import CacheBackend, RedisCacheBackend, SecondTierCache
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -146,16 +150,31 @@ class Batch:
         avg_duration = total_duration / len(self.requests)
         duration_variance = sum((req.duration - avg_duration) ** 2 for req in self.requests) / len(self.requests)
         
+        # Check style parameters similarity
+        style_params_list = [json.dumps(req.style_params, sort_keys=True) for req in self.requests]
+        unique_styles = len(set(style_params_list))
+        
+        return self._combine_similarity(
+            engine_consistency, resolution_consistency, content_consistency,
+            avg_duration, duration_variance, unique_styles, len(self.requests)
+        )
+    
+    @staticmethod
+    def _combine_similarity(engine_consistency: float,
+                            resolution_consistency: float,
+                            content_consistency: float,
+                            avg_duration: float,
+                            duration_variance: float,
+                            unique_styles: int,
+                            batch_size: int) -> float:
+        """Combine per-factor consistency measures into a similarity score"""
         # Lower variance = higher similarity (with minimum floor)
         if avg_duration > 0:
             duration_similarity = 1.0 / (1.0 + math.sqrt(duration_variance) / max(1, avg_duration))
         else:
             duration_similarity = 1.0
         
-        # Check style parameters similarity
-        style_params_list = [json.dumps(req.style_params, sort_keys=True) for req in self.requests]
-        unique_styles = len(set(style_params_list))
-        style_similarity = max(0.1, 1.0 - (unique_styles - 1) / max(1, len(self.requests)))
+        style_similarity = max(0.1, 1.0 - (unique_styles - 1) / max(1, batch_size))
         
         # Combine all factors with weights
         weights = {'engine': 0.3, 'resolution': 0.25, 'content': 0.25, 'duration': 0.1, 'style': 0.1}
@@ -206,10 +225,11 @@ class Batch:
         # Base cost is sum of individual requests
         base_cost = sum(req.estimated_cost for req in self.requests)
         
-        # Apply batching discounts based on batch size and similarity
-        batch_size = len(self.requests)
-        similarity = self.similarity_score
-        
+        return self._discounted_cost(base_cost, len(self.requests), self.similarity_score)
+    
+    @staticmethod
+    def _discounted_cost(base_cost: float, batch_size: int, similarity: float) -> float:
+        """Apply batching discounts to the summed cost of a batch"""
         # Volume discount - larger batches get better discounts
         # Changed to more conservative and reliable discounts
         if batch_size >= 20:
@@ -264,14 +284,260 @@ class Batch:
         
         return True
 
+class BatchAccumulator:
+    """Incrementally grows a batch while keeping running aggregates
+    
+    Batch.__post_init__ recomputes costs, duration variance and style
+    hashes over every request, so probing "what if this request joined"
+    with a temporary Batch is O(batch size). The accumulator keeps the
+    same quantities as running sums and answers those probes in O(1);
+    the final Batch is materialized once when the accumulator is built.
+    """
+    
+    def __init__(self,
+                 first_request: ContentRequest,
+                 max_size: int = 25,
+                 max_cost: float = 500.0,
+                 max_duration: float = 1800.0):
+        self.id = str(uuid.uuid4())
+        self.max_size = max_size
+        self.max_cost = max_cost
+        self.max_duration = max_duration
+        self.engine = first_request.engine
+        self.resolution = first_request.resolution
+        self.content_type = first_request.content_type
+        
+        self.requests: List[ContentRequest] = []
+        self.total_cost = 0.0
+        self.total_duration = 0.0
+        self.duration_sq_sum = 0.0
+        self.style_counts: Dict[str, int] = defaultdict(int)
+        self.engines: Set[str] = set()
+        self.resolutions: Set[str] = set()
+        self.content_types: Set[str] = set()
+        
+        self.add(first_request)
+    
+    def __len__(self) -> int:
+        return len(self.requests)
+    
+    @staticmethod
+    def _style_key(request: ContentRequest) -> str:
+        return json.dumps(request.style_params, sort_keys=True)
+    
+    def add(self, request: ContentRequest):
+        """Add request and update running aggregates"""
+        self.requests.append(request)
+        self.total_cost += request.estimated_cost
+        self.total_duration += request.duration
+        self.duration_sq_sum += request.duration ** 2
+        self.style_counts[self._style_key(request)] += 1
+        self.engines.add(request.engine)
+        self.resolutions.add(request.resolution)
+        self.content_types.add(request.content_type)
+    
+    def can_add(self, request: ContentRequest) -> bool:
+        """Check if request can be added (same rules as Batch.can_add)"""
+        if (request.engine != self.engine or
+                request.resolution != self.resolution or
+                request.content_type != self.content_type):
+            return False
+        
+        if len(self.requests) >= self.max_size:
+            return False
+        
+        if self.total_cost + request.estimated_cost > self.max_cost:
+            return False
+        
+        if self.total_duration + request.duration > self.max_duration:
+            return False
+        
+        return True
+    
+    def similarity_with(self, request: ContentRequest) -> float:
+        """Similarity score the batch would have after adding request"""
+        size = len(self.requests) + 1
+        engine_count = len(self.engines) + (request.engine not in self.engines)
+        resolution_count = len(self.resolutions) + (request.resolution not in self.resolutions)
+        content_count = len(self.content_types) + (request.content_type not in self.content_types)
+        
+        avg_duration = (self.total_duration + request.duration) / size
+        mean_sq = (self.duration_sq_sum + request.duration ** 2) / size
+        duration_variance = max(0.0, mean_sq - avg_duration ** 2)
+        
+        unique_styles = len(self.style_counts) + (self._style_key(request) not in self.style_counts)
+        
+        return Batch._combine_similarity(
+            1.0 if engine_count == 1 else 0.2,
+            1.0 if resolution_count == 1 else 0.3,
+            1.0 if content_count == 1 else 0.1,
+            avg_duration, duration_variance, unique_styles, size
+        )
+    
+    def optimized_cost_with(self, request: ContentRequest) -> float:
+        """Optimized cost the batch would have after adding request"""
+        # Batch.__post_init__ prices the batch before scoring its similarity,
+        # so no similarity bonus is applied here either.
+        return Batch._discounted_cost(
+            self.total_cost + request.estimated_cost, len(self.requests) + 1, 0.0
+        )
+    
+    def build(self) -> Batch:
+        """Materialize the accumulated requests as a Batch"""
+        return Batch(
+            id=self.id,
+            requests=list(self.requests),
+            max_size=self.max_size,
+            max_cost=self.max_cost,
+            max_duration=self.max_duration,
+            engine=self.engine,
+            resolution=self.resolution
+        )
+
+class NearDuplicateIndex:
+    """MinHash/LSH index for finding cached requests similar to a new one
+    
+    Each request is reduced to a token set (prompt words plus style
+    parameters) and a MinHash signature. Signatures are split into bands
+    that are hashed into buckets, so a query is only compared against
+    entries sharing at least one band rather than every cached request.
+    Candidates are ranked by exact Jaccard similarity of their token sets.
+    """
+    
+    _PRIME = (1 << 61) - 1
+    _STOPWORDS = frozenset({
+        'a', 'an', 'the', 'and', 'or', 'of', 'to', 'in', 'on', 'for',
+        'with', 'at', 'by', 'from', 'is', 'are', 'this', 'that'
+    })
+    
+    def __init__(self, num_perm: int = 64, bands: int = 16, max_entries: int = 10000, seed: int = 1):
+        if num_perm % bands != 0:
+            raise ValueError("num_perm must be divisible by bands")
+        
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.max_entries = max_entries
+        
+        rng = random.Random(seed)
+        self._permutations = [
+            (rng.randrange(1, self._PRIME), rng.randrange(0, self._PRIME))
+            for _ in range(num_perm)
+        ]
+        
+        # key -> (partition, tokens, signature)
+        self.entries: OrderedDict = OrderedDict()
+        self.buckets: Dict[Tuple, Set[str]] = defaultdict(set)
+    
+    def __len__(self) -> int:
+        return len(self.entries)
+    
+    @classmethod
+    def tokenize(cls, request: ContentRequest) -> FrozenSet[str]:
+        """Reduce a request to the token set used for similarity"""
+        words = re.findall(r"[a-z0-9]+", request.prompt.lower())
+        tokens = {word for word in words if word not in cls._STOPWORDS}
+        tokens.update(
+            f"style:{name}={json.dumps(value, sort_keys=True, default=str)}"
+            for name, value in request.style_params.items()
+        )
+        return frozenset(tokens)
+    
+    @staticmethod
+    def _partition(request: ContentRequest) -> str:
+        # Only content of the same type and engine can be reused
+        return f"{request.content_type}:{request.engine}"
+    
+    def _signature(self, tokens: FrozenSet[str]) -> Tuple[int, ...]:
+        hashes = [
+            int.from_bytes(hashlib.blake2b(token.encode('utf-8'), digest_size=8).digest(), 'little')
+            for token in tokens
+        ]
+        prime = self._PRIME
+        return tuple(
+            min((a * h + b) % prime for h in hashes)
+            for a, b in self._permutations
+        )
+    
+    def _band_keys(self, partition: str, signature: Tuple[int, ...]) -> List[Tuple]:
+        return [
+            (partition, band, signature[band * self.rows:(band + 1) * self.rows])
+            for band in range(self.bands)
+        ]
+    
+    def add(self, key: str, request: ContentRequest):
+        """Index request under key, replacing any previous entry"""
+        self.remove(key)
+        
+        tokens = self.tokenize(request)
+        if not tokens:
+            return
+        
+        partition = self._partition(request)
+        signature = self._signature(tokens)
+        self.entries[key] = (partition, tokens, signature)
+        for band_key in self._band_keys(partition, signature):
+            self.buckets[band_key].add(key)
+        
+        while len(self.entries) > self.max_entries:
+            self.remove(next(iter(self.entries)))
+    
+    def remove(self, key: str) -> bool:
+        """Drop key from the index, returning whether it was present"""
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return False
+        
+        partition, _, signature = entry
+        for band_key in self._band_keys(partition, signature):
+            bucket = self.buckets.get(band_key)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self.buckets[band_key]
+        return True
+    
+    def query(self, request: ContentRequest, threshold: float = 0.8, limit: int = 5) -> List[Tuple[str, float]]:
+        """Find indexed keys whose similarity to request is at least threshold"""
+        tokens = self.tokenize(request)
+        if not tokens:
+            return []
+        
+        partition = self._partition(request)
+        candidates: Set[str] = set()
+        for band_key in self._band_keys(partition, self._signature(tokens)):
+            candidates.update(self.buckets.get(band_key, ()))
+        
+        matches = []
+        for key in candidates:
+            candidate_tokens = self.entries[key][1]
+            similarity = len(tokens & candidate_tokens) / len(tokens | candidate_tokens)
+            if similarity >= threshold:
+                matches.append((key, similarity))
+        
+        matches.sort(key=lambda match: match[1], reverse=True)
+        return matches[:limit]
+
 class CacheManager:
     """Multi-layer cache for content reuse"""
     
-    def __init__(self, memory_size: int = 1000, redis_config: Optional[Dict] = None):
-        self.memory_cache = LRUCache(memory_size)
+    def __init__(self, memory_size: int = 1000, redis_config: Optional[Dict] = None,
+                 memory_max_bytes: Optional[int] = None,
+                 l2_backend: Optional[CacheBackend] = None,
+                 near_duplicate_index_size: int = 10000):
+        self.memory_cache = LRUCache(memory_size, max_bytes=memory_max_bytes)
+        self.near_duplicate_index = NearDuplicateIndex(max_entries=near_duplicate_index_size)
         self.redis_config = redis_config
         self.local_cache_enabled = True
-        self.redis_cache_enabled = redis_config is not None
+        
+        if l2_backend is None and redis_config is not None:
+            try:
+                l2_backend = RedisCacheBackend(**redis_config)
+            except ImportError:
+                logger.warning("Redis not available, using memory cache only")
+        
+        self.l2_cache = SecondTierCache(l2_backend) if l2_backend is not None else None
+        self.redis_cache_enabled = isinstance(l2_backend, RedisCacheBackend)
         
     def get_cache_key(self, request: ContentRequest) -> str:
         """Generate cache key for request"""
@@ -279,8 +545,9 @@ class CacheManager:
     
     def get(self, request: ContentRequest) -> Optional[Dict[str, Any]]:
         """Get cached content if available"""
-        cache_key = self.get_cache_key(request)
-        
+        return self._get_by_key(self.get_cache_key(request))
+    
+    def _get_by_key(self, cache_key: str) -> Optional[Dict[str, Any]]:
         # Try memory cache first
         if self.local_cache_enabled:
             cached = self.memory_cache.get(cache_key)
@@ -288,10 +555,16 @@ class CacheManager:
                 logger.debug(f"Memory cache hit: {cache_key}")
                 return cached
         
-        # Try Redis cache if available
-        if self.redis_cache_enabled:
-            # Redis implementation would go here
-            pass
+        # Read through to the second tier and promote hits into memory
+        if self.l2_cache is not None:
+            entry = self.l2_cache.get_with_ttl(cache_key)
+            if entry is not None:
+                cached, remaining_ttl = entry
+                logger.debug(f"{self.l2_cache.name} cache hit: {cache_key}")
+                # An entry on the verge of expiring is served but not promoted
+                if self.local_cache_enabled and (remaining_ttl is None or remaining_ttl > 0):
+                    self.memory_cache.set(cache_key, cached, remaining_ttl)
+                return cached
         
         return None
     
@@ -303,71 +576,213 @@ class CacheManager:
         if self.local_cache_enabled:
             self.memory_cache.set(cache_key, content, ttl)
         
-        # Store in Redis cache if available
-        if self.redis_cache_enabled:
-            # Redis implementation would go here
-            pass
+        self.near_duplicate_index.add(cache_key, request)
+        
+        # Store in the second tier (buffered, written behind)
+        if self.l2_cache is not None:
+            self.l2_cache.set(cache_key, content, ttl)
+    
+    def flush(self):
+        """Flush buffered second-tier writes"""
+        if self.l2_cache is not None:
+            self.l2_cache.flush()
+    
+    def close(self):
+        """Flush and close the second tier"""
+        if self.l2_cache is not None:
+            self.l2_cache.close()
     
     def is_near_duplicate(self, request: ContentRequest, threshold: float = 0.8) -> bool:
         """Check if request is near-duplicate of cached content"""
-        # Simplified implementation - would use perceptual hashing in production
-        cache_key = self.get_cache_key(request)
-        return self.memory_cache.get(cache_key) is not None
+        if self.get(request) is not None:
+            return True
+        return self.find_similar(request, threshold) is not None
+    
+    def find_similar(self, request: ContentRequest, threshold: float = 0.8) -> Optional[Tuple[Dict[str, Any], float]]:
+        """Find cached content for the most similar indexed request
+        
+        Returns (content, similarity) for the best match at or above
+        threshold, or None. Index entries whose content has since been
+        evicted from every cache layer are dropped.
+        """
+        match = self.find_similar_entry(request, threshold)
+        if match is None:
+            return None
+        _, cached, similarity = match
+        return cached, similarity
+    
+    def find_similar_entry(self, request: ContentRequest,
+                           threshold: float = 0.8) -> Optional[Tuple[str, Dict[str, Any], float]]:
+        """Like find_similar, but also return the matched entry's cache key
+        
+        Returns (cache_key, content, similarity) or None.
+        """
+        for cache_key, similarity in self.near_duplicate_index.query(request, threshold):
+            cached = self._get_by_key(cache_key)
+            if cached is not None:
+                return cache_key, cached, similarity
+            self.near_duplicate_index.remove(cache_key)
+        return None
+    
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get per-layer cache statistics"""
+        stats = {'memory': self.memory_cache.get_stats()}
+        if self.l2_cache is not None:
+            stats['l2'] = self.l2_cache.get_stats()
+        return stats
 
 class LRUCache:
-    """Least Recently Used cache implementation"""
+    """Least Recently Used cache with TTL expiry and optional byte bound
     
-    def __init__(self, max_size: int = 1000):
+    Recency is tracked with an OrderedDict so hits, updates and evictions
+    are O(1). Expiry deadlines are kept in a min-heap, so cleanup only
+    touches entries that have actually expired; reads also drop expired
+    entries lazily.
+    """
+    
+    def __init__(self, max_size: int = 1000, max_bytes: Optional[int] = None):
         self.max_size = max_size
-        self.cache = {}
-        self.access_order = deque()
+        self.max_bytes = max_bytes
+        self.cache: OrderedDict = OrderedDict()
+        self.expiry_heap: List[Tuple[float, str]] = []  # (expires_at, key)
+        self.current_bytes = 0
         self.lock = asyncio.Lock()
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'expirations': 0
+        }
+    
+    def __len__(self) -> int:
+        return len(self.cache)
     
     def get(self, key: str) -> Optional[Any]:
-        if key in self.cache:
-            # Move to end (most recently used)
-            self.access_order.remove(key)
-            self.access_order.append(key)
-            return self.cache[key]['value']  # Return the actual value, not the metadata
-        return None
+        entry = self.cache.get(key)
+        if entry is None:
+            self.stats['misses'] += 1
+            return None
+        
+        if entry['expires_at'] <= time.time():
+            # Lazy expiry on read
+            self._remove(key)
+            self.stats['expirations'] += 1
+            self.stats['misses'] += 1
+            return None
+        
+        # Move to end (most recently used)
+        self.cache.move_to_end(key)
+        self.stats['hits'] += 1
+        return entry['value']  # Return the actual value, not the metadata
     
-    def set(self, key: str, value: Any, ttl: int = 3600):
+    def set(self, key: str, value: Any, ttl: Optional[float] = 3600):
+        """Cache a value for ``ttl`` seconds; a ttl of None never expires"""
+        if ttl is not None and ttl <= 0:
+            raise ValueError(f"ttl must be positive, or None for no expiry (got {ttl})")
+        
+        size = self._estimate_size(value) if self.max_bytes is not None else 0
+        if self.max_bytes is not None and size > self.max_bytes:
+            logger.debug(f"Value for {key} ({size} bytes) exceeds cache byte bound, not cached")
+            self.delete(key)
+            return
+        
+        now = time.time()
+        expires_at = now + ttl if ttl is not None else float('inf')
+        
         if key in self.cache:
             # Update existing
-            self.cache[key] = {
-                'value': value,
-                'timestamp': time.time(),
-                'ttl': ttl
-            }
-            self.access_order.remove(key)
-            self.access_order.append(key)
-        else:
-            # Add new item
-            if len(self.cache) >= self.max_size:
-                # Remove least recently used
-                oldest_key = self.access_order.popleft()
-                del self.cache[oldest_key]
-            
-            self.cache[key] = {
-                'value': value,
-                'timestamp': time.time(),
-                'ttl': ttl
-            }
-            self.access_order.append(key)
+            self.current_bytes -= self.cache[key]['size']
+            self.cache.move_to_end(key)
+        
+        self.cache[key] = {
+            'value': value,
+            'timestamp': now,
+            'ttl': ttl,
+            'expires_at': expires_at,
+            'size': size
+        }
+        self.current_bytes += size
+        
+        if expires_at != float('inf'):
+            heapq.heappush(self.expiry_heap, (expires_at, key))
+            # Overwritten keys leave stale heap entries behind; rebuild
+            # the heap once they dominate it.
+            if len(self.expiry_heap) > 2 * len(self.cache) + 64:
+                self._rebuild_expiry_heap()
+        
+        self._enforce_bounds()
+    
+    def delete(self, key: str) -> bool:
+        """Remove key from the cache, returning whether it was present"""
+        if key not in self.cache:
+            return False
+        self._remove(key)
+        return True
     
-    def cleanup_expired(self):
+    def cleanup_expired(self) -> int:
         """Remove expired cache entries"""
         current_time = time.time()
-        expired_keys = []
-        
-        for key, data in self.cache.items():
-            if current_time - data['timestamp'] > data['ttl']:
-                expired_keys.append(key)
-        
-        for key in expired_keys:
-            del self.cache[key]
-            if key in self.access_order:
-                self.access_order.remove(key)
+        removed = 0
+        
+        while self.expiry_heap and self.expiry_heap[0][0] <= current_time:
+            expires_at, key = heapq.heappop(self.expiry_heap)
+            entry = self.cache.get(key)
+            # Skip heap entries left behind by overwrites and deletes
+            if entry is not None and entry['expires_at'] == expires_at:
+                self._remove(key)
+                self.stats['expirations'] += 1
+                removed += 1
+        
+        return removed
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss/eviction counters and current occupancy"""
+        lookups = self.stats['hits'] + self.stats['misses']
+        return {
+            **self.stats,
+            'hit_ratio': self.stats['hits'] / lookups if lookups else 0.0,
+            'size': len(self.cache),
+            'max_size': self.max_size,
+            'bytes': self.current_bytes,
+            'max_bytes': self.max_bytes
+        }
+    
+    def _remove(self, key: str):
+        entry = self.cache.pop(key)
+        self.current_bytes -= entry['size']
+    
+    def _enforce_bounds(self):
+        """Evict until both the entry count and byte bound are respected"""
+        if self._over_bounds():
+            # Prefer dropping already-expired entries over live ones
+            self.cleanup_expired()
+        
+        while self.cache and self._over_bounds():
+            # Remove least recently used
+            oldest_key, entry = self.cache.popitem(last=False)
+            self.current_bytes -= entry['size']
+            self.stats['evictions'] += 1
+    
+    def _over_bounds(self) -> bool:
+        if len(self.cache) > self.max_size:
+            return True
+        return self.max_bytes is not None and self.current_bytes > self.max_bytes
+    
+    def _rebuild_expiry_heap(self):
+        self.expiry_heap = [
+            (entry['expires_at'], key)
+            for key, entry in self.cache.items()
+            if entry['expires_at'] != float('inf')
+        ]
+        heapq.heapify(self.expiry_heap)
+    
+    @staticmethod
+    def _estimate_size(value: Any) -> int:
+        """Approximate serialized size of a cached value in bytes"""
+        try:
+            return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        except Exception:
+            return len(repr(value).encode('utf-8'))
 
 class SmartBatcher:
     """Smart batching system with cost optimization"""
@@ -395,6 +810,7 @@ class SmartBatcher:
             'total_requests': 0,
             'batched_requests': 0,
             'cached_requests': 0,
+            'near_duplicate_hits': 0,
             'total_cost_saved': 0.0,
             'average_batch_size': 0.0,
             'cache_hit_ratio': 0.0
@@ -405,7 +821,9 @@ class SmartBatcher:
             'batch_pacing_interval': 0.5,  # seconds between batch submissions
             'dynamic_sizing': True,
             'cost_optimization': True,
-            'similarity_focus': True
+            'similarity_focus': True,
+            'near_duplicate_reuse': True,
+            'near_duplicate_threshold': 0.8
         }
     
     async def add_request(self, request: ContentRequest) -> str:
@@ -419,6 +837,21 @@ class SmartBatcher:
             logger.info(f"Cache hit for request {request.id}")
             return f"cached:{request.id}"
         
+        # Reuse content generated for a paraphrase of this request
+        if self.config['near_duplicate_reuse']:
+            match = self.cache_manager.find_similar_entry(request, self.config['near_duplicate_threshold'])
+            if match:
+                matched_key, content, similarity = match
+                # Alias the reused content under this request's own key so
+                # cache_manager.get(request) returns it like any other hit
+                self.cache_manager.set(request, content)
+                self.metrics['cached_requests'] += 1
+                self.metrics['near_duplicate_hits'] += 1
+                request.metadata['near_duplicate_of'] = matched_key
+                request.metadata['near_duplicate_similarity'] = similarity
+                logger.info(f"Near-duplicate cache hit for request {request.id} (similarity {similarity:.2f})")
+                return f"cached:{request.id}"
+        
         # Add to priority queue
         priority_score = request.priority * 100 + request.estimated_cost
         heapq.heappush(self.pending_requests, (priority_score, request))
@@ -495,73 +928,48 @@ class SmartBatcher:
         for request in requests:
             if current_batch is None:
                 # Start new batch
-                current_batch = Batch(
-                    id=str(uuid.uuid4()),
-                    requests=[request],
-                    max_size=self.max_batch_size,
-                    max_cost=self.max_batch_cost,
-                    max_duration=self.max_batch_duration,
-                    engine=request.engine,
-                    resolution=request.resolution
-                )
+                current_batch = self._new_accumulator(request)
             elif current_batch.can_add(request):
                 # Check if adding this request would significantly improve batching efficiency
-                temp_batch = Batch(
-                    id=current_batch.id,
-                    requests=current_batch.requests + [request],
-                    max_size=current_batch.max_size,
-                    max_cost=current_batch.max_cost,
-                    max_duration=current_batch.max_duration,
-                    engine=current_batch.engine,
-                    resolution=current_batch.resolution
-                )
-                
                 # More lenient similarity checking
                 should_add = False
                 
                 # If batch is small (< 5), be more lenient with similarity
-                if len(current_batch.requests) < 5:
+                if len(current_batch) < 5:
                     should_add = True
                 # If similarity is still acceptable after adding
-                elif temp_batch.similarity_score >= (self.similarity_threshold - 0.2):
+                elif current_batch.similarity_with(request) >= (self.similarity_threshold - 0.2):
                     should_add = True
                 # If the request helps fill the batch to a reasonable size
-                elif len(current_batch.requests) < 8 and temp_batch.estimated_optimized_cost < current_batch.max_cost * 0.8:
+                elif len(current_batch) < 8 and current_batch.optimized_cost_with(request) < current_batch.max_cost * 0.8:
                     should_add = True
                 
                 if should_add:
-                    current_batch = temp_batch
+                    current_batch.add(request)
                 else:
                     # Finalize current batch and start new one
-                    batches.append(current_batch)
-                    current_batch = Batch(
-                        id=str(uuid.uuid4()),
-                        requests=[request],
-                        max_size=self.max_batch_size,
-                        max_cost=self.max_batch_cost,
-                        max_duration=self.max_batch_duration,
-                        engine=request.engine,
-                        resolution=request.resolution
-                    )
+                    batches.append(current_batch.build())
+                    current_batch = self._new_accumulator(request)
             else:
                 # Current batch is full, start new one
-                batches.append(current_batch)
-                current_batch = Batch(
-                    id=str(uuid.uuid4()),
-                    requests=[request],
-                    max_size=self.max_batch_size,
-                    max_cost=self.max_batch_cost,
-                    max_duration=self.max_batch_duration,
-                    engine=request.engine,
-                    resolution=request.resolution
-                )
+                batches.append(current_batch.build())
+                current_batch = self._new_accumulator(request)
         
         # Add final batch
         if current_batch:
-            batches.append(current_batch)
+            batches.append(current_batch.build())
         
         return batches
     
+    def _new_accumulator(self, request: ContentRequest) -> BatchAccumulator:
+        """Start a new incremental batch seeded with request"""
+        return BatchAccumulator(
+            request,
+            max_size=self.max_batch_size,
+            max_cost=self.max_batch_cost,
+            max_duration=self.max_batch_duration
+        )
+    
     async def process_batch(self, batch: Batch) -> Dict[str, Any]:
         """Process a batch of requests"""
         logger.info(f"Processing batch {batch.id} with {len(batch.requests)} requests")
@@ -751,7 +1159,8 @@ class SmartBatcher:
             'total_individual_cost': total_individual_cost,
             'total_optimized_cost': total_optimized_cost,
             'active_batches': len(self.active_batches),
-            'queue_size': len(self.pending_requests)
+            'queue_size': len(self.pending_requests),
+            'cache_stats': self.cache_manager.get_stats()
         }
     
     def optimize_configuration(self, recent_metrics: Dict[str, Any]):
@@ -14,6 +14,8 @@ import json
 import tempfile
 import sqlite3
 import os
+import threading
+import time
 import pytest
 from datetime import datetime, timezone
 from typing import Dict, List, Any
@@ -22,7 +24,7 @@ from unittest.mock import Mock, AsyncMock, patch
 # Import the batch processor components
 from batch_processor import (
     BatchProcessor, BulkJob, VideoJob, JobEvent, JobStatus, JobPriority,
-    PipelineState, RateLimiter, QueueManager
+    PipelineState, RateLimiter, QueueManager, BulkJobProgress
 )
 from idea_data_service import SheetFormat, ValidationLevel
 from data_validation import ValidationResult
@@ -122,6 +124,74 @@ class TestQueueManager:
         # Should get low last
         third_job = queue_manager.get_next_job()
         assert third_job.priority == JobPriority.LOW
+    
+    def test_blocked_worker_wakes_on_add(self):
+        """Test that a waiting consumer is woken as soon as a job is added."""
+        queue_manager = QueueManager(max_workers=1)
+        job = VideoJob(
+            id="wake_1", bulk_job_id="bulk_1",
+            idea_data={}, status=JobStatus.QUEUED,
+            priority=JobPriority.NORMAL, ai_provider="test"
+        )
+        
+        received = []
+        consumer = threading.Thread(
+            target=lambda: received.append(queue_manager.get_next_job(timeout=5.0))
+        )
+        consumer.start()
+        time.sleep(0.05)
+        
+        added_at = time.monotonic()
+        queue_manager.add_job(job)
+        consumer.join(timeout=5.0)
+        
+        assert received == [job]
+        assert time.monotonic() - added_at < 0.5
+        assert queue_manager.get_next_job() is None
+    
+    def test_aging_prevents_low_priority_starvation(self):
+        """Test that long-waiting low priority jobs overtake new urgent jobs."""
+        queue_manager = QueueManager(max_workers=1, aging_interval=0.01)
+        
+        low_job = VideoJob(
+            id="low_1", bulk_job_id="bulk_1",
+            idea_data={}, status=JobStatus.QUEUED,
+            priority=JobPriority.LOW, ai_provider="test"
+        )
+        urgent_job = VideoJob(
+            id="urgent_1", bulk_job_id="bulk_1",
+            idea_data={}, status=JobStatus.QUEUED,
+            priority=JobPriority.URGENT, ai_provider="test"
+        )
+        
+        queue_manager.add_job(low_job)
+        # LOW is 9 levels behind URGENT; waiting well over 9 aging intervals
+        time.sleep(0.2)
+        queue_manager.add_job(urgent_job)
+        
+        assert queue_manager.get_next_job().id == "low_1"
+        assert queue_manager.get_next_job().id == "urgent_1"
+    
+    def test_wait_time_histograms(self):
+        """Test per-priority queue wait-time histograms."""
+        queue_manager = QueueManager(max_workers=1)
+        for i in range(3):
+            queue_manager.add_job(VideoJob(
+                id=f"hist_{i}", bulk_job_id="bulk_1",
+                idea_data={}, status=JobStatus.QUEUED,
+                priority=JobPriority.URGENT, ai_provider="test"
+            ))
+        
+        assert queue_manager.get_queue_stats()["depth"]["URGENT"] == 3
+        while queue_manager.get_next_job():
+            pass
+        
+        stats = queue_manager.get_queue_stats()
+        histogram = stats["wait_time_histograms"]["URGENT"]
+        assert stats["depth"]["URGENT"] == 0
+        assert histogram["count"] == 3
+        assert sum(histogram["buckets"].values()) == 3
+        assert stats["wait_time_histograms"]["LOW"]["count"] == 0
 
 
 class TestBatchProcessor:
@@ -203,6 +273,97 @@ class TestBatchProcessor:
         assert "video_jobs" in status
         assert "rate_limiter" in status
     
+    def test_job_creation_pipeline(self, processor):
+        """Test staged job creation: parallel validation, dedupe and early enqueue."""
+        validated = []
+        
+        def slow_validate(idea):
+            time.sleep(0.01)
+            validated.append(idea["title"])
+            return ValidationResult(
+                is_valid=idea["title"] != "Invalid",
+                errors=[],
+                warnings=[],
+                cleaned_data=idea,
+                quality_score=0.8,
+                estimated_cost=0.50,
+                duplicate_score=0.0
+            )
+        
+        processor.validator = Mock()
+        processor.validator.validate_idea = slow_validate
+        processor.pipeline_queue_size = 4
+        
+        ideas = [{"title": f"Idea {i}"} for i in range(40)]
+        ideas += [{"title": "Idea 0"}, {"title": "Invalid"}]
+        
+        bulk_job_id = processor.create_bulk_job("pipeline_sheet", "test_user")
+        bulk_job = processor.bulk_jobs[bulk_job_id]
+        tracker = processor.progress_trackers[bulk_job_id] = BulkJobProgress(bulk_job_id)
+        
+        enqueued_after = []
+        add_job = processor.queue_manager.add_job
+        
+        def record_add_job(job, priority=None):
+            enqueued_after.append(len(validated))
+            add_job(job, priority)
+        
+        processor.queue_manager.add_job = record_add_job
+        
+        stats = asyncio.run(processor._create_video_jobs(
+            bulk_job, ideas, ValidationLevel.STRICT, "test_provider", tracker
+        ))
+        
+        assert len(bulk_job.video_jobs) == 40
+        assert tracker.total == 40
+        assert stats["duplicates"] == 1 and stats["invalid"] == 1
+        assert stats["time_to_first_job"] is not None
+        # The first job was queued long before the last idea was validated
+        assert enqueued_after[0] < len(ideas) // 2
+        assert processor.queue_manager.job_queue.qsize() == 40
+    
+    def test_job_creation_pipeline_skips_failing_ideas(self, processor):
+        """Test that an idea failing in dedupe or persist does not stop the others."""
+        processor.validator = Mock()
+        processor.validator.validate_idea = lambda idea: ValidationResult(
+            is_valid=True,
+            errors=[],
+            warnings=[],
+            cleaned_data=idea,
+            quality_score=0.8,
+            estimated_cost=0.50,
+            duplicate_score=0.0
+        )
+        
+        # The second idea cannot be serialised for its idempotency key
+        ideas = [{"title": "Idea 0"}, {"title": "Idea 1", "when": object()}]
+        ideas += [{"title": f"Idea {i}"} for i in range(2, 6)]
+        
+        bulk_job_id = processor.create_bulk_job("failing_sheet", "test_user")
+        bulk_job = processor.bulk_jobs[bulk_job_id]
+        tracker = processor.progress_trackers[bulk_job_id] = BulkJobProgress(bulk_job_id)
+        
+        # Saving the event for the fourth idea fails outright
+        save_job_event = processor._save_job_event
+        
+        def flaky_save_job_event(event):
+            if "Idea 3" in event.message:
+                raise sqlite3.OperationalError("database is locked")
+            save_job_event(event)
+        
+        processor._save_job_event = flaky_save_job_event
+        
+        stats = asyncio.run(processor._create_video_jobs(
+            bulk_job, ideas, ValidationLevel.STRICT, "test_provider", tracker
+        ))
+        
+        assert stats["failed"] == 2
+        assert [job.idea_data["title"] for job in bulk_job.video_jobs] == [
+            "Idea 0", "Idea 2", "Idea 4", "Idea 5"
+        ]
+        assert tracker.total == 4
+        assert processor.queue_manager.job_queue.qsize() == 4
+    
     @pytest.mark.asyncio
     async def test_video_job_lifecycle(self, processor):
         """Test complete video job lifecycle."""
@@ -441,12 +602,105 @@ class TestIntegration:
         
         processor._save_video_job(video_job)
         
+        # Video job rows are buffered until the next flush
+        processor.job_store.flush()
+        
         # Verify in database
         with sqlite3.connect(temp_db) as conn:
             cursor = conn.execute("SELECT * FROM video_jobs WHERE id = ?", ("test_video",))
             row = cursor.fetchone()
             assert row is not None
             assert row[1] == "test_bulk"  # bulk_job_id
+        
+        processor.job_store.close()
+    
+    def test_batched_persistence(self, tmp_path):
+        """Test that job and event rows are written in bulk transactions."""
+        temp_db = str(tmp_path / "batched.db")
+        processor = BatchProcessor("dummy_creds.json", temp_db)
+        store = processor.job_store
+        # Keep everything buffered until the bulk job is saved
+        store.max_pending = 20000
+        store.flush_interval = 60.0
+        
+        bulk_job = BulkJob(
+            id="bulk_batched",
+            sheet_id="test_sheet",
+            status=PipelineState.RUNNING
+        )
+        
+        for i in range(5000):
+            video_job = VideoJob(
+                id=f"video_{i}",
+                bulk_job_id=bulk_job.id,
+                idea_data={"title": f"Idea {i}"},
+                status=JobStatus.QUEUED,
+                priority=JobPriority.NORMAL,
+                ai_provider="test"
+            )
+            processor._save_video_job(video_job)
+            processor._save_job_event(JobEvent(
+                id=f"event_{i}",
+                job_id=video_job.id,
+                event_type="created",
+                message="Video job created"
+            ))
+        
+        # Later states of the same job replace the buffered row
+        video_job.status = JobStatus.COMPLETED
+        processor._save_video_job(video_job)
+        
+        # Saving the bulk job commits everything buffered in the same transaction
+        processor._save_bulk_job(bulk_job)
+        stats = store.get_stats()
+        assert stats["transactions"] == 1
+        assert stats["video_jobs_written"] == 5000
+        assert stats["events_written"] == 5000
+        assert stats["coalesced_writes"] == 1
+        assert stats["pending_video_jobs"] == 0 and stats["pending_events"] == 0
+        
+        with sqlite3.connect(temp_db) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM video_jobs").fetchone()[0] == 5000
+            assert conn.execute(
+                "SELECT status FROM video_jobs WHERE id = ?", ("video_4999",)
+            ).fetchone()[0] == "completed"
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            indexes = {row[1] for row in conn.execute("SELECT type, name FROM sqlite_master WHERE type = 'index'")}
+            assert "idx_video_jobs_bulk_job_id" in indexes
+            assert "idx_job_events_job_id" in indexes
+        
+        store.close()
+    
+    def test_batched_events_keep_their_own_timestamps(self, tmp_path):
+        """Test that events flushed together keep their creation times and order."""
+        temp_db = str(tmp_path / "events.db")
+        processor = BatchProcessor("dummy_creds.json", temp_db)
+        store = processor.job_store
+        store.max_pending = 1000
+        store.flush_interval = 60.0
+        
+        created = [
+            datetime(2025, 1, 1, 12, 0, 0, tzinfo=timezone.utc),
+            datetime(2025, 1, 1, 12, 0, 5, tzinfo=timezone.utc),
+            # Same instant as the previous event: insertion order breaks the tie
+            datetime(2025, 1, 1, 12, 0, 5, tzinfo=timezone.utc),
+        ]
+        for i, created_at in enumerate(created):
+            processor._save_job_event(JobEvent(
+                id=f"event_{i}",
+                job_id="video_1",
+                event_type="status_changed",
+                message=f"step {i}",
+                created_at=created_at
+            ))
+        
+        rows = store.fetch_job_events(["video_1"])
+        assert store.get_stats()["transactions"] == 1
+        assert [row[0] for row in rows] == ["event_2", "event_1", "event_0"]
+        assert rows[2][5] == "2025-01-01 12:00:00.000000"
+        assert rows[1][5] == "2025-01-01 12:00:05.000000"
+        
+        store.close()
 
 
 class TestProgressTracking:
@@ -513,6 +767,79 @@ class TestProgressTracking:
         # Verify callback was called
         assert len(callback_invocations) == 1
         assert callback_invocations[0] == ("test_job", result)
+    
+    def _start_tracked_bulk_job(self, processor, job_count):
+        """Register a running bulk job with progress tracking, as process_sheet_ideas does."""
+        bulk_job_id = processor.create_bulk_job(f"sheet_{job_count}", "test_user")
+        bulk_job = processor.bulk_jobs[bulk_job_id]
+        bulk_job.status = PipelineState.RUNNING
+        tracker = processor.progress_trackers[bulk_job_id] = BulkJobProgress(bulk_job_id)
+        
+        for i in range(job_count):
+            video_job = VideoJob(
+                id=f"{bulk_job_id}_{i}", bulk_job_id=bulk_job_id,
+                idea_data={}, status=JobStatus.QUEUED,
+                priority=JobPriority.NORMAL, ai_provider="test"
+            )
+            bulk_job.video_jobs.append(video_job)
+            tracker.add_job(video_job)
+        
+        processor._on_bulk_progress(bulk_job, tracker.seal())
+        return bulk_job
+    
+    def test_push_based_bulk_progress(self, tracking_processor):
+        """Test that job transitions push progress and resolve the completion future."""
+        processor = tracking_processor
+        bulk_job = self._start_tracked_bulk_job(processor, 4)
+        
+        progress_updates = []
+        processor.add_progress_callback(lambda job_id, progress, message: progress_updates.append(progress))
+        
+        async def scenario():
+            waiter = asyncio.ensure_future(processor.wait_for_bulk_job(bulk_job.id, timeout=5.0))
+            
+            streamed = []
+            
+            async def consume():
+                async for snapshot in processor.stream_bulk_job_progress(bulk_job.id):
+                    streamed.append(snapshot["finished"])
+            
+            consumer = asyncio.ensure_future(consume())
+            await asyncio.sleep(0)
+            
+            # Transitions arrive from worker threads
+            def run_jobs():
+                for job in bulk_job.video_jobs:
+                    processor._set_job_status(job, JobStatus.DISPATCHED)
+                    processor._set_job_status(job, JobStatus.COMPLETED)
+            
+            await asyncio.get_running_loop().run_in_executor(None, run_jobs)
+            final = await waiter
+            await asyncio.wait_for(consumer, timeout=5.0)
+            return final, streamed
+        
+        final, streamed = asyncio.run(scenario())
+        
+        assert final["done"] and final["finished"] == 4 and final["failed"] == 0
+        assert streamed[0] == 0 and streamed[-1] == 4
+        assert progress_updates == [25, 50, 75, 100]
+        assert bulk_job.status == PipelineState.COMPLETED
+        assert processor.get_bulk_job_status(bulk_job.id)["statistics"]["completed"] == 4
+    
+    def test_retried_jobs_do_not_complete_bulk_job(self, tracking_processor):
+        """Test that only terminal failures count towards bulk job completion."""
+        processor = tracking_processor
+        bulk_job = self._start_tracked_bulk_job(processor, 2)
+        first, second = bulk_job.video_jobs
+        
+        processor._set_job_status(first, JobStatus.COMPLETED)
+        processor._set_job_status(second, JobStatus.RETRIED)
+        assert bulk_job.status == PipelineState.RUNNING
+        assert processor.get_bulk_job_status(bulk_job.id)["statistics"]["queued"] == 1
+        
+        processor._set_job_status(second, JobStatus.FAILED)
+        assert bulk_job.status == PipelineState.FAILED
+        assert bulk_job.error_message == "1 jobs failed"
 
 
 def run_integration_demo():
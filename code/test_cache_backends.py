@@ -0,0 +1,234 @@
+"""
+Test Suite for Second-Tier Cache Backends
+
+Covers the SQLite and Redis backends (the latter against an in-process
+stand-in), write-behind buffering, negative caching and CacheManager
+read-through across restarts.
+"""
+
+import time
+
+import pytest
+
+from cache_backends import RedisCacheBackend, SecondTierCache, SQLiteCacheBackend
+from smart_batcher import CacheManager, ContentRequest
+
+
+class FakeRedis:
+    """Minimal in-process stand-in for the redis-py client"""
+
+    def __init__(self):
+        self.data = {}
+        self.expiry = {}
+        self.commands = 0
+
+    def _alive(self, key):
+        expires_at = self.expiry.get(key)
+        if expires_at is not None and expires_at <= time.time():
+            self.data.pop(key, None)
+            self.expiry.pop(key, None)
+        return key in self.data
+
+    def ping(self):
+        return True
+
+    def get(self, key):
+        self.commands += 1
+        return self.data[key] if self._alive(key) else None
+
+    def set(self, key, value):
+        self.commands += 1
+        self.data[key] = value
+        self.expiry.pop(key, None)
+
+    def setex(self, key, ttl, value):
+        self.commands += 1
+        self.data[key] = value
+        self.expiry[key] = time.time() + ttl
+
+    def ttl(self, key):
+        if not self._alive(key):
+            return -2
+        if key not in self.expiry:
+            return -1
+        return int(self.expiry[key] - time.time())
+
+    def delete(self, key):
+        self.commands += 1
+        self.data.pop(key, None)
+        self.expiry.pop(key, None)
+
+
+class CountingBackend(SQLiteCacheBackend):
+    """SQLite backend that counts lookups reaching storage"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.get_calls = 0
+        self.write_batches = 0
+
+    def get(self, key):
+        self.get_calls += 1
+        return super().get(key)
+
+    def set_many(self, entries):
+        self.write_batches += 1
+        super().set_many(entries)
+
+
+class TestSQLiteCacheBackend:
+    """Test on-disk backend"""
+
+    def test_round_trip_and_persistence(self, tmp_path):
+        db_path = str(tmp_path / "cache.db")
+        backend = SQLiteCacheBackend(db_path)
+        backend.set_many([("a", '{"v": 1}', 60), ("b", '{"v": 2}', None)])
+        backend.close()
+
+        reopened = SQLiteCacheBackend(db_path)
+        payload, ttl = reopened.get("a")
+        assert payload == '{"v": 1}'
+        assert 0 < ttl <= 60
+        assert reopened.get("b") == ('{"v": 2}', None)
+        assert reopened.get("missing") is None
+
+    def test_expired_entries_are_not_returned(self, tmp_path):
+        backend = SQLiteCacheBackend(str(tmp_path / "cache.db"))
+        backend.set("short", "{}", 0.05)
+        time.sleep(0.1)
+        assert backend.get("short") is None
+        assert backend.purge_expired() == 0
+
+    @pytest.mark.parametrize("ttl", [0, -5])
+    def test_non_positive_ttl_is_rejected(self, tmp_path, ttl):
+        backend = SQLiteCacheBackend(str(tmp_path / "cache.db"))
+        with pytest.raises(ValueError):
+            backend.set_many([("ok", "{}", 60), ("zero", "{}", ttl)])
+        assert backend.get("ok") is None
+
+
+class TestRedisCacheBackend:
+    """Test Redis backend against a local stand-in"""
+
+    def test_round_trip_with_prefix(self):
+        client = FakeRedis()
+        backend = RedisCacheBackend(client=client, key_prefix="content-cache:")
+        backend.set_many([("a", "1", 30), ("b", "2", None)])
+
+        assert "content-cache:a" in client.data
+        payload, ttl = backend.get("a")
+        assert payload == "1" and 0 < ttl <= 30
+        assert backend.get("b") == ("2", None)
+
+        backend.delete("a")
+        assert backend.get("a") is None
+
+    def test_non_positive_ttl_is_rejected(self):
+        client = FakeRedis()
+        backend = RedisCacheBackend(client=client)
+        with pytest.raises(ValueError):
+            backend.set("zero", "1", 0)
+        assert client.commands == 0
+
+
+class TestSecondTierCache:
+    """Test write-behind buffering, negative caching and statistics"""
+
+    def test_write_behind_reads_own_writes_and_flushes_in_batches(self, tmp_path):
+        backend = CountingBackend(str(tmp_path / "cache.db"))
+        tier = SecondTierCache(backend, flush_interval=60.0)
+
+        for i in range(10):
+            tier.set(f"key_{i}", {"value": i}, ttl=60)
+
+        # Buffered writes are visible before they reach the backend
+        assert tier.get("key_3") == {"value": 3}
+        assert backend.get_calls == 0
+        assert tier.get_stats()["pending_writes"] == 10
+
+        assert tier.flush() == 10
+        assert backend.write_batches == 1
+        assert backend.get("key_9")[0] == '{"value": 9}'
+        tier.close()
+
+    def test_negative_cache_skips_backend_for_repeated_misses(self, tmp_path):
+        backend = CountingBackend(str(tmp_path / "cache.db"))
+        tier = SecondTierCache(backend, write_behind=False, negative_ttl=60.0)
+
+        for _ in range(5):
+            assert tier.get("absent") is None
+        assert backend.get_calls == 1
+        assert tier.get_stats()["negative_hits"] == 4
+
+        # A write clears the negative entry
+        tier.set("absent", {"now": "present"})
+        assert tier.get("absent") == {"now": "present"}
+
+        stats = tier.get_stats()
+        assert stats["hits"] == 1 and stats["misses"] == 5
+        assert stats["hit_ratio"] == pytest.approx(1 / 6)
+
+    @pytest.mark.parametrize("ttl", [0, -1])
+    def test_non_positive_ttl_is_rejected(self, tmp_path, ttl):
+        tier = SecondTierCache(SQLiteCacheBackend(str(tmp_path / "cache.db")), flush_interval=60.0)
+        with pytest.raises(ValueError):
+            tier.set("key", {"value": 1}, ttl=ttl)
+        assert tier.get_stats()["pending_writes"] == 0
+        tier.close()
+
+    def test_buffered_entries_expire_before_they_are_flushed(self, tmp_path, monkeypatch):
+        backend = CountingBackend(str(tmp_path / "cache.db"))
+        backend.set("key", '{"value": "old"}', 600)
+        tier = SecondTierCache(backend, flush_interval=60.0)
+        now = time.time()
+        monkeypatch.setattr(time, "time", lambda: now)
+
+        tier.set("key", {"value": "new"}, ttl=10)
+        tier.set("forever", {"value": 1}, ttl=None)
+        value, remaining = tier.get_with_ttl("key")
+        assert value == {"value": "new"} and remaining == pytest.approx(10)
+
+        now += 11
+        assert tier.get_with_ttl("key") is None
+        assert tier.get("forever") == {"value": 1}
+
+        # The expired write is dropped and the value it replaced is not served again
+        assert tier.flush() == 1
+        assert backend.get("key") is None
+        assert tier.get_with_ttl("forever") == ({"value": 1}, None)
+        tier.close()
+
+    def test_backend_errors_are_counted_as_misses(self):
+        class BrokenBackend(SQLiteCacheBackend):
+            def get(self, key):
+                raise ConnectionError("backend down")
+
+        tier = SecondTierCache(BrokenBackend(":memory:"), write_behind=False)
+        assert tier.get("anything") is None
+        assert tier.get_stats()["errors"] == 1
+
+
+class TestCacheManagerSecondTier:
+    """Test CacheManager read-through across restarts"""
+
+    def test_hits_survive_restart_and_promote_into_memory(self, tmp_path):
+        db_path = str(tmp_path / "cache.db")
+        request = ContentRequest(id="r1", content_type="video", prompt="Office workspace with laptop")
+
+        first = CacheManager(memory_size=10, l2_backend=SQLiteCacheBackend(db_path))
+        first.set(request, {"file_path": "generated/video/r1.mp4"}, ttl=600)
+        first.close()
+
+        second = CacheManager(memory_size=10, l2_backend=SQLiteCacheBackend(db_path))
+        assert second.get(request) == {"file_path": "generated/video/r1.mp4"}
+        assert second.get(request) == {"file_path": "generated/video/r1.mp4"}
+
+        stats = second.get_stats()
+        assert stats["memory"]["hits"] == 1 and stats["memory"]["misses"] == 1
+        assert stats["l2"]["hits"] == 1
+        assert stats["l2"]["backend"] == "sqlite"
+
+    def test_redis_backend_enables_redis_flag(self):
+        manager = CacheManager(l2_backend=RedisCacheBackend(client=FakeRedis()))
+        assert manager.redis_cache_enabled
+        assert manager.get_stats()["l2"]["backend"] == "redis"
@@ -0,0 +1,167 @@
+"""
+Test Suite for the LRUCache memory tier
+
+Covers recency ordering, heap-based and lazy TTL expiry, the byte bound,
+the hit/miss/eviction counters and TTL validation.
+"""
+
+import types
+
+import pytest
+
+import smart_batcher
+from smart_batcher import LRUCache
+
+
+class FakeClock:
+    """Stands in for the time module so expiry can be tested without sleeping"""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(smart_batcher, "time", types.SimpleNamespace(time=clock.time))
+    return clock
+
+
+class TestRecency:
+    def test_least_recently_used_entry_is_evicted(self, clock):
+        cache = LRUCache(max_size=3)
+        for key in ("a", "b", "c"):
+            cache.set(key, key.upper())
+
+        # Reading "a" makes "b" the least recently used
+        assert cache.get("a") == "A"
+        cache.set("d", "D")
+
+        assert list(cache.cache) == ["c", "a", "d"]
+        assert cache.get("b") is None
+        assert cache.stats["evictions"] == 1
+
+    def test_overwrite_refreshes_recency_and_value(self, clock):
+        cache = LRUCache(max_size=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.set("a", 3)
+        cache.set("c", 4)
+
+        assert list(cache.cache) == ["a", "c"]
+        assert cache.get("a") == 3
+        assert len(cache) == 2
+
+
+class TestExpiry:
+    def test_expired_entries_are_dropped_lazily_on_read(self, clock):
+        cache = LRUCache()
+        cache.set("short", "value", ttl=10)
+        clock.now += 10
+
+        assert cache.get("short") is None
+        assert "short" not in cache.cache
+        assert cache.stats["expirations"] == 1
+        assert cache.stats["misses"] == 1
+
+    def test_cleanup_only_removes_expired_entries(self, clock):
+        cache = LRUCache()
+        cache.set("soon", 1, ttl=5)
+        cache.set("later", 2, ttl=50)
+        cache.set("forever", 3, ttl=None)
+        clock.now += 10
+
+        assert cache.cleanup_expired() == 1
+        assert set(cache.cache) == {"later", "forever"}
+        # Entries without a TTL never enter the expiry heap
+        assert [key for _, key in cache.expiry_heap] == ["later"]
+
+        clock.now += 10_000
+        assert cache.cleanup_expired() == 1
+        assert cache.get("forever") == 3
+
+    def test_stale_heap_entries_from_overwrites_are_skipped(self, clock):
+        cache = LRUCache()
+        cache.set("key", "old", ttl=5)
+        cache.set("key", "new", ttl=100)
+        clock.now += 10
+
+        assert cache.cleanup_expired() == 0
+        assert cache.get("key") == "new"
+        assert cache.stats["expirations"] == 0
+
+    def test_heap_is_rebuilt_when_overwrites_dominate(self, clock):
+        cache = LRUCache()
+        for i in range(200):
+            cache.set("key", i, ttl=60)
+
+        assert len(cache.expiry_heap) <= 2 * len(cache.cache) + 64
+
+    def test_expired_entries_are_evicted_before_live_ones(self, clock):
+        cache = LRUCache(max_size=2)
+        cache.set("live", 1, ttl=100)
+        cache.set("expiring", 2, ttl=5)
+        clock.now += 10
+        cache.set("new", 3, ttl=100)
+
+        assert set(cache.cache) == {"live", "new"}
+        assert cache.stats["expirations"] == 1
+        assert cache.stats["evictions"] == 0
+
+    @pytest.mark.parametrize("ttl", [0, -1])
+    def test_non_positive_ttl_is_rejected(self, clock, ttl):
+        cache = LRUCache()
+        with pytest.raises(ValueError):
+            cache.set("key", "value", ttl=ttl)
+        assert len(cache) == 0
+
+
+class TestByteBound:
+    def test_entries_are_evicted_to_stay_under_max_bytes(self, clock):
+        value = "x" * 100
+        entry_size = LRUCache._estimate_size(value)
+        cache = LRUCache(max_size=100, max_bytes=entry_size * 3)
+        for i in range(5):
+            cache.set(f"k{i}", value)
+
+        assert list(cache.cache) == ["k2", "k3", "k4"]
+        assert cache.current_bytes == entry_size * 3
+        assert cache.stats["evictions"] == 2
+
+    def test_value_larger_than_the_bound_is_not_cached(self, clock):
+        cache = LRUCache(max_bytes=50)
+        cache.set("big", "y" * 10)
+        cache.set("big", "z" * 500)
+
+        assert cache.get("big") is None
+        assert cache.current_bytes == 0
+
+    def test_byte_count_follows_overwrites_and_deletes(self, clock):
+        cache = LRUCache(max_bytes=10_000)
+        cache.set("a", "x" * 10)
+        cache.set("a", "x" * 200)
+        assert cache.current_bytes == LRUCache._estimate_size("x" * 200)
+
+        assert cache.delete("a")
+        assert not cache.delete("a")
+        assert cache.current_bytes == 0
+
+
+class TestStats:
+    def test_counters_and_hit_ratio(self, clock):
+        cache = LRUCache(max_size=1)
+        cache.set("a", 1)
+        cache.get("a")
+        cache.get("a")
+        cache.get("missing")
+        cache.set("b", 2)
+
+        stats = cache.get_stats()
+        assert stats["hits"] == 2
+        assert stats["misses"] == 1
+        assert stats["evictions"] == 1
+        assert stats["hit_ratio"] == 2 / 3
+        assert stats["size"] == 1 and stats["max_size"] == 1
@@ -42,6 +42,7 @@ from parallel_generator import (
     create_audio_request,
     create_video_request
 )
+from cache_backends import SQLiteCacheBackend
 
 
 class TestRateLimiting:
@@ -362,6 +363,24 @@ class TestMultiLayerCache:
         
         await cache.invalidate("test_key")
         assert await cache.get("test_key") is None
+    
+    @pytest.mark.asyncio
+    async def test_second_tier_read_through(self, tmp_path):
+        """Test hits are served from the second tier after a restart"""
+        db_path = str(tmp_path / "cache.db")
+        
+        cache = MultiLayerCache(l2_backend=SQLiteCacheBackend(db_path))
+        await cache.set("test_key", {"data": "test_value"}, ttl_seconds=60)
+        await cache.flush()
+        
+        restarted = MultiLayerCache(l2_backend=SQLiteCacheBackend(db_path))
+        assert await restarted.get("test_key") == {"data": "test_value"}
+        assert await restarted.get("test_key") == {"data": "test_value"}
+        
+        stats = restarted.get_cache_stats()
+        assert stats["l2_hits"] == 1
+        assert stats["memory_hits"] == 1
+        assert stats["l2"]["backend"] == "sqlite"
 
 
 class TestLoadBalancer:
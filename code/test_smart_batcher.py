@@ -187,6 +187,67 @@ class SmartBatcherTestSuite:
             self.log_test("Cache Functionality", "FAIL", str(e))
             return False
     
+    async def test_near_duplicate_reuse(self) -> bool:
+        """Test reuse of cached content for paraphrased requests"""
+        try:
+            cache_manager = CacheManager(memory_size=100)
+            batcher = SmartBatcher(cache_manager=cache_manager)
+            
+            original = ContentRequest(
+                id="orig_1",
+                content_type="video",
+                prompt="Professional office workspace with laptop and fresh coffee on desk",
+                style_params={'video_style': 'corporate_professional'}
+            )
+            cache_manager.set(original, {"file_path": "cached/office.mp4"})
+            
+            # Different word order and filler words defeat the exact fingerprint
+            paraphrase = ContentRequest(
+                id="para_1",
+                content_type="video",
+                prompt="A laptop and fresh coffee on desk in a modern professional office workspace",
+                style_params={'video_style': 'corporate_professional'}
+            )
+            assert cache_manager.get(paraphrase) is None, "Exact lookup should miss"
+            
+            match = cache_manager.find_similar(paraphrase, threshold=0.8)
+            assert match is not None, "Paraphrase should match cached content"
+            assert match[0] == {"file_path": "cached/office.mp4"}
+            assert cache_manager.is_near_duplicate(paraphrase, threshold=0.8)
+            
+            unrelated = ContentRequest(
+                id="other_1",
+                content_type="video",
+                prompt="Sunset over mountain lake with kayaks",
+                style_params={'video_style': 'corporate_professional'}
+            )
+            assert not cache_manager.is_near_duplicate(unrelated, threshold=0.8), \
+                "Unrelated prompt should not match"
+            
+            # Same prompt for a different content type must not be reused
+            as_image = ContentRequest(
+                id="img_1",
+                content_type="image",
+                prompt=paraphrase.prompt,
+                style_params=paraphrase.style_params
+            )
+            assert cache_manager.find_similar(as_image) is None, "Content type should partition index"
+            
+            status = await batcher.add_request(paraphrase)
+            assert status == "cached:para_1", f"Paraphrase should be served from cache, got {status}"
+            assert batcher.metrics['near_duplicate_hits'] == 1
+            assert paraphrase.metadata['near_duplicate_of'] == cache_manager.get_cache_key(original)
+            assert cache_manager.get(paraphrase) == {"file_path": "cached/office.mp4"}, \
+                "Reused content should be retrievable for the paraphrased request"
+            
+            self.log_test("Near-Duplicate Reuse", "PASS",
+                         f"Similarity {paraphrase.metadata['near_duplicate_similarity']:.2f}")
+            return True
+            
+        except Exception as e:
+            self.log_test("Near-Duplicate Reuse", "FAIL", str(e))
+            return False
+    
     async def test_cost_benefit_analysis(self) -> bool:
         """Test cost-benefit analysis for batching decisions"""
         try:
@@ -471,6 +532,7 @@ class SmartBatcherTestSuite:
             self.test_basic_batching,
             self.test_similarity_grouping,
             self.test_cache_functionality,
+            self.test_near_duplicate_reuse,
             self.test_cost_benefit_analysis,
             self.test_priority_queue,
             self.test_dynamic_batch_sizing,
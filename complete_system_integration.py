@@ -131,10 +131,10 @@ class SystemIntegrationManager:
         try:
             # Import integration function
             sys.path.append('/workspace')
-            from integrate_amazon_polly_audio import AmazonPollyIntegration
+            from integrate_amazon_polly_audio import get_shared_polly
             
-            # Initialize Polly and get real voices
-            polly = AmazonPollyIntegration()
+            # Get real voices through the shared Polly client
+            polly = get_shared_polly()
             voices = await polly.get_available_voices()
             
             # Add our custom voice mappings
@@ -350,8 +350,22 @@ class SystemIntegrationManager:
                 "fallback": True
             }'''
             
+            # Close the shared MiniMax session when the processor shuts down
+            cleanup_anchor = '''        # Close sheets client
+        if self.sheets_client:
+            await self.sheets_client.close()
+'''
+            cleanup_addition = '''        
+        # Close the shared MiniMax session if any video was generated
+        minimax = sys.modules.get('integrate_minimax_video')
+        if minimax is not None:
+            await minimax.close_shared_video_client()
+'''
+            
             # Replace the function
             modified_code = current_code.replace(placeholder_function, real_function)
+            if "close_shared_video_client" not in modified_code:
+                modified_code = modified_code.replace(cleanup_anchor, cleanup_anchor + cleanup_addition)
             
             # Write the updated code
             with open(batch_processor_path, 'w') as f:
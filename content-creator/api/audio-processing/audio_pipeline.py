@@ -5,12 +5,16 @@ Audio Pipeline - Handles text-to-speech, music generation, and audio mixing
 import asyncio
 import json
 import os
+import sys
 import uuid
 from datetime import datetime
-from typing import Dict, List, Any, Optional, Tuple
+from typing import AsyncIterator, Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass, asdict
 import logging
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from segment_timeline import SegmentTimeline, ordered_batches
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -62,6 +66,8 @@ class AudioPipeline:
         self.audio_dir = audio_dir
         self.voices = []
         self.voice_cache = {}
+        self.voiceover_batch_size = None  # Lines per provider call, None sends the whole script at once
+        self.max_in_flight_batches = 4
         
     async def initialize(self):
         """Initialize audio pipeline and load available voices"""
@@ -80,10 +86,10 @@ class AudioPipeline:
         try:
             # Import integration function
             sys.path.append('/workspace')
-            from integrate_amazon_polly_audio import AmazonPollyIntegration
+            from integrate_amazon_polly_audio import get_shared_polly
             
-            # Initialize Polly and get real voices
-            polly = AmazonPollyIntegration()
+            # Get real voices through the shared Polly client
+            polly = get_shared_polly()
             voices = await polly.get_available_voices()
             
             # Add our custom voice mappings
@@ -152,6 +158,40 @@ class AudioPipeline:
             List of AudioSegment objects
         """
         
+        try:
+            audio_segments = [
+                segment async for segment in self.stream_voiceover(
+                    script_scenes, voice_id, style_preferences
+                )
+            ]
+        except Exception as e:
+            logger.error(f"Failed to generate voiceover: {e}")
+            raise
+        
+        logger.info(f"Generated {len(audio_segments)} voiceover segments")
+        return audio_segments
+    
+    async def stream_voiceover(self, 
+                              script_scenes: List[Dict[str, Any]], 
+                              voice_id: str = "professional_female",
+                              style_preferences: Optional[Dict[str, Any]] = None) -> AsyncIterator[AudioSegment]:
+        """
+        Generate voiceover audio from script scenes, yielding segments in scene order
+        
+        Lines are sent in batches of ``voiceover_batch_size`` (the whole script
+        by default), up to ``max_in_flight_batches`` at a time. Each segment is
+        yielded with its final start/end times as soon as all earlier lines
+        are done.
+        
+        Args:
+            script_scenes: List of script scenes with voiceover text
+            voice_id: Selected voice ID
+            style_preferences: Voice style preferences (speed, pitch, emotion)
+            
+        Yields:
+            AudioSegment objects in scene order
+        """
+        
         logger.info(f"Generating voiceover with voice: {voice_id}")
         
         if not self.voices:
@@ -164,64 +204,55 @@ class AudioPipeline:
         
         # Prepare text segments for batch processing
         text_segments = []
-        segment_info = []
         
         for scene in script_scenes:
             text = scene.get("voiceover_text", "").strip()
             if text:
                 text_segments.append(text)
-                segment_info.append({
-                    "scene_id": scene.get("id", str(uuid.uuid4())),
-                    "scene_number": scene.get("scene_number", 0),
-                    "duration_estimate": len(text) * 0.1  # Rough estimate
-                })
         
         if not text_segments:
             logger.warning("No text segments found for voiceover generation")
-            return []
+            return
         
-        # Generate audio segments
-        audio_segments = []
-        
-        try:
+        async def generate_batch(texts: List[str], start: int) -> List[str]:
             # This would call batch_text_to_audio in actual implementation
-            generated_audio = await self._generate_audio_batch(
-                texts=text_segments,
+            return await self._generate_audio_batch(
+                texts=texts,
                 voice_id=voice_id,
-                style_preferences=style_preferences or {}
+                style_preferences=style_preferences or {},
+                start_index=start
             )
-            
-            # Process generated audio into segments
-            for i, (audio_file, info) in enumerate(zip(generated_audio, segment_info)):
-                segment = AudioSegment(
-                    id=str(uuid.uuid4()),
-                    text=text_segments[i],
-                    voice=voice_id,
-                    duration=info["duration_estimate"],
-                    file_path=audio_file,
-                    start_time=sum(a.duration for a in audio_segments),
-                    end_time=0,  # Will be calculated
-                    sentiment=self._analyze_sentiment(text_segments[i]),
-                    emotion=self._extract_emotion(text_segments[i]),
-                    volume=0.8,
-                    quality_score=8.5  # Mock quality score
-                )
-                
-                segment.end_time = segment.start_time + segment.duration
-                audio_segments.append(segment)
-                
-        except Exception as e:
-            logger.error(f"Failed to generate voiceover: {e}")
-            raise
         
-        logger.info(f"Generated {len(audio_segments)} voiceover segments")
-        return audio_segments
+        timeline = SegmentTimeline()
+        batch_size = self.voiceover_batch_size or len(text_segments)
+        
+        async for text, audio_file in ordered_batches(
+            text_segments, generate_batch, batch_size, self.max_in_flight_batches
+        ):
+            yield timeline.place(AudioSegment(
+                id=str(uuid.uuid4()),
+                text=text,
+                voice=voice_id,
+                duration=len(text) * 0.1,  # Rough estimate
+                file_path=audio_file,
+                start_time=0,  # Set by the timeline
+                end_time=0,
+                sentiment=self._analyze_sentiment(text),
+                emotion=self._extract_emotion(text),
+                volume=0.8,
+                quality_score=8.5  # Mock quality score
+            ))
     
     async def _generate_audio_batch(self, 
                                    texts: List[str], 
                                    voice_id: str, 
-                                   style_preferences: Dict[str, Any]) -> List[str]:
-        """Generate audio files from text batch using Amazon Polly"""
+                                   style_preferences: Dict[str, Any],
+                                   start_index: int = 0) -> List[str]:
+        """Generate audio files from text batch using Amazon Polly
+        
+        Files are numbered from ``start_index`` so batches of one script
+        never overwrite each other.
+        """
         
         # Import integration function
         sys.path.append('/workspace')
@@ -236,14 +267,15 @@ class AudioPipeline:
                 texts=texts,
                 voice_id=polly_voice_id,
                 output_dir=self.audio_dir,
-                engine="neural"
+                engine="neural",
+                start_index=start_index
             )
             return audio_files
         except Exception as e:
             logger.error(f"Amazon Polly integration failed: {e}")
             # Fallback to mock implementation
             audio_files = []
-            for i, text in enumerate(texts):
+            for i, text in enumerate(texts, start=start_index):
                 output_path = os.path.join(self.audio_dir, f"voiceover_{i:03d}.mp3")
                 os.makedirs(os.path.dirname(output_path), exist_ok=True)
                 with open(output_path, "w") as f:
@@ -31,6 +31,11 @@ class CommentScraperSettings(BaseSettings):
     
     # Daily Request Limits
     TIKTOK_DAILY_LIMIT: int = 1000  # Fixed daily limit for Research API
+    YOUTUBE_DAILY_QUOTA: int = 10000  # Data API quota units per day
+    
+    # Rate Limit State
+    RATE_LIMIT_STATE_FILE: str = Field(default="./rate_limit_state.json")  # Daily counters, empty to disable
+    RATE_LIMIT_SHARED_STORE: str = Field(default="")  # SQLite path shared by scraper processes
     
     # Database Configuration
     DATABASE_URL: str = Field(default="sqlite:///./comment_scraper.db")
@@ -14,7 +14,7 @@ from .models.comment_models import (
     CommentBase, CommentWithAnalysis, Platform, ContentType, ScrapingJob
 )
 from .scraper_factory import scraping_manager, ScraperFactory
-from .utils.comment_analyzer import comment_analyzer
+from .utils.comment_analyzer import comment_analyzer, CommentTrendAggregator
 from .utils.data_extractor import data_extractor
 from .utils.api_key_manager import api_key_manager
 from .utils.rate_limiter import rate_limiter
@@ -53,6 +53,7 @@ class CommentScrapingAPI:
     async def cleanup(self) -> None:
         """Cleanup resources."""
         await scraping_manager.cleanup()
+        comment_analyzer.shutdown()
         logger.info("Comment Scraping API cleanup completed")
     
     # ====================
@@ -68,11 +69,19 @@ class CommentScrapingAPI:
         include_analysis: bool = True,
         language_filter: Optional[str] = None,
         start_date: Optional[datetime] = None,
-        end_date: Optional[datetime] = None
+        end_date: Optional[datetime] = None,
+        include_replies: bool = True,
+        include_comments: bool = True,
+        analysis_chunk_size: int = 500
     ) -> Dict[str, Any]:
         """
         Scrape and analyze comments from specified content.
         
+        Comments are analyzed in chunks while scraping continues, and trend
+        statistics are folded in chunk by chunk. With ``include_comments``
+        disabled only the statistics are kept, so memory stays bounded for
+        any number of comments.
+        
         Args:
             platform: Platform to scrape from
             content_id: Content ID to scrape comments from
@@ -82,6 +91,9 @@ class CommentScrapingAPI:
             language_filter: Filter by language code
             start_date: Only scrape comments after this date
             end_date: Only scrape comments before this date
+            include_replies: Whether to include replies
+            include_comments: Whether to return the comments themselves
+            analysis_chunk_size: Comments per analysis chunk
             
         Returns:
             Dictionary with scraped comments and analysis results
@@ -89,41 +101,56 @@ class CommentScrapingAPI:
         logger.info(f"Starting scrape and analysis for {platform}:{content_id}")
         
         try:
-            # Scrape comments
-            comments = []
-            async for comment in scraping_manager.scrape_comments(
-                platform=platform,
-                content_id=content_id,
-                content_type=ContentType(content_type),
-                max_comments=max_comments,
-                language_filter=language_filter,
-                start_date=start_date,
-                end_date=end_date
-            ):
-                comments.append(comment)
+            scraped_count = 0
             
-            logger.info(f"Scraped {len(comments)} comments from {platform}")
+            async def scraped_comments() -> AsyncIterator[CommentBase]:
+                nonlocal scraped_count
+                async for comment in scraping_manager.scrape_comments(
+                    platform=platform,
+                    content_id=content_id,
+                    content_type=ContentType(content_type),
+                    max_comments=max_comments,
+                    include_replies=include_replies,
+                    language_filter=language_filter,
+                    start_date=start_date,
+                    end_date=end_date
+                ):
+                    scraped_count += 1
+                    yield comment
             
-            # Analyze comments if requested
-            analyzed_comments = comments
+            comments = []
+            analyzed_count = 0
             analysis_stats = {}
             
-            if include_analysis and comments:
-                logger.info("Starting sentiment analysis...")
-                analyzed_comments = await comment_analyzer.analyze_batch(comments)
+            if include_analysis:
+                logger.info("Starting streamed sentiment analysis...")
+                trends = CommentTrendAggregator()
                 
-                # Generate analysis statistics
-                trends = await comment_analyzer.analyze_comment_trends(analyzed_comments)
-                analysis_stats = trends
+                async for analyzed_chunk in comment_analyzer.analyze_stream(
+                    scraped_comments(), chunk_size=analysis_chunk_size
+                ):
+                    trends.update(analyzed_chunk)
+                    analyzed_count += len(analyzed_chunk)
+                    if include_comments:
+                        comments.extend(analyzed_chunk)
+                
+                analysis_stats = trends.to_dict()
+            else:
+                async for comment in scraped_comments():
+                    if include_comments:
+                        comments.append(comment)
+                analyzed_count = scraped_count
+            
+            logger.info(f"Scraped {scraped_count} comments from {platform}")
             
             return {
                 'success': True,
                 'platform': platform.value,
                 'content_id': content_id,
                 'content_type': content_type,
-                'comments_scraped': len(comments),
-                'comments_analyzed': len(analyzed_comments),
-                'comments': analyzed_comments,
+                'comments_scraped': scraped_count,
+                'comments_analyzed': analyzed_count,
+                'comments': comments,
                 'analysis_stats': analysis_stats,
                 'timestamp': datetime.utcnow().isoformat(),
                 'filters_applied': {
@@ -324,6 +324,10 @@ class BaseCommentScraper(ABC):
                     logger.warning(f"Non-JSON response from {url}")
                     return {"error": "Non-JSON response"}
         
+        except DailyLimitExceeded:
+            # Retrying cannot help until the daily counter resets
+            raise
+        
         except asyncio.TimeoutError:
             self.stats["errors"] += 1
             logger.error(f"Timeout while making request to {url}")
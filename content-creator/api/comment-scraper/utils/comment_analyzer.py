@@ -5,11 +5,15 @@ This module provides utilities for analyzing scraped comments including
 sentiment analysis, topic extraction, and content quality assessment.
 """
 
+import os
 import re
 import asyncio
-from typing import List, Dict, Optional, Tuple, Any
+import pickle
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Dict, Optional, Tuple, Any, AsyncIterator, Deque
 from datetime import datetime
-from collections import Counter
+from collections import Counter, deque
 import logging
 
 try:
@@ -23,19 +27,133 @@ except ImportError:
     NLTK_AVAILABLE = False
     logging.warning("NLTK not available. Install with: pip install nltk")
 
+import numpy as np
+
 from ..models.comment_models import CommentBase, CommentWithAnalysis, SentimentLabel
+from .keyword_automaton import KeywordAutomaton
 
 logger = logging.getLogger(__name__)
 
+# Keyword lexicons shared by the per-comment and batch analysis paths
+POSITIVE_WORDS = ['good', 'great', 'awesome', 'love', 'like', 'amazing', 'excellent', 'fantastic']
+NEGATIVE_WORDS = ['bad', 'terrible', 'hate', 'awful', 'horrible', 'disgusting', 'worst']
+INTENT_PATTERNS = {
+    'question': ['?', 'what', 'how', 'why', 'when', 'where', 'who', 'which'],
+    'complaint': ['hate', 'terrible', 'awful', 'worst', 'horrible', 'disappointing'],
+    'praise': ['love', 'great', 'awesome', 'amazing', 'excellent', 'fantastic'],
+    'request': ['please', 'could', 'would', 'can you', 'please make'],
+    'suggestion': ['should', 'could', 'maybe', 'suggest', 'recommend'],
+    'feedback': ['suggest', 'recommend', 'think', 'feel', 'opinion']
+}
+EMOTIONAL_WORDS = ['love', 'hate', 'amazing', 'terrible', 'awesome', 'worst']
+CTA_WORDS = ['check', 'watch', 'subscribe', 'like', 'share', 'comment']
+URL_MARKERS = ['http', 'www.']
+
+REPEATED_CHARACTERS = re.compile(r'(.)\1{3,}')
+KEYWORD_TOKENS = re.compile(r'\b[a-zA-Z]{3,}\b')
+
+
+class CommentTrendAggregator:
+    """
+    Incrementally folds analyzed comments into trend statistics.
+    
+    Only counters and running sums are kept, so trends over a large
+    comment stream can be computed chunk by chunk without holding the
+    comments in memory.
+    """
+    
+    def __init__(self):
+        """Initialize empty aggregates."""
+        self.total_comments = 0
+        self.sentiment_counts = Counter()
+        self.topic_counts = Counter()
+        self.intent_counts = Counter()
+        self.quality_sum = 0.0
+        self.quality_count = 0
+        self.engagement_sum = 0.0
+        self.engagement_count = 0
+        self.high_quality_comments = 0
+        self.high_engagement_potential = 0
+    
+    def update(self, comments: List[CommentWithAnalysis]) -> None:
+        """
+        Add a chunk of analyzed comments to the aggregates.
+        
+        Args:
+            comments: Analyzed comments to add
+        """
+        for comment in comments:
+            self.total_comments += 1
+            
+            if comment.sentiment_label:
+                self.sentiment_counts[comment.sentiment_label] += 1
+            self.topic_counts.update(comment.topics)
+            if comment.intent:
+                self.intent_counts[comment.intent] += 1
+            
+            if comment.quality_score is not None:
+                self.quality_sum += comment.quality_score
+                self.quality_count += 1
+            if comment.engagement_potential is not None:
+                self.engagement_sum += comment.engagement_potential
+                self.engagement_count += 1
+            
+            if (comment.quality_score or 0) > 0.7:
+                self.high_quality_comments += 1
+            if (comment.engagement_potential or 0) > 0.7:
+                self.high_engagement_potential += 1
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Get the trend analysis for all comments added so far.
+        
+        Returns:
+            Dictionary with trend analysis results, empty if no comments were added
+        """
+        if not self.total_comments:
+            return {}
+        
+        return {
+            'total_comments': self.total_comments,
+            'sentiment_distribution': dict(self.sentiment_counts),
+            'top_topics': dict(self.topic_counts.most_common(10)),
+            'intent_distribution': dict(self.intent_counts),
+            'average_quality_score': self.quality_sum / self.quality_count if self.quality_count else 0.0,
+            'average_engagement_potential': self.engagement_sum / self.engagement_count if self.engagement_count else 0.0,
+            'high_quality_comments': self.high_quality_comments,
+            'high_engagement_potential': self.high_engagement_potential
+        }
+
+
+def _analyze_chunk_in_worker(comments: List[CommentBase]) -> List[CommentWithAnalysis]:
+    """Analyze a chunk of comments inside a process pool worker."""
+    return comment_analyzer.analyze_batch_vectorized(comments)
+
 
 class CommentAnalyzer:
     """Analyzes comments for sentiment, topics, and quality metrics."""
     
-    def __init__(self):
-        """Initialize the comment analyzer."""
+    def __init__(self, max_workers: Optional[int] = None):
+        """
+        Initialize the comment analyzer.
+        
+        Args:
+            max_workers: Process pool size for streamed analysis (defaults to CPU count)
+        """
         self.sia = None
         self.lemmatizer = None
         self.stop_words = None
+        self.max_workers = max_workers
+        self._executor: Optional[Executor] = None
+        self._executor_failed = False
+        self.keyword_automaton = KeywordAutomaton({
+            'positive': POSITIVE_WORDS,
+            'negative': NEGATIVE_WORDS,
+            'emotional': EMOTIONAL_WORDS,
+            'cta': CTA_WORDS,
+            'url': URL_MARKERS,
+            **{f'intent_{intent}': patterns for intent, patterns in INTENT_PATTERNS.items()}
+        })
         
         if NLTK_AVAILABLE:
             self._initialize_nltk()
@@ -117,7 +235,10 @@ class CommentAnalyzer:
     
     async def analyze_batch(self, comments: List[CommentBase]) -> List[CommentWithAnalysis]:
         """
-        Analyze a batch of comments concurrently.
+        Analyze a batch of comments.
+        
+        Uses the vectorized batch engine, falling back to analyzing comments
+        one by one if it fails.
         
         Args:
             comments: List of comments to analyze
@@ -125,6 +246,11 @@ class CommentAnalyzer:
         Returns:
             List of enhanced comments
         """
+        try:
+            return self.analyze_batch_vectorized(comments)
+        except Exception as e:
+            logger.error(f"Vectorized batch analysis failed, analyzing per comment: {e}")
+        
         tasks = [self.analyze_comment(comment) for comment in comments]
         results = await asyncio.gather(*tasks, return_exceptions=True)
         
@@ -138,6 +264,217 @@ class CommentAnalyzer:
         
         return analyzed_comments
     
+    async def analyze_stream(
+        self,
+        comments: AsyncIterator[CommentBase],
+        chunk_size: int = 500,
+        max_pending_chunks: Optional[int] = None
+    ) -> AsyncIterator[List[CommentWithAnalysis]]:
+        """
+        Analyze a stream of comments in chunks, off the event loop.
+        
+        Comments are pulled from the iterator in chunks that are analyzed in a
+        process pool while the next chunks are being scraped. Once
+        ``max_pending_chunks`` chunks are waiting for analysis, no more comments
+        are pulled until the oldest chunk is done, so memory stays bounded no
+        matter how long the stream is.
+        
+        Args:
+            comments: Async iterator of comments, e.g. from scrape_comments
+            chunk_size: Comments per analysis chunk
+            max_pending_chunks: Chunks in flight at once (defaults to the pool size)
+            
+        Yields:
+            Lists of analyzed comments, in stream order
+        """
+        chunk_size = max(1, chunk_size)
+        max_pending_chunks = max(1, max_pending_chunks or self._pool_size())
+        pending: Deque[asyncio.Future] = deque()
+        chunk: List[CommentBase] = []
+        
+        try:
+            async for comment in comments:
+                chunk.append(comment)
+                if len(chunk) < chunk_size:
+                    continue
+                
+                pending.append(asyncio.ensure_future(self._analyze_chunk(chunk)))
+                chunk = []
+                
+                if len(pending) >= max_pending_chunks:
+                    yield await pending.popleft()
+            
+            if chunk:
+                pending.append(asyncio.ensure_future(self._analyze_chunk(chunk)))
+            
+            while pending:
+                yield await pending.popleft()
+        
+        finally:
+            for future in pending:
+                future.cancel()
+    
+    def shutdown(self) -> None:
+        """Shut down the analysis process pool."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+    
+    def _pool_size(self) -> int:
+        """Number of worker processes used for streamed analysis."""
+        return self.max_workers or os.cpu_count() or 1
+    
+    def _get_executor(self) -> Optional[Executor]:
+        """Get the analysis process pool, creating it on first use."""
+        if self._executor is None and not self._executor_failed:
+            try:
+                self._executor = ProcessPoolExecutor(max_workers=self._pool_size())
+            except (OSError, NotImplementedError) as e:
+                logger.warning(f"Process pool unavailable, analyzing on the event loop: {e}")
+                self._executor_failed = True
+        return self._executor
+    
+    async def _analyze_chunk(self, comments: List[CommentBase]) -> List[CommentWithAnalysis]:
+        """Analyze a chunk in the process pool, falling back to in-process analysis."""
+        executor = self._get_executor()
+        
+        if executor is not None:
+            try:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(executor, _analyze_chunk_in_worker, comments)
+            except (BrokenProcessPool, pickle.PicklingError, AttributeError) as e:
+                logger.warning(f"Process pool analysis failed, analyzing on the event loop: {e}")
+                self._executor_failed = True
+                self.shutdown()
+        
+        return await self.analyze_batch(comments)
+    
+    def analyze_batch_vectorized(self, comments: List[CommentBase]) -> List[CommentWithAnalysis]:
+        """
+        Analyze a batch of comments in one vectorized pass.
+        
+        Produces the same results as analyze_comment, but each text is
+        lowercased and split once, all keyword lexicons are matched in a
+        single shared automaton pass over the batch, and the sentiment,
+        intent, quality and engagement scores are computed with NumPy.
+        
+        Args:
+            comments: List of comments to analyze
+            
+        Returns:
+            List of enhanced comments, in input order
+        """
+        if not comments:
+            return []
+        
+        automaton = self.keyword_automaton
+        texts = [comment.text for comment in comments]
+        lowered = [text.lower() for text in texts]
+        words = [text.split() for text in lowered]
+        
+        word_counts = np.fromiter((len(w) for w in words), dtype=np.int64, count=len(comments))
+        unique_counts = np.fromiter((len(set(w)) for w in words), dtype=np.int64, count=len(comments))
+        like_counts = np.fromiter((c.like_count for c in comments), dtype=np.int64, count=len(comments))
+        reply_counts = np.fromiter((c.reply_count for c in comments), dtype=np.int64, count=len(comments))
+        verified = np.fromiter((c.user_verified for c in comments), dtype=bool, count=len(comments))
+        repeated = np.fromiter(
+            (REPEATED_CHARACTERS.search(text) is not None for text in lowered), dtype=bool, count=len(comments)
+        )
+        
+        counts = automaton.count_matches(lowered)
+        has_exclamation = np.fromiter(('!' in text for text in texts), dtype=bool, count=len(comments))
+        has_question = np.fromiter(('?' in text for text in texts), dtype=bool, count=len(comments))
+        has_url = counts[:, automaton.column('url')] > 0
+        
+        # Sentiment
+        if NLTK_AVAILABLE and self.sia:
+            sentiment_scores = np.array([
+                self.sia.polarity_scores(text)['compound'] if text.strip() else 0.0 for text in texts
+            ])
+            positive = sentiment_scores >= 0.05
+            negative = sentiment_scores <= -0.05
+            sentiment_confidence = np.minimum(np.abs(sentiment_scores), 1.0)
+        else:
+            positive_counts = counts[:, automaton.column('positive')]
+            negative_counts = counts[:, automaton.column('negative')]
+            positive = positive_counts > negative_counts
+            negative = negative_counts > positive_counts
+            sentiment_scores = np.where(
+                positive, np.minimum(positive_counts / 10, 1.0),
+                np.where(negative, -np.minimum(negative_counts / 10, 1.0), 0.0)
+            )
+            sentiment_confidence = np.abs(sentiment_scores)
+        
+        # Intent: first intent with the most matched patterns, as in detect_intent
+        intent_names = list(INTENT_PATTERNS)
+        intent_counts = counts[:, [automaton.column(f'intent_{intent}') for intent in intent_names]]
+        best_intent = intent_counts.argmax(axis=1)
+        best_count = intent_counts.max(axis=1)
+        intent_confidence = np.where(
+            best_count > 0, np.minimum(best_count / np.maximum(word_counts, 1) * 2, 1.0), 0.1
+        )
+        
+        # Quality, adding factors in the same order as calculate_quality_score
+        quality = np.where((word_counts >= 5) & (word_counts <= 50), 0.3, np.where(word_counts < 5, 0.1, 0.2))
+        quality += np.where(like_counts > 0, np.minimum(like_counts / 10, 0.3), 0.0)
+        quality += np.where(verified, 0.1, 0.0)
+        quality += np.where(reply_counts > 0, np.minimum(reply_counts / 5, 0.2), 0.0)
+        quality += np.where(has_exclamation, 0.05, 0.0)
+        quality += np.where(has_question, 0.05, 0.0)
+        quality -= np.where(has_url, 0.1, 0.0)
+        quality -= np.where(repeated, 0.2, 0.0)
+        quality += np.where(unique_counts > word_counts * 0.7, 0.1, 0.0)
+        quality = np.clip(quality, 0.0, 1.0)
+        
+        # Engagement potential, in the same order as predict_engagement_potential
+        engagement = np.where(np.abs(sentiment_scores) > 0.5, 0.3, 0.0)
+        engagement += np.where(has_question, 0.2, 0.0)
+        engagement += np.minimum(counts[:, automaton.column('emotional')] * 0.1, 0.2)
+        engagement += np.where((word_counts >= 10) & (word_counts <= 30), 0.2, np.where(word_counts > 50, -0.1, 0.0))
+        engagement += np.minimum(counts[:, automaton.column('cta')] * 0.1, 0.2)
+        engagement += np.where(verified, 0.1, 0.0)
+        engagement += np.where(like_counts > 5, 0.1, 0.0)
+        engagement = np.clip(engagement, 0.0, 1.0)
+        
+        labels = np.where(positive, 0, np.where(negative, 1, 2)).tolist()
+        sentiment_labels = (SentimentLabel.POSITIVE, SentimentLabel.NEGATIVE, SentimentLabel.NEUTRAL)
+        intents = [
+            intent_names[best] if count > 0 else 'comment'
+            for best, count in zip(best_intent.tolist(), best_count.tolist())
+        ]
+        word_count_list = word_counts.tolist()
+        processed_at = datetime.utcnow()
+        
+        analyzed = []
+        for i, comment in enumerate(comments):
+            try:
+                topics = self._extract_topics_from_lower(texts[i], lowered[i])
+            except Exception as e:
+                logger.error(f"Topic extraction error: {e}")
+                topics = []
+            topic_scores = {
+                topic: min(lowered[i].count(topic) / word_count_list[i] * 10, 1.0)
+                for topic in topics
+            }
+            
+            # Every value comes from a validated comment or is clipped to its
+            # field's range, so skip re-validating the model
+            analyzed.append(CommentWithAnalysis.construct(
+                **comment.__dict__,
+                sentiment_score=float(sentiment_scores[i]),
+                sentiment_label=sentiment_labels[labels[i]],
+                sentiment_confidence=float(sentiment_confidence[i]),
+                topics=topics,
+                topic_scores=topic_scores,
+                intent=intents[i],
+                intent_confidence=float(intent_confidence[i]),
+                quality_score=float(quality[i]),
+                engagement_potential=float(engagement[i]),
+                processed_at=processed_at
+            ))
+        
+        return analyzed
+    
     async def analyze_sentiment(self, text: str) -> Dict[str, Any]:
         """
         Analyze sentiment of text.
@@ -191,12 +528,9 @@ class CommentAnalyzer:
     
     async def _simple_sentiment_analysis(self, text: str) -> Dict[str, Any]:
         """Simple keyword-based sentiment analysis fallback."""
-        positive_words = ['good', 'great', 'awesome', 'love', 'like', 'amazing', 'excellent', 'fantastic']
-        negative_words = ['bad', 'terrible', 'hate', 'awful', 'horrible', 'disgusting', 'worst']
-        
         text_lower = text.lower()
-        positive_count = sum(1 for word in positive_words if word in text_lower)
-        negative_count = sum(1 for word in negative_words if word in text_lower)
+        positive_count = sum(1 for word in POSITIVE_WORDS if word in text_lower)
+        negative_count = sum(1 for word in NEGATIVE_WORDS if word in text_lower)
         
         if positive_count > negative_count:
             score = min(positive_count / 10, 1.0)
@@ -228,47 +562,38 @@ class CommentAnalyzer:
             List of extracted topics
         """
         try:
-            if not text or not text.strip():
+            if not text:
                 return []
-            
-            if NLTK_AVAILABLE:
-                # Tokenize and clean text
-                tokens = word_tokenize(text.lower())
-                
-                # Remove punctuation and stop words
-                tokens = [
-                    token for token in tokens 
-                    if token.isalpha() and token not in self.stop_words and len(token) > 2
-                ]
-                
-                # Lemmatize tokens
-                lemmatized = [self.lemmatizer.lemmatize(token) for token in tokens]
-                
-                # Count frequency and get top topics
-                counter = Counter(lemmatized)
-                topics = [word for word, count in counter.most_common(max_topics)]
-                
-                return topics
-            else:
-                # Fallback: simple keyword extraction
-                return await self._simple_keyword_extraction(text, max_topics)
+            return self._extract_topics_from_lower(text, text.lower(), max_topics)
                 
         except Exception as e:
             logger.error(f"Topic extraction error: {e}")
             return []
     
-    async def _simple_keyword_extraction(self, text: str, max_topics: int) -> List[str]:
-        """Simple keyword extraction fallback."""
-        # Remove common words and punctuation
-        words = re.findall(r'\b[a-zA-Z]{3,}\b', text.lower())
-        
-        # Simple frequency analysis
-        from collections import Counter
-        counter = Counter(words)
-        
-        # Get most common words (simple topics)
-        topics = [word for word, count in counter.most_common(max_topics)]
-        return topics
+    def _extract_topics_from_lower(self, text: str, text_lower: str, max_topics: int = 5) -> List[str]:
+        """Extract topics given a text and its lowercased form."""
+        if not text.strip():
+            return []
+        
+        if NLTK_AVAILABLE:
+            # Tokenize and clean text
+            tokens = word_tokenize(text_lower)
+            
+            # Remove punctuation and stop words
+            tokens = [
+                token for token in tokens 
+                if token.isalpha() and token not in self.stop_words and len(token) > 2
+            ]
+            
+            # Lemmatize tokens
+            tokens = [self.lemmatizer.lemmatize(token) for token in tokens]
+        else:
+            # Fallback: simple keyword extraction
+            tokens = KEYWORD_TOKENS.findall(text_lower)
+        
+        # Count frequency and get top topics
+        counter = Counter(tokens)
+        return [word for word, count in counter.most_common(max_topics)]
     
     async def calculate_topic_scores(self, text: str, topics: List[str]) -> Dict[str, float]:
         """Calculate confidence scores for extracted topics."""
@@ -300,19 +625,9 @@ class CommentAnalyzer:
         try:
             text_lower = text.lower()
             
-            # Define intent patterns
-            intent_patterns = {
-                'question': ['?', 'what', 'how', 'why', 'when', 'where', 'who', 'which'],
-                'complaint': ['hate', 'terrible', 'awful', 'worst', 'horrible', 'disappointing'],
-                'praise': ['love', 'great', 'awesome', 'amazing', 'excellent', 'fantastic'],
-                'request': ['please', 'could', 'would', 'can you', 'please make'],
-                'suggestion': ['should', 'could', 'maybe', 'suggest', 'recommend'],
-                'feedback': ['suggest', 'recommend', 'think', 'feel', 'opinion']
-            }
-            
             # Score each intent
             intent_scores = {}
-            for intent, patterns in intent_patterns.items():
+            for intent, patterns in INTENT_PATTERNS.items():
                 score = sum(1 for pattern in patterns if pattern in text_lower)
                 intent_scores[intent] = score
             
@@ -384,11 +699,11 @@ class CommentAnalyzer:
                 score += 0.05
             
             # Contains URL (often lower quality)
-            if 'http' in text or 'www.' in text:
+            if any(marker in text for marker in URL_MARKERS):
                 score -= 0.1
             
             # Contains repeated characters (spam indicator)
-            if re.search(r'(.)\1{3,}', text):
+            if REPEATED_CHARACTERS.search(text):
                 score -= 0.2
             
             # Language quality (basic check)
@@ -430,8 +745,7 @@ class CommentAnalyzer:
                 score += 0.2
             
             # Emotional words
-            emotional_words = ['love', 'hate', 'amazing', 'terrible', 'awesome', 'worst']
-            emotional_count = sum(1 for word in emotional_words if word in text)
+            emotional_count = sum(1 for word in EMOTIONAL_WORDS if word in text)
             score += min(emotional_count * 0.1, 0.2)
             
             # Length factor (medium length tends to get more engagement)
@@ -442,8 +756,7 @@ class CommentAnalyzer:
                 score -= 0.1  # Very long comments often ignored
             
             # Call to action words
-            cta_words = ['check', 'watch', 'subscribe', 'like', 'share', 'comment']
-            cta_count = sum(1 for word in cta_words if word in text)
+            cta_count = sum(1 for word in CTA_WORDS if word in text)
             score += min(cta_count * 0.1, 0.2)
             
             # User factors
@@ -471,39 +784,9 @@ class CommentAnalyzer:
             Dictionary with trend analysis results
         """
         try:
-            if not comments:
-                return {}
-            
-            # Sentiment distribution
-            sentiment_counts = Counter(comment.sentiment_label for comment in comments if comment.sentiment_label)
-            
-            # Topic frequency
-            all_topics = []
-            for comment in comments:
-                all_topics.extend(comment.topics)
-            topic_counts = Counter(all_topics)
-            
-            # Intent distribution
-            intent_counts = Counter(comment.intent for comment in comments if comment.intent)
-            
-            # Quality metrics
-            quality_scores = [comment.quality_score for comment in comments if comment.quality_score is not None]
-            avg_quality = sum(quality_scores) / len(quality_scores) if quality_scores else 0.0
-            
-            # Engagement potential
-            engagement_scores = [comment.engagement_potential for comment in comments if comment.engagement_potential is not None]
-            avg_engagement = sum(engagement_scores) / len(engagement_scores) if engagement_scores else 0.0
-            
-            return {
-                'total_comments': len(comments),
-                'sentiment_distribution': dict(sentiment_counts),
-                'top_topics': dict(topic_counts.most_common(10)),
-                'intent_distribution': dict(intent_counts),
-                'average_quality_score': avg_quality,
-                'average_engagement_potential': avg_engagement,
-                'high_quality_comments': len([c for c in comments if (c.quality_score or 0) > 0.7]),
-                'high_engagement_potential': len([c for c in comments if (c.engagement_potential or 0) > 0.7])
-            }
+            aggregator = CommentTrendAggregator()
+            aggregator.update(comments)
+            return aggregator.to_dict()
             
         except Exception as e:
             logger.error(f"Trend analysis error: {e}")
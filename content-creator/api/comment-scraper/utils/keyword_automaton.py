@@ -0,0 +1,105 @@
+"""
+Keyword Matching Utilities.
+
+This module provides a compiled multi-lexicon keyword matcher that finds
+which keywords occur in a whole batch of texts in one pass per keyword,
+returning per-lexicon match counts as a NumPy matrix.
+"""
+
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+
+class KeywordAutomaton:
+    """
+    Matches keywords from several lexicons against many texts at once.
+
+    Keywords shared between lexicons are searched once. Texts are joined
+    into a single corpus and every keyword is located with C-level substring
+    search, so the cost per keyword is one scan of the batch; hits are mapped
+    back to their texts with a single vectorized lookup. Matching follows
+    ``keyword in text`` semantics: substrings count, and each keyword counts
+    once per text.
+    """
+
+    SEPARATOR = "\n"
+
+    def __init__(self, lexicons: Dict[str, Iterable[str]]):
+        """
+        Compile the lexicons.
+
+        Args:
+            lexicons: Mapping of lexicon name to its keywords
+        """
+        self.lexicon_names: List[str] = list(lexicons)
+        self.keywords: List[str] = []
+        keyword_index: Dict[str, int] = {}
+        memberships = []
+
+        for column, name in enumerate(self.lexicon_names):
+            for keyword in lexicons[name]:
+                if not keyword or self.SEPARATOR in keyword:
+                    raise ValueError(f"Invalid keyword {keyword!r} in lexicon '{name}'")
+                if keyword not in keyword_index:
+                    keyword_index[keyword] = len(self.keywords)
+                    self.keywords.append(keyword)
+                memberships.append((keyword_index[keyword], column))
+
+        # keywords x lexicons, counting repeats so sums match per-keyword loops
+        self.membership = np.zeros((len(self.keywords), len(self.lexicon_names)), dtype=np.int32)
+        for row, column in memberships:
+            self.membership[row, column] += 1
+
+        self._columns = {name: column for column, name in enumerate(self.lexicon_names)}
+
+    def column(self, lexicon: str) -> int:
+        """Get the result column of a lexicon."""
+        return self._columns[lexicon]
+
+    def find_keywords(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Find which keywords occur in each text.
+
+        Args:
+            texts: Texts to search (already normalized, e.g. lowercased)
+
+        Returns:
+            Boolean matrix of shape (texts, keywords)
+        """
+        present = np.zeros((len(texts), len(self.keywords)), dtype=bool)
+        if not texts:
+            return present
+
+        corpus, starts = self._join(texts)
+
+        for k, keyword in enumerate(self.keywords):
+            positions = []
+            position = corpus.find(keyword)
+            while position != -1:
+                positions.append(position)
+                position = corpus.find(keyword, position + len(keyword))
+            if positions:
+                present[np.searchsorted(starts, positions, side="right") - 1, k] = True
+
+        return present
+
+    def _join(self, texts: Sequence[str]) -> Tuple[str, np.ndarray]:
+        """Join texts into one corpus and get the start offset of each text."""
+        corpus = self.SEPARATOR.join(texts)
+        lengths = np.fromiter((len(text) for text in texts), dtype=np.int64, count=len(texts))
+        starts = np.zeros(len(texts), dtype=np.int64)
+        np.cumsum(lengths[:-1] + 1, out=starts[1:])
+        return corpus, starts
+
+    def count_matches(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Count the distinct keywords of each lexicon found in each text.
+
+        Args:
+            texts: Texts to search (already normalized, e.g. lowercased)
+
+        Returns:
+            Integer matrix of shape (texts, lexicons)
+        """
+        return self.find_keywords(texts).astype(np.int32) @ self.membership
@@ -3,14 +3,25 @@ Rate Limiting System for Comment Scraping.
 
 This module implements comprehensive rate limiting across all platforms
 to ensure compliance with API terms of service and prevent service abuse.
+
+Each platform (and optionally each endpoint) has its own token bucket.
+Requests wait in FIFO order for tokens, can carry a weighted cost such as
+YouTube quota units, and are charged against persisted daily counters.
+Bucket and counter state lives in a store: in memory by default, or in a
+SQLite file shared by several scraper processes.
 """
 
 import asyncio
+import json
+import math
+import os
+import sqlite3
+import tempfile
+import threading
 import time
-from typing import Dict, Optional, Tuple
+from typing import Any, Deque, Dict, Optional, Tuple
 from datetime import datetime, timedelta
-from collections import defaultdict, deque
-from dataclasses import dataclass, field
+from collections import deque
 import logging
 
 from ..models.comment_models import Platform, RateLimitInfo
@@ -18,58 +29,428 @@ from ..config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+# Units charged per request, by endpoint; unlisted endpoints cost 1
+ENDPOINT_COSTS: Dict[Platform, Dict[str, int]] = {
+    Platform.YOUTUBE: {
+        "search": 100,
+        "commentThreads": 1,
+        "comments": 1,
+        "videos": 1,
+        "channels": 1
+    }
+}
+
+
+def _utc_day() -> str:
+    """Current UTC date, the period daily counters are kept for."""
+    return datetime.utcnow().strftime("%Y-%m-%d")
 
-@dataclass
-class RateLimitWindow:
-    """Rate limit tracking window."""
-    requests: deque = field(default_factory=deque)
-    limit: int = 100  # requests per window
-    window_seconds: int = 60  # window size in seconds
-    
-    def can_make_request(self) -> bool:
-        """Check if a request can be made within rate limits."""
-        now = time.time()
-        
-        # Remove old requests outside the window
-        while self.requests and self.requests[0] < now - self.window_seconds:
-            self.requests.popleft()
-        
-        # Check if under limit
-        return len(self.requests) < self.limit
-    
-    def record_request(self) -> None:
-        """Record a new request."""
-        self.requests.append(time.time())
-    
-    def time_until_reset(self) -> float:
-        """Get seconds until rate limit resets."""
-        if not self.requests:
-            return 0
-        
-        oldest_request = self.requests[0]
-        reset_time = oldest_request + self.window_seconds
-        return max(0, reset_time - time.time())
-    
-    def remaining_requests(self) -> int:
-        """Get number of requests remaining in current window."""
-        now = time.time()
-        
-        # Remove old requests
-        while self.requests and self.requests[0] < now - self.window_seconds:
-            self.requests.popleft()
-        
-        return max(0, self.limit - len(self.requests))
+
+class MemoryRateLimitStore:
+    """
+    In-process rate limit state.
+    
+    Token buckets live in memory. Daily counters are also written to a JSON
+    file, when one is given, so usage survives restarts.
+    """
+    
+    def __init__(self, state_file: Optional[str] = None):
+        """
+        Initialize the store.
+        
+        Args:
+            state_file: JSON file for daily counters (not persisted if None)
+        """
+        self.state_file = state_file
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._daily: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+        self._load_daily()
+    
+    def try_acquire(
+        self,
+        key: str,
+        cost: float,
+        rate: float,
+        capacity: float,
+        daily_key: Optional[str] = None,
+        daily_limit: Optional[int] = None
+    ) -> float:
+        """
+        Take tokens from a bucket and charge the daily counter.
+        
+        Args:
+            key: Bucket key
+            cost: Tokens to take
+            rate: Refill rate in tokens per second
+            capacity: Bucket size
+            daily_key: Daily counter to charge, if any
+            daily_limit: Daily limit for the counter
+        
+        Returns:
+            0 if granted, seconds until enough tokens otherwise, or infinity
+            if the daily limit would be exceeded
+        """
+        with self._lock:
+            now = time.monotonic()
+            tokens = self._refill(key, rate, capacity, now)
+            
+            if daily_key and daily_limit is not None:
+                if self._daily_used(daily_key) + cost > daily_limit:
+                    return math.inf
+            
+            if tokens < cost:
+                return (cost - tokens) / rate
+            
+            self._buckets[key] = (tokens - cost, now)
+            if daily_key:
+                self._charge_daily(daily_key, cost)
+            return 0.0
+    
+    def refund(self, key: str, cost: float, rate: float, capacity: float) -> None:
+        """Return tokens taken for a request that was not made."""
+        with self._lock:
+            now = time.monotonic()
+            self._buckets[key] = (min(capacity, self._refill(key, rate, capacity, now) + cost), now)
+    
+    def available(self, key: str, rate: float, capacity: float) -> float:
+        """Get the tokens currently in a bucket."""
+        with self._lock:
+            return self._refill(key, rate, capacity, time.monotonic())
+    
+    def daily_usage(self, daily_key: str) -> int:
+        """Get today's usage for a daily counter."""
+        with self._lock:
+            return self._daily_used(daily_key)
+    
+    def reset(self, key: str) -> None:
+        """Refill a bucket."""
+        with self._lock:
+            self._buckets.pop(key, None)
+    
+    def _refill(self, key: str, rate: float, capacity: float, now: float) -> float:
+        tokens, updated = self._buckets.get(key, (capacity, now))
+        return min(capacity, tokens + (now - updated) * rate)
+    
+    def _daily_used(self, daily_key: str) -> int:
+        return self._daily.get(_utc_day(), {}).get(daily_key, 0)
+    
+    def _charge_daily(self, daily_key: str, cost: float) -> None:
+        today = _utc_day()
+        if today not in self._daily:
+            # Keep only the current day
+            self._daily = {today: {}}
+        counters = self._daily[today]
+        counters[daily_key] = counters.get(daily_key, 0) + int(cost)
+        self._save_daily()
+    
+    def _load_daily(self) -> None:
+        if not self.state_file or not os.path.exists(self.state_file):
+            return
+        try:
+            with open(self.state_file) as f:
+                self._daily = json.load(f).get("daily", {})
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not load rate limit state from {self.state_file}: {e}")
+    
+    def _save_daily(self) -> None:
+        if not self.state_file:
+            return
+        directory = os.path.dirname(os.path.abspath(self.state_file))
+        try:
+            fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                json.dump({"daily": self._daily}, f)
+            os.replace(temp_path, self.state_file)
+        except OSError as e:
+            logger.warning(f"Could not save rate limit state to {self.state_file}: {e}")
+
+
+class SQLiteRateLimitStore:
+    """
+    Rate limit state shared between processes through a local SQLite file.
+    
+    Every acquisition is a single IMMEDIATE transaction, so scraper workers
+    on the same machine draw from the same buckets and daily counters.
+    """
+    
+    def __init__(self, path: str, timeout: float = 30.0):
+        """
+        Initialize the store, creating its tables if needed.
+        
+        Args:
+            path: SQLite database file
+            timeout: Seconds to wait for another process's transaction
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=timeout, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS buckets (key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS daily_usage "
+            "(day TEXT NOT NULL, key TEXT NOT NULL, used INTEGER NOT NULL, PRIMARY KEY (day, key))"
+        )
+    
+    def try_acquire(
+        self,
+        key: str,
+        cost: float,
+        rate: float,
+        capacity: float,
+        daily_key: Optional[str] = None,
+        daily_limit: Optional[int] = None
+    ) -> float:
+        """Take tokens from a bucket and charge the daily counter (see MemoryRateLimitStore)."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()
+                tokens = self._refill(key, rate, capacity, now)
+                day = _utc_day()
+                
+                if daily_key and daily_limit is not None:
+                    if self._daily_used(day, daily_key) + cost > daily_limit:
+                        self._conn.execute("ROLLBACK")
+                        return math.inf
+                
+                if tokens < cost:
+                    self._conn.execute("ROLLBACK")
+                    return (cost - tokens) / rate
+                
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO buckets (key, tokens, updated) VALUES (?, ?, ?)",
+                    (key, tokens - cost, now)
+                )
+                if daily_key:
+                    self._conn.execute(
+                        "INSERT INTO daily_usage (day, key, used) VALUES (?, ?, ?) "
+                        "ON CONFLICT (day, key) DO UPDATE SET used = used + excluded.used",
+                        (day, daily_key, int(cost))
+                    )
+                self._conn.execute("COMMIT")
+                return 0.0
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+    
+    def refund(self, key: str, cost: float, rate: float, capacity: float) -> None:
+        """Return tokens taken for a request that was not made."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()
+                tokens = min(capacity, self._refill(key, rate, capacity, now) + cost)
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO buckets (key, tokens, updated) VALUES (?, ?, ?)",
+                    (key, tokens, now)
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+    
+    def available(self, key: str, rate: float, capacity: float) -> float:
+        """Get the tokens currently in a bucket."""
+        with self._lock:
+            return self._refill(key, rate, capacity, time.time())
+    
+    def daily_usage(self, daily_key: str) -> int:
+        """Get today's usage for a daily counter."""
+        with self._lock:
+            return self._daily_used(_utc_day(), daily_key)
+    
+    def reset(self, key: str) -> None:
+        """Refill a bucket."""
+        with self._lock:
+            self._conn.execute("DELETE FROM buckets WHERE key = ?", (key,))
+    
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+    
+    def _refill(self, key: str, rate: float, capacity: float, now: float) -> float:
+        row = self._conn.execute("SELECT tokens, updated FROM buckets WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return capacity
+        tokens, updated = row
+        return min(capacity, tokens + max(0.0, now - updated) * rate)
+    
+    def _daily_used(self, day: str, daily_key: str) -> int:
+        row = self._conn.execute(
+            "SELECT used FROM daily_usage WHERE day = ? AND key = ?", (day, daily_key)
+        ).fetchone()
+        return row[0] if row else 0
+
+
+class TokenBucket:
+    """
+    Token bucket with FIFO async waiters.
+    
+    Waiting requests queue in arrival order and a single dispatcher sleeps
+    until the request at the head can be served, so waking never stampedes
+    the store. State is kept in a rate limit store, which may be shared.
+    """
+    
+    def __init__(
+        self,
+        key: str,
+        limit: int,
+        window_seconds: float,
+        store: Any,
+        daily_key: Optional[str] = None,
+        daily_limit: Optional[int] = None
+    ):
+        """
+        Initialize the bucket.
+        
+        Args:
+            key: Store key for this bucket
+            limit: Units allowed per window (also the burst size)
+            window_seconds: Window size in seconds
+            store: Rate limit store holding the bucket state
+            daily_key: Daily counter charged by this bucket, if any
+            daily_limit: Daily limit for the counter
+        """
+        self.key = key
+        self.limit = limit
+        self.window_seconds = window_seconds
+        self.rate = limit / window_seconds
+        self.store = store
+        self.daily_key = daily_key
+        self.daily_limit = daily_limit
+        
+        self._waiters: Deque[Tuple[float, asyncio.Future]] = deque()
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    def try_acquire(self, cost: float = 1) -> float:
+        """
+        Take tokens without waiting.
+        
+        Args:
+            cost: Units the request costs
+        
+        Returns:
+            0 if granted, seconds until it could be granted otherwise, or
+            infinity if the daily limit would be exceeded
+        """
+        if cost > self.limit:
+            raise ValueError(f"Request cost {cost} exceeds bucket size {self.limit} for {self.key}")
+        if self._waiters:
+            # Queued requests go first
+            return max(cost / self.rate, 1e-3)
+        return self.store.try_acquire(self.key, cost, self.rate, self.limit, self.daily_key, self.daily_limit)
+    
+    async def acquire(self, cost: float = 1) -> None:
+        """
+        Wait until the request can be made, in FIFO order with other waiters.
+        
+        Args:
+            cost: Units the request costs
+        
+        Raises:
+            DailyQuotaExhausted: If the daily limit would be exceeded
+        """
+        if cost > self.limit:
+            raise ValueError(f"Request cost {cost} exceeds bucket size {self.limit} for {self.key}")
+        
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Waiters from a previous event loop can never be served
+            self._waiters.clear()
+            self._dispatcher = None
+            self._loop = loop
+        
+        if not self._waiters:
+            wait = self.store.try_acquire(self.key, cost, self.rate, self.limit, self.daily_key, self.daily_limit)
+            if wait == 0:
+                return
+            if math.isinf(wait):
+                raise DailyQuotaExhausted(self.daily_key, self.daily_limit)
+        
+        future = loop.create_future()
+        self._waiters.append((cost, future))
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = loop.create_task(self._dispatch())
+        await future
+    
+    def refund(self, cost: float = 1) -> None:
+        """
+        Give back tokens for a request that was granted but not made.
+        
+        Only the bucket is refilled; daily counters are not refunded, so
+        buckets with a daily limit should be charged last.
+        
+        Args:
+            cost: Units the request cost
+        """
+        self.store.refund(self.key, cost, self.rate, self.limit)
+    
+    @property
+    def waiting(self) -> int:
+        """Number of requests waiting for tokens."""
+        return sum(1 for _, future in self._waiters if not future.done())
+    
+    def available(self) -> float:
+        """Tokens currently available."""
+        return self.store.available(self.key, self.rate, self.limit)
+    
+    async def _dispatch(self) -> None:
+        """Serve waiters in order, sleeping only until the head can be served."""
+        try:
+            while self._waiters:
+                cost, future = self._waiters[0]
+                if future.done():
+                    # Cancelled while waiting
+                    self._waiters.popleft()
+                    continue
+                
+                wait = self.store.try_acquire(
+                    self.key, cost, self.rate, self.limit, self.daily_key, self.daily_limit
+                )
+                if wait == 0:
+                    self._waiters.popleft()
+                    future.set_result(None)
+                elif math.isinf(wait):
+                    self._waiters.popleft()
+                    future.set_exception(DailyQuotaExhausted(self.daily_key, self.daily_limit))
+                else:
+                    await asyncio.sleep(wait)
+        except Exception as e:
+            # A failing store must not leave requests waiting forever
+            logger.error(f"Rate limiter store error for {self.key}: {e}")
+            while self._waiters:
+                _, future = self._waiters.popleft()
+                if not future.done():
+                    future.set_exception(e)
 
 
 class RateLimiter:
     """Comprehensive rate limiter for multiple platforms."""
     
-    def __init__(self):
-        """Initialize the rate limiter with platform configurations."""
-        self._platform_limits: Dict[Platform, RateLimitWindow] = {}
-        self._endpoint_limits: Dict[str, RateLimitWindow] = defaultdict(lambda: RateLimitWindow())
+    def __init__(self, store: Optional[Any] = None):
+        """
+        Initialize the rate limiter with platform configurations.
+        
+        Args:
+            store: Rate limit store; defaults to a SQLite store shared between
+                processes if RATE_LIMIT_SHARED_STORE is set, otherwise an
+                in-memory store persisting daily counters to RATE_LIMIT_STATE_FILE
+        """
+        if store is None:
+            if settings.RATE_LIMIT_SHARED_STORE:
+                store = SQLiteRateLimitStore(settings.RATE_LIMIT_SHARED_STORE)
+            else:
+                store = MemoryRateLimitStore(settings.RATE_LIMIT_STATE_FILE or None)
+        self.store = store
+        
+        self._platform_limits: Dict[Platform, TokenBucket] = {}
+        self._endpoint_limits: Dict[Tuple[Platform, str], TokenBucket] = {}
         self._last_reset: Dict[Platform, datetime] = {}
-        self._lock = asyncio.Lock()
         
         # Initialize platform-specific limits
         self._initialize_limits()
@@ -77,11 +458,12 @@ class RateLimiter:
         logger.info("Rate limiter initialized with platform configurations")
     
     def _initialize_limits(self) -> None:
-        """Initialize rate limit windows for all platforms."""
+        """Initialize token buckets for all platforms."""
         platform_configs = {
             Platform.YOUTUBE: {
                 "limit": settings.YOUTUBE_RATE_LIMIT,
-                "window_seconds": 60
+                "window_seconds": 60,
+                "daily_limit": settings.YOUTUBE_DAILY_QUOTA
             },
             Platform.TWITTER: {
                 "limit": settings.TWITTER_RATE_LIMIT,
@@ -93,83 +475,144 @@ class RateLimiter:
             },
             Platform.TIKTOK: {
                 "limit": settings.TIKTOK_RATE_LIMIT,
-                "window_seconds": 60
+                "window_seconds": 60,
+                "daily_limit": settings.TIKTOK_DAILY_LIMIT
             }
         }
         
         for platform, config in platform_configs.items():
-            self._platform_limits[platform] = RateLimitWindow(
+            self._platform_limits[platform] = TokenBucket(
+                key=f"platform:{platform.value}",
                 limit=config["limit"],
-                window_seconds=config["window_seconds"]
+                window_seconds=config["window_seconds"],
+                store=self.store,
+                daily_key=platform.value,
+                daily_limit=config.get("daily_limit")
             )
             self._last_reset[platform] = datetime.utcnow()
     
-    async def acquire(self, platform: Platform, endpoint: str = "default") -> Tuple[bool, float]:
+    def configure_endpoint(
+        self,
+        platform: Platform,
+        endpoint: str,
+        limit: int,
+        window_seconds: float = 60
+    ) -> None:
         """
-        Acquire permission to make a request.
+        Add a limit for one endpoint, applied on top of the platform limit.
+        
+        Args:
+            platform: Platform the endpoint belongs to
+            endpoint: API endpoint name
+            limit: Units allowed per window
+            window_seconds: Window size in seconds
+        """
+        self._endpoint_limits[(platform, endpoint)] = TokenBucket(
+            key=f"endpoint:{platform.value}:{endpoint}",
+            limit=limit,
+            window_seconds=window_seconds,
+            store=self.store
+        )
+    
+    def get_request_cost(self, platform: Platform, endpoint: str = "default") -> int:
+        """Get the units a request to an endpoint costs."""
+        return ENDPOINT_COSTS.get(platform, {}).get(endpoint, 1)
+    
+    async def acquire(self, platform: Platform, endpoint: str = "default", cost: Optional[int] = None) -> None:
+        """
+        Wait for permission to make a request.
+        
+        Requests queue in FIFO order per bucket; the endpoint limit (if
+        configured) is acquired before the platform limit, and its tokens
+        are refunded if the platform limit is not granted.
         
         Args:
             platform: Platform to make request for
             endpoint: API endpoint being accessed
-            
+            cost: Units the request costs (defaults to the endpoint's cost)
+        
+        Raises:
+            DailyLimitExceeded: When the platform's daily limit would be exceeded
+        """
+        platform_bucket = self._platform_limits.get(platform)
+        if not platform_bucket:
+            logger.warning(f"No rate limit configured for platform {platform}")
+            return
+        
+        cost = self.get_request_cost(platform, endpoint) if cost is None else cost
+        
+        endpoint_bucket = self._endpoint_limits.get((platform, endpoint))
+        if endpoint_bucket:
+            await endpoint_bucket.acquire(cost)
+        
+        try:
+            await platform_bucket.acquire(cost)
+        except BaseException as e:
+            # The request will not be made, so its endpoint tokens are not spent
+            if endpoint_bucket:
+                endpoint_bucket.refund(cost)
+            if isinstance(e, DailyQuotaExhausted):
+                raise DailyLimitExceeded(platform, platform_bucket.daily_limit, self.get_daily_usage(platform))
+            raise
+        
+        logger.debug(f"Request allowed for {platform}:{endpoint} (cost {cost})")
+    
+    def try_acquire(self, platform: Platform, endpoint: str = "default", cost: Optional[int] = None) -> Tuple[bool, float]:
+        """
+        Take permission for a request without waiting.
+        
+        Args:
+            platform: Platform to make request for
+            endpoint: API endpoint being accessed
+            cost: Units the request costs (defaults to the endpoint's cost)
+        
         Returns:
             Tuple of (can_proceed, wait_time_seconds)
         """
-        async with self._lock:
-            platform_window = self._platform_limits.get(platform)
-            endpoint_window = self._endpoint_limits.get(endpoint)
-            
-            if not platform_window:
-                logger.warning(f"No rate limit configured for platform {platform}")
-                return True, 0
-            
-            # Check platform-level limit
-            if not platform_window.can_make_request():
-                wait_time = platform_window.time_until_reset()
-                logger.info(
-                    f"Rate limit hit for {platform}. Waiting {wait_time:.2f} seconds"
-                )
-                return False, wait_time
-            
-            # Check endpoint-specific limit if configured
-            if endpoint_window and not endpoint_window.can_make_request():
-                wait_time = endpoint_window.time_until_reset()
-                logger.info(
-                    f"Rate limit hit for endpoint {endpoint}. Waiting {wait_time:.2f} seconds"
-                )
-                return False, wait_time
-            
-            # Record the request
-            platform_window.record_request()
-            if endpoint_window:
-                endpoint_window.record_request()
-            
-            logger.debug(f"Request allowed for {platform}:{endpoint}")
+        platform_bucket = self._platform_limits.get(platform)
+        if not platform_bucket:
             return True, 0
-    
-    async def wait_for_capacity(self, platform: Platform, endpoint: str = "default") -> None:
-        """Wait until capacity is available for a request."""
-        can_proceed, wait_time = await self.acquire(platform, endpoint)
         
-        if not can_proceed:
-            logger.info(f"Waiting {wait_time:.2f} seconds for rate limit reset")
-            await asyncio.sleep(wait_time)
+        cost = self.get_request_cost(platform, endpoint) if cost is None else cost
+        
+        endpoint_bucket = self._endpoint_limits.get((platform, endpoint))
+        if endpoint_bucket:
+            wait_time = endpoint_bucket.try_acquire(cost)
+            if wait_time:
+                return False, wait_time
+        
+        wait_time = platform_bucket.try_acquire(cost)
+        if wait_time:
+            if endpoint_bucket:
+                endpoint_bucket.refund(cost)
+            logger.info(f"Rate limit hit for {platform}. Retry in {wait_time:.2f} seconds")
+            return False, wait_time
+        
+        return True, 0
+    
+    async def wait_for_capacity(self, platform: Platform, endpoint: str = "default", cost: Optional[int] = None) -> None:
+        """Wait until capacity is available for a request, then take it."""
+        await self.acquire(platform, endpoint, cost)
     
     def get_status(self, platform: Platform) -> Optional[RateLimitInfo]:
         """Get current rate limit status for a platform."""
-        platform_window = self._platform_limits.get(platform)
+        bucket = self._platform_limits.get(platform)
         
-        if not platform_window:
+        if not bucket:
             return None
         
+        available = bucket.available()
+        remaining = int(available)
+        time_until_full = (bucket.limit - available) / bucket.rate
+        
         return RateLimitInfo(
             platform=platform,
             endpoint="all",
-            limit=platform_window.limit,
-            remaining=platform_window.remaining_requests(),
-            reset_time=datetime.utcnow() + timedelta(seconds=platform_window.time_until_reset()),
-            is_limited=platform_window.remaining_requests() <= 0,
-            retry_after=int(platform_window.time_until_reset()) if platform_window.remaining_requests() <= 0 else None
+            limit=bucket.limit,
+            remaining=remaining,
+            reset_time=datetime.utcnow() + timedelta(seconds=time_until_full),
+            is_limited=remaining <= 0,
+            retry_after=math.ceil((1 - available) / bucket.rate) if remaining <= 0 else None
         )
     
     def get_all_status(self) -> Dict[Platform, RateLimitInfo]:
@@ -179,26 +622,24 @@ class RateLimiter:
     def reset_limits(self, platform: Platform) -> None:
         """Manually reset rate limits for a platform (used for testing)."""
         if platform in self._platform_limits:
-            self._platform_limits[platform].requests.clear()
+            self.store.reset(self._platform_limits[platform].key)
+            for (endpoint_platform, _), bucket in self._endpoint_limits.items():
+                if endpoint_platform == platform:
+                    self.store.reset(bucket.key)
             self._last_reset[platform] = datetime.utcnow()
             logger.info(f"Rate limits reset for {platform}")
     
     def get_daily_usage(self, platform: Platform) -> int:
-        """Get estimated daily usage for platforms with daily limits (e.g., TikTok)."""
-        if platform == Platform.TIKTOK:
-            # TikTok Research API has a fixed daily limit of 1000 requests
-            # This is a simplified calculation - in practice you'd track this properly
-            platform_window = self._platform_limits.get(platform)
-            if platform_window:
-                return len(platform_window.requests)
-        return 0
-    
-    def can_make_daily_request(self, platform: Platform) -> Tuple[bool, str]:
+        """Get today's usage (requests or quota units) for a platform."""
+        return self.store.daily_usage(platform.value)
+    
+    def can_make_daily_request(self, platform: Platform, cost: int = 1) -> Tuple[bool, str]:
         """Check if daily request limits allow for a new request."""
-        if platform == Platform.TIKTOK:
+        bucket = self._platform_limits.get(platform)
+        if bucket and bucket.daily_limit is not None:
             daily_usage = self.get_daily_usage(platform)
-            if daily_usage >= settings.TIKTOK_DAILY_LIMIT:
-                return False, f"Daily limit reached ({daily_usage}/{settings.TIKTOK_DAILY_LIMIT})"
+            if daily_usage + cost > bucket.daily_limit:
+                return False, f"Daily limit reached ({daily_usage}/{bucket.daily_limit})"
         
         return True, ""
 
@@ -217,18 +658,11 @@ class RateLimitMiddleware:
         Args:
             platform: Platform for the request
             endpoint: API endpoint being accessed
-            
+        
         Raises:
-            RateLimitExceeded: When rate limit is exceeded
+            DailyLimitExceeded: When the daily limit is exceeded
         """
-        can_proceed, wait_time = await self.rate_limiter.acquire(platform, endpoint)
-        
-        if not can_proceed:
-            # This could be raised as a custom exception
-            logger.warning(f"Rate limit exceeded for {platform}:{endpoint}, wait time: {wait_time:.2f}s")
-            await asyncio.sleep(wait_time)
-            # Retry after waiting
-            await self.rate_limiter.wait_for_capacity(platform, endpoint)
+        await self.rate_limiter.acquire(platform, endpoint)
     
     async def handle_batch(self, platform: Platform, requests: list, endpoint: str = "default") -> None:
         """
@@ -278,4 +712,13 @@ class DailyLimitExceeded(Exception):
         super().__init__(
             f"Daily request limit exceeded for {platform}. "
             f"Used {used}/{limit} requests today."
-        )
\ No newline at end of file
+        )
+
+
+class DailyQuotaExhausted(Exception):
+    """Raised by a token bucket when its daily counter is used up."""
+    
+    def __init__(self, daily_key: str, limit: int):
+        self.daily_key = daily_key
+        self.limit = limit
+        super().__init__(f"Daily limit of {limit} reached for {daily_key}")
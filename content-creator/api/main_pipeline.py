@@ -6,6 +6,7 @@ import asyncio
 import json
 import os
 import uuid
+from collections import OrderedDict
 from datetime import datetime
 from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass, asdict
@@ -17,6 +18,8 @@ from api.audio_processing import AudioPipeline, AudioMix
 from api.video_generation import VideoGenerationPipeline, VideoComposition
 from api.content_library import ContentLibraryManager, SceneMetadata, SearchQuery
 from api.sentiment_analysis import SentimentAnalysisPipeline, SentimentAnalysisPipelineFactory
+from api.stage_graph import PipelineStage, StageGraph, StageGraphError, StageRun
+from api.provider_batching import ProviderBatcher
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -64,6 +67,7 @@ class ContentCreationPipeline:
         self.script_generator = ScriptGenerator()
         self.audio_pipeline = None  # Will be initialized per request
         self.video_pipeline = None  # Will be initialized per request
+        self.provider_batcher = None  # Set while create_content_many is running
         self.content_library = ContentLibraryManager(f"{project_root}/content-library")
         self.sentiment_pipeline = SentimentAnalysisPipelineFactory.get_pipeline()
         
@@ -74,13 +78,24 @@ class ContentCreationPipeline:
             "failed_requests": 0,
             "average_processing_time": 0.0,
             "popular_platforms": {},
-            "error_rate": 0.0
+            "error_rate": 0.0,
+            "stage_timings": {}  # stage -> run counts and timings
         }
+        
+        # Outputs of completed stages for failed requests, so a retry only
+        # re-runs the failed stage and whatever depends on it
+        self.max_resumable_requests = 100
+        self._resumable_outputs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
     
     async def create_content(self, request: ContentCreationRequest) -> ContentCreationResult:
         """
         Main method to create content from idea to final output
         
+        Stages run through a dependency graph: audio and video generation both
+        start as soon as the script is ready, and the content library update
+        runs alongside the platform adaptations. If a previous attempt for the
+        same request failed, stages that completed then are reused.
+        
         Args:
             request: ContentCreationRequest with all requirements
             
@@ -95,24 +110,20 @@ class ContentCreationPipeline:
             # Update statistics
             self.stats["total_requests"] += 1
             
-            # Step 1: Generate script from idea
-            script = await self._generate_script(request)
-            
-            # Step 2: Generate audio (voiceover + background music)
-            audio_mixes = await self._generate_audio(request, script)
-            
-            # Step 3: Generate videos
-            video_compositions = await self._generate_videos(request, script)
+            cached_outputs = self._resumable_outputs.pop(request.id, None)
+            if cached_outputs:
+                logger.info(f"Resuming request {request.id} with cached stages: {list(cached_outputs)}")
             
-            # Step 4: Create platform-specific adaptations
-            platform_content = await self._create_platform_adaptations(
-                request, script, video_compositions, audio_mixes
+            outputs = await self._build_stage_graph(request).run(
+                cached_outputs=cached_outputs,
+                on_stage_complete=self._record_stage_run
             )
             
-            # Step 5: Add to content library if requested
-            library_scenes = []
-            if request.add_to_library:
-                library_scenes = await self._add_to_content_library(request, script, video_compositions)
+            script = outputs["script"]
+            audio_mixes = outputs["audio"]
+            video_compositions = outputs["videos"]
+            platform_content = outputs["platform_content"]
+            library_scenes = outputs["library_scenes"]
             
             # Calculate processing time
             processing_time = (datetime.now() - start_time).total_seconds()
@@ -144,7 +155,11 @@ class ContentCreationPipeline:
             self.stats["failed_requests"] += 1
             processing_time = (datetime.now() - start_time).total_seconds()
             
-            logger.error(f"Content creation failed: {e}")
+            if isinstance(e, StageGraphError):
+                logger.error(f"Content creation failed in stage '{e.stage}': {e}")
+                self._remember_stage_outputs(request.id, e.outputs)
+            else:
+                logger.error(f"Content creation failed: {e}")
             
             return ContentCreationResult(
                 id=str(uuid.uuid4()),
@@ -160,6 +175,130 @@ class ContentCreationPipeline:
                 created_at=datetime.now().isoformat()
             )
     
+    async def create_content_many(self,
+                                  requests: List[ContentCreationRequest],
+                                  max_concurrent_requests: int = 50,
+                                  video_batch_size: int = 20,
+                                  audio_batch_size: int = 50,
+                                  max_provider_calls: int = 4) -> List[ContentCreationResult]:
+        """
+        Create content for many requests with shared provider batching
+        
+        Voiceover texts (per voice) and video prompts from all requests in
+        flight are coalesced into provider-sized batches and the results are
+        fanned back out to each request. Provider calls across the whole run
+        share a single concurrency budget.
+        
+        Args:
+            requests: Requests to process
+            max_concurrent_requests: Requests processed at the same time
+            video_batch_size: Video prompts per provider call
+            audio_batch_size: Voiceover texts per provider call
+            max_provider_calls: Provider batches in flight at the same time
+            
+        Returns:
+            ContentCreationResult per request, in request order
+        """
+        
+        if self.provider_batcher is not None:
+            raise RuntimeError("create_content_many is already running on this pipeline")
+        
+        batcher = ProviderBatcher(
+            self.generated_content_dir,
+            video_batch_size=video_batch_size,
+            audio_batch_size=audio_batch_size,
+            max_provider_calls=max_provider_calls
+        )
+        request_slots = asyncio.Semaphore(max_concurrent_requests)
+        
+        async def run_request(request: ContentCreationRequest) -> ContentCreationResult:
+            async with request_slots:
+                return await self.create_content(request)
+        
+        logger.info(f"Creating content for {len(requests)} requests with shared provider batching")
+        
+        self.provider_batcher = batcher
+        try:
+            results = await asyncio.gather(*(run_request(request) for request in requests))
+            await batcher.drain()
+        finally:
+            self.provider_batcher = None
+        
+        self.stats["provider_batching"] = batcher.get_stats()
+        return list(results)
+    
+    def _build_stage_graph(self, request: ContentCreationRequest) -> StageGraph:
+        """Build the stage dependency graph for a request"""
+        
+        return StageGraph([
+            PipelineStage("script", lambda: self._generate_script(request)),
+            PipelineStage(
+                "audio",
+                lambda script: self._generate_audio(request, script),
+                depends_on=("script",)
+            ),
+            PipelineStage(
+                "videos",
+                lambda script: self._generate_videos(request, script),
+                depends_on=("script",)
+            ),
+            PipelineStage(
+                "platform_content",
+                lambda script, videos, audio: self._create_platform_adaptations(
+                    request, script, videos, audio
+                ),
+                depends_on=("script", "videos", "audio")
+            ),
+            PipelineStage(
+                "library_scenes",
+                lambda script, videos: self._add_to_content_library(request, script, videos),
+                depends_on=("script", "videos"),
+                condition=lambda: request.add_to_library,
+                default=[]
+            )
+        ])
+    
+    def _record_stage_run(self, stage_run: StageRun):
+        """Fold a finished stage into the per-stage timing statistics"""
+        
+        timings = self.stats["stage_timings"].setdefault(stage_run.name, {
+            "runs": 0,
+            "failures": 0,
+            "cached": 0,
+            "skipped": 0,
+            "total_time": 0.0,
+            "average_time": 0.0,
+            "last_time": 0.0
+        })
+        
+        if stage_run.status == "cached":
+            timings["cached"] += 1
+            return
+        if stage_run.status == "skipped":
+            timings["skipped"] += 1
+            return
+        if stage_run.status == "failed":
+            timings["failures"] += 1
+            return
+        if stage_run.status == "cancelled":
+            return
+        
+        timings["runs"] += 1
+        timings["total_time"] += stage_run.duration
+        timings["average_time"] = timings["total_time"] / timings["runs"]
+        timings["last_time"] = stage_run.duration
+    
+    def _remember_stage_outputs(self, request_id: str, outputs: Dict[str, Any]):
+        """Keep completed stage outputs of a failed request for a later retry"""
+        
+        if not outputs:
+            return
+        
+        self._resumable_outputs[request_id] = outputs
+        self._resumable_outputs.move_to_end(request_id)
+        while len(self._resumable_outputs) > self.max_resumable_requests:
+            self._resumable_outputs.popitem(last=False)
+    
     async def _generate_script(self, request: ContentCreationRequest) -> Script:
         """Generate script from the original idea"""
         
@@ -190,7 +329,10 @@ class ContentCreationPipeline:
         
         # Initialize audio pipeline for this request
         audio_pipeline = AudioPipeline(f"{self.generated_content_dir}/audio/{request.id}")
-        await audio_pipeline.initialize()
+        if self.provider_batcher is not None:
+            await self.provider_batcher.initialize_audio_pipeline(audio_pipeline)
+        else:
+            await audio_pipeline.initialize()
         
         self.audio_pipeline = audio_pipeline
         
@@ -245,6 +387,8 @@ class ContentCreationPipeline:
         
         # Initialize video pipeline for this request
         video_pipeline = VideoGenerationPipeline(f"{self.generated_content_dir}/videos/{request.id}")
+        if self.provider_batcher is not None:
+            self.provider_batcher.bind_video_pipeline(video_pipeline)
         self.video_pipeline = video_pipeline
         
         # Convert script scenes to video pipeline format
@@ -293,6 +437,9 @@ class ContentCreationPipeline:
         
         logger.info("Creating platform-specific adaptations...")
         
+        # Per-request pipeline: videos may come from an earlier attempt and
+        # other requests may be generating concurrently
+        video_pipeline = VideoGenerationPipeline(f"{self.generated_content_dir}/videos/{request.id}")
         platform_content = {}
         
         for platform in request.platforms:
@@ -316,7 +463,7 @@ class ContentCreationPipeline:
             
             # Generate thumbnail if requested
             if request.style_preferences.get("generate_thumbnails", True):
-                thumbnail_path = await self.video_pipeline.generate_thumbnail(
+                thumbnail_path = await video_pipeline.generate_thumbnail(
                     video_compositions[platform]
                 )
                 platform_data["video"]["thumbnail"] = thumbnail_path
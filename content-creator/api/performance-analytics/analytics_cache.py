@@ -0,0 +1,249 @@
+"""
+Analytics Cache Module
+
+Shared result cache for the analytics components. Bounded (least recently
+used entries are evicted first), with per-entry TTLs, invalidation by
+content id when new engagement data is written, and single-flight loading
+so concurrent identical queries share one database round trip.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Set
+
+from .config import AnalyticsConfig
+
+
+@dataclass
+class CacheEntry:
+    """A cached value with its expiry and the content it depends on"""
+    value: Any
+    expires_at: float
+    content_ids: Optional[Set[str]] = None  # None depends on all content
+
+
+@dataclass
+class CacheStats:
+    """Counters for cache effectiveness"""
+    hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+    
+    @property
+    def hit_ratio(self) -> float:
+        """Share of lookups served without loading, including coalesced waits"""
+        lookups = self.hits + self.coalesced + self.misses
+        return (self.hits + self.coalesced) / lookups if lookups else 0.0
+
+
+def _retrieve_exception(task: asyncio.Future):
+    """Mark a load's failure as retrieved when every caller has stopped waiting"""
+    if not task.cancelled():
+        task.exception()
+
+
+class AnalyticsCache:
+    """Bounded TTL cache shared by EngagementTracker, TrendAnalyzer and CorrelationAnalyzer
+    
+    Keys are strings prefixed by the kind of result (``summary:``,
+    ``trend:``, ``correlations:``). Each entry records the content ids its
+    result was computed from; ``invalidate_content`` drops those entries and
+    every entry computed across all content. A load that is still running
+    when its content is invalidated returns its result to the callers that
+    asked for it, but the stale result is not stored.
+    """
+    
+    def __init__(self, max_entries: int = None, default_ttl: float = None):
+        self.max_entries = max_entries or AnalyticsConfig.CACHE_MAX_SIZE
+        self.default_ttl = default_ttl if default_ttl is not None else AnalyticsConfig.CACHE_TTL_SECONDS
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._content_keys: Dict[str, Set[str]] = {}
+        self._global_keys: Set[str] = set()
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self._in_flight_content: Dict[str, Optional[Set[str]]] = {}
+        self._stale_loads: Set[str] = set()
+        self.stats = CacheStats()
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        """Get a live cached value, counting a hit or miss"""
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at <= time.monotonic():
+            self._remove(key)
+            self.stats.expirations += 1
+            entry = None
+        
+        if entry is None:
+            self.stats.misses += 1
+            return default
+        
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return entry.value
+    
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[float] = None,
+        content_ids: Optional[Iterable[str]] = None
+    ):
+        """
+        Store a value.
+        
+        Args:
+            key: Cache key
+            value: Value to cache
+            ttl: Seconds until the entry expires (default ``default_ttl``)
+            content_ids: Content the value was computed from; None means the
+                value depends on all content
+        """
+        if key in self._entries:
+            self._remove(key)
+        
+        ids = set(content_ids) if content_ids is not None else None
+        self._entries[key] = CacheEntry(
+            value=value,
+            expires_at=time.monotonic() + (self.default_ttl if ttl is None else ttl),
+            content_ids=ids
+        )
+        if ids is None:
+            self._global_keys.add(key)
+        else:
+            for content_id in ids:
+                self._content_keys.setdefault(content_id, set()).add(key)
+        
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+            self.stats.evictions += 1
+    
+    async def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: Optional[float] = None,
+        content_ids: Optional[Iterable[str]] = None
+    ) -> Any:
+        """
+        Get a cached value, or load it once for all concurrent callers.
+        
+        Callers asking for a key that is already loading wait for that load
+        instead of starting their own. None results and errors are returned
+        or raised to every waiting caller and are not cached.
+        """
+        missing = object()
+        value = self.get(key, missing)
+        if value is not missing:
+            return value
+        
+        pending = self._in_flight.get(key)
+        if pending is not None:
+            # Undo the miss counted by get(); this lookup shares a load
+            self.stats.misses -= 1
+            self.stats.coalesced += 1
+            return await asyncio.shield(pending)
+        
+        ids = set(content_ids) if content_ids is not None else None
+        # The load runs in its own task so cancelling any one caller, including
+        # the one that started it, does not fail the others
+        task = asyncio.ensure_future(self._load(key, loader, ttl, ids))
+        task.add_done_callback(_retrieve_exception)
+        self._in_flight[key] = task
+        self._in_flight_content[key] = ids
+        return await asyncio.shield(task)
+    
+    async def _load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: Optional[float],
+        ids: Optional[Set[str]]
+    ) -> Any:
+        """Run a loader and cache its result unless it was invalidated meanwhile"""
+        try:
+            value = await loader()
+            if value is not None and key not in self._stale_loads:
+                self.set(key, value, ttl=ttl, content_ids=ids)
+            return value
+        finally:
+            self._in_flight.pop(key, None)
+            self._in_flight_content.pop(key, None)
+            self._stale_loads.discard(key)
+    
+    def invalidate_content(self, content_ids: Iterable[str]) -> int:
+        """
+        Drop entries computed from the given content, and all-content entries.
+        
+        Returns:
+            Number of entries removed
+        """
+        content_ids = set(content_ids)
+        keys = set(self._global_keys)
+        for content_id in content_ids:
+            keys.update(self._content_keys.get(content_id, ()))
+        
+        # Loads still reading the old data must not store their results
+        for key, ids in self._in_flight_content.items():
+            if ids is None or not ids.isdisjoint(content_ids):
+                self._stale_loads.add(key)
+        
+        for key in keys:
+            self._remove(key)
+        self.stats.invalidations += len(keys)
+        return len(keys)
+    
+    def invalidate_prefix(self, prefix: str) -> int:
+        """Drop every entry whose key starts with ``prefix``"""
+        keys = [key for key in self._entries if key.startswith(prefix)]
+        for key in keys:
+            self._remove(key)
+        self.stats.invalidations += len(keys)
+        return len(keys)
+    
+    def clear(self):
+        """Drop all entries (statistics are kept)"""
+        self._entries.clear()
+        self._content_keys.clear()
+        self._global_keys.clear()
+        self._stale_loads.update(self._in_flight)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache size and hit statistics"""
+        return {
+            'size': len(self._entries),
+            'max_entries': self.max_entries,
+            'in_flight': len(self._in_flight),
+            'hits': self.stats.hits,
+            'misses': self.stats.misses,
+            'coalesced': self.stats.coalesced,
+            'hit_ratio': self.stats.hit_ratio,
+            'evictions': self.stats.evictions,
+            'expirations': self.stats.expirations,
+            'invalidations': self.stats.invalidations
+        }
+    
+    def keys(self, prefix: str = "") -> list:
+        """Get the cached keys, least recently used first"""
+        return [key for key in self._entries if key.startswith(prefix)]
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def _remove(self, key: str):
+        """Remove an entry and its content index references"""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        if entry.content_ids is None:
+            self._global_keys.discard(key)
+            return
+        for content_id in entry.content_ids:
+            keys = self._content_keys.get(content_id)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._content_keys[content_id]
@@ -17,6 +17,7 @@ import asyncpg
 import numpy as np
 import pandas as pd
 
+from .analytics_cache import AnalyticsCache
 from .engagement_tracker import EngagementTracker, EngagementSummary, Platform, MetricType
 from .correlation_analyzer import CorrelationAnalyzer, CorrelationResult, FeatureImportance
 from .trend_analyzer import TrendAnalyzer, TrendAnalysis, TrendDirection
@@ -98,11 +99,12 @@ class OptimizationInsight:
 class AnalyticsDashboard:
     """Main analytics dashboard providing unified access to all features"""
     
-    def __init__(self, db_pool: asyncpg.Pool):
+    def __init__(self, db_pool: asyncpg.Pool, cache: Optional[AnalyticsCache] = None):
         self.db_pool = db_pool
-        self.engagement_tracker = EngagementTracker(db_pool)
-        self.correlation_analyzer = CorrelationAnalyzer(db_pool)
-        self.trend_analyzer = TrendAnalyzer(db_pool)
+        self.cache = cache if cache is not None else AnalyticsCache()
+        self.engagement_tracker = EngagementTracker(db_pool, cache=self.cache)
+        self.correlation_analyzer = CorrelationAnalyzer(db_pool, cache=self.cache)
+        self.trend_analyzer = TrendAnalyzer(db_pool, cache=self.cache)
         self.logger = logging.getLogger(__name__)
         
     async def get_dashboard_overview(
@@ -23,6 +23,7 @@ from .correlation_analyzer import CorrelationAnalyzer
 from .trend_analyzer import TrendAnalyzer
 from .analytics_dashboard import AnalyticsDashboard, DashboardTimeframe
 from .integration import PerformanceAnalyticsManager
+from .analytics_cache import AnalyticsCache
 from .config import get_config_for_environment
 
 # Set up logging
@@ -113,6 +114,9 @@ class DashboardOverviewResponse(BaseModel):
 
 # Dependencies
 
+# Shared across requests; each request builds its own manager
+analytics_cache = AnalyticsCache()
+
 async def get_db_pool() -> asyncpg.Pool:
     """Dependency to get database pool"""
     # This would be configured based on your database setup
@@ -124,7 +128,7 @@ async def get_analytics_manager(db_pool: asyncpg.Pool = Depends(get_db_pool)) ->
     if not db_pool:
         raise HTTPException(status_code=500, detail="Database not available")
     
-    manager = PerformanceAnalyticsManager(db_pool)
+    manager = PerformanceAnalyticsManager(db_pool, cache=analytics_cache)
     return manager
 
 
@@ -168,7 +172,10 @@ async def system_status(manager: PerformanceAnalyticsManager = Depends(get_analy
             "database": "connected",
             "cache": {
                 "size": cache_stats['cache_size'],
-                "entries": cache_stats['cached_entries'][:5]  # Show first 5 entries
+                "entries": cache_stats['cached_entries'][:5],  # Show first 5 entries
+                "hit_ratio": cache_stats['hit_ratio'],
+                "evictions": cache_stats['evictions'],
+                "invalidations": cache_stats['invalidations']
             },
             "configuration": {
                 "environment": "development",  # Would be determined from environment
@@ -0,0 +1,280 @@
+"""
+Bulk Ingest Module
+
+Handles high-volume ingestion of engagement snapshots. Rows are staged in
+bulk (COPY on PostgreSQL, executemany on SQLite) and merged into
+engagement_snapshots with a single upsert statement per chunk.
+"""
+
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Sequence, Tuple
+
+import asyncpg
+
+
+# (seq, content_id, platform, timestamp, metrics, metadata)
+StagingRow = Tuple[int, str, str, Any, str, str]
+
+
+@dataclass
+class IngestResult:
+    """Outcome of a bulk ingestion run"""
+    ids: List[str] = field(default_factory=list)
+    rows_received: int = 0
+    rows_written: int = 0
+    rows_failed: int = 0
+    chunks: int = 0
+    failed_chunks: int = 0
+    elapsed_seconds: float = 0.0
+    
+    @property
+    def rows_per_second(self) -> float:
+        """Snapshots ingested per second of wall time"""
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.rows_written / self.elapsed_seconds
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary, without the per-row ids"""
+        return {
+            'rows_received': self.rows_received,
+            'rows_written': self.rows_written,
+            'rows_failed': self.rows_failed,
+            'chunks': self.chunks,
+            'failed_chunks': self.failed_chunks,
+            'elapsed_seconds': self.elapsed_seconds,
+            'rows_per_second': self.rows_per_second
+        }
+
+
+class PostgresBulkWriter:
+    """Writes snapshot chunks to PostgreSQL through a COPY-loaded staging table
+    
+    Each chunk runs in one transaction on one pooled connection: the rows are
+    streamed into a temporary staging table with the binary COPY protocol,
+    then merged with a single INSERT ... SELECT ... ON CONFLICT statement.
+    When a chunk holds several snapshots for the same content, platform and
+    day, the last one wins, as it would with one upsert per snapshot.
+    """
+    
+    CREATE_STAGING = """
+    CREATE TEMP TABLE engagement_snapshots_staging (
+        seq integer NOT NULL,
+        content_id text NOT NULL,
+        platform text NOT NULL,
+        timestamp timestamptz NOT NULL,
+        metrics jsonb NOT NULL,
+        metadata jsonb NOT NULL
+    ) ON COMMIT DROP
+    """
+    
+    STAGING_COLUMNS = ['seq', 'content_id', 'platform', 'timestamp', 'metrics', 'metadata']
+    
+    MERGE_STAGING = """
+    WITH merged AS (
+        INSERT INTO engagement_snapshots
+        (content_id, platform, timestamp, metrics, metadata)
+        SELECT DISTINCT ON (content_id, platform, timestamp::date)
+            content_id, platform, timestamp, metrics, metadata
+        FROM engagement_snapshots_staging
+        ORDER BY content_id, platform, timestamp::date, seq DESC
+        ON CONFLICT (content_id, platform, (timestamp::date))
+        DO UPDATE SET
+            metrics = EXCLUDED.metrics,
+            metadata = EXCLUDED.metadata,
+            updated_at = NOW()
+        RETURNING id, content_id, platform, timestamp::date AS day
+    )
+    SELECT s.seq, m.id
+    FROM engagement_snapshots_staging s
+    JOIN merged m
+    ON m.content_id = s.content_id
+    AND m.platform = s.platform
+    AND m.day = s.timestamp::date
+    """
+    
+    def __init__(self, db_pool: asyncpg.Pool):
+        self.db_pool = db_pool
+    
+    async def write_chunk(self, rows: Sequence[StagingRow]) -> List[Tuple[int, Any]]:
+        """Stage and merge one chunk, returning (seq, id) for every staged row"""
+        async with self.db_pool.acquire() as conn:
+            async with conn.transaction():
+                await conn.execute(self.CREATE_STAGING)
+                await conn.copy_records_to_table(
+                    'engagement_snapshots_staging',
+                    records=rows,
+                    columns=self.STAGING_COLUMNS
+                )
+                merged = await conn.fetch(self.MERGE_STAGING)
+        
+        return [(row['seq'], row['id']) for row in merged]
+
+
+class SQLiteBulkWriter:
+    """Writes snapshot chunks to a SQLite database
+    
+    A stand-in for PostgresBulkWriter in local development and tests. It
+    uses the same staging-then-merge shape, with executemany in place of
+    COPY. The connection is used from a worker thread so the event loop is
+    not blocked while a chunk is written.
+    """
+    
+    CREATE_TABLE = """
+    CREATE TABLE IF NOT EXISTS engagement_snapshots (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        content_id TEXT NOT NULL,
+        platform TEXT NOT NULL,
+        timestamp TEXT NOT NULL,
+        metrics TEXT NOT NULL,
+        metadata TEXT NOT NULL,
+        updated_at TEXT
+    )
+    """
+    
+    CREATE_DAY_INDEX = """
+    CREATE UNIQUE INDEX IF NOT EXISTS idx_engagement_snapshots_day
+    ON engagement_snapshots (content_id, platform, date(timestamp))
+    """
+    
+    CREATE_STAGING = """
+    CREATE TEMP TABLE IF NOT EXISTS engagement_snapshots_staging (
+        seq INTEGER NOT NULL,
+        content_id TEXT NOT NULL,
+        platform TEXT NOT NULL,
+        timestamp TEXT NOT NULL,
+        metrics TEXT NOT NULL,
+        metadata TEXT NOT NULL
+    )
+    """
+    
+    INSERT_STAGING = """
+    INSERT INTO engagement_snapshots_staging
+    (seq, content_id, platform, timestamp, metrics, metadata)
+    VALUES (?, ?, ?, ?, ?, ?)
+    """
+    
+    MERGE_STAGING = """
+    INSERT INTO engagement_snapshots
+    (content_id, platform, timestamp, metrics, metadata)
+    SELECT content_id, platform, timestamp, metrics, metadata
+    FROM engagement_snapshots_staging
+    WHERE seq IN (
+        SELECT MAX(seq) FROM engagement_snapshots_staging
+        GROUP BY content_id, platform, date(timestamp)
+    )
+    ORDER BY seq
+    ON CONFLICT (content_id, platform, date(timestamp))
+    DO UPDATE SET
+        metrics = excluded.metrics,
+        metadata = excluded.metadata,
+        updated_at = datetime('now')
+    """
+    
+    SELECT_STAGED_IDS = """
+    SELECT s.seq, e.id
+    FROM engagement_snapshots_staging s
+    JOIN engagement_snapshots e
+    ON e.content_id = s.content_id
+    AND e.platform = s.platform
+    AND date(e.timestamp) = date(s.timestamp)
+    """
+    
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(self.CREATE_TABLE)
+        self.conn.execute(self.CREATE_DAY_INDEX)
+        self.conn.execute(self.CREATE_STAGING)
+        self._lock = threading.Lock()
+    
+    async def write_chunk(self, rows: Sequence[StagingRow]) -> List[Tuple[int, Any]]:
+        """Stage and merge one chunk, returning (seq, id) for every staged row"""
+        return await asyncio.to_thread(self._write_chunk, rows)
+    
+    def _write_chunk(self, rows: Sequence[StagingRow]) -> List[Tuple[int, Any]]:
+        """Write one chunk in a single transaction"""
+        staged = [
+            (seq, content_id, platform, timestamp.isoformat(), metrics, metadata)
+            for seq, content_id, platform, timestamp, metrics, metadata in rows
+        ]
+        
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                self.conn.execute("DELETE FROM engagement_snapshots_staging")
+                self.conn.executemany(self.INSERT_STAGING, staged)
+                self.conn.execute(self.MERGE_STAGING)
+                merged = self.conn.execute(self.SELECT_STAGED_IDS).fetchall()
+                self.conn.execute("DELETE FROM engagement_snapshots_staging")
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+        
+        return merged
+    
+    def close(self):
+        """Close the database connection"""
+        self.conn.close()
+
+
+async def bulk_ingest(
+    writer,
+    rows: Sequence[Tuple[str, str, Any, str, str]],
+    chunk_size: int,
+    logger=None
+) -> IngestResult:
+    """
+    Ingest snapshot rows chunk by chunk through a bulk writer.
+    
+    Args:
+        writer: PostgresBulkWriter, SQLiteBulkWriter or any object with an
+            async ``write_chunk(rows)`` returning (seq, id) pairs
+        rows: (content_id, platform, timestamp, metrics_json, metadata_json)
+            tuples, in arrival order
+        chunk_size: Maximum rows per staging load and merge
+        logger: Optional logger for failed chunks
+    
+    Returns:
+        IngestResult whose ``ids`` hold the stored row id of every snapshot
+        in a successful chunk, in input order
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    
+    result = IngestResult(rows_received=len(rows))
+    started = time.perf_counter()
+    
+    for start in range(0, len(rows), chunk_size):
+        chunk = [(seq,) + tuple(row) for seq, row in enumerate(rows[start:start + chunk_size])]
+        result.chunks += 1
+        
+        try:
+            merged = await writer.write_chunk(chunk)
+        except Exception as e:
+            result.failed_chunks += 1
+            result.rows_failed += len(chunk)
+            if logger:
+                logger.error(f"Failed to ingest snapshots {start}-{start + len(chunk) - 1}: {e}")
+            continue
+        
+        ids_by_seq = dict(merged)
+        for seq in range(len(chunk)):
+            if seq in ids_by_seq:
+                result.ids.append(str(ids_by_seq[seq]))
+        result.rows_written += len(chunk)
+    
+    result.elapsed_seconds = time.perf_counter() - started
+    return result
+
+
+def encode_json(value: Dict[Any, Any]) -> str:
+    """Serialize a metrics or metadata mapping, using enum values as keys"""
+    return json.dumps({getattr(k, 'value', k): v for k, v in value.items()})
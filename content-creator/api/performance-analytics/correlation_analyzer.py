@@ -21,6 +21,8 @@ from scipy.stats import pearsonr, spearmanr
 import warnings
 warnings.filterwarnings('ignore')
 
+from .analytics_cache import AnalyticsCache
+
 
 class ContentFeature(Enum):
     """Types of content features to analyze"""
@@ -82,10 +84,10 @@ class FeatureImportance:
 class CorrelationAnalyzer:
     """Analyzes correlations between content features and performance"""
     
-    def __init__(self, db_pool: asyncpg.Pool):
+    def __init__(self, db_pool: asyncpg.Pool, cache: Optional[AnalyticsCache] = None):
         self.db_pool = db_pool
         self.logger = logging.getLogger(__name__)
-        self._cached_analysis = {}
+        self.cache = cache if cache is not None else AnalyticsCache()
         self._cache_duration = timedelta(hours=1)
         
     async def analyze_feature_correlations(
@@ -97,12 +99,30 @@ class CorrelationAnalyzer:
     ) -> List[CorrelationResult]:
         """Analyze correlations between features and performance metrics"""
         
-        cache_key = f"correlations:{hash(str(content_ids))}:{hash(str(platforms))}:{time_period_days}"
+        cache_key = (
+            f"correlations:{hash(str(content_ids))}:{hash(str(platforms))}:"
+            f"{time_period_days}:{significance_threshold}"
+        )
         
-        if cache_key in self._cached_analysis:
-            cached_entry = self._cached_analysis[cache_key]
-            if datetime.now() - cached_entry['timestamp'] < self._cache_duration:
-                return cached_entry['data']
+        # Concurrent requests for the same analysis share one query; analyses
+        # without a content filter depend on (and are invalidated by) all content
+        return await self.cache.get_or_load(
+            cache_key,
+            lambda: self._load_feature_correlations(
+                content_ids, platforms, time_period_days, significance_threshold
+            ),
+            ttl=self._cache_duration.total_seconds(),
+            content_ids=content_ids or None
+        )
+    
+    async def _load_feature_correlations(
+        self,
+        content_ids: Optional[List[str]],
+        platforms: Optional[List[str]],
+        time_period_days: int,
+        significance_threshold: float
+    ) -> List[CorrelationResult]:
+        """Query content features and performance and correlate them"""
         
         try:
             # Build base query
@@ -197,12 +217,6 @@ class CorrelationAnalyzer:
                 if correlation_result:
                     correlations.append(correlation_result)
             
-            # Cache results
-            self._cached_analysis[cache_key] = {
-                'data': correlations,
-                'timestamp': datetime.now()
-            }
-            
             return correlations
             
         except Exception as e:
@@ -592,4 +606,4 @@ class CorrelationAnalyzer:
     
     async def clear_cache(self):
         """Clear cached analysis results"""
-        self._cached_analysis.clear()
\ No newline at end of file
+        self.cache.invalidate_prefix("correlations:")
\ No newline at end of file
@@ -17,6 +17,9 @@ import asyncpg
 import numpy as np
 from scipy import stats
 
+from .analytics_cache import AnalyticsCache
+from .bulk_ingest import IngestResult, PostgresBulkWriter, bulk_ingest, encode_json
+
 
 class MetricType(Enum):
     """Types of engagement metrics to track"""
@@ -84,12 +87,23 @@ class EngagementSummary:
 class EngagementTracker:
     """Tracks and analyzes engagement metrics across platforms"""
     
-    def __init__(self, db_pool: asyncpg.Pool):
+    def __init__(
+        self,
+        db_pool: asyncpg.Pool,
+        bulk_writer=None,
+        bulk_chunk_size: int = 10000,
+        cache: Optional[AnalyticsCache] = None
+    ):
         self.db_pool = db_pool
         self.logger = logging.getLogger(__name__)
-        self._metric_cache = {}
+        self.cache = cache if cache is not None else AnalyticsCache()
         self._cache_duration = timedelta(minutes=5)
         
+        # Bulk ingestion (staging load + single merge per chunk)
+        self.bulk_writer = bulk_writer or PostgresBulkWriter(db_pool)
+        self.bulk_chunk_size = bulk_chunk_size
+        self.last_ingest: Optional[IngestResult] = None
+        
     async def track_engagement(self, snapshot: EngagementSnapshot) -> str:
         """Record a new engagement snapshot"""
         try:
@@ -98,7 +112,7 @@ class EngagementTracker:
             INSERT INTO engagement_snapshots 
             (content_id, platform, timestamp, metrics, metadata)
             VALUES ($1, $2, $3, $4, $5)
-            ON CONFLICT (content_id, platform, timestamp::date) 
+            ON CONFLICT (content_id, platform, (timestamp::date)) 
             DO UPDATE SET 
                 metrics = EXCLUDED.metrics,
                 metadata = EXCLUDED.metadata,
@@ -111,16 +125,12 @@ class EngagementTracker:
                 snapshot.content_id,
                 snapshot.platform.value,
                 snapshot.timestamp,
-                json.dumps(snapshot.metrics),
-                json.dumps(snapshot.metadata)
+                encode_json(snapshot.metrics),
+                encode_json(snapshot.metadata)
             )
             
-            # Update cache
-            cache_key = f"{snapshot.content_id}:{snapshot.platform.value}"
-            self._metric_cache[cache_key] = {
-                'data': snapshot,
-                'timestamp': datetime.now()
-            }
+            # Summaries and trends of this content are now stale
+            self.cache.invalidate_content([snapshot.content_id])
             
             return str(result)
             
@@ -136,13 +146,23 @@ class EngagementTracker:
     ) -> Optional[EngagementSummary]:
         """Get engagement summary for a specific content piece over a time period"""
         
-        cache_key = f"{content_id}:{platform.value}:{period_days}"
+        cache_key = f"summary:{content_id}:{platform.value}:{period_days}"
         
-        # Check cache first
-        if cache_key in self._metric_cache:
-            cache_entry = self._metric_cache[cache_key]
-            if datetime.now() - cache_entry['timestamp'] < self._cache_duration:
-                return cache_entry['data']
+        # Concurrent requests for the same summary share one query
+        return await self.cache.get_or_load(
+            cache_key,
+            lambda: self._load_engagement_summary(content_id, platform, period_days),
+            ttl=self._cache_duration.total_seconds(),
+            content_ids=[content_id]
+        )
+    
+    async def _load_engagement_summary(
+        self,
+        content_id: str,
+        platform: Platform,
+        period_days: int
+    ) -> Optional[EngagementSummary]:
+        """Query and summarize engagement snapshots"""
         
         try:
             end_date = datetime.now()
@@ -210,7 +230,7 @@ class EngagementTracker:
                     growth_rates[metric_type] = 0
                     trend_directions[metric_type] = "stable"
             
-            summary = EngagementSummary(
+            return EngagementSummary(
                 content_id=content_id,
                 platform=platform,
                 period_start=start_date,
@@ -221,36 +241,49 @@ class EngagementTracker:
                 trend_direction=trend_directions
             )
             
-            # Cache the result
-            self._metric_cache[cache_key] = {
-                'data': summary,
-                'timestamp': datetime.now()
-            }
-            
-            return summary
-            
         except Exception as e:
             self.logger.error(f"Error getting engagement summary: {e}")
             raise
     
-    async def batch_track_engagement(self, snapshots: List[EngagementSnapshot]) -> List[str]:
-        """Track multiple engagement snapshots in batch"""
-        tasks = []
-        for snapshot in snapshots:
-            task = self.track_engagement(snapshot)
-            tasks.append(task)
+    async def batch_track_engagement(
+        self,
+        snapshots: List[EngagementSnapshot],
+        chunk_size: Optional[int] = None
+    ) -> List[str]:
+        """Track multiple engagement snapshots in batch
+        
+        Snapshots are written in chunks of ``chunk_size`` (default
+        ``bulk_chunk_size``), each staged in bulk and merged with one
+        statement. Returns the stored id of every snapshot in a successful
+        chunk; failed chunks are logged and skipped. Throughput of the run
+        is kept in ``last_ingest``.
+        """
+        rows = [
+            (
+                snapshot.content_id,
+                snapshot.platform.value,
+                snapshot.timestamp,
+                encode_json(snapshot.metrics),
+                encode_json(snapshot.metadata)
+            )
+            for snapshot in snapshots
+        ]
+        
+        result = await bulk_ingest(
+            self.bulk_writer, rows, chunk_size or self.bulk_chunk_size, logger=self.logger
+        )
+        self.last_ingest = result
         
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        # Summaries and trends of the ingested content are now stale
+        if result.rows_written:
+            self.cache.invalidate_content({snapshot.content_id for snapshot in snapshots})
         
-        # Filter out exceptions and return valid IDs
-        valid_results = []
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                self.logger.error(f"Failed to track snapshot {i}: {result}")
-            else:
-                valid_results.append(result)
+        self.logger.info(
+            f"Ingested {result.rows_written}/{result.rows_received} snapshots in "
+            f"{result.chunks} chunks ({result.rows_per_second:.0f} rows/s)"
+        )
         
-        return valid_results
+        return result.ids
     
     async def get_platform_metrics(
         self, 
@@ -446,12 +479,14 @@ class EngagementTracker:
             raise
     
     async def clear_cache(self):
-        """Clear the metric cache"""
-        self._metric_cache.clear()
+        """Clear cached engagement summaries"""
+        self.cache.invalidate_prefix("summary:")
         
     async def get_cache_stats(self) -> Dict[str, Any]:
-        """Get cache statistics"""
+        """Get statistics of the shared analytics cache"""
+        stats = self.cache.get_stats()
         return {
-            'cache_size': len(self._metric_cache),
-            'cached_entries': list(self._metric_cache.keys())
+            'cache_size': stats['size'],
+            'cached_entries': self.cache.keys(),
+            **stats
         }
\ No newline at end of file
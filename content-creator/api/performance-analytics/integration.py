@@ -14,6 +14,7 @@ from dataclasses import asdict
 import asyncpg
 import logging
 
+from .analytics_cache import AnalyticsCache
 from .engagement_tracker import EngagementTracker, EngagementSnapshot, Platform, MetricType
 from .correlation_analyzer import CorrelationAnalyzer
 from .trend_analyzer import TrendAnalyzer
@@ -27,12 +28,15 @@ logger = logging.getLogger(__name__)
 class PerformanceAnalyticsManager:
     """Main manager class for the performance analytics system"""
     
-    def __init__(self, db_pool: asyncpg.Pool):
+    def __init__(self, db_pool: asyncpg.Pool, cache: Optional[AnalyticsCache] = None):
         self.db_pool = db_pool
-        self.engagement_tracker = EngagementTracker(db_pool)
-        self.correlation_analyzer = CorrelationAnalyzer(db_pool)
-        self.trend_analyzer = TrendAnalyzer(db_pool)
-        self.dashboard = AnalyticsDashboard(db_pool)
+        
+        # One cache for all components, so writes invalidate every cached view
+        self.cache = cache if cache is not None else AnalyticsCache()
+        self.engagement_tracker = EngagementTracker(db_pool, cache=self.cache)
+        self.correlation_analyzer = CorrelationAnalyzer(db_pool, cache=self.cache)
+        self.trend_analyzer = TrendAnalyzer(db_pool, cache=self.cache)
+        self.dashboard = AnalyticsDashboard(db_pool, cache=self.cache)
         
         logger.info("Performance Analytics Manager initialized")
     
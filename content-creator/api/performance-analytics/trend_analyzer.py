@@ -21,6 +21,8 @@ from scipy.signal import find_peaks
 import warnings
 warnings.filterwarnings('ignore')
 
+from .analytics_cache import AnalyticsCache
+
 
 class TrendDirection(Enum):
     """Trend direction indicators"""
@@ -87,10 +89,10 @@ class ForecastPoint:
 class TrendAnalyzer:
     """Analyzes trends and patterns in performance data"""
     
-    def __init__(self, db_pool: asyncpg.Pool):
+    def __init__(self, db_pool: asyncpg.Pool, cache: Optional[AnalyticsCache] = None):
         self.db_pool = db_pool
         self.logger = logging.getLogger(__name__)
-        self._trend_cache = {}
+        self.cache = cache if cache is not None else AnalyticsCache()
         self._cache_duration = timedelta(hours=2)
         
     async def analyze_trend(
@@ -104,10 +106,22 @@ class TrendAnalyzer:
         
         cache_key = f"trend:{content_id}:{metric_name}:{time_period_days}:{forecast_days}"
         
-        if cache_key in self._trend_cache:
-            cached_entry = self._trend_cache[cache_key]
-            if datetime.now() - cached_entry['timestamp'] < self._cache_duration:
-                return cached_entry['data']
+        # Concurrent requests for the same trend share one query
+        return await self.cache.get_or_load(
+            cache_key,
+            lambda: self._load_trend(content_id, metric_name, time_period_days, forecast_days),
+            ttl=self._cache_duration.total_seconds(),
+            content_ids=[content_id]
+        )
+    
+    async def _load_trend(
+        self,
+        content_id: str,
+        metric_name: str,
+        time_period_days: int,
+        forecast_days: int
+    ) -> Optional[TrendAnalysis]:
+        """Query the metric time series and analyze its trend"""
         
         try:
             end_date = datetime.now()
@@ -145,18 +159,10 @@ class TrendAnalyzer:
                 values.append(float(row['avg_value'] or 0))
             
             # Perform trend analysis
-            trend_analysis = await self._perform_trend_analysis(
+            return await self._perform_trend_analysis(
                 dates, values, metric_name, time_period_days, forecast_days
             )
             
-            # Cache result
-            self._trend_cache[cache_key] = {
-                'data': trend_analysis,
-                'timestamp': datetime.now()
-            }
-            
-            return trend_analysis
-            
         except Exception as e:
             self.logger.error(f"Error analyzing trend: {e}")
             raise
@@ -645,4 +651,4 @@ class TrendAnalyzer:
     
     async def clear_cache(self):
         """Clear cached trend analyses"""
-        self._trend_cache.clear()
\ No newline at end of file
+        self.cache.invalidate_prefix("trend:")
\ No newline at end of file
@@ -0,0 +1,217 @@
+"""
+Provider Batching - Coalesces TTS and video generation work across concurrent requests
+"""
+
+import asyncio
+import os
+import shutil
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+import logging
+
+from api.audio_processing import AudioPipeline
+from api.video_generation import VideoGenerationPipeline
+
+logger = logging.getLogger(__name__)
+
+class BatchCoalescer:
+    """Collects items submitted by many callers and processes them in shared batches
+
+    Items are grouped by key (e.g. voice) and a batch is sent as soon as it
+    reaches ``batch_size`` items, or ``max_wait`` seconds after its first item
+    arrived. Each caller gets back its own results in submission order.
+    Batches in flight are bounded by ``slots``, one at a time by default.
+    """
+
+    def __init__(self,
+                 process_batch: Callable[[Any, List[Any]], Awaitable[List[Any]]],
+                 batch_size: int,
+                 max_wait: float = 0.05,
+                 slots: Optional[asyncio.Semaphore] = None):
+        self.process_batch = process_batch
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+        self.slots = slots or asyncio.Semaphore(1)
+
+        self._buffers: Dict[Any, List[Tuple[Any, asyncio.Future]]] = {}
+        self._timers: Dict[Any, asyncio.TimerHandle] = {}
+        self._tasks: Set[asyncio.Task] = set()
+
+        self.stats = {
+            "items": 0,
+            "batches": 0,
+            "largest_batch": 0,
+            "failed_batches": 0
+        }
+
+    async def submit(self, key: Any, items: List[Any]) -> List[Any]:
+        """Queue items for batching and wait for their results"""
+
+        if not items:
+            return []
+
+        loop = asyncio.get_running_loop()
+        futures = []
+
+        for item in items:
+            future = loop.create_future()
+            buffer = self._buffers.setdefault(key, [])
+            buffer.append((item, future))
+            futures.append(future)
+
+            if len(buffer) >= self.batch_size:
+                self._flush(key)
+
+        if key in self._buffers and key not in self._timers:
+            self._timers[key] = loop.call_later(self.max_wait, self._flush, key)
+
+        return list(await asyncio.gather(*futures))
+
+    async def drain(self):
+        """Send all buffered items and wait for in-flight batches"""
+
+        for key in list(self._buffers):
+            self._flush(key)
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def _flush(self, key: Any):
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+
+        buffer = self._buffers.pop(key, None)
+        if not buffer:
+            return
+
+        task = asyncio.ensure_future(self._run_batch(key, buffer))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, key: Any, buffer: List[Tuple[Any, asyncio.Future]]):
+        items = [item for item, _ in buffer]
+
+        try:
+            async with self.slots:
+                results = await self.process_batch(key, items)
+            if len(results) != len(items):
+                raise RuntimeError(f"Provider returned {len(results)} results for a batch of {len(items)}")
+        except Exception as e:
+            self.stats["failed_batches"] += 1
+            logger.error(f"Batch of {len(items)} items failed: {e}")
+            for _, future in buffer:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self.stats["items"] += len(items)
+        self.stats["batches"] += 1
+        self.stats["largest_batch"] = max(self.stats["largest_batch"], len(items))
+
+        for (_, future), result in zip(buffer, results):
+            if not future.done():
+                future.set_result(result)
+
+class ProviderBatcher:
+    """Shares voiceover and video generation batches between requests
+
+    Per-request AudioPipeline and VideoGenerationPipeline instances are bound
+    to the batcher, which replaces their batch calls with submissions to
+    shared coalescers. Every item carries the output file of the request it
+    came from, so results land in that request's own directories. All
+    provider calls draw from one ``max_provider_calls`` budget.
+    """
+
+    def __init__(self,
+                 generated_content_dir: str,
+                 video_batch_size: int = 20,
+                 audio_batch_size: int = 50,
+                 max_provider_calls: int = 4,
+                 max_wait: float = 0.05):
+        self.generated_content_dir = generated_content_dir
+        self.provider_slots = asyncio.Semaphore(max_provider_calls)
+        self._voices: Optional[List[Dict[str, Any]]] = None
+        self._voices_lock = asyncio.Lock()
+
+        self.video = BatchCoalescer(self._generate_video_batch, video_batch_size, max_wait, self.provider_slots)
+        self.audio = BatchCoalescer(self._generate_audio_batch, audio_batch_size, max_wait, self.provider_slots)
+
+    def bind_video_pipeline(self, video_pipeline: VideoGenerationPipeline):
+        """Route a request's video batches through the shared coalescer"""
+
+        async def generate_video_batch(prompts: List[str], configs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+            # Resolve output files against the request's own directory before batching
+            items = [
+                (prompt, {**config, "output_path": video_pipeline._segment_output_path(config)})
+                for prompt, config in zip(prompts, configs)
+            ]
+            return await self.video.submit(None, items)
+
+        video_pipeline._generate_video_batch = generate_video_batch
+
+    async def initialize_audio_pipeline(self, audio_pipeline: AudioPipeline):
+        """Initialize and bind a request's audio pipeline, loading voices once per batcher"""
+
+        async with self._voices_lock:
+            if self._voices is None:
+                await audio_pipeline.initialize()
+                self._voices = audio_pipeline.voices
+        audio_pipeline.voices = list(self._voices)
+        self.bind_audio_pipeline(audio_pipeline)
+
+    def bind_audio_pipeline(self, audio_pipeline: AudioPipeline):
+        """Route a request's voiceover batches through the shared coalescer"""
+
+        async def generate_audio_batch(texts: List[str],
+                                       voice_id: str,
+                                       style_preferences: Dict[str, Any],
+                                       start_index: int = 0) -> List[str]:
+            # Resolve output files against the request's own directory before batching
+            items = [
+                (text, os.path.join(audio_pipeline.audio_dir, f"voiceover_{i:03d}.mp3"))
+                for i, text in enumerate(texts, start=start_index)
+            ]
+            return await self.audio.submit(voice_id, items)
+
+        audio_pipeline._generate_audio_batch = generate_audio_batch
+
+    async def drain(self):
+        """Wait for all buffered and in-flight provider batches"""
+
+        await asyncio.gather(self.video.drain(), self.audio.drain())
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get batch counts for both providers"""
+
+        return {
+            "video": dict(self.video.stats),
+            "audio": dict(self.audio.stats)
+        }
+
+    async def _generate_video_batch(self, key: Any, items: List[Tuple[str, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        pipeline = VideoGenerationPipeline(f"{self.generated_content_dir}/videos/batches")
+        return await pipeline._generate_video_batch(
+            prompts=[prompt for prompt, _ in items],
+            configs=[config for _, config in items]
+        )
+
+    async def _generate_audio_batch(self, voice_id: str, items: List[Tuple[str, str]]) -> List[str]:
+        # Voiceover files are named by position within a batch, so the batch is
+        # generated in a scratch directory and each file moved to its request
+        batch_dir = os.path.join(self.generated_content_dir, "audio", "batches", uuid.uuid4().hex)
+        pipeline = AudioPipeline(batch_dir)
+        try:
+            audio_files = await pipeline._generate_audio_batch(
+                texts=[text for text, _ in items], voice_id=voice_id, style_preferences={}
+            )
+            if len(audio_files) != len(items):
+                raise RuntimeError(f"Provider returned {len(audio_files)} voiceovers for a batch of {len(items)}")
+
+            output_paths = []
+            for audio_file, (_, output_path) in zip(audio_files, items):
+                os.makedirs(os.path.dirname(output_path), exist_ok=True)
+                shutil.move(audio_file, output_path)
+                output_paths.append(output_path)
+            return output_paths
+        finally:
+            shutil.rmtree(batch_dir, ignore_errors=True)
@@ -598,7 +598,9 @@ Animation: Button pulses, arrow indicators."""
             "instagram": base_tags[:10] + ["#productivity", "#lifestyle", "#inspiration"]
         }
         
-        return hashtags.get(platform, hashtags["youtube"])
+        # Script.hashtags is keyed by platform; unknown platforms use the YouTube set
+        hashtags.setdefault(platform, hashtags["youtube"])
+        return hashtags
 
     def export_script(self, script: Script, format: str = "json") -> str:
         """Export script to specified format"""
@@ -0,0 +1,71 @@
+"""
+Segment Timeline - Shared scene timeline assembly for the video and audio pipelines
+"""
+
+import asyncio
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, List, Sequence, Tuple
+
+class SegmentTimeline:
+    """Places segments back to back, tracking the running end offset
+
+    Each segment needs ``duration``, ``start_time`` and ``end_time``
+    attributes; placing one is O(1) regardless of how many came before.
+    """
+
+    def __init__(self, start_offset: float = 0.0):
+        self.offset = start_offset
+        self.count = 0
+
+    def place(self, segment: Any) -> Any:
+        """Set the segment's start/end times at the current offset and advance it"""
+
+        segment.start_time = self.offset
+        segment.end_time = segment.start_time + segment.duration
+        self.offset = segment.end_time
+        self.count += 1
+        return segment
+
+async def ordered_batches(items: Sequence[Any],
+                          process_batch: Callable[[List[Any], int], Awaitable[List[Any]]],
+                          batch_size: int,
+                          max_in_flight: int) -> AsyncIterator[Tuple[Any, Any]]:
+    """
+    Process items in concurrent batches and yield (item, result) pairs in input order
+
+    Up to ``max_in_flight`` batches run at once. Results are yielded as soon
+    as every earlier batch has finished, so consumers can start on the first
+    scenes while later ones are still generating.
+
+    Args:
+        items: Items to process, in timeline order
+        process_batch: Called with a batch of items and the index of its first item
+        batch_size: Items per batch
+        max_in_flight: Batches running concurrently
+    """
+
+    batch_size = max(1, batch_size)
+    max_in_flight = max(1, max_in_flight)
+    window: Deque[Tuple[List[Any], asyncio.Future]] = deque()
+    next_start = 0
+
+    try:
+        while next_start < len(items) or window:
+            while next_start < len(items) and len(window) < max_in_flight:
+                batch = list(items[next_start:next_start + batch_size])
+                window.append((batch, asyncio.ensure_future(process_batch(batch, next_start))))
+                next_start += len(batch)
+
+            batch, task = window.popleft()
+            results = await task
+            if len(results) != len(batch):
+                raise RuntimeError(f"Batch returned {len(results)} results for {len(batch)} items")
+
+            for item, result in zip(batch, results):
+                yield item, result
+    finally:
+        # Consumer stopped early or a batch failed: do not leave batches running
+        for _, task in window:
+            task.cancel()
+        if window:
+            await asyncio.gather(*(task for _, task in window), return_exceptions=True)
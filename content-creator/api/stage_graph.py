@@ -0,0 +1,183 @@
+"""
+Stage Graph - Declarative dependency graph executor for pipeline stages
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class PipelineStage:
+    """Single stage of a pipeline graph
+
+    ``func`` is called with the outputs of the stages listed in ``depends_on``
+    as keyword arguments. When ``condition`` returns False the stage is
+    skipped and ``default`` is used as its output.
+    """
+    name: str
+    func: Callable[..., Awaitable[Any]]
+    depends_on: Tuple[str, ...] = ()
+    condition: Optional[Callable[[], bool]] = None
+    default: Any = None
+
+@dataclass
+class StageRun:
+    """Execution record for one stage"""
+    name: str
+    status: str  # completed, failed, skipped, cached, cancelled
+    started_at: float  # seconds since the graph run started
+    duration: float
+    error: Optional[str] = None
+
+class StageGraphError(Exception):
+    """Raised when a stage fails; carries the outputs of the stages that completed"""
+
+    def __init__(self, stage: str, error: BaseException, outputs: Dict[str, Any], runs: List[StageRun]):
+        super().__init__(str(error))
+        self.stage = stage
+        self.error = error
+        self.outputs = outputs
+        self.runs = runs
+
+class StageGraph:
+    """Runs pipeline stages as soon as their dependencies have completed
+
+    Independent stages run concurrently, so a graph run takes about as long
+    as its longest dependency path rather than the sum of all stages.
+    """
+
+    def __init__(self, stages: List[PipelineStage]):
+        self.stages = {stage.name: stage for stage in stages}
+        if len(self.stages) != len(stages):
+            raise ValueError("Stage names must be unique")
+
+        for stage in stages:
+            unknown = [dep for dep in stage.depends_on if dep not in self.stages]
+            if unknown:
+                raise ValueError(f"Stage '{stage.name}' depends on unknown stages: {unknown}")
+
+        self.order = self._topological_order()
+
+    def _topological_order(self) -> List[str]:
+        """Order stages so every stage follows its dependencies, rejecting cycles"""
+
+        remaining = {name: set(stage.depends_on) for name, stage in self.stages.items()}
+        order = []
+
+        while remaining:
+            ready = [name for name, deps in remaining.items() if not deps]
+            if not ready:
+                raise ValueError(f"Stage graph contains a cycle between: {sorted(remaining)}")
+            for name in ready:
+                del remaining[name]
+                order.append(name)
+            for deps in remaining.values():
+                deps.difference_update(ready)
+
+        return order
+
+    def longest_path(self, durations: Dict[str, float]) -> float:
+        """Critical path length of the graph for the given per-stage durations"""
+
+        finish = {}
+        for name in self.order:
+            start = max((finish[dep] for dep in self.stages[name].depends_on), default=0.0)
+            finish[name] = start + durations.get(name, 0.0)
+        return max(finish.values(), default=0.0)
+
+    async def run(self,
+                  cached_outputs: Optional[Dict[str, Any]] = None,
+                  on_stage_complete: Optional[Callable[[StageRun], None]] = None) -> Dict[str, Any]:
+        """
+        Execute the graph
+
+        Args:
+            cached_outputs: Outputs from an earlier run; these stages are not re-executed
+            on_stage_complete: Called with the StageRun of each stage as it finishes
+
+        Returns:
+            Dict mapping stage name -> output
+
+        Raises:
+            StageGraphError: when a stage fails. No further stages are started, stages
+                already running are allowed to finish, and the outputs of all completed
+                stages are attached so a later run can resume from them.
+        """
+
+        run_started = time.perf_counter()
+        outputs: Dict[str, Any] = {}
+        runs: List[StageRun] = []
+
+        def record(stage_run: StageRun):
+            runs.append(stage_run)
+            if on_stage_complete:
+                on_stage_complete(stage_run)
+
+        for name in self.order:
+            if cached_outputs and name in cached_outputs:
+                outputs[name] = cached_outputs[name]
+                record(StageRun(name, "cached", 0.0, 0.0))
+
+        pending = [name for name in self.order if name not in outputs]
+        running: Dict[asyncio.Task, Tuple[str, float]] = {}
+        failure: Optional[Tuple[str, BaseException]] = None
+
+        try:
+            while (pending and failure is None) or running:
+                # Start every stage whose dependencies are available
+                for name in list(pending if failure is None else ()):
+                    stage = self.stages[name]
+                    if not all(dep in outputs for dep in stage.depends_on):
+                        continue
+                    pending.remove(name)
+
+                    if stage.condition is not None and not stage.condition():
+                        outputs[name] = stage.default
+                        record(StageRun(name, "skipped", time.perf_counter() - run_started, 0.0))
+                        continue
+
+                    kwargs = {dep: outputs[dep] for dep in stage.depends_on}
+                    task = asyncio.ensure_future(stage.func(**kwargs))
+                    running[task] = (name, time.perf_counter())
+
+                if not running:
+                    # Skipped stages may have unblocked others
+                    continue
+
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                finished_at = time.perf_counter()
+
+                for task in done:
+                    name, started = running.pop(task)
+                    stage_run = StageRun(name, "completed", started - run_started, finished_at - started)
+
+                    if task.exception() is not None:
+                        error = task.exception()
+                        stage_run.status = "failed"
+                        stage_run.error = str(error)
+                        record(stage_run)
+                        logger.error(f"Stage '{name}' failed after {stage_run.duration:.2f}s: {error}")
+                        if failure is None:
+                            failure = (name, error)
+                        continue
+
+                    outputs[name] = task.result()
+                    record(stage_run)
+        finally:
+            # Only reached with running stages when the run itself is cancelled
+            if running:
+                for task in running:
+                    task.cancel()
+                await asyncio.gather(*running, return_exceptions=True)
+                cancelled_at = time.perf_counter()
+                for name, started in running.values():
+                    record(StageRun(name, "cancelled", started - run_started, cancelled_at - started))
+
+        if failure is not None:
+            raise StageGraphError(failure[0], failure[1], outputs, runs)
+
+        return outputs
@@ -5,12 +5,16 @@ Video Generation Pipeline - Handles text-to-video and image-to-video generation
 import asyncio
 import json
 import os
+import sys
 import uuid
 from datetime import datetime
-from typing import Dict, List, Any, Optional, Tuple
+from typing import AsyncIterator, Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass, asdict
 import logging
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from segment_timeline import SegmentTimeline, ordered_batches
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -52,6 +56,8 @@ class VideoGenerationPipeline:
         self.videos_dir = videos_dir
         self.generation_queue = []
         self.quality_threshold = 6.0
+        self.batch_size = 5  # Scenes per provider call
+        self.max_in_flight_batches = 4
         
     async def generate_video_from_script(self, 
                                         script_scenes: List[Dict[str, Any]],
@@ -71,11 +77,42 @@ class VideoGenerationPipeline:
             List of VideoSegment objects
         """
         
+        video_segments = [
+            segment async for segment in self.stream_video_from_script(
+                script_scenes, resolution, fps, style_preferences
+            )
+        ]
+        
+        logger.info(f"Generated {len(video_segments)} video segments")
+        return video_segments
+    
+    async def stream_video_from_script(self, 
+                                      script_scenes: List[Dict[str, Any]],
+                                      resolution: str = "1920x1080",
+                                      fps: int = 30,
+                                      style_preferences: Optional[Dict[str, Any]] = None) -> AsyncIterator[VideoSegment]:
+        """
+        Generate video segments from script scenes, yielding them in scene order
+        
+        Batches of ``batch_size`` scenes run concurrently, up to
+        ``max_in_flight_batches`` at a time. Each segment is yielded with its
+        final start/end times as soon as all earlier scenes are done, so
+        composition can begin before the last scene finishes.
+        
+        Args:
+            script_scenes: List of script scenes with visual descriptions
+            resolution: Target video resolution
+            fps: Frames per second
+            style_preferences: Visual style preferences
+            
+        Yields:
+            VideoSegment objects in scene order
+        """
+        
         logger.info(f"Generating videos for {len(script_scenes)} scenes")
         
         # Prepare generation prompts
-        prompts = []
-        segment_configs = []
+        scene_jobs = []
         
         for scene in script_scenes:
             visual_description = scene.get("visual_description", "")
@@ -86,52 +123,39 @@ class VideoGenerationPipeline:
                 visual_description, style_preferences or {}
             )
             
-            prompts.append(enhanced_prompt)
-            segment_configs.append({
+            scene_jobs.append((enhanced_prompt, {
                 "scene_id": scene.get("id", str(uuid.uuid4())),
                 "duration": scene_duration,
                 "resolution": resolution,
                 "scene_number": scene.get("scene_number", 0)
-            })
-        
-        # Generate videos in batches
-        video_segments = []
-        batch_size = 5  # Process 5 scenes at a time
+            }))
         
-        for i in range(0, len(prompts), batch_size):
-            batch_prompts = prompts[i:i + batch_size]
-            batch_configs = segment_configs[i:i + batch_size]
-            
-            logger.info(f"Processing batch {i//batch_size + 1} ({len(batch_prompts)} scenes)")
-            
-            # Generate batch of videos
-            batch_videos = await self._generate_video_batch(
-                prompts=batch_prompts,
-                configs=batch_configs
+        async def generate_batch(batch: List[Tuple[str, Dict[str, Any]]], start: int) -> List[Dict[str, Any]]:
+            logger.info(f"Processing batch {start // self.batch_size + 1} ({len(batch)} scenes)")
+            return await self._generate_video_batch(
+                prompts=[prompt for prompt, _ in batch],
+                configs=[config for _, config in batch]
             )
-            
-            # Convert to VideoSegment objects
-            for video_result, config in zip(batch_videos, batch_configs):
-                segment = VideoSegment(
-                    id=str(uuid.uuid4()),
-                    scene_id=config["scene_id"],
-                    prompt=batch_prompts[batch_videos.index(video_result)],
-                    duration=config["duration"],
-                    resolution=config["resolution"],
-                    file_path=video_result["file_path"],
-                    start_time=sum(s.duration for s in video_segments),
-                    end_time=0,  # Will be calculated
-                    quality_score=video_result.get("quality_score", 7.0),
-                    generation_method="text_to_video",
-                    reference_images=[],
-                    style_settings=style_preferences or {}
-                )
-                
-                segment.end_time = segment.start_time + segment.duration
-                video_segments.append(segment)
         
-        logger.info(f"Generated {len(video_segments)} video segments")
-        return video_segments
+        timeline = SegmentTimeline()
+        
+        async for (prompt, config), video_result in ordered_batches(
+            scene_jobs, generate_batch, self.batch_size, self.max_in_flight_batches
+        ):
+            yield timeline.place(VideoSegment(
+                id=str(uuid.uuid4()),
+                scene_id=config["scene_id"],
+                prompt=prompt,
+                duration=config["duration"],
+                resolution=config["resolution"],
+                file_path=video_result["file_path"],
+                start_time=0,  # Set by the timeline
+                end_time=0,
+                quality_score=video_result.get("quality_score", 7.0),
+                generation_method="text_to_video",
+                reference_images=[],
+                style_settings=style_preferences or {}
+            ))
     
     async def _generate_video_batch(self, 
                                    prompts: List[str],
@@ -142,7 +166,7 @@ class VideoGenerationPipeline:
         
         # Create output file paths
         for i, config in enumerate(configs):
-            output_path = os.path.join(self.videos_dir, f"scene_{config['scene_number']:03d}.mp4")
+            output_path = self._segment_output_path(config)
             os.makedirs(os.path.dirname(output_path), exist_ok=True)
             output_files.append(output_path)
         
@@ -172,6 +196,13 @@ class VideoGenerationPipeline:
         
         return generated_videos
     
+    def _segment_output_path(self, config: Dict[str, Any]) -> str:
+        """Output file for a scene, honouring an explicit output_path in its config"""
+        
+        return config.get("output_path") or os.path.join(
+            self.videos_dir, f"scene_{config['scene_number']:03d}.mp4"
+        )
+    
     def _enhance_video_prompt(self, 
                              visual_description: str, 
                              style_preferences: Dict[str, Any]) -> str:
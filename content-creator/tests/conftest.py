@@ -0,0 +1,39 @@
+"""
+Shared test helpers - loading the comment scraper package
+
+The comment scraper lives in a dashed directory (api/comment-scraper), so it
+cannot be imported by name. Test modules that need it call
+load_comment_scraper() before importing from ``comment_scraper``; nothing is
+loaded for the other test modules.
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+COMMENT_SCRAPER_DIR = Path(__file__).parent.parent / "api" / "comment-scraper"
+
+
+def load_comment_scraper():
+    """Register the comment scraper as the ``comment_scraper`` package
+
+    Skips the calling test module when the package cannot be imported, e.g.
+    its settings need pydantic v1 ``BaseSettings``.
+    """
+    if "comment_scraper" in sys.modules:
+        return sys.modules["comment_scraper"]
+    spec = importlib.util.spec_from_file_location(
+        "comment_scraper", COMMENT_SCRAPER_DIR / "__init__.py",
+        submodule_search_locations=[str(COMMENT_SCRAPER_DIR)]
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["comment_scraper"] = module
+    try:
+        spec.loader.exec_module(module)
+    except ImportError as e:
+        for name in [name for name in sys.modules if name.split(".")[0] == "comment_scraper"]:
+            del sys.modules[name]
+        pytest.skip(f"comment_scraper cannot be imported: {e}", allow_module_level=True)
+    return module
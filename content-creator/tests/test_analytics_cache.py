@@ -0,0 +1,162 @@
+"""
+Test Script - Shared analytics cache for performance-analytics
+"""
+
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta
+
+import test_engagement_bulk_ingest  # noqa: F401  (loads the performance_analytics package)
+from performance_analytics.analytics_cache import AnalyticsCache
+from performance_analytics.correlation_analyzer import CorrelationAnalyzer
+from performance_analytics.engagement_tracker import (
+    EngagementSnapshot, EngagementTracker, MetricType, Platform
+)
+from performance_analytics.trend_analyzer import TrendAnalyzer
+
+
+class FakePool:
+    """Stands in for asyncpg.Pool, serving snapshot rows and counting queries"""
+
+    def __init__(self, views=100.0):
+        self.views = views
+        self.fetches = 0
+
+    async def fetch(self, query, *args):
+        self.fetches += 1
+        await asyncio.sleep(0.01)
+        now = datetime.now()
+        return [
+            {"timestamp": now - timedelta(days=3 - i),
+             "metrics": json.dumps({"views": self.views + i, "likes": 10.0})}
+            for i in range(3)
+        ]
+
+    async def fetchval(self, query, *args):
+        self.views += 50
+        return 1
+
+
+def make_snapshot(content_id="video_1"):
+    return EngagementSnapshot(
+        content_id=content_id,
+        platform=Platform.YOUTUBE,
+        timestamp=datetime.now(),
+        metrics={MetricType.VIEWS: 150.0},
+        metadata={}
+    )
+
+
+def test_cache_is_bounded_and_expires_entries():
+    cache = AnalyticsCache(max_entries=3, default_ttl=60)
+    for i in range(5):
+        cache.set(f"summary:c{i}", i, content_ids=[f"c{i}"])
+
+    assert cache.keys() == ["summary:c2", "summary:c3", "summary:c4"]
+    assert cache.get("summary:c0") is None
+    assert cache.get("summary:c2") == 2
+
+    cache.set("trend:c9", 9, ttl=0.01, content_ids=["c9"])
+    time.sleep(0.02)
+    assert cache.get("trend:c9") is None
+
+    # Adding trend:c9 evicted summary:c3, the least recently used entry
+    assert cache.keys() == ["summary:c4", "summary:c2"]
+    stats = cache.get_stats()
+    assert stats["size"] == 2
+    assert stats["evictions"] == 3
+    assert stats["expirations"] == 1
+    assert stats["hits"] == 1 and stats["misses"] == 2
+    assert stats["hit_ratio"] == 1 / 3
+
+
+def test_concurrent_identical_summaries_share_one_query():
+    pool = FakePool()
+    tracker = EngagementTracker(pool)
+
+    async def run():
+        summaries = await asyncio.gather(
+            *(tracker.get_engagement_summary("video_1", Platform.YOUTUBE) for _ in range(20))
+        )
+        cached = await tracker.get_engagement_summary("video_1", Platform.YOUTUBE)
+        return summaries, cached
+
+    summaries, cached = asyncio.run(run())
+
+    assert pool.fetches == 1
+    assert all(summary is summaries[0] for summary in summaries)
+    assert cached is summaries[0]
+    stats = asyncio.run(tracker.get_cache_stats())
+    assert stats["coalesced"] == 19 and stats["hits"] == 1 and stats["misses"] == 1
+    assert stats["cached_entries"] == ["summary:video_1:youtube:30"]
+
+
+def test_writes_invalidate_cached_views_of_that_content():
+    pool = FakePool()
+    cache = AnalyticsCache()
+    tracker = EngagementTracker(pool, cache=cache)
+    trends = TrendAnalyzer(pool, cache=cache)
+    correlations = CorrelationAnalyzer(pool, cache=cache)
+
+    async def run():
+        before = await tracker.get_engagement_summary("video_1", Platform.YOUTUBE)
+        cache.set("trend:video_1:views:90:30", "trend 1", content_ids=["video_1"])
+        cache.set("trend:video_2:views:90:30", "trend 2", content_ids=["video_2"])
+        cache.set("correlations:all", ["all content"], content_ids=None)
+
+        await tracker.track_engagement(make_snapshot("video_1"))
+        after = await tracker.get_engagement_summary("video_1", Platform.YOUTUBE)
+        return before, after
+
+    before, after = asyncio.run(run())
+
+    assert pool.fetches == 2
+    assert after.total_metrics[MetricType.VIEWS] == before.total_metrics[MetricType.VIEWS] + 150
+    assert cache.keys("trend:") == ["trend:video_2:views:90:30"]
+    assert cache.keys("correlations:") == []
+    assert trends.cache is correlations.cache is tracker.cache
+
+
+def test_load_invalidated_mid_flight_is_not_stored():
+    pool = FakePool()
+    tracker = EngagementTracker(pool)
+
+    async def run():
+        loading = asyncio.ensure_future(tracker.get_engagement_summary("video_1", Platform.YOUTUBE))
+        await asyncio.sleep(0)
+        tracker.cache.invalidate_content(["video_1"])
+        stale = await loading
+        fresh = await tracker.get_engagement_summary("video_1", Platform.YOUTUBE)
+        return stale, fresh
+
+    stale, fresh = asyncio.run(run())
+
+    assert stale is not None and fresh is not stale
+    assert pool.fetches == 2
+
+
+def test_cancelled_caller_does_not_fail_coalesced_waiters():
+    cache = AnalyticsCache()
+    loads = []
+
+    async def loader():
+        loads.append(1)
+        await asyncio.sleep(0.02)
+        return "summary"
+
+    async def run():
+        leader = asyncio.ensure_future(cache.get_or_load("summary:video_1", loader))
+        await asyncio.sleep(0)
+        waiter = asyncio.ensure_future(cache.get_or_load("summary:video_1", loader))
+        await asyncio.sleep(0)
+        leader.cancel()
+        result = await waiter
+        return leader, result
+
+    leader, result = asyncio.run(run())
+
+    assert leader.cancelled()
+    assert result == "summary"
+    assert loads == [1]
+    assert cache.get("summary:video_1") == "summary"
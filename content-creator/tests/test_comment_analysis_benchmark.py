@@ -0,0 +1,96 @@
+"""
+Test Script - Throughput benchmark for vectorized comment analysis
+
+Compares CommentAnalyzer.analyze_batch_vectorized against the per-comment
+path (one analyze_comment coroutine per comment, gathered) on a synthetic
+comment stream, and checks both produce the same analysis. Throughput is
+reported by running this file directly rather than asserted, since the
+speedup depends on the machine and on whether NLTK is installed.
+"""
+
+import asyncio
+import json
+import random
+import sys
+import time
+from datetime import datetime
+from typing import Any, Dict, List
+
+from conftest import load_comment_scraper
+
+load_comment_scraper()
+
+from comment_scraper import CommentBase, Platform
+from comment_scraper.utils.comment_analyzer import CommentAnalyzer
+
+OPENERS = ["I love this", "Honestly the worst", "What a great", "Not sure about this", "This is awesome,",
+           "Terrible", "Amazing", "Could you explain the", "Why does the", "ok so the"]
+SUBJECTS = ["video", "tutorial", "editing", "soundtrack", "intro", "explanation", "thumbnail", "ending"]
+TAILS = ["thanks for sharing!", "please make a part two", "you should try a longer cut", "how did you film it?",
+         "check out my channel", "I think it was a bit slow", "soooooo good", "www.example.com has more",
+         "would watch again", "feel like it needed more detail", "", "subscribe for more"]
+
+
+def make_comments(count: int, seed: int = 7) -> List[CommentBase]:
+    rng = random.Random(seed)
+    comments = []
+    for i in range(count):
+        text = " ".join(
+            part for part in (rng.choice(OPENERS), rng.choice(SUBJECTS), rng.choice(TAILS)) if part
+        )
+        comments.append(CommentBase(
+            comment_id=f"c{i}",
+            platform=Platform.YOUTUBE,
+            content_id="video_1",
+            text=text,
+            like_count=rng.randint(0, 40),
+            reply_count=rng.randint(0, 6),
+            user_verified=rng.random() < 0.1,
+            created_at=datetime(2024, 1, 1)
+        ))
+    return comments
+
+
+def run_analysis_benchmark(comment_count: int = 5000) -> Dict[str, Any]:
+    """Analyze ``comment_count`` comments with both paths and report comments per second"""
+
+    analyzer = CommentAnalyzer()
+    comments = make_comments(comment_count)
+
+    async def per_comment():
+        return await asyncio.gather(*(analyzer.analyze_comment(comment) for comment in comments))
+
+    started = time.perf_counter()
+    per_comment_results = asyncio.run(per_comment())
+    per_comment_elapsed = time.perf_counter() - started
+
+    started = time.perf_counter()
+    vectorized_results = analyzer.analyze_batch_vectorized(comments)
+    vectorized_elapsed = time.perf_counter() - started
+
+    return {
+        "comments": comment_count,
+        "per_comment_per_second": comment_count / per_comment_elapsed,
+        "vectorized_per_second": comment_count / vectorized_elapsed,
+        "speedup": per_comment_elapsed / vectorized_elapsed,
+        "per_comment_results": per_comment_results,
+        "vectorized_results": vectorized_results
+    }
+
+
+def test_vectorized_analysis_matches_per_comment_path():
+    result = run_analysis_benchmark(comment_count=2000)
+
+    for expected, actual in zip(result["per_comment_results"], result["vectorized_results"]):
+        assert actual.dict(exclude={"processed_at"}) == expected.dict(exclude={"processed_at"})
+    assert len(result["vectorized_results"]) == 2000
+
+
+if __name__ == "__main__":
+    result = run_analysis_benchmark(comment_count=20000)
+    result.pop("per_comment_results")
+    result.pop("vectorized_results")
+    print(f"per-comment: {result['per_comment_per_second']:.0f} comments/s, "
+          f"vectorized: {result['vectorized_per_second']:.0f} comments/s "
+          f"({result['speedup']:.1f}x)")
+    print(json.dumps(result, indent=2))
@@ -0,0 +1,143 @@
+"""
+Test Script - Streaming, chunked comment analysis for the comment scraper
+"""
+
+import asyncio
+from datetime import datetime
+
+from conftest import load_comment_scraper
+
+load_comment_scraper()
+
+from comment_scraper import CommentBase, Platform, comment_api, comment_analyzer, scraping_manager
+from comment_scraper.utils.comment_analyzer import CommentAnalyzer, CommentTrendAggregator
+
+TEXTS = [
+    "I love this video, amazing work!",
+    "Terrible audio, worst upload this week",
+    "How did you film the intro? Please make a tutorial",
+    "You should try a longer version maybe",
+    "ok",
+    "Check my channel and subscribe!!!! www.example.com",
+]
+
+
+def make_comments(count):
+    return [
+        CommentBase(
+            comment_id=f"c{i}",
+            platform=Platform.YOUTUBE,
+            content_id="video_1",
+            text=f"{TEXTS[i % len(TEXTS)]} #{i}",
+            like_count=i % 12,
+            reply_count=i % 3,
+            user_verified=i % 5 == 0,
+            created_at=datetime(2024, 1, 1)
+        )
+        for i in range(count)
+    ]
+
+
+def analysis_fields(comment):
+    return comment.dict(exclude={"processed_at", "scraped_at"})
+
+
+def test_streamed_analysis_matches_batch_analysis():
+    comments = make_comments(230)
+
+    async def stream():
+        for comment in comments:
+            yield comment
+
+    async def run():
+        analyzer = CommentAnalyzer(max_workers=2)
+        try:
+            chunks = [chunk async for chunk in analyzer.analyze_stream(stream(), chunk_size=50)]
+        finally:
+            analyzer.shutdown()
+        batch = await analyzer.analyze_batch(comments)
+        return chunks, batch, await analyzer.analyze_comment_trends(batch)
+
+    chunks, batch, trends = asyncio.run(run())
+
+    assert [len(chunk) for chunk in chunks] == [50, 50, 50, 50, 30]
+    streamed = [comment for chunk in chunks for comment in chunk]
+    assert [analysis_fields(c) for c in streamed] == [analysis_fields(c) for c in batch]
+
+    aggregator = CommentTrendAggregator()
+    for chunk in chunks:
+        aggregator.update(chunk)
+    assert aggregator.to_dict() == trends
+    assert trends["total_comments"] == 230
+
+
+def test_stream_stops_pulling_while_chunks_are_pending():
+    pulled = 0
+
+    async def stream():
+        nonlocal pulled
+        for comment in make_comments(400):
+            pulled += 1
+            yield comment
+
+    async def run():
+        analyzer = CommentAnalyzer(max_workers=2)
+        consumed = 0
+        most_buffered = 0
+        try:
+            async for chunk in analyzer.analyze_stream(stream(), chunk_size=20, max_pending_chunks=2):
+                consumed += len(chunk)
+                most_buffered = max(most_buffered, pulled - consumed)
+                await asyncio.sleep(0.01)  # Slow consumer
+        finally:
+            analyzer.shutdown()
+        return consumed, most_buffered
+
+    consumed, most_buffered = asyncio.run(run())
+
+    assert consumed == 400
+    # Never more than the pending chunks plus the one being filled
+    assert most_buffered <= 2 * 20
+
+
+def test_scrape_and_analyze_streams_into_trend_aggregates():
+    comments = make_comments(120)
+    original = scraping_manager.scrape_comments
+
+    async def fake_scrape_comments(**kwargs):
+        assert kwargs["include_replies"] is False
+        for comment in comments[:kwargs["max_comments"]]:
+            await asyncio.sleep(0)
+            yield comment
+
+    async def run():
+        scraping_manager.scrape_comments = fake_scrape_comments
+        try:
+            summary = await comment_api.scrape_and_analyze_comments(
+                platform=Platform.YOUTUBE,
+                content_id="video_1",
+                max_comments=100,
+                include_replies=False,
+                include_comments=False,
+                analysis_chunk_size=16
+            )
+            full = await comment_api.scrape_and_analyze_comments(
+                platform=Platform.YOUTUBE,
+                content_id="video_1",
+                max_comments=100,
+                include_replies=False
+            )
+        finally:
+            scraping_manager.scrape_comments = original
+            comment_analyzer.shutdown()
+        return summary, full
+
+    summary, full = asyncio.run(run())
+
+    assert summary["success"] and full["success"]
+    assert summary["comments"] == []
+    assert summary["comments_scraped"] == summary["comments_analyzed"] == 100
+    assert summary["analysis_stats"] == full["analysis_stats"]
+    assert summary["analysis_stats"]["total_comments"] == 100
+    assert len(full["comments"]) == 100
+    assert full["comments"][0].sentiment_label is not None
@@ -0,0 +1,187 @@
+"""
+Test Script - Bulk ingestion for EngagementTracker.batch_track_engagement
+
+Runs against the SQLite stand-in writer. The tests only check what gets stored;
+``python test_engagement_bulk_ingest.py`` reports throughput of bulk ingestion
+against one upsert statement per snapshot.
+"""
+
+import asyncio
+import importlib.util
+import json
+import sqlite3
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# The analytics package lives in a dashed directory, so load it as a package by path
+package_dir = Path(__file__).parent.parent / "api" / "performance-analytics"
+if "performance_analytics" not in sys.modules:
+    spec = importlib.util.spec_from_file_location(
+        "performance_analytics", package_dir / "__init__.py", submodule_search_locations=[str(package_dir)]
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["performance_analytics"] = module
+    spec.loader.exec_module(module)
+
+from performance_analytics.bulk_ingest import SQLiteBulkWriter, encode_json
+from performance_analytics.engagement_tracker import (
+    EngagementSnapshot, EngagementTracker, MetricType, Platform
+)
+
+START = datetime(2024, 1, 1, 0, 30)
+
+
+def make_snapshots(count, content_pieces=500, hours_per_step=6):
+    platforms = list(Platform)
+    return [
+        EngagementSnapshot(
+            content_id=f"content_{i % content_pieces}",
+            platform=platforms[i % len(platforms)],
+            timestamp=START + timedelta(hours=hours_per_step * (i // content_pieces)),
+            metrics={MetricType.VIEWS: float(i), MetricType.LIKES: float(i % 50)},
+            metadata={"batch": i // content_pieces}
+        )
+        for i in range(count)
+    ]
+
+
+def stored_rows(db_path):
+    conn = sqlite3.connect(db_path)
+    rows = conn.execute(
+        "SELECT id, content_id, platform, date(timestamp), metrics FROM engagement_snapshots"
+    ).fetchall()
+    conn.close()
+    return {(content_id, platform, day): (row_id, json.loads(metrics))
+            for row_id, content_id, platform, day, metrics in rows}
+
+
+def test_bulk_ingest_merges_one_row_per_content_and_day(tmp_path):
+    db_path = str(tmp_path / "engagement.db")
+    writer = SQLiteBulkWriter(db_path)
+    tracker = EngagementTracker(db_pool=None, bulk_writer=writer, bulk_chunk_size=700)
+    # 4 snapshots per content piece per day, spread over 2.5 days
+    snapshots = make_snapshots(5000)
+
+    ids = asyncio.run(tracker.batch_track_engagement(snapshots))
+    writer.close()
+
+    rows = stored_rows(db_path)
+    assert len(ids) == 5000
+    assert tracker.last_ingest.chunks == 8
+    assert tracker.last_ingest.rows_written == 5000
+    assert tracker.last_ingest.rows_per_second > 0
+
+    latest = {}
+    for snapshot, row_id in zip(snapshots, ids):
+        key = (snapshot.content_id, snapshot.platform.value, snapshot.timestamp.date().isoformat())
+        assert rows[key][0] == int(row_id)
+        latest[key] = snapshot
+    assert len(rows) == len(latest)
+    for key, snapshot in latest.items():
+        assert rows[key][1] == {"views": snapshot.metrics[MetricType.VIEWS],
+                                "likes": snapshot.metrics[MetricType.LIKES]}
+
+
+def test_bulk_ingest_upserts_existing_rows(tmp_path):
+    db_path = str(tmp_path / "engagement.db")
+    writer = SQLiteBulkWriter(db_path)
+    tracker = EngagementTracker(db_pool=None, bulk_writer=writer)
+    snapshots = make_snapshots(1000)
+
+    first_ids = asyncio.run(tracker.batch_track_engagement(snapshots))
+    for snapshot in snapshots:
+        snapshot.metrics[MetricType.VIEWS] += 1
+    second_ids = asyncio.run(tracker.batch_track_engagement(snapshots, chunk_size=300))
+    writer.close()
+
+    assert second_ids == first_ids
+    rows = stored_rows(db_path)
+    last = snapshots[-1]
+    key = (last.content_id, last.platform.value, last.timestamp.date().isoformat())
+    assert rows[key][1]["views"] == last.metrics[MetricType.VIEWS]
+
+
+def test_failed_chunks_are_skipped_and_reported(tmp_path):
+    writer = SQLiteBulkWriter(str(tmp_path / "engagement.db"))
+    original = writer.write_chunk
+    calls = 0
+
+    async def flaky_write_chunk(rows):
+        nonlocal calls
+        calls += 1
+        if calls == 2:
+            raise sqlite3.OperationalError("database is locked")
+        return await original(rows)
+
+    writer.write_chunk = flaky_write_chunk
+    tracker = EngagementTracker(db_pool=None, bulk_writer=writer, bulk_chunk_size=250)
+
+    ids = asyncio.run(tracker.batch_track_engagement(make_snapshots(1000)))
+    writer.close()
+
+    assert len(ids) == 750
+    assert tracker.last_ingest.failed_chunks == 1
+    assert tracker.last_ingest.rows_failed == 250
+
+
+def run_ingest_benchmark(db_dir, snapshot_count=100000, chunk_size=10000):
+    """Ingest ``snapshot_count`` snapshots in bulk and row by row, reporting rows per second"""
+
+    snapshots = make_snapshots(snapshot_count, content_pieces=5000)
+
+    writer = SQLiteBulkWriter(str(Path(db_dir) / "bulk.db"))
+    tracker = EngagementTracker(db_pool=None, bulk_writer=writer, bulk_chunk_size=chunk_size)
+    asyncio.run(tracker.batch_track_engagement(snapshots))
+    writer.close()
+
+    # Baseline: one upsert statement and commit per snapshot
+    per_row = SQLiteBulkWriter(str(Path(db_dir) / "per_row.db"))
+    upsert = """
+    INSERT INTO engagement_snapshots (content_id, platform, timestamp, metrics, metadata)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT (content_id, platform, date(timestamp))
+    DO UPDATE SET metrics = excluded.metrics, metadata = excluded.metadata
+    RETURNING id
+    """
+    started = time.perf_counter()
+    for snapshot in snapshots:
+        per_row.conn.execute(upsert, (
+            snapshot.content_id, snapshot.platform.value, snapshot.timestamp.isoformat(),
+            encode_json(snapshot.metrics), encode_json(snapshot.metadata)
+        )).fetchone()
+    per_row_elapsed = time.perf_counter() - started
+    per_row.close()
+
+    return {
+        "snapshots": snapshot_count,
+        "bulk": tracker.last_ingest.to_dict(),
+        "per_row_per_second": snapshot_count / per_row_elapsed,
+        "speedup": tracker.last_ingest.rows_per_second / (snapshot_count / per_row_elapsed)
+    }
+
+
+def test_ingest_benchmark_stores_the_same_rows_both_ways(tmp_path):
+    # Throughput is timing-dependent, so it is only reported when run as a script
+    result = run_ingest_benchmark(tmp_path, snapshot_count=20000, chunk_size=5000)
+
+    assert result["bulk"]["rows_written"] == 20000
+    assert result["bulk"]["failed_chunks"] == 0
+
+    def metrics_by_key(db_path):
+        return {key: metrics for key, (_, metrics) in stored_rows(db_path).items()}
+
+    bulk = metrics_by_key(str(tmp_path / "bulk.db"))
+    assert len(bulk) == 20000 // 4
+    assert bulk == metrics_by_key(str(tmp_path / "per_row.db"))
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as db_dir:
+        result = run_ingest_benchmark(db_dir, snapshot_count=int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
+    print(f"bulk: {result['bulk']['rows_per_second']:.0f} rows/s, "
+          f"per-row: {result['per_row_per_second']:.0f} rows/s ({result['speedup']:.1f}x)")
+    print(json.dumps(result, indent=2))
@@ -0,0 +1,181 @@
+"""
+Test Script - Throughput benchmark for shared provider batching
+
+Compares ContentCreationPipeline.create_content_many against running every
+request through create_content on its own, with provider calls simulated as
+a fixed per-call latency plus a per-item cost under a provider concurrency
+limit. Requests per second are reported by running this file directly
+rather than asserted, since wall-clock speedups depend on the machine.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict
+
+# Add the project root to Python path
+current_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(current_dir))
+sys.path.insert(0, str(current_dir / "api"))
+
+from api.main_pipeline import ContentCreationPipeline
+from api.audio_processing import AudioPipeline
+from api.video_generation import VideoGenerationPipeline
+
+
+class SimulatedProvider:
+    """Stands in for the TTS and video providers with a latency model"""
+
+    def __init__(self, call_latency: float = 0.02, item_latency: float = 0.001, max_concurrent_calls: int = 4):
+        self.call_latency = call_latency
+        self.item_latency = item_latency
+        self.max_concurrent_calls = max_concurrent_calls
+        self.calls = {"audio": [], "video": []}
+        self._slots = None
+
+    async def _call(self, kind: str, count: int):
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_concurrent_calls)
+        async with self._slots:
+            self.calls[kind].append(count)
+            await asyncio.sleep(self.call_latency + self.item_latency * count)
+
+    def install(self):
+        provider = self
+
+        async def generate_video_batch(pipeline, prompts, configs):
+            await provider._call("video", len(prompts))
+            return [
+                {
+                    "file_path": pipeline._segment_output_path(config),
+                    "duration": config["duration"],
+                    "quality_score": 7.5,
+                    "resolution": config["resolution"],
+                    "prompt": prompt
+                }
+                for prompt, config in zip(prompts, configs)
+            ]
+
+        async def generate_audio_batch(pipeline, texts, voice_id, style_preferences, start_index=0):
+            await provider._call("audio", len(texts))
+            os.makedirs(pipeline.audio_dir, exist_ok=True)
+            audio_files = []
+            for i, text in enumerate(texts, start=start_index):
+                audio_file = f"{pipeline.audio_dir}/voiceover_{i:03d}.mp3"
+                with open(audio_file, "w") as f:
+                    f.write(text)
+                audio_files.append(audio_file)
+            return audio_files
+
+        self._originals = (VideoGenerationPipeline._generate_video_batch, AudioPipeline._generate_audio_batch)
+        VideoGenerationPipeline._generate_video_batch = generate_video_batch
+        AudioPipeline._generate_audio_batch = generate_audio_batch
+
+    def uninstall(self):
+        VideoGenerationPipeline._generate_video_batch, AudioPipeline._generate_audio_batch = self._originals
+
+
+def _make_requests(pipeline: ContentCreationPipeline, count: int):
+    return [
+        pipeline.create_request_from_idea(
+            idea=f"Productivity tip #{i}: automate your weekly reporting with AI tools",
+            platforms=["youtube", "tiktok"],
+            duration_preferences={"youtube": 120, "tiktok": 45},
+            include_background_music=False,
+            add_to_library=False
+        )
+        for i in range(count)
+    ]
+
+
+def run_throughput_benchmark(request_count: int = 200, batched: bool = True) -> Dict[str, Any]:
+    """Process ``request_count`` ideas and report requests per second"""
+
+    provider = SimulatedProvider()
+    provider.install()
+    # Voice loading falls back to built-in voices without Polly; keep that noise out too
+    logging.disable(logging.CRITICAL)
+
+    try:
+        with tempfile.TemporaryDirectory() as project_root:
+            pipeline = ContentCreationPipeline(project_root)
+            requests = _make_requests(pipeline, request_count)
+
+            async def run():
+                if batched:
+                    return await pipeline.create_content_many(requests)
+                return await asyncio.gather(*(pipeline.create_content(request) for request in requests))
+
+            started = time.perf_counter()
+            results = asyncio.run(run())
+            elapsed = time.perf_counter() - started
+            # Read voiceovers back before the project directory is removed
+            audio_files = {}
+            for result in results:
+                for mix in result.audio_mixes.values():
+                    for segment in mix.voice_segments:
+                        with open(segment.file_path) as f:
+                            audio_files[segment.file_path] = f.read()
+            batches_dir = os.path.join(pipeline.generated_content_dir, "audio", "batches")
+            leftover_batches = os.listdir(batches_dir) if os.path.isdir(batches_dir) else []
+    finally:
+        logging.disable(logging.NOTSET)
+        provider.uninstall()
+
+    return {
+        "mode": "create_content_many" if batched else "create_content",
+        "requests": request_count,
+        "completed": sum(result.status == "completed" for result in results),
+        "elapsed_seconds": elapsed,
+        "requests_per_second": request_count / elapsed if elapsed > 0 else float("inf"),
+        "audio_calls": len(provider.calls["audio"]),
+        "video_calls": len(provider.calls["video"]),
+        "results": results,
+        "audio_files": audio_files,
+        "leftover_batches": leftover_batches
+    }
+
+
+def test_batched_results_match_single_request_path():
+    single = run_throughput_benchmark(request_count=10, batched=False)
+    batched = run_throughput_benchmark(request_count=10, batched=True)
+
+    assert single["completed"] == batched["completed"] == 10
+    for one, many in zip(single["results"], batched["results"]):
+        for platform, composition in many.video_compositions.items():
+            # Fanned-out segments land in the request's own directory
+            assert all(many.request_id in segment.file_path for segment in composition.segments)
+            assert len(composition.segments) == len(one.video_compositions[platform].segments)
+        assert set(many.audio_mixes) == set(one.audio_mixes)
+        for mix in many.audio_mixes.values():
+            # Coalesced voiceovers are moved into the request's own audio directory
+            for segment in mix.voice_segments:
+                assert os.path.dirname(segment.file_path).endswith(f"audio/{many.request_id}")
+                assert batched["audio_files"][segment.file_path] == segment.text
+    assert batched["leftover_batches"] == []
+
+
+def test_create_content_many_coalesces_provider_calls():
+    single = run_throughput_benchmark(request_count=200, batched=False)
+    batched = run_throughput_benchmark(request_count=200, batched=True)
+
+    assert batched["completed"] == single["completed"] == 200
+    assert batched["audio_calls"] + batched["video_calls"] < (single["audio_calls"] + single["video_calls"]) / 4
+
+
+if __name__ == "__main__":
+    summary = []
+    for batched in (False, True):
+        result = run_throughput_benchmark(request_count=200, batched=batched)
+        for key in ("results", "audio_files", "leftover_batches"):
+            result.pop(key)
+        summary.append(result)
+        print(f"{result['mode']:>20}: {result['elapsed_seconds']:.2f}s "
+              f"({result['requests_per_second']:.1f} req/s, "
+              f"{result['audio_calls']} audio / {result['video_calls']} video provider calls)")
+    print(json.dumps(summary, indent=2))
@@ -0,0 +1,170 @@
+"""
+Test Script - Token-bucket rate limiting for the comment scraper
+"""
+
+import asyncio
+import multiprocessing
+import time
+
+import pytest
+
+from conftest import load_comment_scraper
+
+load_comment_scraper()
+
+from comment_scraper import Platform
+from comment_scraper.utils.rate_limiter import (
+    DailyLimitExceeded, MemoryRateLimitStore, RateLimiter, SQLiteRateLimitStore, TokenBucket
+)
+
+
+class CountingStore(MemoryRateLimitStore):
+    """Memory store that counts how often buckets are checked"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checks = 0
+
+    def try_acquire(self, *args, **kwargs):
+        self.checks += 1
+        return super().try_acquire(*args, **kwargs)
+
+
+def test_waiters_are_served_in_arrival_order():
+    store = CountingStore()
+    bucket = TokenBucket("test", limit=2, window_seconds=0.2, store=store)
+    granted = []
+
+    async def request(i):
+        await bucket.acquire()
+        granted.append(i)
+
+    async def run():
+        started = time.perf_counter()
+        await asyncio.gather(*(request(i) for i in range(12)))
+        return time.perf_counter() - started
+
+    elapsed = asyncio.run(run())
+
+    assert granted == list(range(12))
+    # Two burst tokens, then ten more at 10 per second
+    assert 0.9 <= elapsed < 1.5
+    # One dispatcher checks the head waiter; waiters are not all woken to retry
+    assert store.checks <= 12 * 2 + 2
+
+
+def test_weighted_costs_use_endpoint_quota_units():
+    limiter = RateLimiter(store=MemoryRateLimitStore())
+
+    assert limiter.get_request_cost(Platform.YOUTUBE, "search") == 100
+    assert limiter.get_request_cost(Platform.YOUTUBE, "commentThreads") == 1
+    assert limiter.get_request_cost(Platform.TWITTER, "search") == 1
+
+    assert limiter.try_acquire(Platform.YOUTUBE, "search") == (True, 0)
+    can_proceed, wait_time = limiter.try_acquire(Platform.YOUTUBE, "commentThreads")
+    assert not can_proceed and wait_time == pytest.approx(0.6, abs=0.05)
+    assert limiter.get_daily_usage(Platform.YOUTUBE) == 100
+    assert limiter.get_status(Platform.YOUTUBE).is_limited
+
+
+def test_endpoint_limits_apply_on_top_of_platform_limits():
+    limiter = RateLimiter(store=MemoryRateLimitStore())
+    limiter.configure_endpoint(Platform.TWITTER, "tweets", limit=1, window_seconds=60)
+
+    assert limiter.try_acquire(Platform.TWITTER, "tweets") == (True, 0)
+    assert not limiter.try_acquire(Platform.TWITTER, "tweets")[0]
+    assert limiter.try_acquire(Platform.TWITTER, "users")[0]
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        yield MemoryRateLimitStore()
+    else:
+        store = SQLiteRateLimitStore(str(tmp_path / "rate_limits.db"))
+        yield store
+        store.close()
+
+
+def test_platform_denial_does_not_spend_endpoint_tokens(store):
+    limiter = RateLimiter(store=store)
+    limiter.configure_endpoint(Platform.TWITTER, "tweets", limit=5, window_seconds=60)
+    platform_bucket = limiter._platform_limits[Platform.TWITTER]
+    endpoint_bucket = limiter._endpoint_limits[(Platform.TWITTER, "tweets")]
+    # Drain the platform bucket through another endpoint
+    while limiter.try_acquire(Platform.TWITTER, "users")[0]:
+        pass
+
+    for _ in range(3):
+        can_proceed, wait_time = limiter.try_acquire(Platform.TWITTER, "tweets")
+        assert not can_proceed and wait_time > 0
+
+    assert endpoint_bucket.available() == pytest.approx(5, abs=0.01)
+    assert platform_bucket.available() < 1
+
+
+def test_daily_limit_refunds_endpoint_tokens(store):
+    limiter = RateLimiter(store=store)
+    limiter.configure_endpoint(Platform.TIKTOK, "query", limit=3, window_seconds=3600)
+    limiter._platform_limits[Platform.TIKTOK].daily_limit = 1
+    endpoint_bucket = limiter._endpoint_limits[(Platform.TIKTOK, "query")]
+
+    async def run():
+        await limiter.acquire(Platform.TIKTOK, "query")
+        for _ in range(4):
+            with pytest.raises(DailyLimitExceeded):
+                await limiter.acquire(Platform.TIKTOK, "query")
+
+    asyncio.run(run())
+
+    # Only the request that was made is charged
+    assert endpoint_bucket.available() == pytest.approx(2, abs=0.01)
+    assert limiter.get_daily_usage(Platform.TIKTOK) == 1
+
+
+def test_daily_counters_persist_and_are_enforced(tmp_path):
+    state_file = str(tmp_path / "rate_limits.json")
+    limiter = RateLimiter(store=MemoryRateLimitStore(state_file))
+    limiter._platform_limits[Platform.TIKTOK].daily_limit = 5
+
+    async def use(limiter, count):
+        for _ in range(count):
+            await limiter.acquire(Platform.TIKTOK, "query")
+
+    asyncio.run(use(limiter, 3))
+
+    restarted = RateLimiter(store=MemoryRateLimitStore(state_file))
+    restarted._platform_limits[Platform.TIKTOK].daily_limit = 5
+    assert restarted.get_daily_usage(Platform.TIKTOK) == 3
+
+    asyncio.run(use(restarted, 2))
+    with pytest.raises(DailyLimitExceeded):
+        asyncio.run(restarted.acquire(Platform.TIKTOK, "query"))
+    assert restarted.can_make_daily_request(Platform.TIKTOK)[0] is False
+
+
+def _grab_tokens(path, attempts, results):
+    store = SQLiteRateLimitStore(path)
+    granted = 0
+    for _ in range(attempts):
+        if store.try_acquire("shared", 1, rate=0.001, capacity=25, daily_key="youtube", daily_limit=1000) == 0:
+            granted += 1
+    store.close()
+    results.put(granted)
+
+
+def test_processes_share_one_quota(tmp_path):
+    path = str(tmp_path / "rate_limits.db")
+    SQLiteRateLimitStore(path).close()
+
+    context = multiprocessing.get_context("fork")
+    results = context.Queue()
+    workers = [context.Process(target=_grab_tokens, args=(path, 20, results)) for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(timeout=30)
+
+    granted = [results.get(timeout=5) for _ in workers]
+    assert sum(granted) == 25
+    assert SQLiteRateLimitStore(path).daily_usage("youtube") == 25
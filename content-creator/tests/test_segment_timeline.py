@@ -0,0 +1,174 @@
+"""
+Test Script - Streaming segment timeline assembly for the video and audio pipelines
+"""
+
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pytest
+
+# Add the project root to Python path
+current_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(current_dir))
+sys.path.insert(0, str(current_dir / "api"))
+
+from api.segment_timeline import SegmentTimeline, ordered_batches
+from api.audio_processing import AudioPipeline
+from api.video_generation import VideoGenerationPipeline
+
+
+def make_scenes(count):
+    return [
+        {
+            "id": f"scene_{i}",
+            "scene_number": i + 1,
+            "duration": 1 + i % 7,
+            "visual_description": f"Scene {i} visuals",
+            "voiceover_text": f"Line {i} " + "word " * (i % 5)
+        }
+        for i in range(count)
+    ]
+
+
+def install_slow_video_batches(pipeline, delays):
+    """Replace the provider call with one that sleeps per batch and records concurrency"""
+
+    state = {"in_flight": 0, "max_in_flight": 0, "calls": 0}
+
+    async def generate_video_batch(prompts, configs):
+        delay = delays[state["calls"] % len(delays)]
+        state["calls"] += 1
+        state["in_flight"] += 1
+        state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+        try:
+            await asyncio.sleep(delay)
+        finally:
+            state["in_flight"] -= 1
+        return [
+            {"file_path": f"{config['scene_id']}.mp4", "quality_score": 7.5, "prompt": prompt}
+            for prompt, config in zip(prompts, configs)
+        ]
+
+    pipeline._generate_video_batch = generate_video_batch
+    return state
+
+
+def test_video_offsets_follow_scene_order():
+    with tempfile.TemporaryDirectory() as videos_dir:
+        pipeline = VideoGenerationPipeline(videos_dir)
+        pipeline.batch_size = 4
+        # Later batches finish first; the timeline must still follow scene order
+        install_slow_video_batches(pipeline, [0.05, 0.01, 0.03])
+        scenes = make_scenes(30)
+
+        segments = asyncio.run(pipeline.generate_video_from_script(scenes))
+
+    assert [s.scene_id for s in segments] == [scene["id"] for scene in scenes]
+    assert [s.file_path for s in segments] == [f"{scene['id']}.mp4" for scene in scenes]
+    assert len({s.prompt for s in segments}) == 30
+
+    offset = 0
+    for segment, scene in zip(segments, scenes):
+        assert segment.start_time == offset
+        assert segment.end_time == offset + scene["duration"]
+        offset = segment.end_time
+
+
+def test_video_batches_run_concurrently_within_limit():
+    with tempfile.TemporaryDirectory() as videos_dir:
+        pipeline = VideoGenerationPipeline(videos_dir)
+        pipeline.batch_size = 5
+        pipeline.max_in_flight_batches = 3
+        state = install_slow_video_batches(pipeline, [0.05])
+
+        started = time.perf_counter()
+        segments = asyncio.run(pipeline.generate_video_from_script(make_scenes(60)))
+        elapsed = time.perf_counter() - started
+
+    assert len(segments) == 60
+    assert state["calls"] == 12
+    assert state["max_in_flight"] == 3
+    # 12 sequential batches would take 0.6s
+    assert elapsed < 0.4
+
+
+def test_first_segment_streams_before_last_batch_finishes():
+    with tempfile.TemporaryDirectory() as videos_dir:
+        pipeline = VideoGenerationPipeline(videos_dir)
+        pipeline.batch_size = 2
+        pipeline.max_in_flight_batches = 2
+        state = install_slow_video_batches(pipeline, [0.02])
+
+        async def consume():
+            async for segment in pipeline.stream_video_from_script(make_scenes(20)):
+                return segment, state["calls"]
+
+        first, calls_so_far = asyncio.run(consume())
+
+    assert first.scene_id == "scene_0" and first.start_time == 0
+    assert calls_so_far < 10
+
+
+def test_chunked_voiceover_numbers_files_across_batches():
+    with tempfile.TemporaryDirectory() as audio_dir:
+        pipeline = AudioPipeline(audio_dir)
+        pipeline.voiceover_batch_size = 3
+        calls = []
+
+        async def generate_audio_batch(texts, voice_id, style_preferences, start_index=0):
+            calls.append((start_index, len(texts)))
+            await asyncio.sleep(0.01 * (3 - start_index // 3 % 3))
+            return [f"voiceover_{start_index + i:03d}.mp3" for i in range(len(texts))]
+
+        pipeline._generate_audio_batch = generate_audio_batch
+        scenes = make_scenes(10)
+
+        segments = asyncio.run(pipeline.generate_voiceover(scenes))
+
+    assert calls == [(0, 3), (3, 3), (6, 3), (9, 1)]
+    assert [s.file_path for s in segments] == [f"voiceover_{i:03d}.mp3" for i in range(10)]
+    assert [s.text for s in segments] == [scene["voiceover_text"].strip() for scene in scenes]
+    for previous, segment in zip(segments, segments[1:]):
+        assert segment.start_time == pytest.approx(previous.end_time)
+
+
+def test_ordered_batches_cancels_pending_work_on_failure():
+    started = []
+    cancelled = []
+
+    async def process(batch, start):
+        started.append(start)
+        if start == 0:
+            await asyncio.sleep(0.01)
+            raise RuntimeError("provider error")
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.append(start)
+            raise
+        return batch
+
+    async def consume():
+        return [pair async for pair in ordered_batches(list(range(10)), process, 2, 3)]
+
+    with pytest.raises(RuntimeError, match="provider error"):
+        asyncio.run(consume())
+
+    assert started == [0, 2, 4]
+    assert sorted(cancelled) == [2, 4]
+
+
+def test_timeline_places_segments_back_to_back():
+    class Segment:
+        def __init__(self, duration):
+            self.duration = duration
+            self.start_time = self.end_time = None
+
+    timeline = SegmentTimeline(start_offset=2.0)
+    placed = [timeline.place(Segment(d)) for d in (1.5, 3.0, 0.5)]
+
+    assert [(s.start_time, s.end_time) for s in placed] == [(2.0, 3.5), (3.5, 6.5), (6.5, 7.0)]
+    assert timeline.offset == 7.0 and timeline.count == 3
@@ -0,0 +1,140 @@
+"""
+Test Script - Stage graph execution for the content creation pipeline
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add the project root to Python path
+current_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(current_dir))
+sys.path.insert(0, str(current_dir / "api"))
+
+from api.stage_graph import PipelineStage, StageGraph, StageGraphError
+from api.main_pipeline import ContentCreationPipeline
+
+
+def make_stage(name, delay, depends_on=(), calls=None):
+    """Stage that sleeps and returns its name plus its inputs"""
+
+    async def run(**inputs):
+        if calls is not None:
+            calls.append(name)
+        await asyncio.sleep(delay)
+        return {"stage": name, "inputs": sorted(inputs)}
+
+    return PipelineStage(name, run, depends_on=depends_on)
+
+
+def test_independent_stages_run_concurrently():
+    graph = StageGraph([
+        make_stage("script", 0.05),
+        make_stage("audio", 0.2, ("script",)),
+        make_stage("videos", 0.2, ("script",)),
+        make_stage("adapt", 0.05, ("audio", "videos")),
+    ])
+
+    started = time.perf_counter()
+    outputs = asyncio.run(graph.run())
+    elapsed = time.perf_counter() - started
+
+    assert outputs["adapt"]["inputs"] == ["audio", "videos"]
+    # Longest path is 0.3s; running in sequence would take 0.5s
+    assert elapsed < 0.45
+    assert graph.longest_path({"script": 0.05, "audio": 0.2, "videos": 0.2, "adapt": 0.05}) == pytest.approx(0.3)
+
+
+def test_failed_stage_is_resumed_from_cached_outputs():
+    calls = []
+    attempts = {"videos": 0}
+
+    async def flaky_videos(script):
+        attempts["videos"] += 1
+        if attempts["videos"] == 1:
+            raise RuntimeError("video provider unavailable")
+        return "videos"
+
+    graph = StageGraph([
+        make_stage("script", 0.0, calls=calls),
+        make_stage("audio", 0.0, ("script",), calls=calls),
+        PipelineStage("videos", flaky_videos, depends_on=("script",)),
+        make_stage("adapt", 0.0, ("audio", "videos"), calls=calls),
+    ])
+
+    with pytest.raises(StageGraphError) as exc_info:
+        asyncio.run(graph.run())
+
+    assert exc_info.value.stage == "videos"
+    assert "adapt" not in exc_info.value.outputs
+
+    runs = []
+    outputs = asyncio.run(graph.run(cached_outputs=exc_info.value.outputs, on_stage_complete=runs.append))
+
+    assert outputs["videos"] == "videos"
+    assert calls.count("script") == 1
+    assert {run.name: run.status for run in runs}["script"] == "cached"
+
+
+def test_skipped_stage_uses_default_and_cycles_are_rejected():
+    graph = StageGraph([
+        make_stage("script", 0.0),
+        PipelineStage("library", lambda script: None, depends_on=("script",),
+                      condition=lambda: False, default=[]),
+    ])
+    assert asyncio.run(graph.run())["library"] == []
+
+    with pytest.raises(ValueError):
+        StageGraph([make_stage("a", 0.0, ("b",)), make_stage("b", 0.0, ("a",))])
+
+
+def test_pipeline_records_stage_timings_and_resumes_failed_request(tmp_path):
+    pipeline = ContentCreationPipeline(str(tmp_path))
+    request = pipeline.create_request_from_idea("AI productivity tips", platforms=["youtube"])
+    audio_calls = []
+
+    async def fake_script(request):
+        return "script"
+
+    async def fake_audio(request, script):
+        audio_calls.append(script)
+        await asyncio.sleep(0.01)
+        return {"youtube": "audio"}
+
+    async def failing_videos(request, script):
+        raise RuntimeError("render farm offline")
+
+    async def fake_videos(request, script):
+        return {"youtube": "video"}
+
+    async def fake_adaptations(request, script, videos, audio):
+        return {"youtube": {"video": videos["youtube"], "audio": audio["youtube"]}}
+
+    async def fake_library(request, script, videos):
+        return ["scene"]
+
+    pipeline._generate_script = fake_script
+    pipeline._generate_audio = fake_audio
+    pipeline._generate_videos = failing_videos
+    pipeline._create_platform_adaptations = fake_adaptations
+    pipeline._add_to_content_library = fake_library
+
+    failed = asyncio.run(pipeline.create_content(request))
+    assert failed.status == "failed"
+    assert failed.error_message == "render farm offline"
+
+    pipeline._generate_videos = fake_videos
+    result = asyncio.run(pipeline.create_content(request))
+
+    assert result.status == "completed"
+    assert result.platform_content == {"youtube": {"video": "video", "audio": "audio"}}
+    assert result.library_scenes == ["scene"]
+    # Audio completed during the failed attempt and was not generated again
+    assert len(audio_calls) == 1
+
+    timings = pipeline.stats["stage_timings"]
+    assert timings["videos"]["failures"] == 1 and timings["videos"]["runs"] == 1
+    assert timings["audio"]["runs"] == 1 and timings["audio"]["cached"] == 1
@@ -5,11 +5,16 @@ Replaces placeholder functions in audio_pipeline.py with real TTS functionality
 """
 
 import asyncio
+import hashlib
 import os
 import json
+import shutil
+import threading
+import time
 import boto3
 import uuid
-from typing import List, Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple
 from botocore.exceptions import BotoCoreError, ClientError
 import logging
 
@@ -17,12 +22,108 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Default SynthesizeSpeech request quota per account and region
+POLLY_SYNTHESIZE_TPS = 8.0
+POLLY_SYNTHESIZE_BURST = 10
+
+# Environment variable naming the synthesis cache directory
+POLLY_CACHE_DIR_ENV = "POLLY_CACHE_DIR"
+
+
+def polly_cache_dir() -> str:
+    """Synthesis cache directory: $POLLY_CACHE_DIR, else ``polly`` under the user's cache directory
+    
+    The cache is deliberately kept apart from output directories, which
+    callers may delete (e.g. per-batch scratch directories).
+    """
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.environ.get(POLLY_CACHE_DIR_ENV) or os.path.join(cache_home, "polly")
+
+class TokenBucket:
+    """Token bucket pacing requests to a sustained rate with bounded bursts
+    
+    Callers reserve tokens in arrival order and sleep until their
+    reservation is due, so waiting never blocks the event loop and the
+    bucket can be shared by coroutines on any loop.
+    """
+    
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def reserve(self, tokens: float = 1.0) -> float:
+        """Take tokens, returning how many seconds the caller must wait before using them"""
+        
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+            
+            # Tokens may go negative: later callers then queue behind this reservation
+            self._tokens -= tokens
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+    
+    async def acquire(self, tokens: float = 1.0):
+        """Wait until tokens are available"""
+        
+        delay = self.reserve(tokens)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
 class AmazonPollyIntegration:
-    """Amazon Polly integration for real TTS generation"""
+    """Amazon Polly integration for real TTS generation
+    
+    Blocking boto3 calls run on a bounded thread pool, request starts are
+    paced by a token bucket sized from Polly's TPS quota, audio streams are
+    written to disk in chunks, and results are kept in a content-addressed
+    cache keyed by (text, voice, engine, format, sample rate) so repeated
+    lines are only synthesized once.
+    """
     
     def __init__(self, aws_access_key_id: str = None, aws_secret_access_key: str = None, 
-                 aws_region: str = "us-east-1"):
-        """Initialize Amazon Polly client"""
+                 aws_region: str = "us-east-1",
+                 client: Any = None,
+                 max_concurrency: int = 8,
+                 requests_per_second: float = POLLY_SYNTHESIZE_TPS,
+                 burst: int = POLLY_SYNTHESIZE_BURST,
+                 cache_dir: Optional[str] = None,
+                 chunk_size: int = 64 * 1024):
+        """
+        Initialize Amazon Polly client
+        
+        Args:
+            client: Pre-built Polly client (e.g. a local stub); skips credential lookup
+            max_concurrency: Synthesis requests in flight at once (thread pool size)
+            requests_per_second: Sustained request rate, defaults to the SynthesizeSpeech quota
+            burst: Requests allowed back to back before pacing kicks in
+            cache_dir: Directory for cached audio; defaults to $POLLY_CACHE_DIR, and
+                caching is disabled when neither is set
+            chunk_size: Bytes read from the audio stream per write
+        """
+        
+        self.max_concurrency = max_concurrency
+        self.chunk_size = chunk_size
+        self.cache_dir = cache_dir or os.environ.get(POLLY_CACHE_DIR_ENV)
+        self.rate_limiter = TokenBucket(requests_per_second, burst)
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="polly")
+        self._inflight: Dict[Tuple[asyncio.AbstractEventLoop, str], asyncio.Future] = {}
+        self.stats = {
+            "requests": 0,
+            "cache_hits": 0,
+            "synthesized": 0,
+            "failures": 0,
+            "bytes_written": 0
+        }
+        
+        if client is not None:
+            self.polly = client
+            self.aws_region = aws_region
+            return
         
         # Get credentials from environment or parameters
         self.aws_access_key_id = aws_access_key_id or os.environ.get('AWS_ACCESS_KEY_ID')
@@ -45,12 +146,24 @@ class AmazonPollyIntegration:
             logger.error(f"Failed to initialize Amazon Polly client: {e}")
             raise
     
+    async def _run_blocking(self, func, *args, **kwargs):
+        """Run a blocking boto3 call on the synthesis thread pool"""
+        
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, lambda: func(*args, **kwargs))
+    
+    def close(self):
+        """Shut down the synthesis thread pool"""
+        
+        self._executor.shutdown(wait=True)
+    
     async def get_available_voices(self) -> List[Dict[str, Any]]:
         """Get list of available voices from Amazon Polly"""
         
         try:
             # Get English voices
-            response = self.polly.describe_voices(
+            response = await self._run_blocking(
+                self.polly.describe_voices,
                 LanguageCode='en-US',
                 Engine='neural'  # Get neural voices (higher quality)
             )
@@ -69,7 +182,8 @@ class AmazonPollyIntegration:
                 })
             
             # Also add some standard voices for comparison
-            std_response = self.polly.describe_voices(
+            std_response = await self._run_blocking(
+                self.polly.describe_voices,
                 LanguageCode='en-US',
                 Engine='standard'
             )
@@ -132,6 +246,8 @@ class AmazonPollyIntegration:
             Dictionary with synthesis results
         """
         
+        self.stats["requests"] += 1
+        
         try:
             # Prepare synthesis request
             request_args = {
@@ -146,16 +262,13 @@ class AmazonPollyIntegration:
             if '<' in text and '>' in text:
                 request_args['TextType'] = 'ssml'
             
-            logger.info(f"Synthesizing speech: {text[:50]}... using voice {voice_id}")
-            
-            # Make the request
-            response = self.polly.synthesize_speech(**request_args)
-            
-            # Save audio to file
-            os.makedirs(os.path.dirname(output_file), exist_ok=True)
+            cache_key = self._cache_key(request_args)
+            cached = await self._synthesize_cached(cache_key, request_args, output_file)
             
-            with open(output_file, 'wb') as audio_file:
-                audio_file.write(response['AudioStream'].read())
+            # Place audio at the requested path
+            os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+            if self.cache_dir:
+                await self._run_blocking(self._materialize, self._cache_path(cache_key, output_format), output_file)
             
             # Calculate estimated duration (rough estimate: ~150 words per minute)
             word_count = len(text.split())
@@ -170,13 +283,16 @@ class AmazonPollyIntegration:
                 "word_count": word_count,
                 "estimated_duration": estimated_duration,
                 "file_size": os.path.getsize(output_file),
-                "cost_estimate": self._calculate_cost(len(text), engine)
+                "cached": cached,
+                # Cache hits are not billed
+                "cost_estimate": 0.0 if cached else self._calculate_cost(len(text), engine)
             }
             
-            logger.info(f"Speech synthesis completed: {output_file}")
+            logger.info(f"Speech synthesis completed: {output_file}{' (cached)' if cached else ''}")
             return result
             
         except Exception as e:
+            self.stats["failures"] += 1
             logger.error(f"Speech synthesis failed: {e}")
             return {
                 "success": False,
@@ -185,12 +301,132 @@ class AmazonPollyIntegration:
                 "voice_id": voice_id
             }
     
+    async def _synthesize_cached(self, cache_key: str, request_args: Dict[str, Any],
+                                 output_file: Optional[str] = None) -> bool:
+        """
+        Make sure audio for the request exists, returning True if it came from the cache
+        
+        With caching disabled the audio is written straight to ``output_file``.
+        Concurrent requests for the same content share one synthesis call.
+        """
+        
+        if not self.cache_dir:
+            await self._synthesize_to_file(request_args, output_file)
+            return False
+        
+        cache_path = self._cache_path(cache_key, request_args['OutputFormat'])
+        if os.path.exists(cache_path):
+            self.stats["cache_hits"] += 1
+            return True
+        
+        # In-flight futures belong to their event loop, so a shared integration keys them by loop
+        loop = asyncio.get_running_loop()
+        inflight_key = (loop, cache_key)
+        inflight = self._inflight.get(inflight_key)
+        if inflight is not None:
+            await asyncio.shield(inflight)
+            self.stats["cache_hits"] += 1
+            return True
+        
+        future = loop.create_future()
+        self._inflight[inflight_key] = future
+        try:
+            await self._synthesize_to_file(request_args, cache_path)
+            future.set_result(cache_path)
+        except BaseException as e:
+            future.set_exception(e)
+            # Waiters get the error; mark it retrieved so an unshared failure is not logged twice
+            future.exception()
+            raise
+        finally:
+            del self._inflight[inflight_key]
+        return False
+    
+    async def _synthesize_to_file(self, request_args: Dict[str, Any], path: str):
+        """Pace, then synthesize on the thread pool"""
+        
+        await self.rate_limiter.acquire()
+        logger.info(f"Synthesizing speech: {request_args['Text'][:50]}... using voice {request_args['VoiceId']}")
+        written = await self._run_blocking(self._synthesize_blocking, request_args, path)
+        self.stats["synthesized"] += 1
+        self.stats["bytes_written"] += written
+    
+    def _synthesize_blocking(self, request_args: Dict[str, Any], path: str) -> int:
+        """Call Polly and stream the audio to ``path`` in chunks (runs on a worker thread)"""
+        
+        response = self.polly.synthesize_speech(**request_args)
+        stream = response['AudioStream']
+        
+        # Write to a temporary file first so readers never see partial audio
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        temp_path = f"{path}.{uuid.uuid4().hex}.part"
+        written = 0
+        try:
+            with open(temp_path, 'wb') as audio_file:
+                while True:
+                    chunk = stream.read(self.chunk_size)
+                    if not chunk:
+                        break
+                    audio_file.write(chunk)
+                    written += len(chunk)
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        finally:
+            close = getattr(stream, 'close', None)
+            if close:
+                close()
+        
+        return written
+    
+    def _cache_key(self, request_args: Dict[str, Any]) -> str:
+        """Content address for a synthesis request"""
+        
+        identity = json.dumps([
+            request_args['Text'],
+            request_args['VoiceId'],
+            request_args['Engine'],
+            request_args['OutputFormat'],
+            request_args['SampleRate'],
+            request_args.get('TextType', 'text')
+        ])
+        return hashlib.sha256(identity.encode('utf-8')).hexdigest()
+    
+    def _cache_path(self, cache_key: str, output_format: str) -> str:
+        extension = {"ogg_vorbis": "ogg"}.get(output_format, output_format)
+        return os.path.join(self.cache_dir, cache_key[:2], f"{cache_key}.{extension}")
+    
+    @staticmethod
+    def _materialize(cache_path: str, output_file: str):
+        """Copy a cached file to the output path
+        
+        Copied rather than hard-linked, so later in-place edits of the output
+        (normalization, post-processing) cannot corrupt the cache entry.
+        """
+        
+        if os.path.abspath(cache_path) == os.path.abspath(output_file):
+            return
+        temp_path = f"{output_file}.{uuid.uuid4().hex}.part"
+        try:
+            shutil.copyfile(cache_path, temp_path)
+            os.replace(temp_path, output_file)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+    
     async def batch_synthesize(self, texts: List[str], voice_id: str, 
                               output_dir: str, base_filename: str = "audio",
-                              engine: str = "neural", output_format: str = "mp3") -> List[Dict[str, Any]]:
+                              engine: str = "neural", output_format: str = "mp3",
+                              start_index: int = 0) -> List[Dict[str, Any]]:
         """
         Synthesize multiple texts in batch
         
+        Texts are synthesized concurrently, bounded by ``max_concurrency`` and
+        paced by the token bucket, and results are returned in input order.
+        
         Args:
             texts: List of texts to synthesize
             voice_id: Polly voice ID
@@ -198,38 +434,28 @@ class AmazonPollyIntegration:
             base_filename: Base filename for output files
             engine: 'neural' or 'standard'
             output_format: 'mp3', 'ogg_vorbis', or 'pcm'
+            start_index: Number of the first output file
             
         Returns:
             List of synthesis results
         """
         
-        results = []
-        total_cost = 0
-        
-        for i, text in enumerate(texts):
-            # Create unique filename
-            filename = f"{base_filename}_{i:03d}.{output_format}"
-            output_file = os.path.join(output_dir, filename)
-            
-            # Synthesize speech
-            result = await self.synthesize_speech(
+        results = await asyncio.gather(*(
+            self.synthesize_speech(
                 text=text,
                 voice_id=voice_id,
-                output_file=output_file,
+                output_file=os.path.join(output_dir, f"{base_filename}_{i:03d}.{output_format}"),
                 engine=engine,
                 output_format=output_format
             )
-            
-            results.append(result)
-            
-            if result['success']:
-                total_cost += result['cost_estimate']
-            
-            # Small delay to avoid rate limiting
-            await asyncio.sleep(0.1)
+            for i, text in enumerate(texts, start=start_index)
+        ))
+        
+        total_cost = sum(result['cost_estimate'] for result in results if result['success'])
+        cached = sum(1 for result in results if result.get('cached'))
         
-        logger.info(f"Batch synthesis completed. Total cost: ${total_cost:.4f}")
-        return results
+        logger.info(f"Batch synthesis completed ({cached}/{len(texts)} from cache). Total cost: ${total_cost:.4f}")
+        return list(results)
     
     def _calculate_cost(self, text_length: int, engine: str) -> float:
         """
@@ -278,10 +504,40 @@ class AmazonPollyIntegration:
             }
         }
 
+_shared_polly: Optional[AmazonPollyIntegration] = None
+_shared_polly_lock = threading.Lock()
+
+def get_shared_polly() -> AmazonPollyIntegration:
+    """Get the Polly integration shared by every caller in this process
+    
+    One boto3 client, thread pool, token bucket and cache (at
+    polly_cache_dir()) serve all batches, so pacing holds across calls and
+    cached lines survive the output directories they were first written to.
+    """
+    
+    global _shared_polly
+    
+    with _shared_polly_lock:
+        if _shared_polly is None:
+            _shared_polly = AmazonPollyIntegration(cache_dir=polly_cache_dir())
+        return _shared_polly
+
+def close_shared_polly():
+    """Shut down the shared Polly integration, if one was created"""
+    
+    global _shared_polly
+    
+    with _shared_polly_lock:
+        polly, _shared_polly = _shared_polly, None
+    if polly is not None:
+        polly.close()
+
 # Integration function to replace mock implementation in audio_pipeline.py
 async def real_audio_generation(texts: List[str], voice_id: str = "Joanna", 
                                output_dir: str = "/workspace/generated-content/audio",
-                               engine: str = "neural") -> List[str]:
+                               engine: str = "neural",
+                               polly: Optional[AmazonPollyIntegration] = None,
+                               start_index: int = 0) -> List[str]:
     """
     Replace the mock _generate_audio_batch function with real Amazon Polly integration
     
@@ -290,13 +546,15 @@ async def real_audio_generation(texts: List[str], voice_id: str = "Joanna",
         voice_id: Amazon Polly voice ID
         output_dir: Directory to save audio files
         engine: 'neural' or 'standard'
+        polly: Integration to use instead of the process-wide get_shared_polly()
+        start_index: Number of the first output file
         
     Returns:
         List of generated audio file paths
     """
     
-    # Initialize Amazon Polly integration
-    polly = AmazonPollyIntegration()
+    # Reuse the process-wide client, thread pool, rate limiter and cache
+    polly = polly or get_shared_polly()
     
     # Generate audio files
     os.makedirs(output_dir, exist_ok=True)
@@ -305,7 +563,8 @@ async def real_audio_generation(texts: List[str], voice_id: str = "Joanna",
         voice_id=voice_id,
         output_dir=output_dir,
         base_filename="voiceover",
-        engine=engine
+        engine=engine,
+        start_index=start_index
     )
     
     # Extract successful file paths
@@ -7,9 +7,10 @@ Replaces placeholder function in batch_processor.py with real video generation
 import asyncio
 import os
 import json
-import requests
+import time
+import aiohttp
 import uuid
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Set
 from datetime import datetime
 import logging
 
@@ -17,14 +18,180 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Statuses worth checking again on the next sweep
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+class VideoTaskPoller:
+    """Tracks all outstanding MiniMax video tasks from a single polling loop
+    
+    Each sweep checks every outstanding task concurrently over the shared
+    session. The interval between sweeps starts at ``min_interval`` and grows
+    by ``backoff_factor`` (up to ``max_interval``) while no task changes
+    state; it drops back to ``min_interval`` when a task finishes or a new
+    one is registered.
+    """
+    
+    def __init__(self,
+                 client: "MiniMaxVideoIntegration",
+                 min_interval: float = 2.0,
+                 max_interval: float = 30.0,
+                 backoff_factor: float = 1.5):
+        self.client = client
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff_factor = backoff_factor
+        
+        self._tasks: Dict[str, Dict[str, Any]] = {}  # task_id -> {"future", "deadline"}
+        self._interval = min_interval
+        self._next_sweep_at = 0.0
+        self._last_registration = 0.0
+        self._wakeup: Optional[asyncio.Event] = None
+        self._runner: Optional[asyncio.Task] = None
+        
+        self.stats = {
+            "sweeps": 0,
+            "status_requests": 0,
+            "completed": 0,
+            "failed": 0,
+            "timed_out": 0
+        }
+    
+    @property
+    def outstanding(self) -> int:
+        return len(self._tasks)
+    
+    async def wait_for(self, task_id: str, max_wait_time: float = 300) -> Optional[str]:
+        """Wait for a task to finish, returning its video URL or None if it failed or timed out"""
+        
+        loop = asyncio.get_running_loop()
+        entry = self._tasks.get(task_id)
+        if entry is None:
+            entry = {"future": loop.create_future(), "deadline": loop.time() + max_wait_time}
+            self._tasks[task_id] = entry
+        
+        # Check new tasks soon even if the poller has backed off
+        self._last_registration = loop.time()
+        self._interval = self.min_interval
+        self._next_sweep_at = min(self._next_sweep_at, loop.time() + self.min_interval)
+        
+        if self._runner is None or self._runner.done():
+            self._wakeup = asyncio.Event()
+            self._next_sweep_at = loop.time() + self.min_interval
+            self._runner = asyncio.create_task(self._run())
+        else:
+            self._wakeup.set()
+        
+        return await asyncio.shield(entry["future"])
+    
+    async def close(self):
+        """Stop polling and resolve every outstanding task as failed"""
+        
+        if self._runner is not None:
+            # A runner left over from a closed loop is already finished
+            if not self._runner.done():
+                self._runner.cancel()
+                await asyncio.gather(self._runner, return_exceptions=True)
+            self._runner = None
+        for task_id in list(self._tasks):
+            self._finish(task_id, None)
+    
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        
+        while self._tasks:
+            delay = self._next_sweep_at - loop.time()
+            if delay > 0:
+                self._wakeup.clear()
+                try:
+                    # Woken early when new tasks move the next sweep forward
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                    continue
+                except asyncio.TimeoutError:
+                    pass
+            
+            sweep_started = loop.time()
+            changed = await self._sweep()
+            
+            if changed or self._last_registration >= sweep_started:
+                self._interval = self.min_interval
+            else:
+                self._interval = min(self._interval * self.backoff_factor, self.max_interval)
+            self._next_sweep_at = loop.time() + self._interval
+    
+    async def _sweep(self) -> bool:
+        """Check every outstanding task once; returns True if any task finished"""
+        
+        loop = asyncio.get_running_loop()
+        task_ids = list(self._tasks)
+        self.stats["sweeps"] += 1
+        self.stats["status_requests"] += len(task_ids)
+        
+        results = await asyncio.gather(
+            *(self.client._fetch_task_status(task_id) for task_id in task_ids),
+            return_exceptions=True
+        )
+        
+        changed = False
+        now = loop.time()
+        
+        for task_id, result in zip(task_ids, results):
+            if task_id not in self._tasks:
+                continue
+            
+            if isinstance(result, Exception):
+                # Network errors are retried on the next sweep until the deadline
+                logger.warning(f"Error polling task {task_id}: {result}")
+                status = None
+            else:
+                status = result.get("status")
+            
+            if status == "completed":
+                self.stats["completed"] += 1
+                self._finish(task_id, result.get("video_url"))
+                changed = True
+            elif status == "failed":
+                logger.error(f"Video generation task {task_id} failed: {result.get('error')}")
+                self.stats["failed"] += 1
+                self._finish(task_id, None)
+                changed = True
+            elif status not in (None, "pending", "processing"):
+                logger.warning(f"Unknown task status: {status}")
+                self.stats["failed"] += 1
+                self._finish(task_id, None)
+                changed = True
+            elif now >= self._tasks[task_id]["deadline"]:
+                logger.error(f"Video generation task {task_id} timed out")
+                self.stats["timed_out"] += 1
+                self._finish(task_id, None)
+                changed = True
+        
+        return changed
+    
+    def _finish(self, task_id: str, video_url: Optional[str]):
+        entry = self._tasks.pop(task_id, None)
+        if entry is not None and not entry["future"].done():
+            entry["future"].set_result(video_url)
+
 class MiniMaxVideoIntegration:
-    """MiniMax Video API integration for talking head generation"""
+    """MiniMax Video API integration for talking head generation
     
-    def __init__(self, api_key: str = None):
+    All requests share one pooled aiohttp session. Asynchronous generation
+    tasks are tracked by a single VideoTaskPoller, and downloads are streamed
+    to a temporary file that is renamed into place once complete.
+    """
+    
+    def __init__(self, api_key: str = None,
+                 base_url: str = "https://api.minimax.chat/v1",
+                 max_connections: int = 20,
+                 poll_interval: float = 2.0,
+                 max_poll_interval: float = 30.0,
+                 download_chunk_size: int = 64 * 1024):
         """Initialize MiniMax Video client"""
         
         self.api_key = api_key or os.environ.get('MINIMAX_API_KEY')
-        self.base_url = "https://api.minimax.chat/v1"
+        self.base_url = base_url.rstrip("/")
+        self.max_connections = max_connections
+        self.download_chunk_size = download_chunk_size
         
         if not self.api_key:
             raise ValueError("MiniMax API key not found. Set MINIMAX_API_KEY environment variable.")
@@ -35,8 +202,40 @@ class MiniMaxVideoIntegration:
             "Content-Type": "application/json"
         }
         
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.poller = VideoTaskPoller(self, min_interval=poll_interval, max_interval=max_poll_interval)
+        
         logger.info("MiniMax Video client initialized successfully")
     
+    async def __aenter__(self):
+        """Async context manager entry"""
+        self._get_session()
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit"""
+        await self.close()
+    
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Shared session with a bounded connection pool, created on first use
+        
+        The session carries no default headers: the API key is sent only on
+        MiniMax API calls, never to the hosts serving finished videos.
+        """
+        
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_connections)
+            )
+        return self.session
+    
+    async def close(self):
+        """Stop polling and close the pooled session"""
+        
+        await self.poller.close()
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+    
     async def generate_talking_head_video(self, 
                                          script_text: str,
                                          avatar_url: str,
@@ -75,24 +274,23 @@ class MiniMaxVideoIntegration:
             logger.info(f"Generating talking head video: {script_text[:50]}...")
             
             # Make the API request
-            response = requests.post(
+            async with self._get_session().post(
                 f"{self.base_url}/video/generate",
-                headers=self.headers,
                 json=payload,
-                timeout=300  # 5 minutes timeout for video generation
-            )
-            
-            if response.status_code != 200:
-                error_msg = f"API request failed: {response.status_code} - {response.text}"
-                logger.error(error_msg)
-                return {
-                    "success": False,
-                    "error": error_msg,
-                    "output_url": None,
-                    "cost": 0
-                }
-            
-            result = response.json()
+                headers=self.headers,
+                timeout=aiohttp.ClientTimeout(total=300)  # 5 minutes timeout for video generation
+            ) as response:
+                if response.status != 200:
+                    error_msg = f"API request failed: {response.status} - {await response.text()}"
+                    logger.error(error_msg)
+                    return {
+                        "success": False,
+                        "error": error_msg,
+                        "output_url": None,
+                        "cost": 0
+                    }
+                
+                result = await response.json()
             
             # Extract results
             video_url = result.get("video_url") or result.get("output_url")
@@ -145,7 +343,10 @@ class MiniMaxVideoIntegration:
     
     async def _poll_video_task(self, task_id: str, max_wait_time: int = 300) -> Optional[str]:
         """
-        Poll for video generation task completion
+        Wait for video generation task completion
+        
+        The task is handed to the shared poller, which checks it together with
+        every other outstanding task.
         
         Args:
             task_id: Task ID from the initial request
@@ -155,62 +356,52 @@ class MiniMaxVideoIntegration:
             Video URL when ready, None if failed
         """
         
-        start_time = datetime.now()
-        
-        while (datetime.now() - start_time).seconds < max_wait_time:
-            try:
-                # Check task status
-                response = requests.get(
-                    f"{self.base_url}/video/task/{task_id}",
-                    headers=self.headers,
-                    timeout=30
-                )
-                
-                if response.status_code == 200:
-                    result = response.json()
-                    status = result.get("status")
-                    
-                    if status == "completed":
-                        return result.get("video_url")
-                    elif status == "failed":
-                        logger.error(f"Video generation task {task_id} failed: {result.get('error')}")
-                        return None
-                    elif status in ["pending", "processing"]:
-                        # Wait before next check
-                        await asyncio.sleep(10)
-                        continue
-                    else:
-                        logger.warning(f"Unknown task status: {status}")
-                        return None
-                else:
-                    logger.error(f"Task status check failed: {response.status_code}")
-                    return None
-                    
-            except Exception as e:
-                logger.error(f"Error polling task {task_id}: {e}")
-                return None
+        return await self.poller.wait_for(task_id, max_wait_time)
+    
+    async def _fetch_task_status(self, task_id: str) -> Dict[str, Any]:
+        """Fetch a task's status; transient HTTP errors report status None so the task is retried"""
         
-        logger.error(f"Video generation timed out after {max_wait_time} seconds")
-        return None
+        async with self._get_session().get(
+            f"{self.base_url}/video/task/{task_id}",
+            headers=self.headers,
+            timeout=aiohttp.ClientTimeout(total=30)
+        ) as response:
+            if response.status == 200:
+                return await response.json()
+            if response.status in RETRYABLE_STATUS_CODES:
+                logger.warning(f"Task status check for {task_id} returned {response.status}, retrying")
+                return {"status": None}
+            logger.error(f"Task status check failed: {response.status}")
+            return {"status": "failed", "error": f"HTTP {response.status}"}
     
-    async def _download_video(self, video_url: str, output_file: str) -> str:
-        """Download video from URL to local file"""
+    async def _download_video(self, video_url: str, output_file: str) -> Optional[str]:
+        """Stream video from URL to a temporary file and move it into place when complete"""
+        
+        temp_file = f"{output_file}.{uuid.uuid4().hex}.part"
         
         try:
-            response = requests.get(video_url, stream=True, timeout=300)
-            response.raise_for_status()
+            os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
             
-            os.makedirs(os.path.dirname(output_file), exist_ok=True)
+            async with self._get_session().get(
+                video_url,
+                timeout=aiohttp.ClientTimeout(total=300)
+            ) as response:
+                response.raise_for_status()
+                
+                with open(temp_file, 'wb') as f:
+                    async for chunk in response.content.iter_chunked(self.download_chunk_size):
+                        f.write(chunk)
             
-            with open(output_file, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
+            # Readers never see a partially downloaded video
+            os.replace(temp_file, output_file)
             
             logger.info(f"Video downloaded: {output_file}")
             return output_file
             
         except Exception as e:
             logger.error(f"Failed to download video: {e}")
+            if os.path.exists(temp_file):
+                os.remove(temp_file)
             return None
     
     def _calculate_cost(self, text_length: int, duration: int, resolution: str) -> float:
@@ -322,6 +513,59 @@ class MiniMaxVideoIntegration:
             }
         }
 
+_shared_client: Optional[MiniMaxVideoIntegration] = None
+_shared_client_loop: Optional[asyncio.AbstractEventLoop] = None
+_retiring_clients: Set[asyncio.Future] = set()
+
+def _retire_client(client: MiniMaxVideoIntegration, loop: asyncio.AbstractEventLoop):
+    """Close a shared client that belongs to another event loop"""
+    
+    if loop.is_closed():
+        # Its connections died with the loop; release the rest from here
+        closing = asyncio.ensure_future(client.close())
+    else:
+        closing = asyncio.wrap_future(asyncio.run_coroutine_threadsafe(client.close(), loop))
+    _retiring_clients.add(closing)
+    closing.add_done_callback(_forget_retired_client)
+
+def _forget_retired_client(closing: asyncio.Future):
+    _retiring_clients.discard(closing)
+    if not closing.cancelled() and closing.exception() is not None:
+        logger.warning(f"Failed to close replaced MiniMax client: {closing.exception()}")
+
+def get_shared_video_client() -> MiniMaxVideoIntegration:
+    """Get the MiniMax client shared by all jobs on the running event loop
+    
+    Call close_shared_video_client() before the loop shuts down.
+    """
+    
+    global _shared_client, _shared_client_loop
+    
+    loop = asyncio.get_running_loop()
+    # aiohttp sessions are bound to the loop they were created on
+    if _shared_client is None or _shared_client_loop is not loop:
+        if _shared_client is not None:
+            _retire_client(_shared_client, _shared_client_loop)
+        _shared_client = MiniMaxVideoIntegration()
+        _shared_client_loop = loop
+    return _shared_client
+
+async def close_shared_video_client():
+    """Close the shared MiniMax client and any client it replaced"""
+    
+    global _shared_client, _shared_client_loop
+    
+    client, loop = _shared_client, _shared_client_loop
+    _shared_client = None
+    _shared_client_loop = None
+    if client is not None:
+        if loop is asyncio.get_running_loop():
+            await client.close()
+        else:
+            _retire_client(client, loop)
+    if _retiring_clients:
+        await asyncio.gather(*_retiring_clients, return_exceptions=True)
+
 # Integration function to replace placeholder in batch_processor.py
 async def real_video_generation(video_job) -> Dict[str, Any]:
     """
@@ -334,8 +578,8 @@ async def real_video_generation(video_job) -> Dict[str, Any]:
         Dictionary with video generation results
     """
     
-    # Initialize MiniMax Video integration
-    minimax = MiniMaxVideoIntegration()
+    # Shared integration so concurrent jobs reuse one session and one poller
+    minimax = get_shared_video_client()
     
     # Extract job parameters
     script_text = getattr(video_job, 'script_text', '')
@@ -438,6 +682,8 @@ async def main():
         
         print(f"Video generation result: {result}")
         
+        await minimax.close()
+        
     except Exception as e:
         print(f"Error: {e}")
 
@@ -243,6 +243,47 @@ class BatchingPerformanceBenchmarks:
         
         return results
     
+    async def run_batch_building_scaling_benchmarks(
+        self,
+        request_counts: Tuple[int, ...] = (1000, 10000, 100000)
+    ) -> List[Dict[str, Any]]:
+        """Measure batch construction time as the pending queue grows
+        
+        Batch limits are lifted so that every compatible request lands in the
+        same batch; this is the case where per-candidate Batch rebuilding
+        used to make batch construction quadratic.
+        """
+        print("\n=== Batch Building Scaling Benchmarks ===")
+        results = []
+        
+        for request_count in request_counts:
+            batcher = SmartBatcher(
+                max_batch_size=request_count,
+                max_batch_cost=float('inf'),
+                max_batch_duration=float('inf'),
+                similarity_threshold=0.7,
+                cache_manager=CacheManager(memory_size=1000)
+            )
+            
+            for i, req_data in enumerate(self._generate_test_requests(request_count)):
+                await batcher.add_request(ContentRequest(id=f"scale_{i}", **req_data))
+            
+            start_time = time.perf_counter()
+            batches = await batcher.build_optimal_batches()
+            build_time = time.perf_counter() - start_time
+            
+            result = {
+                'total_requests': request_count,
+                'batches_created': len(batches),
+                'build_time_seconds': build_time,
+                'microseconds_per_request': build_time / request_count * 1e6
+            }
+            results.append(result)
+            print(f"  {request_count} requests -> {len(batches)} batches in {build_time:.3f}s "
+                  f"({result['microseconds_per_request']:.1f} us/request)")
+        
+        return results
+    
     async def _run_throughput_benchmark(
         self, 
         benchmark_name: str, 
@@ -644,6 +685,18 @@ class BatchingPerformanceBenchmarks:
 import random
 
 
+def test_batch_building_scales_linearly():
+    """Building batches for 100k queued requests costs ~10x building 10k"""
+    benchmarker = BatchingPerformanceBenchmarks()
+    results = asyncio.run(benchmarker.run_batch_building_scaling_benchmarks((10000, 100000)))
+    small, large = results
+    
+    assert large['batches_created'] <= 3  # one batch per content type
+    # A quadratic builder would be ~10x slower per request at 100k; allow
+    # generous headroom for timer noise and cache effects.
+    assert large['microseconds_per_request'] < small['microseconds_per_request'] * 3
+
+
 async def run_all_performance_benchmarks():
     """Run all performance benchmarks"""
     print("=== Batching Performance Benchmarks ===")
@@ -658,6 +711,7 @@ async def run_all_performance_benchmarks():
     resource_results = await benchmarker.run_resource_utilization_benchmarks()
     load_test_results = await benchmarker.run_concurrent_load_tests()
     scalability_results = await benchmarker.run_scalability_benchmarks()
+    batch_building_results = await benchmarker.run_batch_building_scaling_benchmarks()
     
     # Generate report
     report = benchmarker.generate_performance_report()
@@ -714,7 +768,8 @@ async def run_all_performance_benchmarks():
                 'p99_response_time_ms': r.p99_response_time_ms
             }
             for r in benchmarker.load_test_results
-        ]
+        ],
+        'batch_building_scaling': batch_building_results
     }
     
     return detailed_results
@@ -0,0 +1,119 @@
+"""
+Performance Benchmarks for Schedule Generation
+
+Measures SchedulingOptimizer.generate_optimal_schedule on large bulk jobs to
+check that slot search stays fast as the schedule fills up.
+"""
+
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Tuple
+
+# Add the code directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'code'))
+
+from scheduling_optimizer import (
+    SchedulingOptimizer, Platform, ContentType, AudienceProfile,
+    SchedulingConstraint, PriorityTier
+)
+
+
+BENCHMARK_PLATFORMS = {
+    Platform.INSTAGRAM: ContentType.INSTAGRAM_REELS,
+    Platform.TIKTOK: ContentType.TIKTOK_VIDEO,
+    Platform.LINKEDIN: ContentType.LINKEDIN_POST,
+    Platform.YOUTUBE: ContentType.YOUTUBE_SHORTS,
+}
+
+
+def run_schedule_generation_benchmark(post_count: int = 10000,
+                                      window_days: int = 90,
+                                      seed: int = 42) -> Dict[str, Any]:
+    """Schedule ``post_count`` posts across four platforms over ``window_days`` days"""
+    rng = random.Random(seed)
+    platforms = list(BENCHMARK_PLATFORMS)
+    priorities = [tier.value for tier in PriorityTier]
+
+    posts = []
+    for i in range(post_count):
+        platform = rng.choice(platforms)
+        posts.append({
+            'id': f'post_{i}',
+            'platform': platform.value,
+            'content_type': BENCHMARK_PLATFORMS[platform].value,
+            'priority': rng.choice(priorities)
+        })
+
+    constraints = [
+        SchedulingConstraint(platform=platform, min_gap_hours=6.0, max_concurrent_posts=2)
+        for platform in platforms
+    ]
+    audience_profiles = {
+        platform: AudienceProfile(
+            age_cohorts={'18-24': 0.3, '25-34': 0.4, '35-44': 0.3},
+            device_split={'mobile': 0.7, 'desktop': 0.3},
+            time_zone_weights={'UTC-5': 0.6, 'UTC-8': 0.4}
+        )
+        for platform in platforms
+    }
+    start_date = datetime(2025, 1, 6, 9, 0)
+    end_date = start_date + timedelta(days=window_days)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        optimizer = SchedulingOptimizer(db_path=os.path.join(tmp_dir, 'benchmark.db'))
+
+        # Keep per-post logging out of the measurement
+        logging.disable(logging.INFO)
+        try:
+            started = time.perf_counter()
+            plan = optimizer.generate_optimal_schedule(
+                posts, constraints, audience_profiles, start_date, end_date, max_concurrent=3
+            )
+            elapsed = time.perf_counter() - started
+        finally:
+            logging.disable(logging.NOTSET)
+
+    return {
+        'post_count': post_count,
+        'window_days': window_days,
+        'scheduled_posts': len(plan.job_assignments),
+        'elapsed_seconds': elapsed,
+        'posts_per_second': len(plan.job_assignments) / elapsed if elapsed > 0 else float('inf'),
+        'schedule_adherence_score': plan.schedule_adherence_score
+    }
+
+
+def test_schedule_generation_10k_posts_90_days():
+    """10k posts over a 90-day window are scheduled in seconds"""
+    result = run_schedule_generation_benchmark(post_count=10000, window_days=90)
+
+    assert result['scheduled_posts'] == 10000
+    assert result['elapsed_seconds'] < 30.0
+
+
+def test_schedule_generation_scales_near_linearly():
+    """Per-post cost does not grow with the size of the existing schedule"""
+    small = run_schedule_generation_benchmark(post_count=1000, window_days=90)
+    large = run_schedule_generation_benchmark(post_count=10000, window_days=90)
+
+    small_per_post = small['elapsed_seconds'] / small['scheduled_posts']
+    large_per_post = large['elapsed_seconds'] / large['scheduled_posts']
+    # A schedule rescan per slot would make each post ~10x more expensive
+    assert large_per_post < small_per_post * 3
+
+
+if __name__ == "__main__":
+    results = [
+        run_schedule_generation_benchmark(post_count=count, window_days=90)
+        for count in (1000, 5000, 10000)
+    ]
+    for result in results:
+        print(f"{result['post_count']:>6} posts / {result['window_days']} days: "
+              f"{result['elapsed_seconds']:.2f}s ({result['posts_per_second']:.0f} posts/sec)")
+    print(json.dumps(results, indent=2))
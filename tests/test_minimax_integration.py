@@ -0,0 +1,221 @@
+"""
+Tests for the async MiniMax video client.
+
+Runs MiniMaxVideoIntegration against a local fake MiniMax HTTP server to
+cover the pooled session, multiplexed task polling with adaptive backoff
+and atomic streaming downloads, plus the lifecycle of the shared client.
+"""
+
+import asyncio
+import gc
+import os
+import sys
+import warnings
+
+from aiohttp import web
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import integrate_minimax_video
+from integrate_minimax_video import MiniMaxVideoIntegration, close_shared_video_client, get_shared_video_client
+
+VIDEO_BYTES = b"\x00\x00\x00\x18ftypmp42" * 10_000
+
+
+class FakeMiniMaxServer:
+    """Local stand-in for the MiniMax video API"""
+
+    def __init__(self, polls_until_ready: int = 3):
+        self.polls_until_ready = polls_until_ready
+        self.tasks = {}
+        self.generate_requests = 0
+        self.status_requests = 0
+        self.peers = set()
+        self.base_url = None
+        self._runner = None
+
+        self.app = web.Application()
+        self.app.router.add_post('/v1/video/generate', self.generate)
+        self.app.router.add_get('/v1/video/task/{task_id}', self.task_status)
+        self.app.router.add_get('/files/{name}', self.download)
+
+    async def start(self):
+        self._runner = web.AppRunner(self.app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://127.0.0.1:{port}"
+
+    async def stop(self):
+        await self._runner.cleanup()
+
+    def _track(self, request, api=True):
+        if api:
+            assert request.headers['Authorization'] == 'Bearer test-key'
+        else:
+            # Video hosts never receive the API key
+            assert 'Authorization' not in request.headers
+        self.peers.add(request.transport.get_extra_info('peername'))
+
+    async def generate(self, request):
+        self._track(request)
+        payload = await request.json()
+        self.generate_requests += 1
+        task_id = f"task_{self.generate_requests}"
+        polls = 1000 if 'slow' in payload['prompt'] else self.polls_until_ready
+        self.tasks[task_id] = {'polls': 0, 'ready_after': polls, 'prompt': payload['prompt']}
+        return web.json_response({'task_id': task_id})
+
+    async def task_status(self, request):
+        self._track(request)
+        self.status_requests += 1
+        task = self.tasks[request.match_info['task_id']]
+        task['polls'] += 1
+        if 'fail' in task['prompt']:
+            return web.json_response({'status': 'failed', 'error': 'moderation'})
+        if task['polls'] < task['ready_after']:
+            return web.json_response({'status': 'processing'})
+        name = 'broken.mp4' if 'broken' in task['prompt'] else f"{request.match_info['task_id']}.mp4"
+        return web.json_response({'status': 'completed', 'video_url': f"{self.base_url}/files/{name}"})
+
+    async def download(self, request):
+        self._track(request, api=False)
+        response = web.StreamResponse()
+        response.content_length = len(VIDEO_BYTES)
+        await response.prepare(request)
+        if request.match_info['name'] == 'broken.mp4':
+            # Drop the connection half way through the body
+            await response.write(VIDEO_BYTES[:len(VIDEO_BYTES) // 2])
+            request.transport.close()
+            return response
+        for start in range(0, len(VIDEO_BYTES), 16_384):
+            await response.write(VIDEO_BYTES[start:start + 16_384])
+        await response.write_eof()
+        return response
+
+
+def run_with_server(scenario, **server_kwargs):
+    async def main():
+        server = FakeMiniMaxServer(**server_kwargs)
+        await server.start()
+        client = MiniMaxVideoIntegration(
+            api_key='test-key',
+            base_url=f"{server.base_url}/v1",
+            max_connections=4,
+            poll_interval=0.02,
+            max_poll_interval=0.2
+        )
+        try:
+            return await scenario(server, client)
+        finally:
+            await client.close()
+            await server.stop()
+
+    return asyncio.run(main())
+
+
+def test_bulk_jobs_share_session_and_poller(tmp_path):
+    async def scenario(server, client):
+        results = await asyncio.gather(*(
+            client.generate_talking_head_video(
+                script_text=f"Scene {i} narration",
+                avatar_url="https://example.com/avatar.jpg",
+                output_file=str(tmp_path / f"video_{i}.mp4")
+            )
+            for i in range(20)
+        ))
+        return results, server
+
+    results, server = run_with_server(scenario)
+
+    assert all(result['success'] for result in results)
+    for i, result in enumerate(results):
+        with open(result['local_file'], 'rb') as f:
+            assert f.read() == VIDEO_BYTES
+    assert not [name for name in os.listdir(tmp_path) if name.endswith('.part')]
+
+    # Every task needs 3 checks; sweeps cover all tasks at once
+    assert server.status_requests == 20 * 3
+    # Pooled session: connections are reused and bounded by the connector limit
+    assert len(server.peers) <= 4
+
+
+def test_poller_backs_off_while_tasks_are_pending():
+    async def scenario(server, client):
+        result = await asyncio.wait_for(
+            client.generate_talking_head_video(
+                script_text="A slow render",
+                avatar_url="https://example.com/avatar.jpg"
+            ),
+            timeout=5
+        )
+        return result, client.poller.stats
+
+    async def short_deadline(server, client):
+        original = client._poll_video_task
+
+        async def poll(task_id, max_wait_time=300):
+            return await original(task_id, max_wait_time=1.0)
+
+        client._poll_video_task = poll
+        return await scenario(server, client)
+
+    result, stats = run_with_server(short_deadline)
+
+    assert result['output_url'] is None
+    assert stats['timed_out'] == 1
+    # A fixed 0.02s interval would need ~50 sweeps in one second
+    assert stats['sweeps'] < 20
+
+
+def test_failed_task_and_interrupted_download(tmp_path):
+    async def scenario(server, client):
+        failed = await client.generate_talking_head_video(
+            script_text="This one will fail",
+            avatar_url="https://example.com/avatar.jpg",
+            output_file=str(tmp_path / "failed.mp4")
+        )
+        broken = await client.generate_talking_head_video(
+            script_text="A broken download",
+            avatar_url="https://example.com/avatar.jpg",
+            output_file=str(tmp_path / "broken.mp4")
+        )
+        return failed, broken, client.poller.stats
+
+    failed, broken, stats = run_with_server(scenario)
+
+    assert failed['output_url'] is None and failed['local_file'] is None
+    assert stats['failed'] == 1
+    assert broken['output_url'].endswith('broken.mp4')
+    assert broken['local_file'] is None
+    # Neither the truncated video nor its temp file is left behind
+    assert os.listdir(tmp_path) == []
+
+
+def test_shared_client_is_closed_on_loop_change_and_shutdown(monkeypatch):
+    monkeypatch.setenv('MINIMAX_API_KEY', 'test-key')
+
+    async def open_shared_client():
+        client = get_shared_video_client()
+        assert get_shared_video_client() is client
+        client._get_session()
+        return client
+
+    async def replace_then_shut_down(previous):
+        client = await open_shared_client()
+        assert client is not previous
+        await close_shared_video_client()
+        return client
+
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter('always')
+        # Each asyncio.run() is a new loop, as in repeated batch runs
+        first = asyncio.run(open_shared_client())
+        second = asyncio.run(replace_then_shut_down(first))
+        gc.collect()
+
+    assert first.session.closed and second.session.closed
+    assert integrate_minimax_video._shared_client is None
+    assert not integrate_minimax_video._retiring_clients
+    assert not [w for w in caught if 'Unclosed' in str(w.message)]
@@ -0,0 +1,249 @@
+"""
+Tests for the concurrent Amazon Polly synthesis engine.
+
+Runs AmazonPollyIntegration against a local stub client to cover thread-pool
+concurrency, token-bucket pacing, chunked streaming and the
+content-addressed cache without AWS credentials.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import integrate_amazon_polly_audio
+from integrate_amazon_polly_audio import (
+    AmazonPollyIntegration, TokenBucket, close_shared_polly, get_shared_polly, polly_cache_dir, real_audio_generation
+)
+
+
+class StubAudioStream:
+    """Mimics botocore's StreamingBody"""
+
+    def __init__(self, payload: bytes):
+        self.payload = payload
+        self.position = 0
+        self.reads = 0
+        self.closed = False
+
+    def read(self, amt=None):
+        self.reads += 1
+        end = len(self.payload) if amt is None else self.position + amt
+        chunk = self.payload[self.position:end]
+        self.position += len(chunk)
+        return chunk
+
+    def close(self):
+        self.closed = True
+
+
+class StubPollyClient:
+    """Blocking stand-in for the boto3 Polly client"""
+
+    def __init__(self, latency: float = 0.05, payload_size: int = 1024, fail_on: str = None):
+        self.latency = latency
+        self.payload_size = payload_size
+        self.fail_on = fail_on
+        self.calls = []
+        self.streams = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def synthesize_speech(self, **request_args):
+        with self._lock:
+            self.calls.append(request_args)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.latency)  # Blocking, like the real client
+            if self.fail_on and self.fail_on in request_args['Text']:
+                raise RuntimeError("ThrottlingException")
+            seed = request_args['Text'].encode('utf-8')
+            payload = (seed * (self.payload_size // len(seed) + 1))[:self.payload_size]
+            stream = StubAudioStream(payload)
+            self.streams.append(stream)
+            return {'AudioStream': stream}
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def describe_voices(self, **kwargs):
+        return {'Voices': [{'Id': 'Joanna', 'Name': 'Joanna', 'LanguageCode': 'en-US',
+                            'SupportedEngines': ['neural']}]}
+
+
+def make_polly(tmp_path, client, **kwargs):
+    kwargs.setdefault('requests_per_second', 1000.0)
+    kwargs.setdefault('burst', 1000)
+    kwargs.setdefault('cache_dir', str(tmp_path / 'cache'))
+    return AmazonPollyIntegration(client=client, **kwargs)
+
+
+def test_batch_runs_concurrently_without_blocking_event_loop(tmp_path):
+    client = StubPollyClient(latency=0.05)
+    polly = make_polly(tmp_path, client, max_concurrency=8)
+    texts = [f"Scene {i}: automate the weekly report." for i in range(40)]
+
+    async def run():
+        ticks = 0
+        done = asyncio.Event()
+
+        async def ticker():
+            nonlocal ticks
+            while not done.is_set():
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        ticker_task = asyncio.create_task(ticker())
+        started = time.perf_counter()
+        results = await polly.batch_synthesize(texts, 'Joanna', str(tmp_path / 'out'))
+        elapsed = time.perf_counter() - started
+        done.set()
+        await ticker_task
+        return results, elapsed, ticks
+
+    results, elapsed, ticks = asyncio.run(run())
+    polly.close()
+
+    assert all(result['success'] for result in results)
+    assert [os.path.basename(r['output_file']) for r in results][:2] == ['audio_000.mp3', 'audio_001.mp3']
+    # 40 serial calls would take 2s
+    assert elapsed < 1.0
+    assert 1 < client.max_in_flight <= 8
+    # The loop kept running while Polly calls were blocking
+    assert ticks >= elapsed / 0.01 * 0.5
+
+
+def test_repeated_lines_are_synthesized_once(tmp_path):
+    client = StubPollyClient(latency=0.02)
+    polly = make_polly(tmp_path, client)
+    texts = ["Welcome back!", "Let's get started.", "Welcome back!", "Welcome back!"]
+
+    first = asyncio.run(polly.batch_synthesize(texts, 'Joanna', str(tmp_path / 'first')))
+    second = asyncio.run(polly.batch_synthesize(texts, 'Joanna', str(tmp_path / 'second')))
+    other_voice = asyncio.run(polly.synthesize_speech("Welcome back!", 'Matthew', str(tmp_path / 'm.mp3')))
+    polly.close()
+
+    # Two unique lines for Joanna plus one for Matthew
+    assert len(client.calls) == 3
+    assert [r['cached'] for r in first].count(False) == 2
+    assert all(r['cached'] for r in second)
+    assert not other_voice['cached']
+    assert second[0]['cost_estimate'] == 0.0
+
+    with open(first[0]['output_file'], 'rb') as a, open(second[3]['output_file'], 'rb') as b:
+        assert a.read() == b.read()
+    assert polly.stats['synthesized'] == 3
+
+
+def test_outputs_are_independent_copies_of_the_cache_entry(tmp_path):
+    client = StubPollyClient()
+    polly = make_polly(tmp_path, client)
+
+    first = asyncio.run(polly.synthesize_speech("Welcome back!", 'Joanna', str(tmp_path / 'a.mp3')))
+    second = asyncio.run(polly.synthesize_speech("Welcome back!", 'Joanna', str(tmp_path / 'b.mp3')))
+    polly.close()
+    assert second['cached']
+
+    with open(first['output_file'], 'rb') as f:
+        original = f.read()
+    # Post-processing an output in place must not touch the cache or other outputs
+    with open(first['output_file'], 'r+b') as f:
+        f.write(b'normalized')
+
+    cache_files = [os.path.join(root, name) for root, _, names in os.walk(polly.cache_dir) for name in names]
+    assert len(cache_files) == 1
+    with open(cache_files[0], 'rb') as cached, open(second['output_file'], 'rb') as other:
+        assert cached.read() == original
+        assert other.read() == original
+    assert os.stat(first['output_file']).st_nlink == 1
+
+
+def test_cache_dir_is_one_stable_location(tmp_path, monkeypatch):
+    monkeypatch.delenv('POLLY_CACHE_DIR', raising=False)
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path / 'user-cache'))
+    assert AmazonPollyIntegration(client=StubPollyClient()).cache_dir is None
+    assert polly_cache_dir() == str(tmp_path / 'user-cache' / 'polly')
+
+    monkeypatch.setenv('POLLY_CACHE_DIR', str(tmp_path / 'shared'))
+    assert AmazonPollyIntegration(client=StubPollyClient()).cache_dir == str(tmp_path / 'shared')
+    assert polly_cache_dir() == str(tmp_path / 'shared')
+
+
+def test_batches_share_one_integration_and_cache(tmp_path, monkeypatch):
+    client = StubPollyClient(latency=0.0)
+    monkeypatch.setattr(integrate_amazon_polly_audio, '_shared_polly', make_polly(tmp_path, client))
+    texts = ["Welcome back.", "Today: automation."]
+
+    async def batch(output_dir):
+        return await real_audio_generation(texts, 'Joanna', output_dir=output_dir)
+
+    try:
+        shared = get_shared_polly()
+        # Each batch writes to a scratch directory that is removed afterwards
+        for i in range(3):
+            scratch = tmp_path / f'batch_{i}'
+            files = asyncio.run(batch(str(scratch)))
+            assert [os.path.basename(path) for path in files] == ['voiceover_000.mp3', 'voiceover_001.mp3']
+            for path in files:
+                os.remove(path)
+            os.rmdir(scratch)
+
+        assert get_shared_polly() is shared
+        assert len(client.calls) == 2
+        assert shared.stats['cache_hits'] == 4
+    finally:
+        close_shared_polly()
+    assert integrate_amazon_polly_audio._shared_polly is None
+
+
+def test_audio_stream_is_written_in_chunks_atomically(tmp_path):
+    client = StubPollyClient(latency=0.0, payload_size=10_000, fail_on="broken")
+    polly = make_polly(tmp_path, client, chunk_size=1024, cache_dir=None)
+
+    ok = asyncio.run(polly.synthesize_speech("A long narration line.", 'Joanna', str(tmp_path / 'ok.mp3')))
+    failed = asyncio.run(polly.synthesize_speech("A broken line.", 'Joanna', str(tmp_path / 'bad.mp3')))
+    polly.close()
+
+    assert ok['success'] and ok['file_size'] == 10_000
+    assert client.streams[0].reads == 11 and client.streams[0].closed
+    assert not failed['success']
+    assert 'ThrottlingException' in failed['error']
+    assert sorted(os.listdir(tmp_path)) == ['ok.mp3']
+
+
+def test_token_bucket_paces_requests(tmp_path):
+    client = StubPollyClient(latency=0.0)
+    polly = make_polly(tmp_path, client, requests_per_second=20.0, burst=2)
+    texts = [f"Line {i}" for i in range(10)]
+
+    started = time.perf_counter()
+    results = asyncio.run(polly.batch_synthesize(texts, 'Joanna', str(tmp_path / 'out')))
+    elapsed = time.perf_counter() - started
+    polly.close()
+
+    assert all(result['success'] for result in results)
+    # 2 burst tokens, then 8 requests at 20/s
+    assert elapsed >= 0.35
+
+
+def test_token_bucket_reservations_queue_in_order():
+    bucket = TokenBucket(rate=10.0, capacity=1)
+
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == pytest.approx(0.1, abs=0.01)
+    assert bucket.reserve() == pytest.approx(0.2, abs=0.01)
+
+
+def test_voices_are_loaded_off_the_event_loop(tmp_path):
+    polly = make_polly(tmp_path, StubPollyClient())
+    voices = asyncio.run(polly.get_available_voices())
+    polly.close()
+
+    assert voices[0]['voice_id'] == 'Joanna'
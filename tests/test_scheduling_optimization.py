@@ -233,6 +233,39 @@ class TestSchedulingOptimizationAlgorithms:
         assert young_scores[21] > professional_scores[21], \
             "Young audiences should prefer late evening content"
     
+    def test_timing_score_matrix_memoized_and_invalidated(self, scheduling_optimizer, sample_audience_profile):
+        """Test weekly timing score matrix caching and invalidation on new metrics."""
+        matrix = scheduling_optimizer.get_timing_score_matrix(
+            Platform.TIKTOK, ContentType.TIKTOK_VIDEO, sample_audience_profile
+        )
+        
+        assert matrix.shape == (7, 24)
+        for day_of_week in range(7):
+            scores = scheduling_optimizer.calculate_timing_scores(
+                Platform.TIKTOK, ContentType.TIKTOK_VIDEO, sample_audience_profile, day_of_week
+            )
+            assert [scores[hour] for hour in range(24)] == matrix[day_of_week].tolist()
+        
+        # Same inputs are served from the cache
+        assert scheduling_optimizer.get_timing_score_matrix(
+            Platform.TIKTOK, ContentType.TIKTOK_VIDEO, sample_audience_profile
+        ) is matrix
+        
+        # A post recorded now penalizes the surrounding hours on the next lookup
+        posted_at = datetime.now().replace(hour=2, minute=0, second=0, microsecond=0)
+        scheduling_optimizer.record_performance_metrics(PerformanceMetrics(
+            platform=Platform.TIKTOK,
+            content_type=ContentType.TIKTOK_VIDEO,
+            posted_at=posted_at,
+            engagement_rate=0.05
+        ))
+        
+        updated = scheduling_optimizer.get_timing_score_matrix(
+            Platform.TIKTOK, ContentType.TIKTOK_VIDEO, sample_audience_profile
+        )
+        assert updated is not matrix
+        assert not np.array_equal(updated, matrix)
+    
     # Test Multi-Platform Scheduling
     def test_generate_optimal_schedule_basic(self, scheduling_optimizer, sample_constraints, sample_audience_profile):
         """Test basic optimal schedule generation."""